@@ -48,6 +48,24 @@ _REDIS_UPDATE_INTERVAL_SECONDS = 5
 
 _REDIS_POLL_TIMEOUT = 0.15
 
+# Sorted sets indexing the running conversations and connections. The score of
+# each member is the time at which it expires unless it is refreshed, so that
+# lookups don't have to scan the keyspace.
+_REDIS_CONVERSATION_INDEX_KEY = 'ohcnvidx'
+_REDIS_CONNECTION_INDEX_KEY = 'ohcnctidx'
+
+# Hash of conversation_id -> user_id for the running conversations
+_REDIS_CONVERSATION_USER_KEY = 'ohcnvusr'
+
+# Value of the per entry keys written by servers which also write the indexes.
+# Servers which predate the indexes write 1, so a key which has any other value
+# was last refreshed by a server which does not index it.
+_REDIS_INDEXED_ENTRY_VALUE = 'indexed'
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
 
 @dataclass
 class _LLMResponseRequest:
@@ -73,10 +91,24 @@ class ClusteredConversationManager(StandaloneConversationManager):
     The Redis communication uses several key patterns:
     - ohcnv:{user_id}:{conversation_id} - Marks a conversation as active
     - ohcnct:{user_id}:{conversation_id}:{connection_id} - Tracks connections to conversations
+
+    Running conversations and connections are also indexed in sorted sets scored by
+    the time at which they expire, so that they can be looked up without scanning:
+    - ohcnvidx, ohcnvidx:{user_id} - Conversation IDs, for the cluster and per user
+    - ohcnvusr - Hash of conversation ID to user ID
+    - ohcnctidx, ohcnctidx:{user_id} - {conversation_id}:{connection_id}, for the
+      cluster and per user
+    - ohcnctidx:cnv:{conversation_id} - Connection IDs per conversation
+    Expired members are ignored when reading, and removed whenever a server
+    refreshes its own entries. Servers which only write the per entry keys (e.g.:
+    Servers running an older version during a rolling deploy) are found by scanning
+    for those keys on startup, and their entries are indexed on each refresh for as
+    long as any keys are found which were last refreshed by such a server.
     """
 
     _redis_listen_task: asyncio.Task | None = field(default=None)
     _redis_update_task: asyncio.Task | None = field(default=None)
+    _unindexed_redis_entries_found: bool = field(default=True)
 
     _llm_responses: dict[str, _LLMResponseRequest] = field(default_factory=dict)
 
@@ -221,6 +253,50 @@ class ClusteredConversationManager(StandaloneConversationManager):
     ):
         return f'ohcnct:{user_id}:{conversation_id}:{connection_id}'
 
+    def _get_redis_user_conversation_index_key(self, user_id: str | None):
+        return f'{_REDIS_CONVERSATION_INDEX_KEY}:{user_id}'
+
+    def _get_redis_user_connection_index_key(self, user_id: str | None):
+        return f'{_REDIS_CONNECTION_INDEX_KEY}:{user_id}'
+
+    def _get_redis_conversation_connection_index_key(self, conversation_id: str):
+        return f'{_REDIS_CONNECTION_INDEX_KEY}:cnv:{conversation_id}'
+
+    async def _get_unexpired_members(self, key: str) -> list[str]:
+        redis = self._get_redis_client()
+        members = await redis.zrangebyscore(key, f'({time.time()}', '+inf')
+        return [_decode(member) for member in members]
+
+    async def _index_conversation(self, pipe, user_id: str | None, sid: str):
+        """Add commands to a pipeline to (re)index a running conversation."""
+        now = time.time()
+        expires_at = now + _REDIS_ENTRY_TIMEOUT_SECONDS
+        user_index_key = self._get_redis_user_conversation_index_key(user_id)
+        await pipe.zadd(_REDIS_CONVERSATION_INDEX_KEY, {sid: expires_at})
+        await pipe.zremrangebyscore(user_index_key, '-inf', now)
+        await pipe.zadd(user_index_key, {sid: expires_at})
+        await pipe.expire(user_index_key, _REDIS_ENTRY_TIMEOUT_SECONDS)
+        await pipe.hset(_REDIS_CONVERSATION_USER_KEY, sid, str(user_id))
+
+    async def _index_connection(
+        self, pipe, user_id: str, conversation_id: str, connection_id: str
+    ):
+        """Add commands to a pipeline to (re)index a connection."""
+        now = time.time()
+        expires_at = now + _REDIS_ENTRY_TIMEOUT_SECONDS
+        member = f'{conversation_id}:{connection_id}'
+        user_index_key = self._get_redis_user_connection_index_key(user_id)
+        conversation_index_key = self._get_redis_conversation_connection_index_key(
+            conversation_id
+        )
+        await pipe.zadd(_REDIS_CONNECTION_INDEX_KEY, {member: expires_at})
+        await pipe.zremrangebyscore(user_index_key, '-inf', now)
+        await pipe.zadd(user_index_key, {member: expires_at})
+        await pipe.expire(user_index_key, _REDIS_ENTRY_TIMEOUT_SECONDS)
+        await pipe.zremrangebyscore(conversation_index_key, '-inf', now)
+        await pipe.zadd(conversation_index_key, {connection_id: expires_at})
+        await pipe.expire(conversation_index_key, _REDIS_ENTRY_TIMEOUT_SECONDS)
+
     async def _get_event_store(self, sid, user_id) -> EventStoreABC | None:
         session = self._local_agent_loops_by_sid.get(sid)
         if session:
@@ -270,16 +346,32 @@ class ClusteredConversationManager(StandaloneConversationManager):
         if filter_to_sids is not None and not filter_to_sids:
             return set()
         if user_id:
-            pattern = self._get_redis_conversation_key(user_id, '*')
+            conversation_ids = await self._get_unexpired_members(
+                self._get_redis_user_conversation_index_key(user_id)
+            )
+        elif filter_to_sids is not None:
+            # Look up each conversation in a single round trip
+            redis = self._get_redis_client()
+            sids = list(filter_to_sids)
+            pipe = redis.pipeline()
+            for sid in sids:
+                await pipe.zscore(_REDIS_CONVERSATION_INDEX_KEY, sid)
+            scores = await pipe.execute()
+            now = time.time()
+            return {
+                sid
+                for sid, score in zip(sids, scores, strict=True)
+                if score is not None and score > now
+            }
         else:
-            pattern = self._get_redis_conversation_key('*', '*')
-        redis = self._get_redis_client()
-        result = set()
-        async for key in redis.scan_iter(pattern):
-            conversation_id = key.decode().split(':')[2]
-            if filter_to_sids is None or conversation_id in filter_to_sids:
-                result.add(conversation_id)
-        return result
+            conversation_ids = await self._get_unexpired_members(
+                _REDIS_CONVERSATION_INDEX_KEY
+            )
+        return {
+            conversation_id
+            for conversation_id in conversation_ids
+            if filter_to_sids is None or conversation_id in filter_to_sids
+        }
 
     async def get_connections(
         self, user_id: str | None = None, filter_to_sids: set[str] | None = None
@@ -300,15 +392,32 @@ class ClusteredConversationManager(StandaloneConversationManager):
         if filter_to_sids is not None and not filter_to_sids:
             return {}
         if user_id:
-            pattern = self._get_redis_connection_key(user_id, '*', '*')
+            members = await self._get_unexpired_members(
+                self._get_redis_user_connection_index_key(user_id)
+            )
+        elif filter_to_sids is not None:
+            # Look up the connections of each conversation in a single round trip
+            redis = self._get_redis_client()
+            sids = list(filter_to_sids)
+            min_score = f'({time.time()}'
+            pipe = redis.pipeline()
+            for sid in sids:
+                await pipe.zrangebyscore(
+                    self._get_redis_conversation_connection_index_key(sid),
+                    min_score,
+                    '+inf',
+                )
+            connection_ids = await pipe.execute()
+            return {
+                _decode(connection_id): sid
+                for sid, sid_connection_ids in zip(sids, connection_ids, strict=True)
+                for connection_id in sid_connection_ids
+            }
         else:
-            pattern = self._get_redis_connection_key('*', '*', '*')
-        redis = self._get_redis_client()
+            members = await self._get_unexpired_members(_REDIS_CONNECTION_INDEX_KEY)
         result = {}
-        async for key in redis.scan_iter(pattern):
-            parts = key.decode().split(':')
-            conversation_id = parts[2]
-            connection_id = parts[3]
+        for member in members:
+            conversation_id, connection_id = member.split(':', 1)
             if filter_to_sids is None or conversation_id in filter_to_sids:
                 result[connection_id] = conversation_id
         return result
@@ -397,8 +506,15 @@ class ClusteredConversationManager(StandaloneConversationManager):
         # If we can set the key in redis then no other worker is running this conversation
         redis = self._get_redis_client()
         key = self._get_redis_conversation_key(user_id, sid)  # type: ignore
-        created = await redis.set(key, 1, nx=True, ex=_REDIS_ENTRY_TIMEOUT_SECONDS)
+        created = await redis.set(
+            key, _REDIS_INDEXED_ENTRY_VALUE, nx=True, ex=_REDIS_ENTRY_TIMEOUT_SECONDS
+        )
         if created:
+            # Index the conversation straight away so that it counts towards the
+            # limit of running conversations on other servers
+            pipe = redis.pipeline()
+            await self._index_conversation(pipe, user_id, sid)
+            await pipe.execute()
             await self._start_agent_loop(
                 sid, settings, user_id, initial_user_msg, replay_json
             )
@@ -436,21 +552,36 @@ class ClusteredConversationManager(StandaloneConversationManager):
         """Refresh all entries in Redis to maintain conversation state across the cluster.
 
         This method:
-        1. Scans Redis for all conversation keys to build a mapping of conversation IDs to user IDs
-        2. Updates Redis entries for all local conversations to prevent them from expiring
-        3. Updates Redis entries for all local connections to prevent them from expiring
+        1. Indexes entries written by servers which predate the indexes, while there are any
+        2. Updates Redis entries and indexes for all local conversations to prevent them from expiring
+        3. Looks up the user IDs of the conversations with local connections
+        4. Updates Redis entries and indexes for all local connections to prevent them from expiring
+        5. Removes expired members from the cluster wide indexes
 
         This is critical for maintaining the distributed state and allowing other servers
         to detect when a server has gone down unexpectedly.
         """
         redis = self._get_redis_client()
 
-        # Build a mapping of conversation_id -> user_id from existing Redis keys
-        pattern = self._get_redis_conversation_key('*', '*')
-        conversation_user_ids = {}
-        async for key in redis.scan_iter(pattern):
-            parts = key.decode().split(':')
-            conversation_user_ids[parts[2]] = parts[1]
+        if self._unindexed_redis_entries_found:
+            self._unindexed_redis_entries_found = (
+                await self._index_unindexed_redis_entries()
+            )
+
+        # Build a mapping of conversation_id -> user_id for the local connections
+        conversation_user_ids = {
+            sid: str(session.user_id)
+            for sid, session in self._local_agent_loops_by_sid.items()
+        }
+        remote_sids = list(
+            set(self._local_connection_id_to_session_id.values())
+            - conversation_user_ids.keys()
+        )
+        if remote_sids:
+            user_ids = await redis.hmget(_REDIS_CONVERSATION_USER_KEY, remote_sids)
+            for sid, user_id in zip(remote_sids, user_ids, strict=True):
+                if user_id is not None:
+                    conversation_user_ids[sid] = _decode(user_id)
 
         pipe = redis.pipeline()
 
@@ -460,9 +591,10 @@ class ClusteredConversationManager(StandaloneConversationManager):
             if sid:
                 await pipe.set(
                     self._get_redis_conversation_key(session.user_id, sid),
-                    1,
+                    _REDIS_INDEXED_ENTRY_VALUE,
                     ex=_REDIS_ENTRY_TIMEOUT_SECONDS,
                 )
+                await self._index_conversation(pipe, session.user_id, sid)
 
         # Then, update all local connections
         for (
@@ -475,13 +607,92 @@ class ClusteredConversationManager(StandaloneConversationManager):
                     self._get_redis_connection_key(
                         user_id, conversation_id, connection_id
                     ),
-                    1,
+                    _REDIS_INDEXED_ENTRY_VALUE,
                     ex=_REDIS_ENTRY_TIMEOUT_SECONDS,
                 )
+                await self._index_connection(
+                    pipe, user_id, conversation_id, connection_id
+                )
 
         # Execute all commands in the pipeline
         await pipe.execute()
 
+        await self._remove_expired_from_redis_indexes()
+
+    async def _remove_expired_from_redis_indexes(self):
+        """Remove the conversations and connections of servers which stopped without
+        cleaning up from the cluster wide indexes. The per user and per conversation
+        indexes expire by themselves once nothing refreshes them."""
+        redis = self._get_redis_client()
+        now = time.time()
+        expired_sids = [
+            _decode(sid)
+            for sid in await redis.zrangebyscore(
+                _REDIS_CONVERSATION_INDEX_KEY, '-inf', now
+            )
+        ]
+        await redis.zremrangebyscore(_REDIS_CONNECTION_INDEX_KEY, '-inf', now)
+        if not expired_sids:
+            return
+
+        # Only the members read are removed, and the user of a conversation is only
+        # removed with it. (A conversation restarted since it was read is added
+        # back with its user on the next refresh of the server running it.)
+        pipe = redis.pipeline()
+        for sid in expired_sids:
+            await pipe.zrem(_REDIS_CONVERSATION_INDEX_KEY, sid)
+        removed = await pipe.execute()
+        removed_sids = [
+            sid for sid, count in zip(expired_sids, removed, strict=True) if count
+        ]
+        if removed_sids:
+            await redis.hdel(_REDIS_CONVERSATION_USER_KEY, *removed_sids)
+
+    async def _index_unindexed_redis_entries(self) -> bool:
+        """Index any conversations and connections whose per entry keys were last
+        refreshed by a server which predates the indexes. Such a server keeps
+        refreshing only those keys, so their entries are indexed again on each
+        refresh. Returns True if any were found."""
+        redis = self._get_redis_client()
+        conversation_keys = [
+            _decode(key)
+            async for key in redis.scan_iter(self._get_redis_conversation_key('*', '*'))
+        ]
+        connection_keys = [
+            _decode(key)
+            async for key in redis.scan_iter(
+                self._get_redis_connection_key('*', '*', '*')
+            )
+        ]
+        keys = conversation_keys + connection_keys
+        if not keys:
+            return False
+
+        # Keys which expired since the scan have no value, and are skipped
+        values = await redis.mget(keys)
+        unindexed_keys = {
+            key
+            for key, value in zip(keys, values, strict=True)
+            if value is not None and _decode(value) != _REDIS_INDEXED_ENTRY_VALUE
+        }
+        if not unindexed_keys:
+            return False
+
+        logger.info(
+            'indexing_unindexed_redis_entries', extra={'count': len(unindexed_keys)}
+        )
+        pipe = redis.pipeline()
+        for key in conversation_keys:
+            if key in unindexed_keys:
+                user_id, sid = key.split(':')[1:3]
+                await self._index_conversation(pipe, user_id, sid)
+        for key in connection_keys:
+            if key in unindexed_keys:
+                user_id, sid, connection_id = key.split(':')[1:4]
+                await self._index_connection(pipe, user_id, sid, connection_id)
+        await pipe.execute()
+        return True
+
     async def _disconnect_from_stopped(self):
         """
         Handle connections to conversations that have stopped unexpectedly.
@@ -503,12 +714,9 @@ class ClusteredConversationManager(StandaloneConversationManager):
             return
 
         # Get the list of sessions which are actually running
-        redis = self._get_redis_client()
-        pattern = self._get_redis_conversation_key('*', '*')
-        running_remote = set()
-        async for key in redis.scan_iter(pattern):
-            parts = key.decode().split(':')
-            running_remote.add(parts[2])
+        running_remote = await self._get_running_agent_loops_remotely(
+            filter_to_sids=connected_to_remote_sids
+        )
 
         # Get the list of connections locally where the remote agentloop has died.
         stopped_conversation_ids = connected_to_remote_sids - running_remote
@@ -616,23 +824,40 @@ class ClusteredConversationManager(StandaloneConversationManager):
         logger.info(f'_close_session:{sid}')
         redis = self._get_redis_client()
 
-        # Keys to delete from redis
-        to_delete = []
-
         # Remove connections
         connection_ids_to_remove = list(
             connection_id
             for connection_id, conn_sid in self._local_connection_id_to_session_id.items()
             if sid == conn_sid
         )
+        session = self._local_agent_loops_by_sid.pop(sid, None)
 
+        pipe = redis.pipeline()
         if connection_ids_to_remove:
-            pattern = self._get_redis_connection_key('*', sid, '*')
-            async for key in redis.scan_iter(pattern):
-                parts = key.decode().split(':')
-                connection_id = parts[3]
-                if connection_id in connection_ids_to_remove:
-                    to_delete.append(key)
+            if session:
+                user_id = str(session.user_id)
+            else:
+                value = await redis.hget(_REDIS_CONVERSATION_USER_KEY, sid)
+                user_id = _decode(value) if value is not None else None
+            if user_id:
+                members = [
+                    f'{sid}:{connection_id}'
+                    for connection_id in connection_ids_to_remove
+                ]
+                await pipe.delete(
+                    *(
+                        self._get_redis_connection_key(user_id, sid, connection_id)
+                        for connection_id in connection_ids_to_remove
+                    )
+                )
+                await pipe.zrem(_REDIS_CONNECTION_INDEX_KEY, *members)
+                await pipe.zrem(
+                    self._get_redis_user_connection_index_key(user_id), *members
+                )
+                await pipe.zrem(
+                    self._get_redis_conversation_connection_index_key(sid),
+                    *connection_ids_to_remove,
+                )
 
             logger.info(f'removing connections: {connection_ids_to_remove}')
             for connection_id in connection_ids_to_remove:
@@ -640,15 +865,18 @@ class ClusteredConversationManager(StandaloneConversationManager):
                 self._local_connection_id_to_session_id.pop(connection_id, None)
 
         # Delete the conversation key if running locally
-        session = self._local_agent_loops_by_sid.pop(sid, None)
         if not session:
             logger.info(f'no_session_to_close:{sid}')
-            if to_delete:
-                redis.delete(*to_delete)
+            await pipe.execute()
             return
 
-        to_delete.append(self._get_redis_conversation_key(session.user_id, sid))
-        await redis.delete(*to_delete)
+        await pipe.delete(self._get_redis_conversation_key(session.user_id, sid))
+        await pipe.zrem(_REDIS_CONVERSATION_INDEX_KEY, sid)
+        await pipe.zrem(
+            self._get_redis_user_conversation_index_key(session.user_id), sid
+        )
+        await pipe.hdel(_REDIS_CONVERSATION_USER_KEY, sid)
+        await pipe.execute()
         try:
             redis_client = self._get_redis_client()
             if redis_client:
@@ -672,16 +900,20 @@ class ClusteredConversationManager(StandaloneConversationManager):
 
     async def get_agent_loop_info(self, user_id=None, filter_to_sids=None):
         # conversation_ids = await self.get_running_agent_loops(user_id=user_id, filter_to_sids=filter_to_sids)
-        redis = self._get_redis_client()
-        results = []
+        conversation_ids = sorted(
+            await self._get_running_agent_loops_remotely(user_id, filter_to_sids)
+        )
         if user_id:
-            pattern = self._get_redis_conversation_key(user_id, '*')
+            user_ids: list = [user_id] * len(conversation_ids)
+        elif conversation_ids:
+            redis = self._get_redis_client()
+            user_ids = await redis.hmget(_REDIS_CONVERSATION_USER_KEY, conversation_ids)
         else:
-            pattern = self._get_redis_conversation_key('*', '*')
-
-        async for key in redis.scan_iter(pattern):
-            uid, conversation_id = key.decode().split(':')[1:]
-            if filter_to_sids is None or conversation_id in filter_to_sids:
+            user_ids = []
+        results = []
+        for conversation_id, uid in zip(conversation_ids, user_ids, strict=True):
+            if uid is not None:
+                uid = _decode(uid)
                 results.append(
                     AgentLoopInfo(
                         conversation_id,
@@ -284,6 +284,24 @@ class SaasSQLAppConversationInfoService(SQLAppConversationInfoService):
 
         return results
 
+    async def get_app_conversation_info_by_sandbox_ids(
+        self, sandbox_ids: list[str], include_sub_conversations: bool = False
+    ) -> list[AppConversationInfo]:
+        """Get conversation info for sandboxes with user_id from SAAS metadata."""
+        if not sandbox_ids:
+            return []
+        query = await self._secure_select_with_saas_metadata()
+        query = query.where(StoredConversationMetadata.sandbox_id.in_(sandbox_ids))
+        if not include_sub_conversations:
+            query = query.where(
+                StoredConversationMetadata.parent_conversation_id.is_(None)
+            )
+        result = await self.db_session.execute(query)
+        return [
+            self._to_info_with_user_id(stored_metadata, saas_metadata)
+            for stored_metadata, saas_metadata in result.all()
+        ]
+
     async def save_app_conversation_info(
         self, info: AppConversationInfo
     ) -> AppConversationInfo:
@@ -197,12 +197,14 @@ class SaasConversationStore(ConversationStore):
         self,
         page_id: str | None = None,
         limit: int = 20,
+        selected_repository: str | None = None,
+        trigger: ConversationTrigger | None = None,
     ) -> ConversationMetadataResultSet:
         offset = page_id_to_offset(page_id)
 
         def _search():
             with self.session_maker() as session:
-                conversations = (
+                query = (
                     session.query(StoredConversationMetadata)
                     .join(
                         StoredConversationMetadataSaas,
@@ -214,7 +216,18 @@ class SaasConversationStore(ConversationStore):
                     )
                     .filter(StoredConversationMetadataSaas.org_id == self.org_id)
                     .filter(StoredConversationMetadata.conversation_version == 'V0')
-                    .order_by(StoredConversationMetadata.created_at.desc())
+                )
+                if selected_repository is not None:
+                    query = query.filter(
+                        StoredConversationMetadata.selected_repository
+                        == selected_repository
+                    )
+                if trigger is not None:
+                    query = query.filter(
+                        StoredConversationMetadata.trigger == trigger.value
+                    )
+                conversations = (
+                    query.order_by(StoredConversationMetadata.created_at.desc())
                     .offset(offset)
                     .limit(limit + 1)
                     .all()
@@ -1,4 +1,5 @@
 import asyncio
+import fnmatch
 import json
 import time
 from dataclasses import dataclass
@@ -39,7 +40,87 @@ class AsyncIteratorMock:
         return self.items.pop(0)
 
 
-def get_mock_sio(get_message: GetMessageMock | None = None, scan_keys=None):
+class RedisIndexMock:
+    """Sorted sets and hashes backing the index commands of the Redis mock."""
+
+    def __init__(self):
+        self.sorted_sets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    async def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zscore(self, key, member):
+        return self.sorted_sets.get(key, {}).get(member)
+
+    async def zrangebyscore(self, key, min, max):
+        def in_range(score):
+            low, high = str(min), str(max)
+            above = (
+                score > float(low[1:]) if low.startswith('(') else score >= float(low)
+            )
+            return above and score <= float(high)
+
+        members = self.sorted_sets.get(key, {})
+        return [
+            member.encode()
+            for member, score in sorted(members.items(), key=lambda item: item[1])
+            if in_range(score)
+        ]
+
+    async def zrem(self, key, *members):
+        removed = 0
+        for member in members:
+            if self.sorted_sets.get(key, {}).pop(member, None) is not None:
+                removed += 1
+        return removed
+
+    async def zremrangebyscore(self, key, min, max):
+        for member in await self.zrangebyscore(key, min, max):
+            self.sorted_sets[key].pop(member.decode())
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hget(self, key, field):
+        value = self.hashes.get(key, {}).get(field)
+        return value.encode() if value is not None else None
+
+    async def hmget(self, key, fields):
+        return [await self.hget(key, field) for field in fields]
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            field = field.decode() if isinstance(field, bytes) else field
+            self.hashes.get(key, {}).pop(field, None)
+
+
+_INDEX_COMMANDS = (
+    'zadd',
+    'zscore',
+    'zrangebyscore',
+    'zrem',
+    'zremrangebyscore',
+    'expire',
+    'hset',
+    'hget',
+    'hmget',
+    'hdel',
+)
+
+
+def get_mock_sio(
+    get_message: GetMessageMock | None = None,
+    running_conversations: dict[str, str] | None = None,
+    unindexed_keys: list[str] | None = None,
+):
+    """Get a mock SocketIO server whose Redis mock has the given conversations
+    (conversation_id -> user_id) running, and the given per entry keys which are
+    refreshed by a server which does not index them."""
     sio = MagicMock()
     sio.enter_room = AsyncMock()
     sio.disconnect = AsyncMock()  # Add mock for disconnect method
@@ -50,23 +131,61 @@ def get_mock_sio(get_message: GetMessageMock | None = None, scan_keys=None):
     redis_mock.get = AsyncMock(return_value=None)
     redis_mock.set = AsyncMock()
     redis_mock.delete = AsyncMock()
-
-    # Create a pipeline mock
-    pipeline_mock = MagicMock()
-    pipeline_mock.set = AsyncMock()
-    pipeline_mock.execute = AsyncMock()
-    redis_mock.pipeline = MagicMock(return_value=pipeline_mock)
-
-    # Mock scan_iter to return the specified keys
-    if scan_keys is not None:
-        # Convert keys to bytes as Redis returns bytes
-        encoded_keys = [
-            key.encode() if isinstance(key, str) else key for key in scan_keys
+    redis_mock.scan_iter = MagicMock(
+        side_effect=lambda pattern: AsyncIteratorMock(
+            [
+                key.encode()
+                for key in unindexed_keys or []
+                if fnmatch.fnmatchcase(key, pattern)
+            ]
+        )
+    )
+    redis_mock.mget = AsyncMock(
+        side_effect=lambda keys: [
+            b'1' if key in (unindexed_keys or []) else None for key in keys
         ]
-        # Create a proper async iterator mock
-        async_iter = AsyncIteratorMock(encoded_keys)
-        # Use the async iterator directly as the scan_iter method
-        redis_mock.scan_iter = MagicMock(return_value=async_iter)
+    )
+
+    index = RedisIndexMock()
+    redis_mock.index = index
+    for command in _INDEX_COMMANDS:
+        setattr(redis_mock, command, AsyncMock(side_effect=getattr(index, command)))
+    for conversation_id, user_id in (running_conversations or {}).items():
+        expires_at = time.time() + 60
+        index.sorted_sets.setdefault('ohcnvidx', {})[conversation_id] = expires_at
+        index.sorted_sets.setdefault(f'ohcnvidx:{user_id}', {})[conversation_id] = (
+            expires_at
+        )
+        index.hashes.setdefault('ohcnvusr', {})[conversation_id] = user_id
+
+    # Create a pipeline mock which runs the index commands when executed
+    def pipeline():
+        pipeline_mock = MagicMock()
+        commands = []
+
+        def queue(command):
+            async def queue_command(*args, **kwargs):
+                commands.append((command, args, kwargs))
+
+            return AsyncMock(side_effect=queue_command)
+
+        for command in _INDEX_COMMANDS + ('set', 'delete'):
+            setattr(pipeline_mock, command, queue(command))
+
+        async def execute():
+            results = []
+            for command, args, kwargs in commands:
+                if command in _INDEX_COMMANDS:
+                    results.append(await getattr(index, command)(*args, **kwargs))
+                else:
+                    results.append(True)
+            commands.clear()
+            return results
+
+        pipeline_mock.execute = AsyncMock(side_effect=execute)
+        return pipeline_mock
+
+    redis_mock.pipeline = MagicMock(side_effect=pipeline)
 
     # Create a pubsub mock
     pubsub = AsyncMock()
@@ -81,8 +200,8 @@ def get_mock_sio(get_message: GetMessageMock | None = None, scan_keys=None):
 
 @pytest.mark.asyncio
 async def test_session_not_running_in_cluster():
-    # Create a mock SIO with empty scan results (no running sessions)
-    sio = get_mock_sio(scan_keys=[])
+    # Create a mock SIO with no running sessions
+    sio = get_mock_sio()
 
     async with ClusteredConversationManager(
         sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
@@ -91,15 +210,14 @@ async def test_session_not_running_in_cluster():
             filter_to_sids={'non-existant-session'}
         )
         assert result == set()
-        # Verify scan_iter was called with the correct pattern
-        sio.manager.redis.scan_iter.assert_called_once()
+        # Verify the index was used rather than scanning the keyspace
+        sio.manager.redis.scan_iter.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_get_running_agent_loops_remotely():
-    # Create a mock SIO with scan results for 'existing-session'
-    # The key format is 'ohcnv:{user_id}:{conversation_id}'
-    sio = get_mock_sio(scan_keys=[b'ohcnv:1:existing-session'])
+    # Create a mock SIO with 'existing-session' running for user 1
+    sio = get_mock_sio(running_conversations={'existing-session': '1'})
 
     async with ClusteredConversationManager(
         sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
@@ -108,8 +226,8 @@ async def test_get_running_agent_loops_remotely():
             1, {'existing-session'}
         )
         assert result == {'existing-session'}
-        # Verify scan_iter was called with the correct pattern
-        sio.manager.redis.scan_iter.assert_called_once()
+        # Verify the index was used rather than scanning the keyspace
+        sio.manager.redis.scan_iter.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -120,7 +238,7 @@ async def test_init_new_local_session():
     session_instance.user_id = '1'  # Add user_id for Redis key creation
     mock_session = MagicMock()
     mock_session.return_value = session_instance
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
     get_running_agent_loops_mock = AsyncMock()
     get_running_agent_loops_mock.return_value = set()
     with (
@@ -158,7 +276,7 @@ async def test_join_local_session():
     session_instance.user_id = None  # Add user_id for Redis key creation
     mock_session = MagicMock()
     mock_session.return_value = session_instance
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
     get_running_agent_loops_mock = AsyncMock()
     get_running_agent_loops_mock.return_value = set()
     with (
@@ -199,8 +317,8 @@ async def test_join_cluster_session():
     mock_session = MagicMock()
     mock_session.return_value = session_instance
 
-    # Create a mock SIO with scan results for 'new-session-id'
-    sio = get_mock_sio(scan_keys=[b'ohcnv:1:new-session-id'])
+    # Create a mock SIO with 'new-session-id' running for user 1
+    sio = get_mock_sio(running_conversations={'new-session-id': '1'})
 
     # Mock the Redis set method to return False (key already exists)
     # This simulates that the conversation is already running on another server
@@ -248,7 +366,7 @@ async def test_add_to_local_event_stream():
     session_instance.user_id = '1'  # Add user_id for Redis key creation
     mock_session = MagicMock()
     mock_session.return_value = session_instance
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
     get_running_agent_loops_mock = AsyncMock()
     get_running_agent_loops_mock.return_value = set()
     with (
@@ -288,8 +406,8 @@ async def test_add_to_cluster_event_stream():
     mock_session = MagicMock()
     mock_session.return_value = session_instance
 
-    # Create a mock SIO with scan results for 'new-session-id'
-    sio = get_mock_sio(scan_keys=[b'ohcnv:1:new-session-id'])
+    # Create a mock SIO with 'new-session-id' running for user 1
+    sio = get_mock_sio(running_conversations={'new-session-id': '1'})
 
     # Mock the Redis set method to return False (key already exists)
     # This simulates that the conversation is already running on another server
@@ -324,7 +442,7 @@ async def test_add_to_cluster_event_stream():
 
 @pytest.mark.asyncio
 async def test_cleanup_session_connections():
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
     with (
         patch(
             'server.clustered_conversation_manager.ClusteredConversationManager._redis_subscribe',
@@ -365,7 +483,7 @@ async def test_cleanup_session_connections():
 @pytest.mark.asyncio
 async def test_disconnect_from_stopped_no_remote_connections():
     """Test _disconnect_from_stopped when there are no remote connections."""
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
     with (
         patch(
             'server.clustered_conversation_manager.ClusteredConversationManager._redis_subscribe',
@@ -395,9 +513,9 @@ async def test_disconnect_from_stopped_no_remote_connections():
 @pytest.mark.asyncio
 async def test_disconnect_from_stopped_with_running_remote():
     """Test _disconnect_from_stopped when remote sessions are still running."""
-    # Create a mock SIO with scan results for remote sessions
+    # Create a mock SIO with the remote sessions running
     sio = get_mock_sio(
-        scan_keys=[b'ohcnv:1:remote_session1', b'ohcnv:1:remote_session2']
+        running_conversations={'remote_session1': '1', 'remote_session2': '1'}
     )
     get_running_agent_loops_remotely_mock = AsyncMock()
     get_running_agent_loops_remotely_mock.return_value = {
@@ -441,8 +559,8 @@ async def test_disconnect_from_stopped_with_running_remote():
 @pytest.mark.asyncio
 async def test_disconnect_from_stopped_with_stopped_remote():
     """Test _disconnect_from_stopped when some remote sessions have stopped."""
-    # Create a mock SIO with scan results for only remote_session1
-    sio = get_mock_sio(scan_keys=[b'ohcnv:user1:remote_session1'])
+    # Create a mock SIO with only remote_session1 running
+    sio = get_mock_sio(running_conversations={'remote_session1': 'user1'})
 
     # Mock the database connection to avoid actual database connections
     db_mock = MagicMock()
@@ -511,7 +629,7 @@ async def test_disconnect_from_stopped_with_stopped_remote():
 @pytest.mark.asyncio
 async def test_close_disconnected_detached_conversations():
     """Test _close_disconnected for detached conversations."""
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
 
     with (
         patch(
@@ -544,7 +662,7 @@ async def test_close_disconnected_detached_conversations():
 @pytest.mark.asyncio
 async def test_close_disconnected_inactive_sessions():
     """Test _close_disconnected for inactive sessions."""
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
     get_connections_mock = AsyncMock()
     get_connections_mock.return_value = {}  # No connections
     get_connections_remotely_mock = AsyncMock()
@@ -616,7 +734,7 @@ async def test_close_disconnected_inactive_sessions():
 @pytest.mark.asyncio
 async def test_close_disconnected_with_connections():
     """Test _close_disconnected when sessions have connections."""
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
 
     # Mock local connections
     get_connections_mock = AsyncMock()
@@ -697,7 +815,7 @@ async def test_close_disconnected_with_connections():
 @pytest.mark.asyncio
 async def test_cleanup_stale_integration():
     """Test the integration of _cleanup_stale with the new methods."""
-    sio = get_mock_sio(scan_keys=[])
+    sio = get_mock_sio()
 
     disconnect_from_stopped_mock = AsyncMock()
     close_disconnected_mock = AsyncMock()
@@ -734,3 +852,169 @@ async def test_cleanup_stale_integration():
             # The exact number of calls may vary due to timing, so we check for at least 1
             assert disconnect_from_stopped_mock.await_count >= 1
             assert close_disconnected_mock.await_count >= 1
+
+
+@pytest.mark.asyncio
+async def test_update_state_in_redis_indexes_conversations_and_connections():
+    """Test that local conversations and connections can be looked up without scanning."""
+    sio = get_mock_sio(running_conversations={'remote_session': 'user2'})
+
+    with (
+        patch(
+            'server.clustered_conversation_manager.ClusteredConversationManager._redis_subscribe',
+            AsyncMock(),
+        ),
+    ):
+        async with ClusteredConversationManager(
+            sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+        ) as conversation_manager:
+            session = AsyncMock()
+            session.user_id = 'user1'
+            conversation_manager._local_agent_loops_by_sid['local_session'] = session
+            conversation_manager._local_connection_id_to_session_id.update(
+                {'conn1': 'local_session', 'conn2': 'remote_session'}
+            )
+
+            await conversation_manager._update_state_in_redis()
+            # Only the first refresh scans, as no unindexed entries were found
+            sio.manager.redis.scan_iter.reset_mock()
+            await conversation_manager._update_state_in_redis()
+
+            assert await conversation_manager._get_running_agent_loops_remotely(
+                'user1'
+            ) == {'local_session'}
+            assert await conversation_manager._get_running_agent_loops_remotely() == {
+                'local_session',
+                'remote_session',
+            }
+            assert await conversation_manager._get_connections_remotely('user2') == {
+                'conn2': 'remote_session'
+            }
+            assert await conversation_manager._get_connections_remotely(
+                filter_to_sids={'local_session'}
+            ) == {'conn1': 'local_session'}
+            agent_loop_infos = await conversation_manager.get_agent_loop_info()
+            assert [info.conversation_id for info in agent_loop_infos] == [
+                'local_session',
+                'remote_session',
+            ]
+            sio.manager.redis.scan_iter.assert_not_called()
+
+            await conversation_manager._close_session('local_session')
+
+            assert await conversation_manager._get_running_agent_loops_remotely() == {
+                'remote_session'
+            }
+            assert await conversation_manager._get_connections_remotely() == {
+                'conn2': 'remote_session'
+            }
+
+
+@pytest.mark.asyncio
+async def test_expired_index_entries_are_ignored_and_removed():
+    """Test that the entries of a server which stopped without cleaning up expire."""
+    sio = get_mock_sio(running_conversations={'dead_session': 'user1'})
+    index = sio.manager.redis.index
+    index.sorted_sets['ohcnvidx']['dead_session'] = time.time() - 1
+    index.sorted_sets['ohcnvidx:user1']['dead_session'] = time.time() - 1
+
+    with (
+        patch(
+            'server.clustered_conversation_manager.ClusteredConversationManager._redis_subscribe',
+            AsyncMock(),
+        ),
+    ):
+        async with ClusteredConversationManager(
+            sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+        ) as conversation_manager:
+            assert (
+                await conversation_manager._get_running_agent_loops_remotely() == set()
+            )
+            assert (
+                await conversation_manager._get_running_agent_loops_remotely(
+                    filter_to_sids={'dead_session'}
+                )
+                == set()
+            )
+
+            await conversation_manager._update_state_in_redis()
+
+            assert 'dead_session' not in index.sorted_sets['ohcnvidx']
+            assert 'dead_session' not in index.hashes['ohcnvusr']
+
+
+@pytest.mark.asyncio
+async def test_expired_index_entries_removed_only_once_read():
+    """Test that users are only unmapped for the conversations actually removed."""
+    sio = get_mock_sio(running_conversations={'dead_session': 'user1'})
+    index = sio.manager.redis.index
+    index.sorted_sets['ohcnvidx']['dead_session'] = time.time() - 1
+    index.hashes['ohcnvusr']['restarted_session'] = 'user2'
+    # Read as expired, but removed by another server before this one removes it
+    sio.manager.redis.zrangebyscore = AsyncMock(
+        return_value=[b'dead_session', b'restarted_session']
+    )
+
+    with (
+        patch(
+            'server.clustered_conversation_manager.ClusteredConversationManager._redis_subscribe',
+            AsyncMock(),
+        ),
+    ):
+        async with ClusteredConversationManager(
+            sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+        ) as conversation_manager:
+            await conversation_manager._remove_expired_from_redis_indexes()
+
+            assert 'dead_session' not in index.sorted_sets['ohcnvidx']
+            assert 'dead_session' not in index.hashes['ohcnvusr']
+            assert index.hashes['ohcnvusr']['restarted_session'] == 'user2'
+
+
+@pytest.mark.asyncio
+async def test_unindexed_entries_are_indexed():
+    """Test that conversations of servers which do not write the indexes are found."""
+    unindexed_keys = ['ohcnv:user3:old_session', 'ohcnct:user3:old_session:conn3']
+    sio = get_mock_sio(unindexed_keys=unindexed_keys)
+    index = sio.manager.redis.index
+
+    with (
+        patch(
+            'server.clustered_conversation_manager.ClusteredConversationManager._redis_subscribe',
+            AsyncMock(),
+        ),
+    ):
+        async with ClusteredConversationManager(
+            sio, OpenHandsConfig(), InMemoryFileStore(), MonitoringListener()
+        ) as conversation_manager:
+            await conversation_manager._update_state_in_redis()
+
+            assert await conversation_manager._get_running_agent_loops_remotely(
+                filter_to_sids={'old_session'}
+            ) == {'old_session'}
+            assert await conversation_manager._get_connections_remotely('user3') == {
+                'conn3': 'old_session'
+            }
+            agent_loop_infos = await conversation_manager.get_agent_loop_info()
+            assert [info.conversation_id for info in agent_loop_infos] == [
+                'old_session'
+            ]
+
+            # The old server only refreshes its own keys, so its entries are
+            # indexed again on each refresh for as long as they exist
+            index.sorted_sets['ohcnvidx']['old_session'] = time.time() - 1
+            index.sorted_sets['ohcnctidx']['old_session:conn3'] = time.time() - 1
+            await conversation_manager._update_state_in_redis()
+            assert await conversation_manager._get_running_agent_loops_remotely(
+                filter_to_sids={'old_session'}
+            ) == {'old_session'}
+            assert await conversation_manager._get_connections_remotely() == {
+                'conn3': 'old_session'
+            }
+
+            # Scanning stops once the old server is gone
+            unindexed_keys.clear()
+            await conversation_manager._update_state_in_redis()
+            sio.manager.redis.scan_iter.reset_mock()
+            await conversation_manager._update_state_in_redis()
+            sio.manager.redis.scan_iter.assert_not_called()
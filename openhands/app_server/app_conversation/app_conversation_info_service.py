@@ -11,6 +11,7 @@ from openhands.app_server.app_conversation.app_conversation_models import (
 from openhands.app_server.services.injector import Injector
 from openhands.sdk.event import ConversationStateUpdateEvent
 from openhands.sdk.utils.models import DiscriminatedUnionMixin
+from openhands.sdk.utils.paging import page_iterator
 
 
 class AppConversationInfoService(ABC):
@@ -59,6 +60,22 @@ class AppConversationInfoService(ABC):
             ]
         )
 
+    async def get_app_conversation_info_by_sandbox_ids(
+        self, sandbox_ids: list[str], include_sub_conversations: bool = False
+    ) -> list[AppConversationInfo]:
+        """Get info on all conversations in the sandboxes given."""
+        sandbox_id_set = set(sandbox_ids)
+        if not sandbox_id_set:
+            return []
+        return [
+            info
+            async for info in page_iterator(
+                self.search_app_conversation_info,
+                include_sub_conversations=include_sub_conversations,
+            )
+            if info.sandbox_id in sandbox_id_set
+        ]
+
     @abstractmethod
     async def delete_app_conversation_info(self, conversation_id: UUID) -> bool:
         """Delete a conversation info from the database.
@@ -93,6 +110,18 @@ class AppConversationInfoService(ABC):
         Return the stored info
         """
 
+    @abstractmethod
+    async def update_last_synced_event_timestamp(
+        self, conversation_id: UUID, last_synced_event_timestamp: str
+    ) -> None:
+        """Update the timestamp of the latest event synced from the agent server,
+        without modifying any other conversation info.
+
+        Args:
+            conversation_id: The ID of the conversation to update
+            last_synced_event_timestamp: The timestamp of the latest synced event
+        """
+
     @abstractmethod
     async def process_stats_event(
         self,
@@ -87,6 +87,14 @@ class AppConversationInfo(BaseModel):
 
     public: bool | None = None
 
+    last_synced_event_timestamp: str | None = Field(
+        default=None,
+        description=(
+            'Timestamp of the latest event pulled from the agent server when polling. '
+            'Events before this have already been synced.'
+        ),
+    )
+
     created_at: datetime = Field(default_factory=utc_now)
     updated_at: datetime = Field(default_factory=utc_now)
 
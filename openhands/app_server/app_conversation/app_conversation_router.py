@@ -29,7 +29,7 @@ else:
         return await async_iterator.__anext__()
 
 
-from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -591,13 +591,12 @@ async def get_conversation_skills(
 @router.get('/{conversation_id}/download')
 async def export_conversation(
     conversation_id: UUID,
-    app_conversation_service: AppConversationService = (
-        app_conversation_service_dependency
-    ),
+    user_context: UserContext = user_context_dependency,
 ):
     """Download a conversation trajectory as a zip file.
 
     Returns a zip file containing all events and metadata for the conversation.
+    The zip file is streamed as it is written, rather than built in memory.
 
     Args:
         conversation_id: The UUID of the conversation to download
@@ -605,20 +604,10 @@ async def export_conversation(
     Returns:
         A zip file containing the conversation trajectory
     """
+    chunks = _stream_conversation_export(conversation_id, user_context)
     try:
-        # Get the zip file content
-        zip_content = await app_conversation_service.export_conversation(
-            conversation_id
-        )
-
-        # Return as a downloadable zip file
-        return Response(
-            content=zip_content,
-            media_type='application/zip',
-            headers={
-                'Content-Disposition': f'attachment; filename="conversation_{conversation_id}.zip"'
-            },
-        )
+        # Check the conversation exists before the response starts
+        first_chunk = await anext(chunks)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -626,6 +615,20 @@ async def export_conversation(
             status_code=500, detail=f'Failed to download trajectory: {str(e)}'
         )
 
+    async def stream_chunks() -> AsyncGenerator[bytes, None]:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    # Return as a downloadable zip file
+    return StreamingResponse(
+        stream_chunks(),
+        media_type='application/zip',
+        headers={
+            'Content-Disposition': f'attachment; filename="conversation_{conversation_id}.zip"'
+        },
+    )
+
 
 async def _consume_remaining(
     async_iter, db_session: AsyncSession, httpx_client: httpx.AsyncClient
@@ -660,3 +663,19 @@ async def _stream_app_conversation_start(
             comma = True
             yield chunk
         yield ']'
+
+
+async def _stream_conversation_export(
+    conversation_id: UUID,
+    user_context: UserContext,
+) -> AsyncGenerator[bytes, None]:
+    """Stream the zip file of a conversation export."""
+    # Because the original dependencies are closed after the method returns, we need
+    # a new dependency context which will continue until the stream finishes.
+    state = InjectorState()
+    setattr(state, USER_CONTEXT_ATTR, user_context)
+    async with get_app_conversation_service(state) as app_conversation_service:
+        async for chunk in app_conversation_service.export_conversation(
+            conversation_id
+        ):
+            yield chunk
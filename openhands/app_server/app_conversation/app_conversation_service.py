@@ -124,21 +124,23 @@ class AppConversationService(ABC):
         """
 
     @abstractmethod
-    async def export_conversation(self, conversation_id: UUID) -> bytes:
+    async def export_conversation(
+        self, conversation_id: UUID
+    ) -> AsyncGenerator[bytes, None]:
         """Download a conversation trajectory as a zip file.
 
         Args:
             conversation_id: The UUID of the conversation to download.
 
         This method should:
-        1. Get all events for the conversation
-        2. Create a temporary directory
-        3. Save each event as a JSON file
-        4. Save conversation metadata as meta.json
-        5. Create and return a zip file containing all the data
-
-        Returns the zip file as bytes.
+        1. Raise a ValueError if the conversation does not exist
+        2. Save conversation metadata as meta.json
+        3. Save each event as a JSON file, paging through the events
+        4. Yield the zip file in chunks as it is written, so that the whole
+           archive is never held in memory
         """
+        # This is an abstract method - concrete implementations should provide real values
+        yield b''
 
 
 class AppConversationServiceInjector(
@@ -1,11 +1,9 @@
 import asyncio
 import json
 import logging
-import os
-import tempfile
 import zipfile
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, AsyncGenerator, Sequence
 from uuid import UUID, uuid4
@@ -44,6 +42,10 @@ from openhands.app_server.app_conversation.app_conversation_service_base import
 from openhands.app_server.app_conversation.app_conversation_start_task_service import (
     AppConversationStartTaskService,
 )
+from openhands.app_server.app_conversation.live_status_cache import (
+    LiveStatusCache,
+    get_live_status_cache,
+)
 from openhands.app_server.app_conversation.sql_app_conversation_info_service import (
     SQLAppConversationInfoService,
 )
@@ -117,6 +119,12 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
     access_token_hard_timeout: timedelta | None
     app_mode: str | None = None
     tavily_api_key: str | None = None
+    agent_server_max_concurrency: int = 10
+    agent_server_timeout: float = 5.0
+    # Shared by all services in the process. None disables caching.
+    live_status_cache: LiveStatusCache | None = field(
+        default_factory=get_live_status_cache, kw_only=True
+    )
 
     async def search_app_conversations(
         self,
@@ -298,6 +306,8 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
             await self.app_conversation_info_service.save_app_conversation_info(
                 app_conversation_info
             )
+            if self.live_status_cache is not None:
+                self.live_status_cache.invalidate(info.id)
 
             # Setup default processors
             processors = request.processors or []
@@ -354,23 +364,14 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
         sandboxes_by_id = {sandbox.id: sandbox for sandbox in sandboxes if sandbox}
 
         # Gather the running conversations
-        tasks = [
-            self._get_live_conversation_info(
-                sandbox, sandbox_id_to_conversation_ids.get(sandbox.id)
-            )
-            for sandbox in sandboxes
-            if sandbox and sandbox.status == SandboxStatus.RUNNING
-        ]
-        if tasks:
-            sandbox_conversation_infos = await asyncio.gather(*tasks)
-        else:
-            sandbox_conversation_infos = []
-
-        # Collect the results into a single dictionary
-        conversation_info_by_id = {}
-        for conversation_infos in sandbox_conversation_infos:
-            for conversation_info in conversation_infos:
-                conversation_info_by_id[conversation_info.id] = conversation_info
+        conversation_info_by_id = await self._get_live_conversation_infos(
+            [
+                sandbox
+                for sandbox in sandboxes
+                if sandbox and sandbox.status == SandboxStatus.RUNNING
+            ],
+            sandbox_id_to_conversation_ids,
+        )
 
         # Build app_conversation from info
         result = [
@@ -388,30 +389,103 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
 
         return result
 
+    async def _get_live_conversation_infos(
+        self,
+        sandboxes: Sequence[SandboxInfo],
+        sandbox_id_to_conversation_ids: dict[str, list[UUID]],
+    ) -> dict[UUID, ConversationInfo]:
+        """Get agent status for the conversations in the running sandboxes given.
+
+        Cached statuses are used where possible. The remaining conversations are
+        grouped by agent server, so that each server gets a single request, and
+        the number of requests in flight at once is bounded.
+        """
+        conversation_info_by_id: dict[UUID, ConversationInfo] = {}
+        requests: dict[tuple[str, str | None], tuple[SandboxInfo, list[UUID]]] = {}
+        for sandbox in sandboxes:
+            conversation_ids = sandbox_id_to_conversation_ids.get(sandbox.id)
+            if not conversation_ids:
+                continue
+            try:
+                agent_server_url = self._get_agent_server_url(sandbox)
+            except Exception:
+                _logger.exception(
+                    f'Error getting agent server url for sandbox {sandbox.id}',
+                    stack_info=True,
+                )
+                continue
+            if self.live_status_cache is not None:
+                cached, conversation_ids = self.live_status_cache.lookup(
+                    agent_server_url, conversation_ids
+                )
+                for conversation_info in cached:
+                    conversation_info_by_id[conversation_info.id] = conversation_info
+            if conversation_ids:
+                key = (agent_server_url, sandbox.session_api_key)
+                requests.setdefault(key, (sandbox, []))[1].extend(conversation_ids)
+
+        if not requests:
+            return conversation_info_by_id
+
+        semaphore = asyncio.Semaphore(max(self.agent_server_max_concurrency, 1))
+
+        async def get_bounded(sandbox: SandboxInfo, conversation_ids: list[UUID]):
+            async with semaphore:
+                return await self._get_live_conversation_info(sandbox, conversation_ids)
+
+        results = await asyncio.gather(
+            *(
+                get_bounded(sandbox, conversation_ids)
+                for sandbox, conversation_ids in requests.values()
+            )
+        )
+        for conversation_infos in results:
+            for conversation_info in conversation_infos:
+                conversation_info_by_id[conversation_info.id] = conversation_info
+        return conversation_info_by_id
+
     async def _get_live_conversation_info(
         self,
         sandbox: SandboxInfo,
-        conversation_ids: list[str],
+        conversation_ids: list[UUID],
     ) -> list[ConversationInfo]:
         """Get agent status for multiple conversations from the Agent Server."""
         try:
             # Build the URL with query parameters
             agent_server_url = self._get_agent_server_url(sandbox)
             url = f'{agent_server_url.rstrip("/")}/api/conversations'
-            params = {'ids': conversation_ids}
+            params = {
+                'ids': [str(conversation_id) for conversation_id in conversation_ids]
+            }
 
             # Set up headers
             headers = {}
             if sandbox.session_api_key:
                 headers['X-Session-API-Key'] = sandbox.session_api_key
 
-            response = await self.httpx_client.get(url, params=params, headers=headers)
+            response = await self.httpx_client.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.agent_server_timeout,
+            )
             response.raise_for_status()
 
             data = response.json()
-            conversation_info = _conversation_info_type_adapter.validate_python(data)
-            conversation_info = [c for c in conversation_info if c]
+            conversation_info: list[ConversationInfo] = [
+                c for c in _conversation_info_type_adapter.validate_python(data) if c
+            ]
+            if self.live_status_cache is not None:
+                self.live_status_cache.put(
+                    agent_server_url, conversation_ids, conversation_info
+                )
             return conversation_info
+        except httpx.TimeoutException:
+            # A slow agent server should not hold up the other conversations
+            _logger.warning(
+                f'Timed out getting conversation status from sandbox {sandbox.id}'
+            )
+            return []
         except httpx.HTTPStatusError as exc:
             # The runtime API stops idle sandboxes all the time and they return a 503.
             # This is normal and should not be logged.
@@ -1402,16 +1476,23 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
         deleted_tasks = await self.app_conversation_start_task_service.delete_app_conversation_start_tasks(
             app_conversation_info.id
         )
+        self.event_service.clear_cache(app_conversation_info.id)
+        if self.live_status_cache is not None:
+            self.live_status_cache.invalidate(app_conversation_info.id)
 
         return deleted_info or deleted_tasks
 
-    async def export_conversation(self, conversation_id: UUID) -> bytes:
+    async def export_conversation(
+        self, conversation_id: UUID
+    ) -> AsyncGenerator[bytes, None]:
         """Download a conversation trajectory as a zip file.
 
         Args:
             conversation_id: The UUID of the conversation to download.
 
-        Returns the zip file as bytes.
+        Yields the zip file in chunks, writing each entry as events are paged
+        from the event service, so that memory use does not grow with the size
+        of the conversation.
         """
         # Get the conversation info to verify it exists and user has access
         conversation_info = (
@@ -1422,43 +1503,52 @@ class LiveStatusAppConversationService(AppConversationServiceBase):
         if not conversation_info:
             raise ValueError(f'Conversation not found: {conversation_id}')
 
-        # Create a temporary directory to store files
-        with tempfile.TemporaryDirectory() as temp_dir:
+        stream = _ZipStream()
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr('meta.json', conversation_info.model_dump_json(indent=2))
+            yield stream.read()
+
             # Get all events for this conversation
             i = 0
             async for event in page_iterator(
                 self.event_service.search_events, conversation_id=conversation_id
             ):
-                event_filename = f'event_{i:06d}_{event.id}.json'
-                event_path = os.path.join(temp_dir, event_filename)
-
-                with open(event_path, 'w') as f:
-                    # Use model_dump with mode='json' to handle UUID serialization
-                    event_data = event.model_dump(mode='json')
-                    json.dump(event_data, f, indent=2)
+                # Use model_dump with mode='json' to handle UUID serialization
+                event_data = event.model_dump(mode='json')
+                zipf.writestr(
+                    f'event_{i:06d}_{event.id}.json', json.dumps(event_data, indent=2)
+                )
                 i += 1
+                chunk = stream.read()
+                if chunk:
+                    yield chunk
 
-            # Create meta.json with conversation info
-            meta_path = os.path.join(temp_dir, 'meta.json')
-            with open(meta_path, 'w') as f:
-                f.write(conversation_info.model_dump_json(indent=2))
+        # The central directory is written when the zip file is closed
+        yield stream.read()
 
-            # Create zip file in memory
-            zip_buffer = tempfile.NamedTemporaryFile()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all files from temp directory to zip
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arcname)
 
-            # Read the zip file content
-            zip_buffer.seek(0)
-            zip_content = zip_buffer.read()
-            zip_buffer.close()
+class _ZipStream:
+    """Unseekable file for a zip file to be written to, which is drained as it is
+    written."""
 
-            return zip_content
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        # ZipFile does not close files passed to it, but its typing requires this
+        return None
+
+    def read(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
 
 
 class LiveStatusAppConversationServiceInjector(AppConversationServiceInjector):
@@ -1466,7 +1556,11 @@ class LiveStatusAppConversationServiceInjector(AppConversationServiceInjector):
         default=120, description='The max timeout time for sandbox startup'
     )
     sandbox_startup_poll_frequency: int = Field(
-        default=2, description='The frequency to poll for sandbox readiness'
+        default=2,
+        description=(
+            'The interval between polls for sandbox readiness. Polls of local '
+            '(docker and process) sandboxes back off exponentially up to this'
+        ),
     )
     init_git_in_empty_workspace: bool = Field(
         default=True,
@@ -1483,6 +1577,20 @@ class LiveStatusAppConversationServiceInjector(AppConversationServiceInjector):
         default=None,
         description='The Tavily Search API key to add to MCP integration',
     )
+    agent_server_max_concurrency: int = Field(
+        default=10,
+        description=(
+            'The max number of agent servers queried at once for the status of '
+            'conversations'
+        ),
+    )
+    agent_server_timeout: float = Field(
+        default=5.0,
+        description=(
+            'The timeout in seconds for getting the status of conversations from '
+            'an agent server'
+        ),
+    )
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -1565,4 +1673,6 @@ class LiveStatusAppConversationServiceInjector(AppConversationServiceInjector):
                 access_token_hard_timeout=access_token_hard_timeout,
                 app_mode=app_mode,
                 tavily_api_key=tavily_api_key,
+                agent_server_max_concurrency=self.agent_server_max_concurrency,
+                agent_server_timeout=self.agent_server_timeout,
             )
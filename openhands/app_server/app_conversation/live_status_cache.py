@@ -0,0 +1,119 @@
+"""Process-wide cache of the live status of conversations in agent servers.
+
+The conversation list page polls, and every open tab polls separately, so
+without a cache every poll asks each running agent server for the status of its
+conversations. Statuses are only kept for a short time to live, so the page
+stays close to live while the polls made within that time (From any tab) share
+the result of a single request. Polls which miss the cache at the same time each
+make their own request.
+
+Entries are keyed by the conversation id and tagged with the url of the agent
+server which reported them, so an entry is not used once a conversation is
+served from another sandbox. Conversations which the agent server did not know
+about are cached too, so that they are not requested again on every poll.
+Failed requests are not cached.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Sequence
+from uuid import UUID
+
+from openhands.agent_server.models import ConversationInfo
+
+DEFAULT_TTL_SECONDS = 2.0
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+@dataclass
+class LiveStatusCacheStats:
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LiveStatusCache:
+    """TTL cache of conversation info from agent servers, by conversation id."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # conversation id -> (expiry time, agent server url, info or None if unknown)
+        self._entries: OrderedDict[UUID, tuple[float, str, ConversationInfo | None]] = (
+            OrderedDict()
+        )
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(
+        self, agent_server_url: str, conversation_ids: Sequence[UUID]
+    ) -> tuple[list[ConversationInfo], list[UUID]]:
+        """Get the cached info for the conversations given, along with the ids of
+        the conversations which must be requested from the agent server."""
+        now = time.monotonic()
+        found = []
+        missing = []
+        for conversation_id in conversation_ids:
+            entry = self._entries.get(conversation_id)
+            if entry is None or entry[0] <= now or entry[1] != agent_server_url:
+                self._misses += 1
+                missing.append(conversation_id)
+                continue
+            self._hits += 1
+            if entry[2] is not None:
+                found.append(entry[2])
+        return found, missing
+
+    def put(
+        self,
+        agent_server_url: str,
+        conversation_ids: Sequence[UUID],
+        conversation_infos: Sequence[ConversationInfo],
+    ):
+        """Store the result of a successful request to an agent server. Requested
+        conversations missing from the result are stored as unknown."""
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        infos_by_id = {info.id: info for info in conversation_infos}
+        for conversation_id in conversation_ids:
+            self._entries.pop(conversation_id, None)
+            self._entries[conversation_id] = (
+                expires_at,
+                agent_server_url,
+                infos_by_id.get(conversation_id),
+            )
+        # Entries are added in order of expiry, so the oldest come first
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or next(iter(self._entries.values()))[0] <= expires_at - self.ttl_seconds
+        ):
+            self._entries.popitem(last=False)
+
+    def invalidate(self, conversation_id: UUID):
+        self._entries.pop(conversation_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> LiveStatusCacheStats:
+        return LiveStatusCacheStats(
+            hits=self._hits, misses=self._misses, entries=len(self._entries)
+        )
+
+
+_live_status_cache = LiveStatusCache()
+
+
+def get_live_status_cache() -> LiveStatusCache:
+    return _live_status_cache
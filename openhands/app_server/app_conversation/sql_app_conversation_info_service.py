@@ -21,7 +21,7 @@ import logging
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, cast
 from uuid import UUID
 
 from fastapi import Request
@@ -100,6 +100,7 @@ class StoredConversationMetadata(Base):  # type: ignore
     sandbox_id = Column(String, nullable=True, index=True)
     parent_conversation_id = Column(String, nullable=True, index=True)
     public = Column(Boolean, nullable=True, index=True)
+    last_synced_event_timestamp = Column(String, nullable=True)
 
 
 @dataclass
@@ -313,6 +314,20 @@ class SQLAppConversationInfoService(AppConversationInfoService):
 
         return results
 
+    async def get_app_conversation_info_by_sandbox_ids(
+        self, sandbox_ids: list[str], include_sub_conversations: bool = False
+    ) -> list[AppConversationInfo]:
+        if not sandbox_ids:
+            return []
+        query = await self._secure_select()
+        query = query.where(StoredConversationMetadata.sandbox_id.in_(sandbox_ids))
+        if not include_sub_conversations:
+            query = query.where(
+                StoredConversationMetadata.parent_conversation_id.is_(None)
+            )
+        result = await self.db_session.execute(query)
+        return [self._to_info(row) for row in result.scalars().all()]
+
     async def save_app_conversation_info(
         self, info: AppConversationInfo
     ) -> AppConversationInfo:
@@ -348,12 +363,31 @@ class SQLAppConversationInfoService(AppConversationInfoService):
                 else None
             ),
             public=info.public,
+            last_synced_event_timestamp=info.last_synced_event_timestamp,
         )
 
         await self.db_session.merge(stored)
         await self.db_session.commit()
         return info
 
+    async def update_last_synced_event_timestamp(
+        self, conversation_id: UUID, last_synced_event_timestamp: str
+    ) -> None:
+        query = await self._secure_select()
+        query = query.where(
+            StoredConversationMetadata.conversation_id == str(conversation_id)
+        )
+        result = await self.db_session.execute(query)
+        stored = result.scalar_one_or_none()
+        if not stored:
+            logger.debug(
+                'Conversation %s not found or not accessible, skipping sync update',
+                conversation_id,
+            )
+            return
+        stored.last_synced_event_timestamp = last_synced_event_timestamp
+        await self.db_session.commit()
+
     async def update_conversation_statistics(
         self, conversation_id: UUID, stats: ConversationStats
     ) -> None:
@@ -535,6 +569,9 @@ class SQLAppConversationInfoService(AppConversationInfoService):
             ),
             sub_conversation_ids=sub_conversation_ids or [],
             public=stored.public,
+            last_synced_event_timestamp=cast(
+                str | None, stored.last_synced_event_timestamp
+            ),
             created_at=created_at,
             updated_at=updated_at,
         )
@@ -146,6 +146,11 @@ def config_from_env() -> AppServerConfig:
     from openhands.app_server.event.google_cloud_event_service import (
         GoogleCloudEventServiceInjector,
     )
+
+    # Imported so that it may be selected with OH_EVENT__KIND
+    from openhands.app_server.event.segment_event_service import (  # noqa: F401
+        SegmentEventServiceInjector,
+    )
     from openhands.app_server.event_callback.sql_event_callback_service import (
         SQLEventCallbackServiceInjector,
     )
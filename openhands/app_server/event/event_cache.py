@@ -0,0 +1,135 @@
+"""Process-wide cache of deserialized V1 events.
+
+Event services are created for each request, so the cache lives at module level
+and is shared by all of them. Validating large events is expensive, and the
+frontend polls the same events repeatedly, so keeping recently used events in
+memory saves both I/O and CPU.
+
+Entries are keyed by the storage path of the conversation as well as the event
+id, so the user prefix which guards access to events on storage also guards
+access to cached events. Events are immutable, so cached objects are shared
+rather than copied.
+
+The hit rate and size of the cache are logged periodically, as it is used.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from uuid import UUID
+
+from openhands.sdk import Event
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_STATS_LOG_INTERVAL_SECONDS = 5 * 60
+
+
+@dataclass
+class EventCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size_bytes: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class EventCache:
+    """LRU cache of events, bounded by the stored size of the events held."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.stats_log_interval_seconds: float = DEFAULT_STATS_LOG_INTERVAL_SECONDS
+        self._stats_logged_at = time.monotonic()
+        self._entries: OrderedDict[tuple[Path, str], tuple[Event, int]] = OrderedDict()
+        # Keys for each conversation (By conversation id hex), for invalidation
+        self._keys_by_conversation: dict[str, set[tuple[Path, str]]] = {}
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, conversation_path: Path, event_id: str) -> Event | None:
+        self._maybe_log_stats()
+        key = (conversation_path, event_id)
+        cached = self._entries.get(key)
+        if cached is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return cached[0]
+
+    def put(self, conversation_path: Path, event_id: str, event: Event, size: int):
+        """Cache an event. The size is that of the event as stored, which callers
+        already know from reading or writing it."""
+        if size > self.max_bytes:
+            return
+        key = (conversation_path, event_id)
+        self._remove(key)
+        self._entries[key] = (event, size)
+        self._size_bytes += size
+        # The last part of the conversation path is the conversation id hex
+        self._keys_by_conversation.setdefault(conversation_path.name, set()).add(key)
+        while self._size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def invalidate(self, conversation_id: UUID):
+        """Drop all cached events for the conversation given."""
+        for key in self._keys_by_conversation.pop(conversation_id.hex, set()):
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_conversation.clear()
+        self._size_bytes = 0
+
+    def stats(self) -> EventCacheStats:
+        return EventCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size_bytes=self._size_bytes,
+            entries=len(self._entries),
+        )
+
+    def log_stats(self):
+        stats = self.stats()
+        _logger.info(
+            'event_cache_stats',
+            extra={**asdict(stats), 'hit_rate': stats.hit_rate},
+        )
+
+    def _maybe_log_stats(self):
+        now = time.monotonic()
+        if now - self._stats_logged_at >= self.stats_log_interval_seconds:
+            self._stats_logged_at = now
+            self.log_stats()
+
+    def _remove(self, key: tuple[Path, str]):
+        cached = self._entries.pop(key, None)
+        if cached is None:
+            return
+        self._size_bytes -= cached[1]
+        keys = self._keys_by_conversation.get(key[0].name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_conversation[key[0].name]
+
+
+_event_cache = EventCache()
+
+
+def get_event_cache() -> EventCache:
+    return _event_cache
@@ -0,0 +1,51 @@
+"""Encodings for V1 events persisted one object per event.
+
+Events may be stored as indented JSON (The original format), compact JSON, or
+compact JSON compressed with zstd behind a magic header. Decoding detects the
+format from the content, so objects written with any encoding can coexist in
+the same conversation and the encoding may be changed at any time.
+"""
+
+from enum import Enum
+
+from openhands.sdk import Event
+
+# Prefix for zstd compressed events. JSON content always starts with '{' (Or
+# whitespace), so this can never be confused with an uncompressed event.
+ZSTD_MAGIC = b'OHZ\x01'
+ZSTD_LEVEL = 3
+
+
+class EventEncoding(Enum):
+    JSON = 'json'
+    COMPACT_JSON = 'compact_json'
+    ZSTD = 'zstd'
+
+
+def encode_event(event: Event, encoding: EventEncoding) -> bytes:
+    """Serialize an event using the encoding given."""
+    if encoding == EventEncoding.JSON:
+        return event.model_dump_json(indent=2).encode()
+    content = event.model_dump_json().encode()
+    if encoding == EventEncoding.ZSTD:
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return ZSTD_MAGIC + compressor.compress(content)
+    return content
+
+
+def decode_event(data: bytes) -> Event:
+    """Deserialize an event written with any of the supported encodings."""
+    if data.startswith(ZSTD_MAGIC):
+        import zstandard
+
+        data = zstandard.ZstdDecompressor().decompress(data[len(ZSTD_MAGIC) :])
+    return Event.model_validate_json(data)
+
+
+def content_type(encoding: EventEncoding) -> str:
+    """Get the MIME type of content written with the encoding given."""
+    if encoding == EventEncoding.ZSTD:
+        return 'application/octet-stream'
+    return 'application/json'
@@ -0,0 +1,114 @@
+"""Sidecar index of the events stored for a single conversation.
+
+The index holds just enough information about each event (id, kind, timestamp
+and where it is stored) to resolve filters, sorting and pagination without
+deserializing the events themselves. It is stored as JSON lines next to the
+events so that new entries can be appended cheaply on every save.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from openhands.agent_server.models import EventSortOrder
+from openhands.app_server.event_callback.event_callback_models import EventKind
+from openhands.sdk import Event
+
+INDEX_FILE_NAME = 'index.jsonl'
+
+
+@dataclass(frozen=True)
+class EventIndexEntry:
+    """Location and searchable attributes of a stored event."""
+
+    id: str
+    kind: str
+    timestamp: datetime
+    file: str
+    offset: int | None = None
+
+    @classmethod
+    def from_event(
+        cls, event: Event, file: str, offset: int | None = None
+    ) -> 'EventIndexEntry':
+        return cls(
+            id=event_id_hex(event),
+            kind=event.kind,
+            timestamp=to_datetime(event.timestamp),
+            file=file,
+            offset=offset,
+        )
+
+    def to_json_line(self) -> str:
+        data: dict = {
+            'id': self.id,
+            'kind': self.kind,
+            'timestamp': self.timestamp.isoformat(),
+            'file': self.file,
+        }
+        if self.offset is not None:
+            data['offset'] = self.offset
+        return json.dumps(data, separators=(',', ':')) + '\n'
+
+    @classmethod
+    def from_json_line(cls, line: str) -> 'EventIndexEntry':
+        data = json.loads(line)
+        return cls(
+            id=data['id'],
+            kind=data['kind'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            file=data['file'],
+            offset=data.get('offset'),
+        )
+
+
+def event_id_hex(event: Event) -> str:
+    return event.id.replace('-', '')
+
+
+def to_datetime(value: str | datetime) -> datetime:
+    """Parse a timestamp, normalizing to the naive local time used by events."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def parse_index(content: str) -> list[EventIndexEntry]:
+    """Parse index content, ignoring duplicates and any torn trailing line."""
+    entries: dict[str, EventIndexEntry] = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = EventIndexEntry.from_json_line(line)
+        except (ValueError, KeyError):
+            continue
+        entries[entry.id] = entry
+    return list(entries.values())
+
+
+def filter_index(
+    entries: list[EventIndexEntry],
+    kind__eq: EventKind | None = None,
+    timestamp__gte: datetime | None = None,
+    timestamp__lt: datetime | None = None,
+    sort_order: EventSortOrder | None = None,
+) -> list[EventIndexEntry]:
+    """Select the entries matching the filters given in the sort order given."""
+    gte = to_datetime(timestamp__gte) if timestamp__gte else None
+    lt = to_datetime(timestamp__lt) if timestamp__lt else None
+    result = [
+        entry
+        for entry in entries
+        if (not kind__eq or entry.kind == kind__eq)
+        and (gte is None or entry.timestamp >= gte)
+        and (lt is None or entry.timestamp < lt)
+    ]
+    if sort_order:
+        result.sort(
+            key=lambda e: e.timestamp,
+            reverse=(sort_order == EventSortOrder.TIMESTAMP_DESC),
+        )
+    return result
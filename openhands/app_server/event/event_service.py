@@ -47,6 +47,17 @@ class EventService(ABC):
     async def save_event(self, conversation_id: UUID, event: Event):
         """Save an event. Internal method intended not be part of the REST api."""
 
+    async def save_events(self, conversation_id: UUID, events: list[Event]):
+        """Save a batch of events for a conversation. Internal method intended not
+        be part of the REST api."""
+        await asyncio.gather(
+            *[self.save_event(conversation_id, event) for event in events]
+        )
+
+    def clear_cache(self, conversation_id: UUID):
+        """Drop any events cached in memory for the conversation given."""
+        return None
+
     async def batch_get_events(
         self, conversation_id: UUID, event_ids: list[UUID]
     ) -> list[Event | None]:
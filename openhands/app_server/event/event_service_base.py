@@ -1,18 +1,24 @@
 import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Sequence
 from uuid import UUID
 
 from openhands.agent_server.models import EventPage, EventSortOrder
-from openhands.agent_server.sockets import page_iterator
 from openhands.app_server.app_conversation.app_conversation_info_service import (
     AppConversationInfoService,
 )
 from openhands.app_server.app_conversation.app_conversation_models import (
     AppConversationInfo,
 )
+from openhands.app_server.event.event_cache import EventCache, get_event_cache
+from openhands.app_server.event.event_index import (
+    EventIndexEntry,
+    event_id_hex,
+    filter_index,
+)
 from openhands.app_server.event.event_service import EventService
 from openhands.app_server.event_callback.event_callback_models import EventKind
 from openhands.sdk import Event
@@ -30,19 +36,68 @@ class EventServiceBase(EventService, ABC):
     app_conversation_info_load_tasks: dict[
         UUID, asyncio.Task[AppConversationInfo | None]
     ]
+    # Shared by all services in the process. None disables caching.
+    event_cache: EventCache | None = field(
+        default_factory=get_event_cache, kw_only=True
+    )
 
     @abstractmethod
-    def _load_event(self, path: Path) -> Event | None:
-        """Get the event at the path given."""
+    def _read_event(self, path: Path) -> tuple[Event, int] | None:
+        """Get the event at the path given, along with its size in bytes as stored."""
 
     @abstractmethod
-    def _store_event(self, path: Path, event: Event):
-        """Store the event given at the path given."""
+    def _store_event(self, path: Path, event: Event) -> int:
+        """Store the event given at the path given, returning its size in bytes."""
+
+    def _load_event(self, path: Path) -> Event | None:
+        """Get the event at the path given."""
+        read = self._read_event(path)
+        return read[0] if read else None
 
     @abstractmethod
     def _search_paths(self, prefix: Path) -> list[Path]:
         """Search paths."""
 
+    def _load_index(self, conversation_path: Path) -> list[EventIndexEntry] | None:
+        """Load the sidecar index for a conversation, or None if there is none.
+
+        The default implementation keeps no index, so searches fall back to
+        scanning every event in the conversation.
+        """
+        return None
+
+    def _store_index(
+        self, conversation_path: Path, entries: list[EventIndexEntry]
+    ) -> bool:
+        """Replace the sidecar index for a conversation. Return False if this
+        service does not keep an index."""
+        return False
+
+    def _append_index(
+        self, conversation_path: Path, entries: Sequence[EventIndexEntry]
+    ):
+        """Add entries to the sidecar index for a conversation, if it exists."""
+
+    def _read_indexed_event(
+        self, conversation_path: Path, entry: EventIndexEntry
+    ) -> tuple[Event, int] | None:
+        """Get the event referenced by the index entry given, and its size."""
+        return self._read_event(conversation_path / entry.file)
+
+    def _store_indexed_events(
+        self, conversation_path: Path, events: Sequence[Event]
+    ) -> list[int]:
+        """Store the events given and add them to the index with a single append.
+        Returns the size in bytes of each event as stored."""
+        entries = []
+        sizes = []
+        for event in events:
+            file_name = f'{event_id_hex(event)}.json'
+            sizes.append(self._store_event(conversation_path / file_name, event))
+            entries.append(EventIndexEntry.from_event(event, file_name))
+        self._append_index(conversation_path, entries)
+        return sizes
+
     async def get_conversation_path(self, conversation_id: UUID) -> Path:
         """Get a path for a conversation. Ensure user_id is included if possible."""
         path = self.prefix
@@ -66,9 +121,18 @@ class EventServiceBase(EventService, ABC):
     async def get_event(self, conversation_id: UUID, event_id: UUID) -> Event | None:
         """Get the event with the given id, or None if not found."""
         conversation_path = await self.get_conversation_path(conversation_id)
+        if self.event_cache:
+            cached = self.event_cache.get(conversation_path, event_id.hex)
+            if cached:
+                return cached
         path = conversation_path / f'{event_id.hex}.json'
         loop = asyncio.get_running_loop()
-        event: Event = await loop.run_in_executor(None, self._load_event, path)
+        read = await loop.run_in_executor(None, self._read_event, path)
+        if read is None:
+            return None
+        event, size = read
+        if self.event_cache:
+            self.event_cache.put(conversation_path, event_id.hex, event, size)
         return event
 
     async def search_events(
@@ -82,39 +146,23 @@ class EventServiceBase(EventService, ABC):
         limit: int = 100,
     ) -> EventPage:
         """Search events matching the given filters."""
-        loop = asyncio.get_running_loop()
-        prefix = await self.get_conversation_path(conversation_id)
-        paths = await loop.run_in_executor(None, self._search_paths, prefix)
-        events = await asyncio.gather(
-            *[loop.run_in_executor(None, self._load_event, path) for path in paths]
+        conversation_path = await self.get_conversation_path(conversation_id)
+        entries, loaded = await self._get_index(conversation_path)
+        entries = filter_index(
+            entries, kind__eq, timestamp__gte, timestamp__lt, sort_order
         )
-        items = []
-        for event in events:
-            if not event:
-                continue
-            if kind__eq and event.kind != kind__eq:
-                continue
-            if timestamp__gte and event.timestamp < timestamp__gte:
-                continue
-            if timestamp__lt and event.timestamp >= timestamp__lt:
-                continue
-            items.append(event)
 
-        if sort_order:
-            items.sort(
-                key=lambda e: e.timestamp,
-                reverse=(sort_order == EventSortOrder.TIMESTAMP_DESC),
-            )
-
-        start_offset = 0
+        start_offset = int(page_id) if page_id else 0
+        end_offset = start_offset + limit
         next_page_id = None
-        if page_id:
-            start_offset = int(page_id)
-            paths = paths[start_offset:]
-        if len(paths) > limit:
-            paths = paths[:limit]
-            next_page_id = str(start_offset + limit)
+        if len(entries) > end_offset:
+            next_page_id = str(end_offset)
 
+        # Only the events on the requested page are deserialized
+        events = await self._load_entries(
+            conversation_path, entries[start_offset:end_offset], loaded
+        )
+        items = [event for event in events if event]
         return EventPage(items=items, next_page_id=next_page_id)
 
     async def count_events(
@@ -125,42 +173,138 @@ class EventServiceBase(EventService, ABC):
         timestamp__lt: datetime | None = None,
     ) -> int:
         """Count events matching the given filters."""
-        # If we are not filtering, we can simply count the paths
-        if not (kind__eq or timestamp__gte or timestamp__lt):
-            conversation_path = await self.get_conversation_path(conversation_id)
-            result = await self._count_events_no_filter(conversation_path)
-            return result
-
-        events = page_iterator(
-            self.search_events,
-            conversation_id=conversation_id,
-            kind__eq=kind__eq,
-            timestamp__gte=timestamp__gte,
-            timestamp__lt=timestamp__lt,
-        )
-        result = sum(1 for event in events)
-        return result
-
-    async def _count_events_no_filter(self, conversation_path: Path) -> int:
-        paths = page_iterator(self._search_paths, conversation_path)
-        result = 0
-        async for _ in paths:
-            result += 1
-        return result
+        conversation_path = await self.get_conversation_path(conversation_id)
+        entries, _ = await self._get_index(conversation_path)
+        if kind__eq or timestamp__gte or timestamp__lt:
+            entries = filter_index(entries, kind__eq, timestamp__gte, timestamp__lt)
+        return len(entries)
 
     async def save_event(self, conversation_id: UUID, event: Event):
-        if isinstance(event.id, str):
-            id_hex = event.id.replace('-', '')
-        else:
-            id_hex = event.id.hex
-        path = (await self.get_conversation_path(conversation_id)) / f'{id_hex}.json'
+        await self.save_events(conversation_id, [event])
+
+    async def save_events(self, conversation_id: UUID, events: list[Event]):
+        if not events:
+            return
+        conversation_path = await self.get_conversation_path(conversation_id)
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._store_event, path, event)
+        sizes = await loop.run_in_executor(
+            None, self._store_indexed_events, conversation_path, events
+        )
+        self._cache_events(conversation_path, events, sizes)
+
+    def _cache_events(
+        self, conversation_path: Path, events: Sequence[Event], sizes: Sequence[int]
+    ):
+        if self.event_cache:
+            for event, size in zip(events, sizes, strict=True):
+                self.event_cache.put(
+                    conversation_path, event_id_hex(event), event, size
+                )
+
+    def clear_cache(self, conversation_id: UUID):
+        if self.event_cache:
+            self.event_cache.invalidate(conversation_id)
 
     async def batch_get_events(
         self, conversation_id: UUID, event_ids: list[UUID]
     ) -> list[Event | None]:
         """Given a list of ids, get events (Or none for any which were not found)."""
-        return await asyncio.gather(
-            *[self.get_event(conversation_id, event_id) for event_id in event_ids]
+        conversation_path = await self.get_conversation_path(conversation_id)
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(None, self._load_index, conversation_path)
+        if entries is None:
+            return await asyncio.gather(
+                *[self.get_event(conversation_id, event_id) for event_id in event_ids]
+            )
+        entries_by_id = {entry.id: entry for entry in entries}
+        return await self._load_entries(
+            conversation_path,
+            [entries_by_id.get(event_id.hex) for event_id in event_ids],
+        )
+
+    async def _get_index(
+        self, conversation_path: Path
+    ) -> tuple[list[EventIndexEntry], dict[str, tuple[Event, int]]]:
+        """Get the index for a conversation, building it if it does not exist.
+
+        Returns the entries along with any events which were loaded while building
+        the index, so that they do not need to be loaded again.
+        """
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(None, self._load_index, conversation_path)
+        if entries is not None:
+            return entries, {}
+        return await self._build_index(conversation_path)
+
+    async def _build_index(
+        self, conversation_path: Path
+    ) -> tuple[list[EventIndexEntry], dict[str, tuple[Event, int]]]:
+        """Build the index for a conversation by scanning all of its events."""
+        loop = asyncio.get_running_loop()
+        paths = await loop.run_in_executor(None, self._search_paths, conversation_path)
+        entries, loaded = await self._index_paths(paths)
+        stored = await loop.run_in_executor(
+            None, self._store_index, conversation_path, entries
         )
+        if not stored:
+            return entries, loaded
+
+        # Events saved while the index was being built were not appended to it,
+        # but their files were written before the index was stored.
+        indexed_files = {entry.file for entry in entries}
+        paths = await loop.run_in_executor(None, self._search_paths, conversation_path)
+        missed_paths = [path for path in paths if path.name not in indexed_files]
+        if missed_paths:
+            missed_entries, missed_loaded = await self._index_paths(missed_paths)
+            await loop.run_in_executor(
+                None, self._append_index, conversation_path, missed_entries
+            )
+            entries.extend(missed_entries)
+            loaded.update(missed_loaded)
+        return entries, loaded
+
+    async def _index_paths(
+        self, paths: list[Path]
+    ) -> tuple[list[EventIndexEntry], dict[str, tuple[Event, int]]]:
+        loop = asyncio.get_running_loop()
+        reads = await asyncio.gather(
+            *[loop.run_in_executor(None, self._read_event, path) for path in paths]
+        )
+        entries = []
+        loaded = {}
+        for path, read in zip(paths, reads, strict=True):
+            if not read:
+                continue
+            entry = EventIndexEntry.from_event(read[0], path.name)
+            entries.append(entry)
+            loaded[entry.id] = read
+        return entries, loaded
+
+    async def _load_entries(
+        self,
+        conversation_path: Path,
+        entries: Sequence[EventIndexEntry | None],
+        loaded: dict[str, tuple[Event, int]] | None = None,
+    ) -> list[Event | None]:
+        loop = asyncio.get_running_loop()
+
+        async def load(entry: EventIndexEntry | None) -> Event | None:
+            if entry is None:
+                return None
+            read = loaded.get(entry.id) if loaded else None
+            if read is None and self.event_cache:
+                cached = self.event_cache.get(conversation_path, entry.id)
+                if cached:
+                    return cached
+            if read is None:
+                read = await loop.run_in_executor(
+                    None, self._read_indexed_event, conversation_path, entry
+                )
+            if read is None:
+                return None
+            event, size = read
+            if self.event_cache:
+                self.event_cache.put(conversation_path, entry.id, event, size)
+            return event
+
+        return await asyncio.gather(*[load(entry) for entry in entries])
@@ -1,11 +1,23 @@
 import glob
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Sequence
+from uuid import uuid4
 
 from fastapi import Request
 
+from openhands.app_server.event.event_encoding import (
+    EventEncoding,
+    decode_event,
+    encode_event,
+)
+from openhands.app_server.event.event_index import (
+    INDEX_FILE_NAME,
+    EventIndexEntry,
+    parse_index,
+)
 from openhands.app_server.event.event_service import EventService, EventServiceInjector
 from openhands.app_server.event.event_service_base import EventServiceBase
 from openhands.app_server.services.injector import InjectorState
@@ -19,29 +31,68 @@ class FilesystemEventService(EventServiceBase):
     """Event service based on file system"""
 
     limit: int = 500
+    encoding: EventEncoding = EventEncoding.COMPACT_JSON
 
-    def _load_event(self, path: Path) -> Event | None:
+    def _read_event(self, path: Path) -> tuple[Event, int] | None:
         try:
-            content = path.read_text()
-            content = Event.model_validate_json(content)
-            return content
+            content = path.read_bytes()
+            return decode_event(content), len(content)
         except Exception:
             _logger.exception('Error reading event', stack_info=True)
             return None
 
-    def _store_event(self, path: Path, event: Event):
-        path.parent.mkdir(parents=True, exist_ok=True)
-        content = event.model_dump_json(indent=2)
-        path.write_text(content)
+    def _store_event(self, path: Path, event: Event) -> int:
+        content = encode_event(event, self.encoding)
+        path.write_bytes(content)
+        return len(content)
+
+    def _store_indexed_events(
+        self, conversation_path: Path, events: Sequence[Event]
+    ) -> list[int]:
+        # The directory is created once for the whole batch rather than per event
+        conversation_path.mkdir(parents=True, exist_ok=True)
+        return super()._store_indexed_events(conversation_path, events)
 
     def _search_paths(self, prefix: Path, page_id: str | None = None) -> list[Path]:
-        search_path = f'{prefix}/*'
+        search_path = f'{prefix}/*.json'
         files = glob.glob(str(search_path))
         paths = [Path(file) for file in files]
         return paths
 
+    def _load_index(self, conversation_path: Path) -> list[EventIndexEntry] | None:
+        index_path = conversation_path / INDEX_FILE_NAME
+        try:
+            content = index_path.read_text()
+        except FileNotFoundError:
+            return None
+        return parse_index(content)
+
+    def _store_index(
+        self, conversation_path: Path, entries: list[EventIndexEntry]
+    ) -> bool:
+        # Don't create directories for conversations without events
+        if not conversation_path.exists():
+            return False
+        # Write to a temporary file and rename so readers never see a partial index
+        tmp_path = conversation_path / f'.{INDEX_FILE_NAME}.{uuid4().hex}.tmp'
+        tmp_path.write_text(''.join(entry.to_json_line() for entry in entries))
+        os.replace(tmp_path, conversation_path / INDEX_FILE_NAME)
+        return True
+
+    def _append_index(
+        self, conversation_path: Path, entries: Sequence[EventIndexEntry]
+    ):
+        # If there is no index yet, it is built from the event files on next read
+        index_path = conversation_path / INDEX_FILE_NAME
+        if not entries or not index_path.exists():
+            return
+        with open(index_path, 'a') as f:
+            f.write(''.join(entry.to_json_line() for entry in entries))
+
 
 class FilesystemEventServiceInjector(EventServiceInjector):
+    encoding: EventEncoding = EventEncoding.COMPACT_JSON
+
     async def inject(
         self, state: InjectorState, request: Request | None = None
     ) -> AsyncGenerator[EventService, None]:
@@ -66,4 +117,5 @@ class FilesystemEventServiceInjector(EventServiceInjector):
                 user_id=user_id,
                 app_conversation_info_service=app_conversation_info_service,
                 app_conversation_info_load_tasks={},
+                encoding=self.encoding,
             )
@@ -1,19 +1,32 @@
 """Google Cloud Storage-based EventService implementation."""
 
-import json
+import asyncio
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import AsyncGenerator, Iterator
+from typing import AsyncGenerator, Iterator, Sequence
+from uuid import UUID
 
 from fastapi import Request
-from google.api_core.exceptions import NotFound
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 from google.cloud.storage.blob import Blob
 from google.cloud.storage.bucket import Bucket
 from google.cloud.storage.client import Client
 
 from openhands.app_server.config import get_app_conversation_info_service
+from openhands.app_server.event.event_encoding import (
+    EventEncoding,
+    content_type,
+    decode_event,
+    encode_event,
+)
+from openhands.app_server.event.event_index import (
+    INDEX_FILE_NAME,
+    EventIndexEntry,
+    event_id_hex,
+    parse_index,
+)
 from openhands.app_server.event.event_service import EventService, EventServiceInjector
 from openhands.app_server.event.event_service_base import EventServiceBase
 from openhands.app_server.services.injector import InjectorState
@@ -21,46 +34,175 @@ from openhands.sdk import Event
 
 _logger = logging.getLogger(__name__)
 
+# Objects can't be appended to, so the entries of each batch of events saved are
+# stored as a small segment object in this directory next to the index. Reads
+# merge the segments into the index once there are this many of them.
+_INDEX_SEGMENTS_DIR = 'index'
+_INDEX_COMPACT_THRESHOLD = 8
+# Number of times the index is read again when its segments were merged into it
+# by another reader while it was being read
+_INDEX_READ_ATTEMPTS = 3
+
 
 @dataclass
 class GoogleCloudEventService(EventServiceBase):
     """Google Cloud Storage-based implementation of EventService."""
 
     bucket: Bucket
+    encoding: EventEncoding = EventEncoding.COMPACT_JSON
 
-    def _load_event(self, path: Path) -> Event | None:
-        """Get the event at the path given."""
+    def _read_event(self, path: Path) -> tuple[Event, int] | None:
+        """Get the event at the path given, along with its size in bytes as stored."""
         blob: Blob = self.bucket.blob(str(path))
         try:
-            with blob.open('r') as f:
-                json_data = f.read()
-            event = Event.model_validate_json(json_data)
-            return event
+            data = blob.download_as_bytes()
+            event = decode_event(data)
+            return event, len(data)
         except NotFound:
             return None
         except Exception:
             _logger.exception(f'Error reading event from {path}')
             return None
 
-    def _store_event(self, path: Path, event: Event):
-        """Store the event given at the path given."""
+    def _store_event(self, path: Path, event: Event) -> int:
+        """Store the event given at the path given, returning its size in bytes."""
         blob: Blob = self.bucket.blob(str(path))
-        data = event.model_dump(mode='json')
-        with blob.open('w') as f:
-            f.write(json.dumps(data, indent=2))
+        data = encode_event(event, self.encoding)
+        # A single multipart request, rather than the resumable upload session
+        # (Two or more requests) used when writing through blob.open
+        blob.upload_from_string(data, content_type=content_type(self.encoding))
+        return len(data)
+
+    async def save_events(self, conversation_id: UUID, events: list[Event]):
+        """Save a batch of events, resolving the conversation path once and
+        uploading the objects concurrently before adding them to the index."""
+        if not events:
+            return
+        conversation_path = await self.get_conversation_path(conversation_id)
+        loop = asyncio.get_running_loop()
+        file_names = [f'{event_id_hex(event)}.json' for event in events]
+        sizes = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    None, self._store_event, conversation_path / file_name, event
+                )
+                for event, file_name in zip(events, file_names, strict=True)
+            ]
+        )
+        entries = [
+            EventIndexEntry.from_event(event, file_name)
+            for event, file_name in zip(events, file_names, strict=True)
+        ]
+        await loop.run_in_executor(None, self._append_index, conversation_path, entries)
+        self._cache_events(conversation_path, events, sizes)
 
     def _search_paths(self, prefix: Path, page_id: str | None = None) -> list[Path]:
         """Search paths."""
         blobs: Iterator[Blob] = self.bucket.list_blobs(
             page_token=page_id, prefix=str(prefix)
         )
-        paths = list(Path(blob.name) for blob in blobs)
+        # Skip the index, which is stored alongside the events
+        paths = list(Path(blob.name) for blob in blobs if blob.name.endswith('.json'))
         return paths
 
+    def _read_index(self, conversation_path: Path) -> tuple[str, int] | None:
+        """Get the content of the index for a conversation and its generation."""
+        blob: Blob = self.bucket.blob(str(conversation_path / INDEX_FILE_NAME))
+        try:
+            content = blob.download_as_bytes().decode('utf-8')
+        except NotFound:
+            return None
+        return content, blob.generation
+
+    def _list_index_segments(self, conversation_path: Path) -> list[Blob]:
+        prefix = f'{conversation_path / _INDEX_SEGMENTS_DIR}/'
+        return list(self.bucket.list_blobs(prefix=prefix))
+
+    def _load_index(self, conversation_path: Path) -> list[EventIndexEntry] | None:
+        for _ in range(_INDEX_READ_ATTEMPTS):
+            read = self._read_index(conversation_path)
+            if read is None:
+                return None
+            content, generation = read
+            segments = self._list_index_segments(conversation_path)
+            try:
+                content += ''.join(
+                    segment.download_as_bytes().decode('utf-8') for segment in segments
+                )
+            except NotFound:
+                # Another reader merged the segments into the index since it was read
+                continue
+            entries = parse_index(content)
+            if len(segments) >= _INDEX_COMPACT_THRESHOLD:
+                self._compact_index(conversation_path, entries, generation, segments)
+            return entries
+        return None
+
+    def _compact_index(
+        self,
+        conversation_path: Path,
+        entries: list[EventIndexEntry],
+        generation: int,
+        segments: list[Blob],
+    ):
+        """Merge the segments read into the index, unless another reader did so
+        first. Segments are only deleted once the index holding them is stored."""
+        blob: Blob = self.bucket.blob(str(conversation_path / INDEX_FILE_NAME))
+        try:
+            blob.upload_from_string(
+                ''.join(entry.to_json_line() for entry in entries),
+                content_type='application/x-ndjson',
+                if_generation_match=generation,
+            )
+        except PreconditionFailed:
+            return
+        for segment in segments:
+            try:
+                segment.delete()
+            except NotFound:
+                pass
+
+    def _store_index(
+        self, conversation_path: Path, entries: list[EventIndexEntry]
+    ) -> bool:
+        # Don't create indexes for conversations without events
+        if not entries:
+            return False
+        blob: Blob = self.bucket.blob(str(conversation_path / INDEX_FILE_NAME))
+        try:
+            # Only create the index if no other server stored one since it was read
+            blob.upload_from_string(
+                ''.join(entry.to_json_line() for entry in entries),
+                content_type='application/x-ndjson',
+                if_generation_match=0,
+            )
+        except PreconditionFailed:
+            return False
+        return True
+
+    def _append_index(
+        self, conversation_path: Path, entries: Sequence[EventIndexEntry]
+    ):
+        if not entries:
+            return
+        # If there is no index yet, it is built from the listing on next read
+        index_blob: Blob = self.bucket.blob(str(conversation_path / INDEX_FILE_NAME))
+        if not index_blob.exists():
+            return
+        # Named for the first event, so a batch saved again replaces its segment
+        blob: Blob = self.bucket.blob(
+            str(conversation_path / _INDEX_SEGMENTS_DIR / f'{entries[0].id}.jsonl')
+        )
+        blob.upload_from_string(
+            ''.join(entry.to_json_line() for entry in entries),
+            content_type='application/x-ndjson',
+        )
+
 
 class GoogleCloudEventServiceInjector(EventServiceInjector):
     bucket_name: str
     prefix: Path = Path('users')
+    encoding: EventEncoding = EventEncoding.COMPACT_JSON
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -87,4 +229,5 @@ class GoogleCloudEventServiceInjector(EventServiceInjector):
                 app_conversation_info_service=app_conversation_info_service,
                 bucket=bucket,
                 app_conversation_info_load_tasks={},
+                encoding=self.encoding,
             )
@@ -0,0 +1,379 @@
+"""Append-only segment log implementation of EventService.
+
+Events for a conversation are appended as compact JSON lines to rolling segment
+files ({conversation_path}/segment-000000.jsonl, segment-000001.jsonl, ...). The
+sidecar index records the segment and byte offset of each event, so reads seek
+directly to the events they need and writes never create a file per event.
+Segments are split into events by line, so events are always stored as compact
+JSON and the other encodings are rejected.
+
+Conversations written by FilesystemEventService (one file per event) remain
+readable, and can be moved into segments with the migration tool:
+
+    python -m openhands.app_server.event.segment_event_service {persistence_dir}
+"""
+
+import argparse
+import asyncio
+import glob
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncGenerator, Literal, Sequence
+from uuid import UUID
+
+from fastapi import Request
+
+from openhands.app_server.event.event_encoding import EventEncoding
+from openhands.app_server.event.event_index import EventIndexEntry
+from openhands.app_server.event.event_service import EventService, EventServiceInjector
+from openhands.app_server.event.filesystem_event_service import FilesystemEventService
+from openhands.app_server.services.injector import InjectorState
+from openhands.sdk import Event
+
+_logger = logging.getLogger(__name__)
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+
+
+def _segment_name(number: int) -> str:
+    return f'{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}'
+
+
+def _segment_number(path: Path) -> int:
+    return int(path.name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+
+
+@dataclass
+class SegmentEventService(FilesystemEventService):
+    """Event service storing events in rolling append-only segment files."""
+
+    max_segment_bytes: int = 8 * 1024 * 1024
+
+    def __post_init__(self):
+        if self.encoding != EventEncoding.COMPACT_JSON:
+            raise ValueError(
+                f'Segments only store compact JSON events, not {self.encoding.value}'
+            )
+
+    def _store_event(self, path: Path, event: Event) -> int:
+        [(_, size)] = self._append_events(path.parent, [event])
+        return size
+
+    def _search_paths(self, prefix: Path, page_id: str | None = None) -> list[Path]:
+        """Get the segment files for a conversation, oldest first."""
+        files = glob.glob(f'{prefix}/{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}')
+        return sorted(Path(file) for file in files)
+
+    def _search_legacy_paths(self, prefix: Path) -> list[Path]:
+        """Get the files of events stored one file per event."""
+        return super()._search_paths(prefix)
+
+    def _load_index(self, conversation_path: Path) -> list[EventIndexEntry] | None:
+        entries = super()._load_index(conversation_path)
+        if entries is None:
+            return None
+        # Events appended after the last indexed event (e.g.: by a writer which
+        # failed before updating the index) are recovered from the segment tail
+        recovered = [
+            entry for entry, _, _ in self._scan_tail(conversation_path, entries)
+        ]
+        self._append_index(conversation_path, recovered)
+        return entries + recovered
+
+    def _read_indexed_event(
+        self, conversation_path: Path, entry: EventIndexEntry
+    ) -> tuple[Event, int] | None:
+        if entry.offset is None:
+            # Event stored one file per event, which has not been migrated
+            return self._read_event(conversation_path / entry.file)
+        try:
+            with open(conversation_path / entry.file, 'rb') as f:
+                f.seek(entry.offset)
+                line = f.readline()
+            return Event.model_validate_json(line), len(line)
+        except Exception:
+            _logger.exception('Error reading event', stack_info=True)
+            return None
+
+    def _store_indexed_events(
+        self, conversation_path: Path, events: Sequence[Event]
+    ) -> list[int]:
+        appended = self._append_events(conversation_path, events)
+        self._append_index(conversation_path, [entry for entry, _ in appended])
+        return [size for _, size in appended]
+
+    async def get_event(self, conversation_id: UUID, event_id: UUID) -> Event | None:
+        events = await self.batch_get_events(conversation_id, [event_id])
+        return events[0]
+
+    async def batch_get_events(
+        self, conversation_id: UUID, event_ids: list[UUID]
+    ) -> list[Event | None]:
+        conversation_path = await self.get_conversation_path(conversation_id)
+        entries, loaded = await self._get_index(conversation_path)
+        entries_by_id = {entry.id: entry for entry in entries}
+        return await self._load_entries(
+            conversation_path,
+            [entries_by_id.get(event_id.hex) for event_id in event_ids],
+            loaded,
+        )
+
+    async def _build_index(
+        self, conversation_path: Path
+    ) -> tuple[list[EventIndexEntry], dict[str, tuple[Event, int]]]:
+        loop = asyncio.get_running_loop()
+        legacy_paths = await loop.run_in_executor(
+            None, self._search_legacy_paths, conversation_path
+        )
+        entries, loaded = await self._index_paths(legacy_paths)
+        scanned = await loop.run_in_executor(
+            None, self._scan_tail, conversation_path, []
+        )
+        for entry, event, size in scanned:
+            entries.append(entry)
+            loaded[entry.id] = (event, size)
+        # Events appended after the scan are recovered from the tail on next load
+        await loop.run_in_executor(None, self._store_index, conversation_path, entries)
+        return entries, loaded
+
+    def _open_segment(self, segment_path: Path):
+        try:
+            return open(segment_path, 'ab', buffering=0)
+        except FileNotFoundError:
+            # Only the first write to a conversation needs to create the directory
+            segment_path.parent.mkdir(parents=True, exist_ok=True)
+            return open(segment_path, 'ab', buffering=0)
+
+    def _append_events(
+        self,
+        conversation_path: Path,
+        events: Sequence[Event],
+        segment_path: Path | None = None,
+    ) -> list[tuple[EventIndexEntry, int]]:
+        """Append events to the active segment, rolling to a new segment when it is
+        full. Each segment receives a single write so that concurrent writers
+        cannot interleave within it, and offsets are derived from the position
+        after the write. Returns the index entry and size in bytes of each event."""
+        if segment_path is None:
+            segments = self._search_paths(conversation_path)
+            segment_path = (
+                segments[-1] if segments else conversation_path / _segment_name(0)
+            )
+        lines = [(event, (event.model_dump_json() + '\n').encode()) for event in events]
+        entries = []
+        while lines:
+            with self._open_segment(segment_path) as f:
+                size = f.tell()
+                chunk_size = 0
+                chunk_len = 0
+                for _, data in lines:
+                    new_chunk_size = chunk_size + len(data)
+                    if (size or chunk_len) and size + new_chunk_size > (
+                        self.max_segment_bytes
+                    ):
+                        break
+                    chunk_size = new_chunk_size
+                    chunk_len += 1
+                chunk = lines[:chunk_len]
+                payload = b''.join(data for _, data in chunk)
+                if payload:
+                    written = f.write(payload)
+                    if written != len(payload):
+                        raise OSError(f'Short write to {segment_path}')
+                offset = f.tell() - chunk_size
+            for event, data in chunk:
+                entries.append(
+                    (
+                        EventIndexEntry.from_event(event, segment_path.name, offset),
+                        len(data),
+                    )
+                )
+                offset += len(data)
+            lines = lines[chunk_len:]
+            if lines:
+                segment_path = segment_path.with_name(
+                    _segment_name(_segment_number(segment_path) + 1)
+                )
+        return entries
+
+    def _scan_segment(
+        self, segment_path: Path, start: int = 0
+    ) -> list[tuple[EventIndexEntry, Event, int]]:
+        """Read the complete events in a segment from the offset given, with the
+        size in bytes of each."""
+        result = []
+        with open(segment_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Write in progress or torn by a crash
+                    break
+                try:
+                    event = Event.model_validate_json(line)
+                    entry = EventIndexEntry.from_event(event, segment_path.name, offset)
+                    result.append((entry, event, len(line)))
+                except Exception:
+                    _logger.warning(f'Skipping unreadable event in {segment_path}')
+                offset += len(line)
+        return result
+
+    def _scan_tail(
+        self, conversation_path: Path, entries: list[EventIndexEntry]
+    ) -> list[tuple[EventIndexEntry, Event, int]]:
+        """Read the events stored in segments after the last of the entries given."""
+        last: EventIndexEntry | None = None
+        for entry in entries:
+            if entry.offset is not None and (
+                last is None or (entry.file, entry.offset) > (last.file, last.offset)
+            ):
+                last = entry
+        result = []
+        for segment_path in self._search_paths(conversation_path):
+            if last is None or segment_path.name > last.file:
+                result.extend(self._scan_segment(segment_path))
+            elif segment_path.name == last.file:
+                scanned = self._scan_segment(segment_path, last.offset or 0)
+                # Skip up to the last indexed event itself, which is found by id
+                # rather than assumed to be the first event read
+                ids = [entry.id for entry, _, _ in scanned]
+                if last.id in ids:
+                    scanned = scanned[ids.index(last.id) + 1 :]
+                result.extend(scanned)
+        return result
+
+    async def compact(self, conversation_id: UUID) -> int:
+        """Rewrite the segments of a conversation, dropping superseded copies of
+        events and unreadable lines. Must not run concurrently with writes to the
+        conversation. Returns the number of events kept."""
+        conversation_path = await self.get_conversation_path(conversation_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._compact, conversation_path)
+
+    def _compact(self, conversation_path: Path) -> int:
+        old_segments = self._search_paths(conversation_path)
+        if not old_segments:
+            return 0
+        events: dict[str, Event] = {}
+        for entry, event, _ in self._scan_tail(conversation_path, []):
+            # Keep the latest copy of each event in its original position
+            events[entry.id] = event
+
+        # New segments are numbered after the old ones, so the index is the only
+        # file which needs to be swapped
+        segment_path = conversation_path / _segment_name(
+            _segment_number(old_segments[-1]) + 1
+        )
+        entries = [
+            entry
+            for entry, _ in self._append_events(
+                conversation_path, list(events.values()), segment_path
+            )
+        ]
+        legacy_entries = [
+            entry
+            for entry in (self._load_index_file(conversation_path) or [])
+            if entry.offset is None
+        ]
+        self._store_index(conversation_path, legacy_entries + entries)
+        for old_segment in old_segments:
+            old_segment.unlink()
+        return len(entries)
+
+    def _load_index_file(self, conversation_path: Path) -> list[EventIndexEntry] | None:
+        return super()._load_index(conversation_path)
+
+    async def migrate_conversation(self, conversation_id: UUID) -> int:
+        """Move events stored one file per event into segments. Must not run
+        concurrently with writes to the conversation. Returns the number of
+        events migrated."""
+        conversation_path = await self.get_conversation_path(conversation_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._migrate, conversation_path)
+
+    def _migrate(self, conversation_path: Path) -> int:
+        legacy_paths = self._search_legacy_paths(conversation_path)
+        if not legacy_paths:
+            return 0
+        events = [event for event in map(self._load_event, legacy_paths) if event]
+        events.sort(key=lambda e: e.timestamp)
+        self._append_events(conversation_path, events)
+
+        # Rebuild the index from the segments before removing the old files, so
+        # that a failure part way through loses nothing (Duplicates are removed
+        # by compaction)
+        entries = [entry for entry, _, _ in self._scan_tail(conversation_path, [])]
+        self._store_index(conversation_path, entries)
+        for path in legacy_paths:
+            path.unlink()
+        return len(events)
+
+
+class SegmentEventServiceInjector(EventServiceInjector):
+    max_segment_bytes: int = 8 * 1024 * 1024
+    encoding: Literal[EventEncoding.COMPACT_JSON] = EventEncoding.COMPACT_JSON
+
+    async def inject(
+        self, state: InjectorState, request: Request | None = None
+    ) -> AsyncGenerator[EventService, None]:
+        from openhands.app_server.config import (
+            get_app_conversation_info_service,
+            get_global_config,
+            get_user_context,
+        )
+
+        async with (
+            get_user_context(state, request) as user_context,
+            get_app_conversation_info_service(
+                state, request
+            ) as app_conversation_info_service,
+        ):
+            # Set up a service with a path {persistence_dir}/{user_id}/v1_conversations
+            prefix = get_global_config().persistence_dir
+            user_id = await user_context.get_user_id()
+
+            yield SegmentEventService(
+                prefix=prefix,
+                user_id=user_id,
+                app_conversation_info_service=app_conversation_info_service,
+                app_conversation_info_load_tasks={},
+                max_segment_bytes=self.max_segment_bytes,
+                encoding=self.encoding,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Migrate V1 conversation events from one file per event to '
+        'segment files'
+    )
+    parser.add_argument('persistence_dir', type=Path)
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Also compact the segments of every conversation',
+    )
+    args = parser.parse_args()
+
+    service = SegmentEventService(
+        prefix=args.persistence_dir,
+        user_id=None,
+        app_conversation_info_service=None,
+        app_conversation_info_load_tasks={},
+    )
+    conversation_paths = glob.glob(
+        f'{args.persistence_dir}/v1_conversations/*'
+    ) + glob.glob(f'{args.persistence_dir}/*/v1_conversations/*')
+    for conversation_path in sorted(Path(path) for path in conversation_paths):
+        if not conversation_path.is_dir():
+            continue
+        migrated = service._migrate(conversation_path)
+        print(f'{conversation_path}: migrated {migrated} events')
+        if args.compact:
+            kept = service._compact(conversation_path)
+            print(f'{conversation_path}: compacted to {kept} events')
+
+
+if __name__ == '__main__':
+    main()
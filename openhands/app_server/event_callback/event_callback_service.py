@@ -61,6 +61,14 @@ class EventCallbackService(ABC):
     async def execute_callbacks(self, conversation_id: UUID, event: Event) -> None:
         """Execute any applicable callbacks for the event and store the results."""
 
+    async def batch_execute_callbacks(
+        self, conversation_id: UUID, events: list[Event]
+    ) -> None:
+        """Execute any applicable callbacks for each of the events in sequence and
+        store the results."""
+        for event in events:
+            await self.execute_callbacks(conversation_id, event)
+
 
 class EventCallbackServiceInjector(
     DiscriminatedUnionMixin, Injector[EventCallbackService], ABC
@@ -5,13 +5,27 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
-from typing import AsyncGenerator
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, cast
 from uuid import UUID
 
 from fastapi import Request
+from pydantic import Field
 from sqlalchemy import UUID as SQLUUID
-from sqlalchemy import Column, Enum, String, and_, func, or_, select
+from sqlalchemy import (
+    Column,
+    CursorResult,
+    Enum,
+    String,
+    and_,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.event import listen
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from openhands.agent_server.utils import utc_now
@@ -48,7 +62,7 @@ class StoredEventCallback(Base):  # type: ignore
     __tablename__ = 'event_callback'
     id = Column(SQLUUID, primary_key=True)
     conversation_id = Column(SQLUUID, nullable=True)
-    status = Column(
+    status: Column[EventCallbackStatus] = Column(
         Enum(EventCallbackStatus), nullable=False, default=EventCallbackStatus.ACTIVE
     )
     processor = Column(create_json_type_decorator(EventCallbackProcessor))
@@ -60,7 +74,9 @@ class StoredEventCallback(Base):  # type: ignore
 class StoredEventCallbackResult(Base):  # type: ignore
     __tablename__ = 'event_callback_result'
     id = Column(SQLUUID, primary_key=True)
-    status = Column(Enum(EventCallbackResultStatus), nullable=True)
+    status: Column[EventCallbackResultStatus | None] = Column(
+        Enum(EventCallbackResultStatus), nullable=True
+    )
     event_callback_id = Column(SQLUUID, index=True)
     event_id = Column(String, index=True)
     conversation_id = Column(SQLUUID, index=True)
@@ -68,11 +84,89 @@ class StoredEventCallbackResult(Base):  # type: ignore
     created_at = Column(UtcDateTime, server_default=func.now(), index=True)
 
 
+@dataclass
+class _RegistryEntry:
+    callbacks: list[EventCallback]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class EventCallbackRegistry:
+    """In-process cache of the callbacks for each conversation (Including global
+    callbacks, and callbacks in any status), grouped by event kind.
+
+    Entries are invalidated once changes to callbacks made in this process are
+    committed. Changes made by other processes are picked up once an entry is older
+    than the ttl. Conversations without any callbacks of their own are never
+    cached, so callbacks added just after a conversation starts are not missed.
+    At most max_size entries are kept, evicting the least recently used.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: OrderedDict[UUID, _RegistryEntry] = OrderedDict()
+
+    def get(self, conversation_id: UUID, ttl: float) -> list[EventCallback] | None:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > ttl:
+            del self._entries[conversation_id]
+            return None
+        self._entries.move_to_end(conversation_id)
+        # Copies are returned so that processors mutating their callback do not
+        # affect other requests
+        return [callback.model_copy(deep=True) for callback in entry.callbacks]
+
+    def put(self, conversation_id: UUID, callbacks: list[EventCallback]):
+        if any(callback.conversation_id is not None for callback in callbacks):
+            self._entries[conversation_id] = _RegistryEntry(
+                callbacks=[callback.model_copy(deep=True) for callback in callbacks]
+            )
+            self._entries.move_to_end(conversation_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, conversation_id: UUID | None):
+        if conversation_id is None:
+            # Global callbacks are part of every entry
+            self._entries.clear()
+        else:
+            self._entries.pop(conversation_id, None)
+
+
+_callback_registry = EventCallbackRegistry()
+
+
+def _matches(callback: EventCallback, event: Event) -> bool:
+    return callback.status == EventCallbackStatus.ACTIVE and (
+        callback.event_kind is None or callback.event_kind == event.kind
+    )
+
+
 @dataclass
 class SQLEventCallbackService(EventCallbackService):
     """SQL implementation of EventCallbackService."""
 
     db_session: AsyncSession
+    registry_ttl: float = 30
+    registry: EventCallbackRegistry = field(default_factory=lambda: _callback_registry)
+    _pending_invalidations: set[UUID | None] = field(default_factory=set, init=False)
+
+    def __post_init__(self):
+        # Saved callbacks are only invalidated in the registry once committed, so
+        # that other requests do not reload them before the change is visible
+        if isinstance(self.db_session, AsyncSession):
+            sync_session = self.db_session.sync_session
+            listen(sync_session, 'after_commit', self._after_commit)
+            listen(sync_session, 'after_rollback', self._after_rollback)
+
+    def _after_commit(self, session):
+        for conversation_id in self._pending_invalidations:
+            self.registry.invalidate(conversation_id)
+        self._pending_invalidations.clear()
+
+    def _after_rollback(self, session):
+        self._pending_invalidations.clear()
 
     async def create_event_callback(
         self, request: CreateEventCallbackRequest
@@ -90,6 +184,7 @@ class SQLEventCallbackService(EventCallbackService):
         self.db_session.add(stored_callback)
         await self.db_session.commit()
         await self.db_session.refresh(stored_callback)
+        self.registry.invalidate(event_callback.conversation_id)
         return EventCallback.model_validate(row2dict(stored_callback))
 
     async def get_event_callback(self, id: UUID) -> EventCallback | None:
@@ -110,8 +205,10 @@ class SQLEventCallbackService(EventCallbackService):
         if stored_callback is None:
             return False
 
+        conversation_id = cast(UUID | None, stored_callback.conversation_id)
         await self.db_session.delete(stored_callback)
         await self.db_session.commit()
+        self.registry.invalidate(conversation_id)
         return True
 
     async def search_event_callbacks(
@@ -179,46 +276,86 @@ class SQLEventCallbackService(EventCallbackService):
         return EventCallbackPage(items=callbacks, next_page_id=next_page_id)
 
     async def save_event_callback(self, event_callback: EventCallback) -> EventCallback:
+        """Save a callback. If the stored callback was changed since this one was
+        loaded (e.g.: It was completed or disabled by another process), the stored
+        callback is kept and returned instead."""
+        loaded_updated_at = event_callback.updated_at
         event_callback.updated_at = utc_now()
-        stored_callback = StoredEventCallback(**event_callback.model_dump())
-        await self.db_session.merge(stored_callback)
-        return event_callback
-
-    async def execute_callbacks(self, conversation_id: UUID, event: Event) -> None:
-        query = (
-            select(StoredEventCallback)
-            .where(StoredEventCallback.status == EventCallbackStatus.ACTIVE)
-            .where(
-                or_(
-                    StoredEventCallback.event_kind == event.kind,
-                    StoredEventCallback.event_kind.is_(None),
-                )
-            )
+        values = event_callback.model_dump()
+        result = await self.db_session.execute(
+            update(StoredEventCallback)
             .where(
-                or_(
-                    StoredEventCallback.conversation_id == conversation_id,
-                    StoredEventCallback.conversation_id.is_(None),
-                )
+                StoredEventCallback.id == event_callback.id,
+                StoredEventCallback.updated_at == loaded_updated_at,
             )
+            .values(**values)
         )
-        result = await self.db_session.execute(query)
-        stored_callbacks = result.scalars().all()
-        if stored_callbacks:
-            callbacks = [
-                EventCallback.model_validate(row2dict(cb)) for cb in stored_callbacks
-            ]
+        if cast(CursorResult, result).rowcount == 0:
+            stored_callback = await self.db_session.get(
+                StoredEventCallback, event_callback.id, populate_existing=True
+            )
+            if stored_callback is None:
+                self.db_session.add(StoredEventCallback(**values))
+            else:
+                _logger.info(
+                    f'Event callback {event_callback.id} was changed concurrently, '
+                    'keeping the stored version'
+                )
+                event_callback = EventCallback.model_validate(row2dict(stored_callback))
+        self._pending_invalidations.add(event_callback.conversation_id)
+        return event_callback
+
+    async def execute_callbacks(self, conversation_id: UUID, event: Event) -> None:
+        await self.batch_execute_callbacks(conversation_id, [event])
+
+    async def batch_execute_callbacks(
+        self, conversation_id: UUID, events: list[Event]
+    ) -> None:
+        callbacks = await self._get_callbacks(conversation_id)
+        executed = False
+        changed: dict[UUID, EventCallback] = {}
+        for event in events:
+            # Callbacks may disable themselves, so matching is checked per event
+            matching = [callback for callback in callbacks if _matches(callback, event)]
+            if not matching:
+                continue
+            executed = True
+            before = {callback.id: callback.model_dump() for callback in matching}
             await asyncio.gather(
                 *[
                     self.execute_callback(conversation_id, callback, event)
-                    for callback in callbacks
+                    for callback in matching
                 ]
             )
+            for callback in matching:
+                if callback.model_dump() != before[callback.id]:
+                    changed[callback.id] = callback
 
-            # Persist any new changes callbacks may have made to itself
-            for callback in callbacks:
+        if executed:
+            # Persist only callbacks which made changes to themselves
+            for callback in changed.values():
                 await self.save_event_callback(callback)
             await self.db_session.commit()
 
+    async def _get_callbacks(self, conversation_id: UUID) -> list[EventCallback]:
+        """Get the callbacks which may apply to events in the conversation given."""
+        callbacks = self.registry.get(conversation_id, self.registry_ttl)
+        if callbacks is not None:
+            return callbacks
+        query = select(StoredEventCallback).where(
+            or_(
+                StoredEventCallback.conversation_id == conversation_id,
+                StoredEventCallback.conversation_id.is_(None),
+            )
+        )
+        result = await self.db_session.execute(query)
+        callbacks = [
+            EventCallback.model_validate(row2dict(stored))
+            for stored in result.scalars().all()
+        ]
+        self.registry.put(conversation_id, callbacks)
+        return callbacks
+
     async def execute_callback(
         self, conversation_id: UUID, callback: EventCallback, event: Event
     ):
@@ -244,10 +381,20 @@ class SQLEventCallbackService(EventCallbackService):
 
 
 class SQLEventCallbackServiceInjector(EventCallbackServiceInjector):
+    registry_ttl: float = Field(
+        default=30,
+        description=(
+            'Seconds for which callbacks are cached in process. Callbacks changed '
+            'by other processes may be missed for up to this long.'
+        ),
+    )
+
     async def inject(
         self, state: InjectorState, request: Request | None = None
     ) -> AsyncGenerator[EventCallbackService, None]:
         from openhands.app_server.config import get_db_session
 
         async with get_db_session(state) as db_session:
-            yield SQLEventCallbackService(db_session=db_session)
+            yield SQLEventCallbackService(
+                db_session=db_session, registry_ttl=self.registry_ttl
+            )
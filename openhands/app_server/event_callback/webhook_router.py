@@ -30,6 +30,7 @@ from openhands.app_server.errors import AuthError
 from openhands.app_server.event.event_service import EventService
 from openhands.app_server.sandbox.sandbox_models import SandboxInfo
 from openhands.app_server.sandbox.sandbox_service import SandboxService
+from openhands.app_server.sandbox.warm_sandbox_pool import get_warm_sandbox_pool
 from openhands.app_server.services.injector import InjectorState
 from openhands.app_server.services.jwt_service import JwtService
 from openhands.app_server.user.auth_user_context import AuthUserContext
@@ -126,6 +127,7 @@ async def on_conversation_update(
         pr_number=existing.pr_number,
         # Preserve parent/child relationship and other metadata
         parent_conversation_id=existing.parent_conversation_id,
+        last_synced_event_timestamp=existing.last_synced_event_timestamp,
         metrics=conversation_info.stats.get_combined_metrics(),
     )
     await app_conversation_info_service.save_app_conversation_info(
@@ -148,12 +150,11 @@ async def on_event(
     app_conversation_info = await valid_conversation(
         conversation_id, sandbox_info, app_conversation_info_service
     )
+    get_warm_sandbox_pool().record_first_event(sandbox_info.id)
 
     try:
-        # Save events...
-        await asyncio.gather(
-            *[event_service.save_event(conversation_id, event) for event in events]
-        )
+        # Save events in a single batch...
+        await event_service.save_events(conversation_id, events)
 
         # Process stats events for V1 conversations
         for event in events:
@@ -220,9 +221,8 @@ async def _run_callbacks_in_bg_and_close(
     setattr(state, USER_CONTEXT_ATTR, SpecifyUserContext(user_id=user_id))
 
     async with get_event_callback_service(state) as event_callback_service:
-        # We don't use asynio.gather here because callbacks must be run in sequence.
-        for event in events:
-            await event_callback_service.execute_callbacks(conversation_id, event)
+        # Callbacks are run for each event in sequence
+        await event_callback_service.batch_execute_callbacks(conversation_id, events)
 
 
 def _import_all_tools():
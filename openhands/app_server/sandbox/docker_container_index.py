@@ -0,0 +1,221 @@
+"""Process-wide index of sandbox containers, kept fresh from docker events.
+
+Listing containers with the docker client inspects each of them, and sandboxes
+are looked up by session API key on every webhook request, so without an index
+every request makes an API call for each container on the host. The index lists
+the sandbox containers once, and then follows the docker events stream in a
+background thread, inspecting only the containers which changed.
+
+The index also remembers which containers passed a health check recently, so
+that polling the sandboxes doesn't check each agent server every time.
+"""
+
+import logging
+import threading
+import time
+
+import docker
+from docker.errors import APIError, NotFound
+from docker.models.containers import Container
+
+from openhands.app_server.sandbox.sandbox_service import SESSION_API_KEY_VARIABLE
+
+_logger = logging.getLogger(__name__)
+
+# Label set on all sandbox containers
+SANDBOX_SPEC_ID_LABEL = 'sandbox_spec_id'
+DEFAULT_HEALTH_CHECK_TTL_SECONDS = 5.0
+# Container events after which a container is inspected again
+_REFRESH_EVENTS = [
+    'create',
+    'start',
+    'restart',
+    'die',
+    'stop',
+    'kill',
+    'oom',
+    'pause',
+    'unpause',
+    'rename',
+    'update',
+    'destroy',
+]
+
+
+def get_session_api_key(container: Container) -> str | None:
+    for env_var in container.attrs['Config']['Env'] or []:
+        key, _, value = env_var.partition('=')
+        if key == SESSION_API_KEY_VARIABLE:
+            return value
+    return None
+
+
+class DockerContainerIndex:
+    """Sandbox containers by name and by session API key."""
+
+    def __init__(
+        self,
+        docker_client: docker.DockerClient,
+        container_name_prefix: str,
+        health_check_ttl_seconds: float = DEFAULT_HEALTH_CHECK_TTL_SECONDS,
+    ):
+        self.docker_client = docker_client
+        self.container_name_prefix = container_name_prefix
+        self.health_check_ttl_seconds = health_check_ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._events_thread: threading.Thread | None = None
+        # Containers by id, with lookups by name and session api key
+        self._containers: dict[str, Container] = {}
+        self._ids_by_name: dict[str, str] = {}
+        self._ids_by_session_api_key: dict[str, str] = {}
+        # Container id -> time until which the container is considered healthy
+        self._healthy_until: dict[str, float] = {}
+
+    def list_containers(self) -> list[Container]:
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._containers.values())
+
+    def get_by_name(self, name: str) -> Container | None:
+        self._ensure_loaded()
+        with self._lock:
+            container_id = self._ids_by_name.get(name)
+            return self._containers.get(container_id) if container_id else None
+
+    def get_by_session_api_key(self, session_api_key: str) -> Container | None:
+        self._ensure_loaded()
+        with self._lock:
+            container_id = self._ids_by_session_api_key.get(session_api_key)
+            return self._containers.get(container_id) if container_id else None
+
+    def put(self, container: Container):
+        """Add or update a container without waiting for its docker event."""
+        with self._lock:
+            self._put(container)
+
+    def is_healthy(self, container: Container) -> bool:
+        """Whether the container passed a health check recently."""
+        if container.id is None:
+            return False
+        with self._lock:
+            healthy_until = self._healthy_until.get(container.id)
+        return healthy_until is not None and time.monotonic() < healthy_until
+
+    def mark_healthy(self, container: Container):
+        if self.health_check_ttl_seconds <= 0 or container.id is None:
+            return
+        with self._lock:
+            if container.id in self._containers:
+                self._healthy_until[container.id] = (
+                    time.monotonic() + self.health_check_ttl_seconds
+                )
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            # Follow events before listing, so that no change is missed
+            events = self.docker_client.events(
+                decode=True,
+                filters={
+                    'type': 'container',
+                    'event': _REFRESH_EVENTS,
+                    'label': SANDBOX_SPEC_ID_LABEL,
+                },
+            )
+            containers = self.docker_client.containers.list(
+                all=True,
+                filters={
+                    'label': SANDBOX_SPEC_ID_LABEL,
+                    'name': self.container_name_prefix,
+                },
+            )
+            self._containers.clear()
+            self._ids_by_name.clear()
+            self._ids_by_session_api_key.clear()
+            self._healthy_until.clear()
+            for container in containers:
+                self._put(container)
+            self._loaded = True
+            self._events_thread = threading.Thread(
+                target=self._follow_events,
+                args=(events,),
+                name='docker-container-index',
+                daemon=True,
+            )
+            self._events_thread.start()
+
+    def _follow_events(self, events):
+        try:
+            for event in events:
+                container_id = event.get('id')
+                if container_id:
+                    self._refresh(container_id)
+        except Exception:
+            _logger.warning('Docker event stream ended', exc_info=True)
+        finally:
+            # Reload from scratch next time, rather than serve stale containers
+            with self._lock:
+                self._loaded = False
+
+    def _refresh(self, container_id: str):
+        try:
+            container = self.docker_client.containers.get(container_id)
+        except NotFound:
+            with self._lock:
+                self._remove(container_id)
+            return
+        except APIError:
+            _logger.warning(f'Error inspecting container {container_id}')
+            return
+        self.put(container)
+
+    def _put(self, container: Container):
+        container_id = container.id
+        # Containers which were not inspected have no id or name to index them by
+        if container_id is None:
+            return
+        self._remove(container_id)
+        name = container.name
+        if name and name.startswith(self.container_name_prefix):
+            self._containers[container_id] = container
+            self._ids_by_name[name] = container_id
+            session_api_key = get_session_api_key(container)
+            if session_api_key:
+                self._ids_by_session_api_key[session_api_key] = container_id
+
+    def _remove(self, container_id: str):
+        container = self._containers.pop(container_id, None)
+        self._healthy_until.pop(container_id, None)
+        if container is None:
+            return
+        name = container.name
+        if name is not None and self._ids_by_name.get(name) == container_id:
+            del self._ids_by_name[name]
+        session_api_key = get_session_api_key(container)
+        if (
+            session_api_key
+            and self._ids_by_session_api_key.get(session_api_key) == container_id
+        ):
+            del self._ids_by_session_api_key[session_api_key]
+
+
+_container_indexes: dict[tuple[int, str], DockerContainerIndex] = {}
+_container_indexes_lock = threading.Lock()
+
+
+def get_docker_container_index(
+    docker_client: docker.DockerClient,
+    container_name_prefix: str,
+    health_check_ttl_seconds: float = DEFAULT_HEALTH_CHECK_TTL_SECONDS,
+) -> DockerContainerIndex:
+    """Get the index shared by the process for a docker client and prefix."""
+    key = (id(docker_client), container_name_prefix)
+    with _container_indexes_lock:
+        index = _container_indexes.get(key)
+        if index is None:
+            index = _container_indexes[key] = DockerContainerIndex(
+                docker_client, container_name_prefix, health_check_ttl_seconds
+            )
+        return index
@@ -2,9 +2,10 @@ import asyncio
 import logging
 import os
 import socket
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import AsyncGenerator
+from typing import AsyncGenerator, ClassVar
 
 import base62
 import docker
@@ -15,6 +16,12 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from openhands.agent_server.utils import utc_now
 from openhands.app_server.errors import SandboxError
+from openhands.app_server.sandbox.docker_container_index import (
+    DEFAULT_HEALTH_CHECK_TTL_SECONDS,
+    SANDBOX_SPEC_ID_LABEL,
+    DockerContainerIndex,
+    get_docker_container_index,
+)
 from openhands.app_server.sandbox.docker_sandbox_spec_service import get_docker_client
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
@@ -26,6 +33,9 @@ from openhands.app_server.sandbox.sandbox_models import (
     SandboxPage,
     SandboxStatus,
 )
+from openhands.app_server.sandbox.sandbox_readiness import (
+    DEFAULT_INITIAL_POLL_INTERVAL,
+)
 from openhands.app_server.sandbox.sandbox_service import (
     ALLOW_CORS_ORIGINS_VARIABLE,
     SESSION_API_KEY_VARIABLE,
@@ -33,7 +43,14 @@ from openhands.app_server.sandbox.sandbox_service import (
     SandboxService,
     SandboxServiceInjector,
 )
+from openhands.app_server.sandbox.sandbox_spec_models import SandboxSpecInfo
 from openhands.app_server.sandbox.sandbox_spec_service import SandboxSpecService
+from openhands.app_server.sandbox.warm_sandbox_pool import (
+    DEFAULT_IDLE_TIMEOUT_SECONDS,
+    WarmSandboxFactory,
+    WarmSandboxPool,
+    get_warm_sandbox_pool,
+)
 from openhands.app_server.services.injector import InjectorState
 from openhands.app_server.utils.docker_utils import (
     replace_localhost_hostname_for_docker,
@@ -41,6 +58,14 @@ from openhands.app_server.utils.docker_utils import (
 
 _logger = logging.getLogger(__name__)
 STARTUP_GRACE_SECONDS = 15
+WARM_SANDBOX_STARTUP_TIMEOUT = 120
+# Idle containers in the warm pool are named with this prefix before the container
+# name prefix, so they are not listed as sandboxes until they are claimed.
+WARM_CONTAINER_NAME_PREFIX = 'warm-'
+
+# Time at which containers from the warm pool were claimed, by container name. (The
+# time the container was created is when it was warmed rather than requested)
+_claimed_at: dict[str, datetime] = {}
 
 
 class VolumeMount(BaseModel):
@@ -64,13 +89,16 @@ class ExposedPort(BaseModel):
 
 
 @dataclass
-class DockerSandboxService(SandboxService):
+class DockerSandboxService(SandboxService, WarmSandboxFactory):
     """Sandbox service built on docker.
 
     The Docker API does not currently support async operations, so some of these operations will block.
     Given that the docker API is intended for local use on a single machine, this is probably acceptable.
     """
 
+    # Polls are to the local docker daemon (Through the container index), so are cheap
+    initial_poll_interval: ClassVar[float | None] = DEFAULT_INITIAL_POLL_INTERVAL
+
     sandbox_spec_service: SandboxSpecService
     container_name_prefix: str
     host_port: int
@@ -85,6 +113,13 @@ class DockerSandboxService(SandboxService):
     docker_client: docker.DockerClient = field(default_factory=get_docker_client)
     startup_grace_seconds: int = STARTUP_GRACE_SECONDS
     use_host_network: bool = False
+    # Shared by all services in the process. Only used once it is started.
+    warm_sandbox_pool: WarmSandboxPool = field(
+        default_factory=get_warm_sandbox_pool, kw_only=True
+    )
+    # Shared by all services in the process. When None, the docker daemon is
+    # asked for the containers every time.
+    container_index: DockerContainerIndex | None = field(default=None, kw_only=True)
 
     def _find_unused_port(self) -> int:
         """Find an unused port on the host machine."""
@@ -131,6 +166,7 @@ class DockerSandboxService(SandboxService):
             created_at = datetime.fromisoformat(created_str.replace('Z', '+00:00'))
         except (ValueError, AttributeError):
             created_at = utc_now()
+        created_at = _claimed_at.get(container.name, created_at)
 
         # Get URL and session key for running containers
         exposed_urls = None
@@ -200,19 +236,48 @@ class DockerSandboxService(SandboxService):
         return SandboxInfo(
             id=container.name,
             created_by_user_id=None,
-            sandbox_spec_id=container.image.tags[0],
+            sandbox_spec_id=self._get_sandbox_spec_id(container),
             status=status,
             session_api_key=session_api_key,
             exposed_urls=exposed_urls,
             created_at=created_at,
         )
 
+    def _get_sandbox_spec_id(self, container) -> str:
+        # Reading the label avoids an extra request to the docker daemon for the image
+        labels = container.attrs['Config'].get('Labels') or {}
+        return labels.get(SANDBOX_SPEC_ID_LABEL) or container.image.tags[0]
+
+    def _list_containers(self) -> list:
+        """List the containers with our prefix. (Filtered by the docker daemon, so
+        that other containers on the host are not inspected)"""
+        if self.container_index is not None:
+            containers = self.container_index.list_containers()
+        else:
+            containers = self.docker_client.containers.list(
+                all=True,
+                filters={
+                    'label': SANDBOX_SPEC_ID_LABEL,
+                    'name': self.container_name_prefix,
+                },
+            )
+        # The name filter matches anywhere in the name
+        return [
+            container
+            for container in containers
+            if container.name and container.name.startswith(self.container_name_prefix)
+        ]
+
     async def _container_to_checked_sandbox_info(self, container) -> SandboxInfo | None:
         sandbox_info = await self._container_to_sandbox_info(container)
         if (
             sandbox_info
             and self.health_check_path is not None
             and sandbox_info.exposed_urls
+            and not (
+                self.container_index is not None
+                and self.container_index.is_healthy(container)
+            )
         ):
             app_server_url = next(
                 exposed_url.url
@@ -227,6 +292,8 @@ class DockerSandboxService(SandboxService):
                     f'{app_server_url}{self.health_check_path}'
                 )
                 response.raise_for_status()
+                if self.container_index is not None:
+                    self.container_index.mark_healthy(container)
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
@@ -255,19 +322,14 @@ class DockerSandboxService(SandboxService):
     ) -> SandboxPage:
         """Search for sandboxes."""
         try:
-            # Get all containers with our prefix
-            all_containers = self.docker_client.containers.list(all=True)
-            sandboxes = []
-
-            for container in all_containers:
-                if container.name and container.name.startswith(
-                    self.container_name_prefix
-                ):
-                    sandbox_info = await self._container_to_checked_sandbox_info(
-                        container
-                    )
-                    if sandbox_info:
-                        sandboxes.append(sandbox_info)
+            # Check the health of all containers concurrently
+            sandbox_infos = await asyncio.gather(
+                *[
+                    self._container_to_checked_sandbox_info(container)
+                    for container in self._list_containers()
+                ]
+            )
+            sandboxes = [sandbox_info for sandbox_info in sandbox_infos if sandbox_info]
 
             # Sort by creation time (newest first)
             sandboxes.sort(key=lambda x: x.created_at, reverse=True)
@@ -298,7 +360,11 @@ class DockerSandboxService(SandboxService):
         try:
             if not sandbox_id.startswith(self.container_name_prefix):
                 return None
-            container = self.docker_client.containers.get(sandbox_id)
+            container = None
+            if self.container_index is not None:
+                container = self.container_index.get_by_name(sandbox_id)
+            if container is None:
+                container = self.docker_client.containers.get(sandbox_id)
             return await self._container_to_checked_sandbox_info(container)
         except (NotFound, APIError):
             return None
@@ -308,19 +374,19 @@ class DockerSandboxService(SandboxService):
     ) -> SandboxInfo | None:
         """Get a single sandbox by session API key."""
         try:
-            # Get all containers with our prefix
-            all_containers = self.docker_client.containers.list(all=True)
+            if self.container_index is not None:
+                container = self.container_index.get_by_session_api_key(session_api_key)
+                if container is None:
+                    return None
+                return await self._container_to_checked_sandbox_info(container)
 
-            for container in all_containers:
-                if container.name and container.name.startswith(
-                    self.container_name_prefix
-                ):
-                    # Check if this container has the matching session API key
-                    env_vars = self._get_container_env_vars(container)
-                    container_session_key = env_vars.get(SESSION_API_KEY_VARIABLE)
+            for container in self._list_containers():
+                # Check if this container has the matching session API key
+                env_vars = self._get_container_env_vars(container)
+                container_session_key = env_vars.get(SESSION_API_KEY_VARIABLE)
 
-                    if container_session_key == session_api_key:
-                        return await self._container_to_checked_sandbox_info(container)
+                if container_session_key == session_api_key:
+                    return await self._container_to_checked_sandbox_info(container)
 
             return None
         except (NotFound, APIError):
@@ -352,12 +418,35 @@ class DockerSandboxService(SandboxService):
                 raise ValueError('Sandbox Spec not found')
             sandbox_spec = sandbox_spec_maybe
 
+        # Use an idle sandbox from the warm pool if there is one
+        sandbox_info = await self.warm_sandbox_pool.claim(
+            self, sandbox_spec.id, sandbox_id
+        )
+        if sandbox_info is not None:
+            self.warm_sandbox_pool.record_start(sandbox_info.id, pooled=True)
+            return sandbox_info
+
         # Generate a sandbox id if none was provided
         if sandbox_id is None:
             sandbox_id = base62.encodebytes(os.urandom(16))
 
-        # Generate container name and session api key
         container_name = f'{self.container_name_prefix}{sandbox_id}'
+        try:
+            container = self._run_container(sandbox_spec, container_name)
+            if self.container_index is not None:
+                # Don't wait for the event, as the sandbox is looked up right away
+                self.container_index.put(container)
+            sandbox_info = await self._container_to_sandbox_info(container)
+            assert sandbox_info is not None
+        except APIError as e:
+            raise SandboxError(f'Failed to start container: {e}')
+
+        self.warm_sandbox_pool.record_start(sandbox_info.id, pooled=False)
+        return sandbox_info
+
+    def _run_container(self, sandbox_spec: SandboxSpecInfo, container_name: str):
+        """Create and start a container for the sandbox spec given, with a new
+        session api key."""
         session_api_key = base62.encodebytes(os.urandom(32))
 
         # Prepare environment variables
@@ -391,7 +480,7 @@ class DockerSandboxService(SandboxService):
 
         # Prepare labels
         labels = {
-            'sandbox_spec_id': sandbox_spec.id,
+            SANDBOX_SPEC_ID_LABEL: sandbox_spec.id,
         }
 
         # Prepare volumes
@@ -409,39 +498,99 @@ class DockerSandboxService(SandboxService):
         if self.use_host_network:
             _logger.info(f'Starting sandbox {container_name} with host network mode')
 
-        try:
-            # Create and start the container
-            container = self.docker_client.containers.run(  # type: ignore[call-overload]
-                image=sandbox_spec.id,
-                command=sandbox_spec.command,  # Use default command from image
-                remove=False,
-                name=container_name,
-                environment=env_vars,
-                ports=port_mappings,
-                volumes=volumes,
-                working_dir=sandbox_spec.working_dir,
-                labels=labels,
-                detach=True,
-                # Use Docker's tini init process to ensure proper signal handling and reaping of
-                # zombie child processes.
-                init=True,
-                # Allow agent-server containers to resolve host.docker.internal
-                # and other custom hostnames for LAN deployments
-                # Note: extra_hosts is not needed with host network mode
-                extra_hosts=self.extra_hosts
-                if self.extra_hosts and not self.use_host_network
-                else None,
-                # Network mode: 'host' for host networking, None for default bridge
-                network_mode=network_mode,
-            )
+        # Create and start the container
+        return self.docker_client.containers.run(  # type: ignore[call-overload]
+            image=sandbox_spec.id,
+            command=sandbox_spec.command,  # Use default command from image
+            remove=False,
+            name=container_name,
+            environment=env_vars,
+            ports=port_mappings,
+            volumes=volumes,
+            working_dir=sandbox_spec.working_dir,
+            labels=labels,
+            detach=True,
+            # Use Docker's tini init process to ensure proper signal handling and reaping of
+            # zombie child processes.
+            init=True,
+            # Allow agent-server containers to resolve host.docker.internal
+            # and other custom hostnames for LAN deployments
+            # Note: extra_hosts is not needed with host network mode
+            extra_hosts=self.extra_hosts
+            if self.extra_hosts and not self.use_host_network
+            else None,
+            # Network mode: 'host' for host networking, None for default bridge
+            network_mode=network_mode,
+        )
 
-            sandbox_info = await self._container_to_sandbox_info(container)
-            assert sandbox_info is not None
-            return sandbox_info
+    async def start_warm_sandbox(self, sandbox_spec_id: str) -> str:
+        """Start an idle container for the warm pool and wait for its agent server."""
+        sandbox_spec = await self.sandbox_spec_service.get_sandbox_spec(sandbox_spec_id)
+        if sandbox_spec is None:
+            raise ValueError('Sandbox Spec not found')
 
+        container_name = (
+            f'{WARM_CONTAINER_NAME_PREFIX}{self.container_name_prefix}'
+            f'{base62.encodebytes(os.urandom(16))}'
+        )
+        try:
+            container = self._run_container(sandbox_spec, container_name)
         except APIError as e:
             raise SandboxError(f'Failed to start container: {e}')
 
+        start = time.time()
+        while time.time() - start <= WARM_SANDBOX_STARTUP_TIMEOUT:
+            try:
+                container.reload()
+            except (NotFound, APIError) as e:
+                raise SandboxError(f'Warm sandbox {container_name} is missing: {e}')
+            sandbox_info = await self._container_to_checked_sandbox_info(container)
+            if sandbox_info and sandbox_info.status == SandboxStatus.RUNNING:
+                return container_name
+            if sandbox_info and sandbox_info.status == SandboxStatus.ERROR:
+                break
+            await asyncio.sleep(1)
+
+        await self.delete_warm_sandbox(container_name)
+        raise SandboxError(f'Warm sandbox failed to start: {container_name}')
+
+    async def claim_warm_sandbox(
+        self, warm_sandbox_id: str, sandbox_id: str | None
+    ) -> SandboxInfo | None:
+        """Rename an idle container from the warm pool to the sandbox id given."""
+        if sandbox_id is None:
+            sandbox_id = base62.encodebytes(os.urandom(16))
+        container_name = f'{self.container_name_prefix}{sandbox_id}'
+        try:
+            container = self.docker_client.containers.get(warm_sandbox_id)
+            if container.status != 'running':
+                return None
+            container.rename(container_name)
+            container.reload()
+        except (NotFound, APIError):
+            return None
+        if self.container_index is not None:
+            self.container_index.put(container)
+        _claimed_at[container_name] = utc_now()
+        return await self._container_to_sandbox_info(container)
+
+    async def delete_warm_sandbox(self, warm_sandbox_id: str) -> None:
+        try:
+            container = self.docker_client.containers.get(warm_sandbox_id)
+            container.remove(force=True)
+        except (NotFound, APIError):
+            pass
+
+    async def delete_stale_warm_sandboxes(self) -> None:
+        warm_prefix = f'{WARM_CONTAINER_NAME_PREFIX}{self.container_name_prefix}'
+        try:
+            containers = self.docker_client.containers.list(all=True)
+        except APIError:
+            return
+        for container in containers:
+            if container.name and container.name.startswith(warm_prefix):
+                await self.delete_warm_sandbox(container.name)
+
     async def resume_sandbox(self, sandbox_id: str) -> bool:
         """Resume a paused sandbox."""
         # Enforce sandbox limits by cleaning up old sandboxes
@@ -488,6 +637,7 @@ class DockerSandboxService(SandboxService):
 
             # Remove the container
             container.remove()
+            _claimed_at.pop(sandbox_id, None)
 
             # Remove associated volume
             try:
@@ -599,6 +749,42 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
             'is problematic. Configure via OH_SANDBOX_USE_HOST_NETWORK environment variable.'
         ),
     )
+    warm_pool_min_idle: int = Field(
+        default=0,
+        description=(
+            'The number of idle sandboxes to keep running for each sandbox spec, so '
+            'that new conversations do not wait for a sandbox to start. Idle '
+            'sandboxes do not count towards max_num_sandboxes.'
+        ),
+    )
+    warm_pool_max_idle: int = Field(
+        default=0,
+        description=(
+            'The max number of idle sandboxes for each sandbox spec. The pool grows '
+            'towards this each time it is found empty. The pool is disabled if '
+            'both this and warm_pool_min_idle are 0, or if host networking is used.'
+        ),
+    )
+    warm_pool_idle_timeout: int = Field(
+        default=DEFAULT_IDLE_TIMEOUT_SECONDS,
+        description=(
+            'Seconds after which idle sandboxes beyond warm_pool_min_idle are deleted'
+        ),
+    )
+    use_container_index: bool = Field(
+        default=True,
+        description=(
+            'Whether to keep an index of sandbox containers in memory, updated from '
+            'the docker events stream, rather than listing containers on each request'
+        ),
+    )
+    health_check_ttl_seconds: float = Field(
+        default=DEFAULT_HEALTH_CHECK_TTL_SECONDS,
+        description=(
+            'Seconds for which a successful health check of a sandbox is reused. '
+            'Only used with the container index. Set to 0 to check every time.'
+        ),
+    )
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -618,7 +804,7 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
             get_httpx_client(state) as httpx_client,
             get_sandbox_spec_service(state) as sandbox_spec_service,
         ):
-            yield DockerSandboxService(
+            service = DockerSandboxService(
                 sandbox_spec_service=sandbox_spec_service,
                 container_name_prefix=self.container_name_prefix,
                 host_port=self.host_port,
@@ -632,4 +818,32 @@ class DockerSandboxServiceInjector(SandboxServiceInjector):
                 extra_hosts=self.extra_hosts,
                 startup_grace_seconds=self.startup_grace_seconds,
                 use_host_network=self.use_host_network,
+                container_index=get_docker_container_index(
+                    get_docker_client(),
+                    self.container_name_prefix,
+                    self.health_check_ttl_seconds,
+                )
+                if self.use_container_index
+                else None,
             )
+            await self._start_warm_pool(service)
+            yield service
+
+    async def _start_warm_pool(self, service: DockerSandboxService):
+        pool = service.warm_sandbox_pool
+        if pool.running or max(self.warm_pool_min_idle, self.warm_pool_max_idle) <= 0:
+            return
+        # With host networking all sandboxes bind to the same ports
+        if self.use_host_network:
+            return
+        default_sandbox_spec = (
+            await service.sandbox_spec_service.get_default_sandbox_spec()
+        )
+        # The pool outlives the request, so it gets an http client of its own
+        pool.start(
+            replace(service, httpx_client=httpx.AsyncClient()),
+            [default_sandbox_spec.id],
+            min_idle=self.warm_pool_min_idle,
+            max_idle=self.warm_pool_max_idle,
+            idle_timeout_seconds=self.warm_pool_idle_timeout,
+        )
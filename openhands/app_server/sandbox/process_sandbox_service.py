@@ -7,13 +7,14 @@ each running within a dedicated directory.
 import asyncio
 import logging
 import os
+import shutil
 import socket
 import subprocess
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, ClassVar
 
 import base62
 import httpx
@@ -30,18 +31,30 @@ from openhands.app_server.sandbox.sandbox_models import (
     SandboxPage,
     SandboxStatus,
 )
+from openhands.app_server.sandbox.sandbox_readiness import (
+    DEFAULT_INITIAL_POLL_INTERVAL,
+    backoff_intervals,
+)
 from openhands.app_server.sandbox.sandbox_service import (
     SandboxService,
     SandboxServiceInjector,
 )
 from openhands.app_server.sandbox.sandbox_spec_models import SandboxSpecInfo
 from openhands.app_server.sandbox.sandbox_spec_service import SandboxSpecService
+from openhands.app_server.sandbox.warm_sandbox_pool import (
+    DEFAULT_IDLE_TIMEOUT_SECONDS,
+    WarmSandboxFactory,
+    WarmSandboxPool,
+    get_warm_sandbox_pool,
+)
 from openhands.app_server.services.injector import InjectorState
 from openhands.app_server.utils.docker_utils import (
     replace_localhost_hostname_for_docker,
 )
 
 _logger = logging.getLogger(__name__)
+# Working directories of idle processes in the warm pool start with this prefix
+WARM_SANDBOX_ID_PREFIX = 'warm-'
 
 
 class ProcessInfo(BaseModel):
@@ -60,10 +73,12 @@ class ProcessInfo(BaseModel):
 
 # Global store
 _processes: dict[str, ProcessInfo] = {}
+# Idle processes in the warm pool, which are not listed as sandboxes
+_warm_processes: dict[str, ProcessInfo] = {}
 
 
 @dataclass
-class ProcessSandboxService(SandboxService):
+class ProcessSandboxService(SandboxService, WarmSandboxFactory):
     """Sandbox service that spawns separate agent server processes.
 
     Each sandbox is implemented as a separate Python process running the
@@ -73,6 +88,9 @@ class ProcessSandboxService(SandboxService):
     - Having its own session API key
     """
 
+    # Polls are to a local process, so are cheap
+    initial_poll_interval: ClassVar[float | None] = DEFAULT_INITIAL_POLL_INTERVAL
+
     user_id: str | None
     sandbox_spec_service: SandboxSpecService
     base_working_dir: str
@@ -81,6 +99,10 @@ class ProcessSandboxService(SandboxService):
     agent_server_module: str
     health_check_path: str
     httpx_client: httpx.AsyncClient
+    # Shared by all services in the process. Only used once it is started.
+    warm_sandbox_pool: WarmSandboxPool = field(
+        default_factory=get_warm_sandbox_pool, kw_only=True
+    )
 
     def __post_init__(self):
         """Initialize the service after dataclass creation."""
@@ -143,10 +165,8 @@ class ProcessSandboxService(SandboxService):
                 stderr=subprocess.PIPE,
             )
 
-            # Wait a moment for the process to start
-            await asyncio.sleep(1)
-
-            # Check if process is still running
+            # Check if process failed right away. (Later failures are detected
+            # while waiting for the server to be ready)
             if process.poll() is not None:
                 stdout, stderr = process.communicate()
                 raise SandboxError(f'Agent process failed to start: {stderr.decode()}')
@@ -156,10 +176,23 @@ class ProcessSandboxService(SandboxService):
         except Exception as e:
             raise SandboxError(f'Failed to start agent process: {e}')
 
-    async def _wait_for_server_ready(self, port: int, timeout: int = 30) -> bool:
-        """Wait for the agent server to be ready."""
+    async def _wait_for_server_ready(
+        self,
+        port: int,
+        timeout: int = 30,
+        process: subprocess.Popen | None = None,
+    ) -> bool:
+        """Wait for the agent server to be ready, polling with an exponential
+        backoff. Stops waiting early if the process exits."""
+        intervals = backoff_intervals()
         start_time = time.time()
         while time.time() - start_time < timeout:
+            if process is not None and process.poll() is not None:
+                _logger.error(
+                    f'Agent process exited with code {process.returncode} '
+                    f'before it was ready'
+                )
+                return False
             try:
                 url = replace_localhost_hostname_for_docker(
                     f'http://localhost:{port}/alive'
@@ -171,7 +204,7 @@ class ProcessSandboxService(SandboxService):
                         return True
             except Exception:
                 pass
-            await asyncio.sleep(1)
+            await asyncio.sleep(next(intervals))
         return False
 
     def _get_process_status(self, process_info: ProcessInfo) -> SandboxStatus:
@@ -301,6 +334,14 @@ class ProcessSandboxService(SandboxService):
                 raise ValueError('Sandbox Spec not found')
             sandbox_spec = sandbox_spec_maybe
 
+        # Use an idle sandbox from the warm pool if there is one
+        sandbox_info = await self.warm_sandbox_pool.claim(
+            self, sandbox_spec.id, sandbox_id
+        )
+        if sandbox_info is not None:
+            self.warm_sandbox_pool.record_start(sandbox_info.id, pooled=True)
+            return sandbox_info
+
         # Generate unique sandbox ID and session API key
         # Use provided sandbox_id if available, otherwise generate a random one
         if sandbox_id is None:
@@ -335,13 +376,111 @@ class ProcessSandboxService(SandboxService):
         _processes[sandbox_id] = process_info
 
         # Wait for server to be ready
-        if not await self._wait_for_server_ready(port):
+        if not await self._wait_for_server_ready(port, process=process):
             # Clean up if server didn't start properly
             await self.delete_sandbox(sandbox_id)
             raise SandboxError('Agent Server Failed to start properly')
 
+        self.warm_sandbox_pool.record_start(sandbox_id, pooled=False)
+        return await self._process_to_sandbox_info(sandbox_id, process_info)
+
+    async def start_warm_sandbox(self, sandbox_spec_id: str) -> str:
+        """Start an idle process for the warm pool and wait for its agent server."""
+        sandbox_spec = await self.sandbox_spec_service.get_sandbox_spec(sandbox_spec_id)
+        if sandbox_spec is None:
+            raise ValueError('Sandbox Spec not found')
+
+        warm_sandbox_id = WARM_SANDBOX_ID_PREFIX + base62.encodebytes(os.urandom(16))
+        session_api_key = base62.encodebytes(os.urandom(32))
+        port = self._find_unused_port()
+        working_dir = self._create_sandbox_directory(warm_sandbox_id)
+        process = await self._start_agent_process(
+            sandbox_id=warm_sandbox_id,
+            port=port,
+            working_dir=working_dir,
+            session_api_key=session_api_key,
+            sandbox_spec=sandbox_spec,
+        )
+        _warm_processes[warm_sandbox_id] = ProcessInfo(
+            pid=process.pid,
+            port=port,
+            user_id=None,
+            working_dir=working_dir,
+            session_api_key=session_api_key,
+            created_at=utc_now(),
+            sandbox_spec_id=sandbox_spec.id,
+        )
+        if not await self._wait_for_server_ready(port, process=process):
+            await self.delete_warm_sandbox(warm_sandbox_id)
+            raise SandboxError('Agent Server Failed to start properly')
+        return warm_sandbox_id
+
+    async def claim_warm_sandbox(
+        self, warm_sandbox_id: str, sandbox_id: str | None
+    ) -> SandboxInfo | None:
+        """Move an idle process from the warm pool to the sandbox id given."""
+        process_info = _warm_processes.get(warm_sandbox_id)
+        if (
+            process_info is None
+            or self._get_process_status(process_info) != SandboxStatus.RUNNING
+        ):
+            return None
+        if sandbox_id is None:
+            sandbox_id = base62.encodebytes(os.urandom(16))
+
+        # The process keeps its working directory when it is renamed
+        working_dir = os.path.join(self.base_working_dir, sandbox_id)
+        try:
+            os.rename(process_info.working_dir, working_dir)
+        except OSError:
+            working_dir = process_info.working_dir
+
+        del _warm_processes[warm_sandbox_id]
+        process_info = process_info.model_copy(
+            update={
+                'user_id': self.user_id,
+                'working_dir': working_dir,
+                'created_at': utc_now(),
+            }
+        )
+        _processes[sandbox_id] = process_info
         return await self._process_to_sandbox_info(sandbox_id, process_info)
 
+    async def delete_warm_sandbox(self, warm_sandbox_id: str) -> None:
+        process_info = _warm_processes.pop(warm_sandbox_id, None)
+        if process_info is None:
+            return
+        try:
+            self._terminate_process(process_info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError) as e:
+            _logger.warning(f'Error deleting warm sandbox {warm_sandbox_id}: {e}')
+
+    async def delete_stale_warm_sandboxes(self) -> None:
+        # Idle processes are only tracked in memory, so all that is left over
+        # from a previous run of the server are their working directories
+        for name in os.listdir(self.base_working_dir):
+            if name.startswith(WARM_SANDBOX_ID_PREFIX) and name not in _warm_processes:
+                shutil.rmtree(
+                    os.path.join(self.base_working_dir, name), ignore_errors=True
+                )
+
+    def _terminate_process(self, process_info: ProcessInfo):
+        """Terminate the process and remove its working directory."""
+        process = psutil.Process(process_info.pid)
+        if process.is_running():
+            # Try graceful termination first
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except psutil.TimeoutExpired:
+                # Force kill if graceful termination fails
+                process.kill()
+                process.wait(timeout=5)
+
+        # Clean up the working directory
+        if os.path.exists(process_info.working_dir):
+            shutil.rmtree(process_info.working_dir, ignore_errors=True)
+
     async def resume_sandbox(self, sandbox_id: str) -> bool:
         """Resume a paused sandbox."""
         process_info = _processes.get(sandbox_id)
@@ -378,22 +517,7 @@ class ProcessSandboxService(SandboxService):
 
         try:
             # Terminate the process
-            process = psutil.Process(process_info.pid)
-            if process.is_running():
-                # Try graceful termination first
-                process.terminate()
-                try:
-                    process.wait(timeout=10)
-                except psutil.TimeoutExpired:
-                    # Force kill if graceful termination fails
-                    process.kill()
-                    process.wait(timeout=5)
-
-            # Clean up the working directory
-            import shutil
-
-            if os.path.exists(process_info.working_dir):
-                shutil.rmtree(process_info.working_dir, ignore_errors=True)
+            self._terminate_process(process_info)
 
             # Remove from our tracking
             del _processes[sandbox_id]
@@ -429,6 +553,27 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
     health_check_path: str = Field(
         default='/alive', description='Health check endpoint path'
     )
+    warm_pool_min_idle: int = Field(
+        default=0,
+        description=(
+            'The number of idle agent server processes to keep running for each '
+            'sandbox spec, so that new conversations do not wait for one to start'
+        ),
+    )
+    warm_pool_max_idle: int = Field(
+        default=0,
+        description=(
+            'The max number of idle agent server processes for each sandbox spec. '
+            'The pool grows towards this each time it is found empty. The pool is '
+            'disabled if both this and warm_pool_min_idle are 0.'
+        ),
+    )
+    warm_pool_idle_timeout: int = Field(
+        default=DEFAULT_IDLE_TIMEOUT_SECONDS,
+        description=(
+            'Seconds after which idle processes beyond warm_pool_min_idle are deleted'
+        ),
+    )
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -446,7 +591,7 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
             get_user_context(state, request) as user_context,
         ):
             user_id = await user_context.get_user_id()
-            yield ProcessSandboxService(
+            service = ProcessSandboxService(
                 user_id=user_id,
                 sandbox_spec_service=sandbox_spec_service,
                 base_working_dir=self.base_working_dir,
@@ -456,3 +601,21 @@ class ProcessSandboxServiceInjector(SandboxServiceInjector):
                 health_check_path=self.health_check_path,
                 httpx_client=httpx_client,
             )
+            await self._start_warm_pool(service)
+            yield service
+
+    async def _start_warm_pool(self, service: ProcessSandboxService):
+        pool = service.warm_sandbox_pool
+        if pool.running or max(self.warm_pool_min_idle, self.warm_pool_max_idle) <= 0:
+            return
+        default_sandbox_spec = (
+            await service.sandbox_spec_service.get_default_sandbox_spec()
+        )
+        # The pool outlives the request, so it gets an http client of its own
+        pool.start(
+            replace(service, user_id=None, httpx_client=httpx.AsyncClient()),
+            [default_sandbox_spec.id],
+            min_idle=self.warm_pool_min_idle,
+            max_idle=self.warm_pool_max_idle,
+            idle_timeout_seconds=self.warm_pool_idle_timeout,
+        )
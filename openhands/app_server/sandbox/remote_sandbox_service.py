@@ -47,7 +47,6 @@ from openhands.app_server.services.injector import InjectorState
 from openhands.app_server.user.specifiy_user_context import ADMIN, USER_CONTEXT_ATTR
 from openhands.app_server.user.user_context import UserContext
 from openhands.app_server.utils.sql_utils import Base, UtcDateTime
-from openhands.sdk.utils.paging import page_iterator
 
 _logger = logging.getLogger(__name__)
 polling_task: asyncio.Task | None = None
@@ -607,15 +606,19 @@ def _build_service_url(url: str, service_name: str):
     return scheme + '://' + service_name + '-' + host_and_path
 
 
-async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
+async def poll_agent_servers(
+    api_url: str,
+    api_key: str,
+    sleep_interval: int,
+    max_concurrent_refreshes: int = 10,
+    refresh_timeout: float = 60,
+):
     """When the app server does not have a public facing url, we poll the agent
     servers for the most recent data.
 
     This is because webhook callbacks cannot be invoked."""
     from openhands.app_server.config import (
         get_app_conversation_info_service,
-        get_event_callback_service,
-        get_event_service,
         get_httpx_client,
     )
 
@@ -643,34 +646,36 @@ async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
 
                 # We allow access to all items here
                 setattr(state, USER_CONTEXT_ATTR, ADMIN)
-                async with (
-                    get_app_conversation_info_service(
+                matches: list[tuple[AppConversationInfo, dict[str, Any]]] = []
+                if runtimes_by_sandbox_id:
+                    # Only load the conversations in running sandboxes, rather than
+                    # every conversation ever created
+                    async with get_app_conversation_info_service(
                         state
-                    ) as app_conversation_info_service,
-                    get_event_service(state) as event_service,
-                    get_event_callback_service(state) as event_callback_service,
-                    get_httpx_client(state) as httpx_client,
-                ):
-                    matches = 0
-                    async for app_conversation_info in page_iterator(
-                        app_conversation_info_service.search_app_conversation_info
-                    ):
-                        runtime = runtimes_by_sandbox_id.get(
-                            app_conversation_info.sandbox_id
+                    ) as app_conversation_info_service:
+                        app_conversation_infos = await app_conversation_info_service.get_app_conversation_info_by_sandbox_ids(
+                            list(runtimes_by_sandbox_id)
                         )
-                        if runtime:
-                            matches += 1
-                            await refresh_conversation(
-                                app_conversation_info_service=app_conversation_info_service,
-                                event_service=event_service,
-                                event_callback_service=event_callback_service,
-                                app_conversation_info=app_conversation_info,
-                                runtime=runtime,
-                                httpx_client=httpx_client,
-                            )
-                    _logger.debug(
-                        f'Matched {len(runtimes_by_sandbox_id)} Runtimes with {matches} Conversations.'
-                    )
+                    matches = [
+                        (
+                            app_conversation_info,
+                            runtimes_by_sandbox_id[app_conversation_info.sandbox_id],
+                        )
+                        for app_conversation_info in app_conversation_infos
+                    ]
+
+                semaphore = asyncio.Semaphore(max_concurrent_refreshes)
+                await asyncio.gather(
+                    *[
+                        _refresh_conversation_with_semaphore(
+                            semaphore, app_conversation_info, runtime, refresh_timeout
+                        )
+                        for app_conversation_info, runtime in matches
+                    ]
+                )
+                _logger.debug(
+                    f'Matched {len(runtimes_by_sandbox_id)} Runtimes with {len(matches)} Conversations.'
+                )
 
             except Exception as exc:
                 _logger.exception(
@@ -684,6 +689,49 @@ async def poll_agent_servers(api_url: str, api_key: str, sleep_interval: int):
             return
 
 
+async def _refresh_conversation_with_semaphore(
+    semaphore: asyncio.Semaphore,
+    app_conversation_info: AppConversationInfo,
+    runtime: dict[str, Any],
+    refresh_timeout: float,
+):
+    """Refresh a conversation once the semaphore allows. Each refresh gets its own
+    services, as a db session may not be shared between concurrent tasks, and is
+    cut short after the timeout given so that an unresponsive runtime does not
+    hold up the poll."""
+    from openhands.app_server.config import (
+        get_app_conversation_info_service,
+        get_event_callback_service,
+        get_event_service,
+        get_httpx_client,
+    )
+
+    async with semaphore:
+        state = InjectorState()
+        setattr(state, USER_CONTEXT_ATTR, ADMIN)
+        async with (
+            get_app_conversation_info_service(state) as app_conversation_info_service,
+            get_event_service(state) as event_service,
+            get_event_callback_service(state) as event_callback_service,
+            get_httpx_client(state) as httpx_client,
+        ):
+            try:
+                async with asyncio.timeout(refresh_timeout):
+                    await refresh_conversation(
+                        app_conversation_info_service=app_conversation_info_service,
+                        event_service=event_service,
+                        event_callback_service=event_callback_service,
+                        app_conversation_info=app_conversation_info,
+                        runtime=runtime,
+                        httpx_client=httpx_client,
+                    )
+            except TimeoutError:
+                _logger.warning(
+                    f'Timed out refreshing conversation {app_conversation_info.id} '
+                    f'in runtime {runtime["session_id"]}'
+                )
+
+
 async def refresh_conversation(
     app_conversation_info_service: AppConversationInfoService,
     event_service: EventService,
@@ -694,8 +742,8 @@ async def refresh_conversation(
 ):
     """Refresh a conversation.
 
-    Grab ConversationInfo and all events from the agent server and make sure they
-    exist in the app server."""
+    Grab ConversationInfo and any events newer than the last sync from the agent
+    server and make sure they exist in the app server."""
     _logger.debug(f'Started Refreshing Conversation {app_conversation_info.id}')
     try:
         url = runtime['url']
@@ -729,33 +777,27 @@ async def refresh_conversation(
             app_conversation_info
         )
 
-        # TODO: It would be nice to have an updated_at__gte filter parameter in the
-        # agent server so that we don't pull the full event list each time
-        event_url = (
-            f'{url}/api/conversations/{app_conversation_info.id.hex}/events/search'
-        )
-
-        async def fetch_events_page(page_id: str | None = None) -> EventPage:
-            """Helper function to fetch a page of events from the agent server."""
-            params: dict[str, str] = {}
-            if page_id:
-                params['page_id'] = page_id
-            response = await httpx_client.get(
-                event_url,
-                params=params,
-                headers={'X-Session-API-Key': runtime['session_api_key']},
-            )
-            response.raise_for_status()
-            return EventPage.model_validate(response.json())
-
-        async for event in page_iterator(fetch_events_page):
-            existing = await event_service.get_event(
-                app_conversation_info.id, UUID(event.id)
+        last_synced_event_timestamp = app_conversation_info.last_synced_event_timestamp
+        try:
+            await _sync_events(
+                event_service=event_service,
+                event_callback_service=event_callback_service,
+                app_conversation_info=app_conversation_info,
+                runtime=runtime,
+                httpx_client=httpx_client,
             )
-            if existing is None:
-                await event_service.save_event(app_conversation_info.id, event)
-                await event_callback_service.execute_callbacks(
-                    app_conversation_info.id, event
+        finally:
+            # Only the high water mark is updated, as callbacks may have modified the
+            # conversation info while syncing. It is updated even if syncing failed
+            # part way so that the pages which were synced are not fetched again.
+            if (
+                app_conversation_info.last_synced_event_timestamp
+                and app_conversation_info.last_synced_event_timestamp
+                != last_synced_event_timestamp
+            ):
+                await app_conversation_info_service.update_last_synced_event_timestamp(
+                    app_conversation_info.id,
+                    app_conversation_info.last_synced_event_timestamp,
                 )
 
         _logger.debug(f'Finished Refreshing Conversation {app_conversation_info.id}')
@@ -764,6 +806,62 @@ async def refresh_conversation(
         _logger.exception(f'Error Refreshing Conversation: {exc}', stack_info=True)
 
 
+async def _sync_events(
+    event_service: EventService,
+    event_callback_service: EventCallbackService,
+    app_conversation_info: AppConversationInfo,
+    runtime: dict[str, Any],
+    httpx_client: httpx.AsyncClient,
+):
+    """Pull events from the agent server which are not older than the high water
+    mark, saving any which do not yet exist and advancing the high water mark.
+
+    Events sharing the high water mark timestamp are fetched again, so existence is
+    still checked - but only for one page at a time in bulk."""
+    url = runtime['url']
+    event_url = f'{url}/api/conversations/{app_conversation_info.id.hex}/events/search'
+    # The filter must stay the same while paging, as page ids are offsets into it
+    search_params: dict[str, str] = {}
+    if app_conversation_info.last_synced_event_timestamp:
+        search_params['timestamp__gte'] = (
+            app_conversation_info.last_synced_event_timestamp
+        )
+    page_id = None
+    while True:
+        params = dict(search_params)
+        if page_id:
+            params['page_id'] = page_id
+        response = await httpx_client.get(
+            event_url,
+            params=params,
+            headers={'X-Session-API-Key': runtime['session_api_key']},
+        )
+        response.raise_for_status()
+        page = EventPage.model_validate(response.json())
+        if not page.items:
+            return
+
+        existing_events = await event_service.batch_get_events(
+            app_conversation_info.id, [UUID(event.id) for event in page.items]
+        )
+        new_events = [
+            event
+            for event, existing in zip(page.items, existing_events, strict=True)
+            if existing is None
+        ]
+        if new_events:
+            await event_service.save_events(app_conversation_info.id, new_events)
+            await event_callback_service.batch_execute_callbacks(
+                app_conversation_info.id, new_events
+            )
+
+        # Events are returned in ascending timestamp order
+        app_conversation_info.last_synced_event_timestamp = page.items[-1].timestamp
+        page_id = page.next_page_id
+        if not page_id:
+            return
+
+
 class RemoteSandboxServiceInjector(SandboxServiceInjector):
     """Dependency injector for remote sandbox services."""
 
@@ -795,6 +893,20 @@ class RemoteSandboxServiceInjector(SandboxServiceInjector):
         default=10,
         description='Maximum number of sandboxes allowed to run simultaneously',
     )
+    max_concurrent_refreshes: int = Field(
+        default=10,
+        description=(
+            'The max number of conversations refreshed concurrently when polling '
+            'agent servers'
+        ),
+    )
+    refresh_timeout: float = Field(
+        default=60,
+        description=(
+            'The max seconds spent refreshing a conversation from its runtime when '
+            'polling agent servers'
+        ),
+    )
 
     async def inject(
         self, state: InjectorState, request: Request | None = None
@@ -820,6 +932,8 @@ class RemoteSandboxServiceInjector(SandboxServiceInjector):
                         api_url=self.api_url,
                         api_key=self.api_key,
                         sleep_interval=self.polling_interval,
+                        max_concurrent_refreshes=self.max_concurrent_refreshes,
+                        refresh_timeout=self.refresh_timeout,
                     )
                 )
         async with (
@@ -0,0 +1,24 @@
+"""Intervals between polls for code waiting on sandboxes to be ready.
+
+Waiting for a sandbox used to mean polling it at a fixed interval, so every start
+was delayed by up to a full interval after the agent server came up. Where polls
+are cheap (A local process or container), waiters poll with an exponential
+backoff starting with a short delay instead.
+"""
+
+from typing import Iterator
+
+DEFAULT_INITIAL_POLL_INTERVAL = 0.05
+DEFAULT_MAX_POLL_INTERVAL = 0.5
+
+
+def backoff_intervals(
+    initial: float = DEFAULT_INITIAL_POLL_INTERVAL,
+    maximum: float = DEFAULT_MAX_POLL_INTERVAL,
+    factor: float = 1.5,
+) -> Iterator[float]:
+    """Yield intervals between polls, growing from initial up to maximum."""
+    interval = min(initial, maximum)
+    while True:
+        yield interval
+        interval = min(interval * factor, maximum)
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
+from typing import ClassVar
 
 import httpx
 
@@ -12,6 +13,7 @@ from openhands.app_server.sandbox.sandbox_models import (
     SandboxPage,
     SandboxStatus,
 )
+from openhands.app_server.sandbox.sandbox_readiness import backoff_intervals
 from openhands.app_server.services.injector import Injector
 from openhands.app_server.utils.docker_utils import (
     replace_localhost_hostname_for_docker,
@@ -29,6 +31,11 @@ ALLOW_CORS_ORIGINS_VARIABLE = 'OH_ALLOW_CORS_ORIGINS_0'
 class SandboxService(ABC):
     """Service for accessing sandboxes in which conversations may be run."""
 
+    # Interval before the first poll while waiting for a sandbox to start, from
+    # which polls back off. None to poll at a fixed interval, where each poll is
+    # a request to a remote API shared by every sandbox which is starting.
+    initial_poll_interval: ClassVar[float | None] = None
+
     @abstractmethod
     async def search_sandboxes(
         self,
@@ -85,12 +92,14 @@ class SandboxService(ABC):
         """Wait for a sandbox to reach RUNNING status with an alive agent server.
 
         This method polls the sandbox status until it reaches RUNNING state and
-        optionally verifies the agent server is responding to health checks.
+        optionally verifies the agent server is responding to health checks. For
+        services with an initial_poll_interval, polls back off exponentially from
+        it up to poll_interval.
 
         Args:
             sandbox_id: The sandbox ID to wait for
             timeout: Maximum time to wait in seconds (default: 120)
-            poll_interval: Time between status checks in seconds (default: 2)
+            poll_interval: (Max) time between status checks in seconds (default: 2)
             httpx_client: Optional httpx client for agent server health checks.
                 If provided, will verify the agent server /alive endpoint responds
                 before returning.
@@ -101,6 +110,9 @@ class SandboxService(ABC):
         Raises:
             SandboxError: If sandbox not found, enters ERROR state, or times out
         """
+        intervals = backoff_intervals(
+            initial=self.initial_poll_interval or poll_interval, maximum=poll_interval
+        )
         start = time.time()
         while time.time() - start <= timeout:
             sandbox = await self.get_sandbox(sandbox_id)
@@ -120,7 +132,7 @@ class SandboxService(ABC):
                 else:
                     return sandbox
 
-            await asyncio.sleep(poll_interval)
+            await asyncio.sleep(next(intervals))
 
         raise SandboxError(f'Sandbox failed to start within {timeout}s: {sandbox_id}')
 
@@ -0,0 +1,322 @@
+"""Process-wide pool of idle sandboxes, kept running so that new conversations
+don't have to wait for a sandbox and its agent server to start.
+
+Sandbox services are created for each request, so the pool lives at module level
+and is maintained by a background task which uses a long lived sandbox service
+of its own. Idle sandboxes are kept for each sandbox spec. When a sandbox is
+requested, an idle one is claimed if there is one: it is given the id requested
+along with the user, and its session API key (Which was generated when it was
+started and was never handed out before) becomes the key of the sandbox.
+
+The pool keeps at least min_idle sandboxes for each spec. Each time the pool is
+found empty the number kept grows by one, up to max_idle, and sandboxes which
+have been idle for longer than the idle timeout are reaped, shrinking the pool
+back towards min_idle.
+
+The hit rate of the pool and the mean time to first event of pooled and cold
+sandboxes are logged periodically by the background task.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Coroutine
+
+from openhands.app_server.sandbox.sandbox_models import SandboxInfo
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT_SECONDS = 30 * 60
+DEFAULT_MAINTENANCE_INTERVAL_SECONDS = 30
+DEFAULT_STATS_LOG_INTERVAL_SECONDS = 5 * 60
+# The max number of started sandboxes waiting for their first event
+_MAX_PENDING_FIRST_EVENTS = 1000
+_MAX_TIME_TO_FIRST_EVENT_SAMPLES = 1000
+
+
+class WarmSandboxFactory(ABC):
+    """Implemented by sandbox services which support a warm pool."""
+
+    @abstractmethod
+    async def start_warm_sandbox(self, sandbox_spec_id: str) -> str:
+        """Start an idle sandbox and wait for its agent server to be running.
+
+        Return an id for the idle sandbox, which is not listed by the service.
+        """
+
+    @abstractmethod
+    async def claim_warm_sandbox(
+        self, warm_sandbox_id: str, sandbox_id: str | None
+    ) -> SandboxInfo | None:
+        """Turn the idle sandbox given into a sandbox of the service, using the
+        sandbox id given (Or a generated one). Return None if the idle sandbox is
+        no longer available, in which case it should be deleted."""
+
+    @abstractmethod
+    async def delete_warm_sandbox(self, warm_sandbox_id: str) -> None:
+        """Delete an idle sandbox."""
+
+    @abstractmethod
+    async def delete_stale_warm_sandboxes(self) -> None:
+        """Delete idle sandboxes left over from a previous run of the server."""
+
+
+@dataclass
+class WarmSandbox:
+    id: str
+    sandbox_spec_id: str
+    idle_since: float
+
+
+@dataclass
+class WarmSandboxPoolStats:
+    hits: int = 0
+    misses: int = 0
+    idle: int = 0
+    starting: int = 0
+    # Mean seconds from a sandbox being requested to its first event
+    pooled_time_to_first_event: float | None = None
+    cold_time_to_first_event: float | None = None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _mean(samples: deque[float]) -> float | None:
+    return sum(samples) / len(samples) if samples else None
+
+
+class WarmSandboxPool:
+    def __init__(self):
+        self.min_idle = 0
+        self.max_idle = 0
+        self.idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS
+        self.maintenance_interval_seconds: float = DEFAULT_MAINTENANCE_INTERVAL_SECONDS
+        self.stats_log_interval_seconds: float = DEFAULT_STATS_LOG_INTERVAL_SECONDS
+        self._stats_logged_at = time.monotonic()
+        self._factory: WarmSandboxFactory | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        # Idle sandboxes for each spec, longest idle first
+        self._idle: dict[str, deque[WarmSandbox]] = defaultdict(deque)
+        self._targets: dict[str, int] = {}
+        self._starting: dict[str, int] = defaultdict(int)
+        self._hits = 0
+        self._misses = 0
+        # sandbox id -> (time requested, whether it came from the pool)
+        self._pending_first_events: OrderedDict[str, tuple[float, bool]] = OrderedDict()
+        self._pooled_time_to_first_event: deque[float] = deque(
+            maxlen=_MAX_TIME_TO_FIRST_EVENT_SAMPLES
+        )
+        self._cold_time_to_first_event: deque[float] = deque(
+            maxlen=_MAX_TIME_TO_FIRST_EVENT_SAMPLES
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self,
+        factory: WarmSandboxFactory,
+        sandbox_spec_ids: list[str],
+        min_idle: int,
+        max_idle: int,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+        maintenance_interval_seconds: float = DEFAULT_MAINTENANCE_INTERVAL_SECONDS,
+    ):
+        """Start maintaining the pool in the background, using the factory given
+        (Which should not be bound to a request). Does nothing if already running."""
+        if self.running:
+            return
+        self.min_idle = min_idle
+        self.max_idle = max(min_idle, max_idle)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+        self._factory = factory
+        self._wakeup = asyncio.Event()
+        for sandbox_spec_id in sandbox_spec_ids:
+            self._targets.setdefault(sandbox_spec_id, self.min_idle)
+        self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self):
+        """Stop maintaining the pool and delete all idle sandboxes."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        factory = self._factory
+        for idle in self._idle.values():
+            while idle:
+                warm_sandbox = idle.popleft()
+                if factory is not None:
+                    await self._delete(factory, warm_sandbox)
+        self._targets.clear()
+
+    async def claim(
+        self,
+        factory: WarmSandboxFactory,
+        sandbox_spec_id: str,
+        sandbox_id: str | None,
+    ) -> SandboxInfo | None:
+        """Claim an idle sandbox for the spec given using the factory given (Which
+        may be bound to the current request). Return None if there was none."""
+        if not self.running or self.max_idle <= 0:
+            return None
+        idle = self._idle[sandbox_spec_id]
+        while idle:
+            warm_sandbox = idle.popleft()
+            try:
+                sandbox_info = await factory.claim_warm_sandbox(
+                    warm_sandbox.id, sandbox_id
+                )
+            except Exception:
+                _logger.exception(
+                    f'Error claiming warm sandbox {warm_sandbox.id}', stack_info=True
+                )
+                sandbox_info = None
+            if sandbox_info is None:
+                await self._delete(factory, warm_sandbox)
+                continue
+            self._hits += 1
+            self._wake()
+            return sandbox_info
+
+        # The pool was empty, so grow it for next time
+        self._misses += 1
+        target = self._targets.get(sandbox_spec_id, self.min_idle)
+        self._targets[sandbox_spec_id] = min(max(target + 1, 1), self.max_idle)
+        self._wake()
+        return None
+
+    def record_start(self, sandbox_id: str, pooled: bool):
+        """Record that a sandbox was requested, for the time to first event."""
+        self._pending_first_events[sandbox_id] = (time.monotonic(), pooled)
+        while len(self._pending_first_events) > _MAX_PENDING_FIRST_EVENTS:
+            self._pending_first_events.popitem(last=False)
+
+    def record_first_event(self, sandbox_id: str):
+        """Record that an event was received from a sandbox. Only the first event
+        after the sandbox was requested is measured."""
+        pending = self._pending_first_events.pop(sandbox_id, None)
+        if pending is None:
+            return
+        started_at, pooled = pending
+        samples = (
+            self._pooled_time_to_first_event
+            if pooled
+            else self._cold_time_to_first_event
+        )
+        samples.append(time.monotonic() - started_at)
+
+    def stats(self) -> WarmSandboxPoolStats:
+        return WarmSandboxPoolStats(
+            hits=self._hits,
+            misses=self._misses,
+            idle=sum(len(idle) for idle in self._idle.values()),
+            starting=sum(self._starting.values()),
+            pooled_time_to_first_event=_mean(self._pooled_time_to_first_event),
+            cold_time_to_first_event=_mean(self._cold_time_to_first_event),
+        )
+
+    def log_stats(self):
+        stats = self.stats()
+        _logger.info(
+            'warm_sandbox_pool_stats',
+            extra={**asdict(stats), 'hit_rate': stats.hit_rate},
+        )
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _maintain(self):
+        assert self._factory is not None and self._wakeup is not None
+        try:
+            await self._factory.delete_stale_warm_sandboxes()
+        except Exception:
+            _logger.exception('Error deleting stale warm sandboxes', stack_info=True)
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._reap(self._factory)
+                await self._replenish(self._factory)
+            except Exception:
+                _logger.exception(
+                    'Error maintaining warm sandbox pool', stack_info=True
+                )
+            now = time.monotonic()
+            if now - self._stats_logged_at >= self.stats_log_interval_seconds:
+                self._stats_logged_at = now
+                self.log_stats()
+            try:
+                async with asyncio.timeout(self.maintenance_interval_seconds):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    async def _reap(self, factory: WarmSandboxFactory):
+        now = time.monotonic()
+        for sandbox_spec_id, idle in self._idle.items():
+            target = self._targets.get(sandbox_spec_id, self.min_idle)
+            while idle and (
+                len(idle) > self.max_idle
+                or (
+                    len(idle) > self.min_idle
+                    and idle[0].idle_since + self.idle_timeout_seconds <= now
+                )
+            ):
+                await self._delete(factory, idle.popleft())
+                target -= 1
+            self._targets[sandbox_spec_id] = max(target, self.min_idle)
+
+    async def _replenish(self, factory: WarmSandboxFactory):
+        starts: list[Coroutine[Any, Any, None]] = []
+        for sandbox_spec_id, target in self._targets.items():
+            num_missing = (
+                target
+                - len(self._idle[sandbox_spec_id])
+                - self._starting[sandbox_spec_id]
+            )
+            starts.extend(
+                self._start(factory, sandbox_spec_id) for _ in range(num_missing)
+            )
+        if starts:
+            await asyncio.gather(*starts)
+
+    async def _start(self, factory: WarmSandboxFactory, sandbox_spec_id: str):
+        self._starting[sandbox_spec_id] += 1
+        try:
+            warm_sandbox_id = await factory.start_warm_sandbox(sandbox_spec_id)
+            self._idle[sandbox_spec_id].append(
+                WarmSandbox(warm_sandbox_id, sandbox_spec_id, time.monotonic())
+            )
+        except Exception:
+            _logger.exception(
+                f'Error starting warm sandbox for {sandbox_spec_id}', stack_info=True
+            )
+        finally:
+            self._starting[sandbox_spec_id] -= 1
+
+    async def _delete(self, factory: WarmSandboxFactory, warm_sandbox: WarmSandbox):
+        try:
+            await factory.delete_warm_sandbox(warm_sandbox.id)
+        except Exception:
+            _logger.exception(
+                f'Error deleting warm sandbox {warm_sandbox.id}', stack_info=True
+            )
+
+
+_warm_sandbox_pool = WarmSandboxPool()
+
+
+def get_warm_sandbox_pool() -> WarmSandboxPool:
+    return _warm_sandbox_pool
@@ -27,7 +27,7 @@ from openhands.events.action import (
 from openhands.events.action.agent import AgentFinishAction
 from openhands.events.event import Event, EventSource
 from openhands.llm.metrics import Metrics
-from openhands.memory.view import View
+from openhands.memory.view import View, ViewBuilder
 from openhands.server.services.conversation_stats import ConversationStats
 from openhands.storage.files import FileStore
 from openhands.storage.locations import get_conversation_agent_state_filename
@@ -200,10 +200,9 @@ class State:
         state = self.__dict__.copy()
         state['history'] = []
 
-        # Remove any view caching attributes. They'll be rebuilt frmo the
-        # history after that gets reloaded.
-        state.pop('_history_checksum', None)
-        state.pop('_view', None)
+        # Remove the view builder. The view will be rebuilt from the history
+        # after that gets reloaded.
+        state.pop('_view_builder', None)
 
         # Remove deprecated fields before pickling
         state.pop('iteration', None)
@@ -304,15 +303,9 @@ class State:
 
     @property
     def view(self) -> View:
-        # Compute a simple checksum from the history to see if we can re-use any
-        # cached view.
-        history_checksum = len(self.history)
-        old_history_checksum = getattr(self, '_history_checksum', -1)
-
-        # If the history has changed, we need to re-create the view and update
-        # the caching.
-        if history_checksum != old_history_checksum:
-            self._history_checksum = history_checksum
-            self._view = View.from_events(self.history)
-
-        return self._view
+        # The view is updated incrementally as events are appended to the
+        # history, and the same view is returned while the history is unchanged.
+        view_builder = getattr(self, '_view_builder', None)
+        if view_builder is None:
+            view_builder = self._view_builder = ViewBuilder()
+        return view_builder.update(self.history)
@@ -5,8 +5,9 @@
 #   - V1 application server (in this repo): openhands/app_server/
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
-from dataclasses import dataclass
-from typing import Optional
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Hashable, Optional, Sequence, overload
 
 from openhands.controller.state.state import State
 from openhands.core.logger import openhands_logger as logger
@@ -25,6 +26,155 @@ from openhands.events.observation.error import ErrorObservation
 from openhands.events.observation.observation import Observation
 
 
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        # objects (e.g.: dataclasses, pydantic models) compare by their attributes
+        if hasattr(value, '__dict__'):
+            return (type(value), _freeze(vars(value)))
+        return (type(value), repr(value))
+    return value
+
+
+def _fingerprint(event: Event) -> Hashable:
+    """A hashable key which is the same for events that compare equal."""
+    return (
+        type(event),
+        tuple(_freeze(getattr(event, f.name)) for f in fields(event) if f.compare),
+    )
+
+
+class _FilteredHistory(Sequence[Event]):
+    """The filtered history checked for loops, with rolling state for each check.
+
+    The last few actions, observations, agent messages and condensations are
+    kept in bounded ring buffers as events are appended, so the checks don't
+    scan the whole history. The first index of each action is kept by its
+    fingerprint, indexed when a loop is found, so finding where it started
+    doesn't either.
+    """
+
+    def __init__(self, offset: int = 0):
+        # index in the full history of the first event considered
+        self.offset = offset
+        self._events: list[Event] = []
+        self.actions: deque[int] = deque(maxlen=6)
+        self.observations: deque[int] = deque(maxlen=6)
+        # (index, number of observations before it) of the last agent messages
+        self.agent_messages: deque[tuple[int, int]] = deque(maxlen=3)
+        self.condensations: deque[int] = deque(maxlen=10)
+        self.observation_count = 0
+        self._first_action_indices: dict[Hashable, list[int]] = {}
+        self._indexed = 0
+
+    @classmethod
+    def from_events(cls, events: Sequence[Event]) -> '_FilteredHistory':
+        if isinstance(events, _FilteredHistory):
+            return events
+        history = cls()
+        for event in events:
+            history.append(event)
+        return history
+
+    def append(self, event: Event) -> None:
+        index = len(self._events)
+        self._events.append(event)
+        if isinstance(event, Action):
+            self.actions.append(index)
+            if isinstance(event, MessageAction) and event.source == EventSource.AGENT:
+                self.agent_messages.append((index, self.observation_count))
+        elif isinstance(event, Observation):
+            self.observations.append(index)
+            self.observation_count += 1
+            if isinstance(event, AgentCondensationObservation):
+                self.condensations.append(index)
+
+    def last_actions(self, count: int) -> list[Event]:
+        """The last actions, most recent first."""
+        return [self._events[i] for i in reversed(self.actions)][:count]
+
+    def last_observations(self, count: int) -> list[Event]:
+        """The last observations, most recent first."""
+        return [self._events[i] for i in reversed(self.observations)][:count]
+
+    def _index_actions(self) -> None:
+        for index in range(self._indexed, len(self._events)):
+            event = self._events[index]
+            if isinstance(event, Action):
+                # only the first of the events which compare equal is indexed
+                indices = self._first_action_indices.setdefault(_fingerprint(event), [])
+                if not any(self._events[i] == event for i in indices):
+                    indices.append(index)
+        self._indexed = len(self._events)
+
+    def index(self, value: Any, start: int = 0, stop: int | None = None) -> int:
+        if isinstance(value, Action) and start == 0 and stop is None:
+            self._index_actions()
+            for i in self._first_action_indices.get(_fingerprint(value), []):
+                if self._events[i] == value:
+                    return i
+        return self._events.index(value, start, len(self) if stop is None else stop)
+
+    @overload
+    def __getitem__(self, index: int) -> Event: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Event]: ...
+
+    def __getitem__(self, index: int | slice) -> Event | list[Event]:
+        return self._events[index]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class _HistoryTracker:
+    """Keeps the filtered history up to date as the state history grows."""
+
+    def __init__(self, headless_mode: bool):
+        self.headless_mode = headless_mode
+        self.filtered_history = _FilteredHistory()
+        self._history: list[Event] | None = None
+        self._seen = 0
+        self._last_seen: Event | None = None
+
+    def update(self, history: list[Event]) -> _FilteredHistory:
+        if (
+            history is not self._history
+            or len(history) < self._seen
+            or (self._seen and history[self._seen - 1] is not self._last_seen)
+        ):
+            # the history was replaced or truncated, start over
+            self.filtered_history = _FilteredHistory()
+            self._history = history
+            self._seen = 0
+
+        for index in range(self._seen, len(history)):
+            self._add(index, history[index])
+        self._seen = len(history)
+        self._last_seen = history[-1] if history else None
+        return self.filtered_history
+
+    def _add(self, index: int, event: Event) -> None:
+        # Filter out user messages and null events
+        if isinstance(event, MessageAction) and event.source == EventSource.USER:
+            if not self.headless_mode:
+                # In interactive mode, only look at history after the last user message
+                self.filtered_history = _FilteredHistory(offset=index + 1)
+            return
+        # there might be some NullAction or NullObservation in the history at least for now
+        if isinstance(event, (NullAction, NullObservation)):
+            return
+        self.filtered_history.append(event)
+
+
 class StuckDetector:
     SYNTAX_ERROR_MESSAGES = [
         'SyntaxError: unterminated string literal (detected at line',
@@ -41,6 +191,15 @@ class StuckDetector:
     def __init__(self, state: State):
         self.state = state
         self.stuck_analysis: Optional[StuckDetector.StuckAnalysis] = None
+        self._trackers: dict[bool, _HistoryTracker] = {}
+
+    def _update(self, headless_mode: bool) -> _FilteredHistory:
+        # Catch up with the events added to the history since the last check, so
+        # each check only looks at those. Not thread safe.
+        tracker = self._trackers.get(headless_mode)
+        if tracker is None:
+            tracker = self._trackers[headless_mode] = _HistoryTracker(headless_mode)
+        return tracker.update(self.state.history)
 
     def is_stuck(self, headless_mode: bool = True) -> bool:
         """Checks if the agent is stuck in a loop.
@@ -53,36 +212,8 @@ class StuckDetector:
         Returns:
             bool: True if the agent is stuck in a loop, False otherwise.
         """
-        filtered_history_offset = 0
-        if not headless_mode:
-            # In interactive mode, only look at history after the last user message
-            last_user_msg_idx = -1
-            for i, event in enumerate(reversed(self.state.history)):
-                if (
-                    isinstance(event, MessageAction)
-                    and event.source == EventSource.USER
-                ):
-                    last_user_msg_idx = len(self.state.history) - i - 1
-                    break
-            filtered_history_offset = last_user_msg_idx + 1
-            history_to_check = self.state.history[last_user_msg_idx + 1 :]
-        else:
-            # In headless mode, look at all history
-            history_to_check = self.state.history
-
-        # Filter out user messages and null events
-        filtered_history = [
-            event
-            for event in history_to_check
-            if not (
-                # Filter works elegantly in both modes:
-                # - In headless: actively filters out user messages from full history
-                # - In non-headless: no-op since we already sliced after last user message
-                (isinstance(event, MessageAction) and event.source == EventSource.USER)
-                # there might be some NullAction or NullObservation in the history at least for now
-                or isinstance(event, (NullAction, NullObservation))
-            )
-        ]
+        filtered_history = self._update(headless_mode)
+        filtered_history_offset = filtered_history.offset
 
         # it takes 3 actions minimum to detect a loop, otherwise nothing to do here
         if len(filtered_history) < 3:
@@ -90,18 +221,8 @@ class StuckDetector:
 
         # the first few scenarios detect 3 or 4 repeated steps
         # prepare the last 4 actions and observations, to check them out
-        last_actions: list[Event] = []
-        last_observations: list[Event] = []
-
-        # retrieve the last four actions and observations starting from the end of history, wherever they are
-        for event in reversed(filtered_history):
-            if isinstance(event, Action) and len(last_actions) < 4:
-                last_actions.append(event)
-            elif isinstance(event, Observation) and len(last_observations) < 4:
-                last_observations.append(event)
-
-            if len(last_actions) == 4 and len(last_observations) == 4:
-                break
+        last_actions = filtered_history.last_actions(4)
+        last_observations = filtered_history.last_observations(4)
 
         # scenario 1: same action, same observation
         if self._is_stuck_repeating_action_observation(
@@ -141,7 +262,7 @@ class StuckDetector:
         self,
         last_actions: list[Event],
         last_observations: list[Event],
-        filtered_history: list[Event],
+        filtered_history: Sequence[Event],
         filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 1: same action, same observation
@@ -174,7 +295,7 @@ class StuckDetector:
         self,
         last_actions: list[Event],
         last_observations: list[Event],
-        filtered_history: list[Event],
+        filtered_history: Sequence[Event],
         filtered_history_offset: int = 0,
     ) -> bool:
         # scenario 2: same action, errors
@@ -316,35 +437,30 @@ class StuckDetector:
         return len(error_lines) == 3 and len(set(error_lines)) == 1
 
     def _is_stuck_monologue(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self, filtered_history: Sequence[Event], filtered_history_offset: int = 0
     ) -> bool:
         # scenario 3: monologue
         # check for repeated MessageActions with source=AGENT
         # see if the agent is engaged in a good old monologue, telling itself the same thing over and over
-        agent_message_actions = [
-            (i, event)
-            for i, event in enumerate(filtered_history)
-            if isinstance(event, MessageAction) and event.source == EventSource.AGENT
-        ]
+        history = _FilteredHistory.from_events(filtered_history)
 
         # last three message actions will do for this check
-        if len(agent_message_actions) >= 3:
-            last_agent_message_actions = agent_message_actions[-3:]
+        if len(history.agent_messages) >= 3:
+            last_agent_message_actions = list(history.agent_messages)[-3:]
+            first_action = history[last_agent_message_actions[0][0]]
 
             if all(
-                (last_agent_message_actions[0][1] == action[1])
-                for action in last_agent_message_actions
+                (first_action == history[index])
+                for index, _ in last_agent_message_actions
             ):
                 # check if there are any observations between the repeated MessageActions
                 # then it's not yet a loop, maybe it can recover
-                start_index = last_agent_message_actions[0][0]
-                end_index = last_agent_message_actions[-1][0]
+                start_index, observations_before_start = last_agent_message_actions[0]
+                _, observations_before_end = last_agent_message_actions[-1]
 
-                has_observation_between = False
-                for event in filtered_history[start_index + 1 : end_index]:
-                    if isinstance(event, Observation):
-                        has_observation_between = True
-                        break
+                has_observation_between = (
+                    observations_before_end > observations_before_start
+                )
 
                 if not has_observation_between:
                     logger.warning('Repeated MessageAction with source=AGENT detected')
@@ -357,23 +473,16 @@ class StuckDetector:
         return False
 
     def _is_stuck_action_observation_pattern(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self, filtered_history: Sequence[Event], filtered_history_offset: int = 0
     ) -> bool:
         # scenario 4: action, observation pattern on the last six steps
         # check if the agent repeats the same (Action, Observation)
         # every other step in the last six steps
-        last_six_actions: list[Event] = []
-        last_six_observations: list[Event] = []
+        history = _FilteredHistory.from_events(filtered_history)
 
         # the end of history is most interesting
-        for event in reversed(filtered_history):
-            if isinstance(event, Action) and len(last_six_actions) < 6:
-                last_six_actions.append(event)
-            elif isinstance(event, Observation) and len(last_six_observations) < 6:
-                last_six_observations.append(event)
-
-            if len(last_six_actions) == 6 and len(last_six_observations) == 6:
-                break
+        last_six_actions = history.last_actions(6)
+        last_six_observations = history.last_observations(6)
 
         # this pattern is every other step, like:
         # (action_1, obs_1), (action_2, obs_2), (action_1, obs_1), (action_2, obs_2),...
@@ -400,14 +509,14 @@ class StuckDetector:
                 self.stuck_analysis = StuckDetector.StuckAnalysis(
                     loop_type='repeating_action_observation_pattern',
                     loop_repeat_times=3,
-                    loop_start_idx=filtered_history.index(last_six_actions[-1])
+                    loop_start_idx=history.index(last_six_actions[-1])
                     + filtered_history_offset,
                 )
                 return True
         return False
 
     def _is_stuck_context_window_error(
-        self, filtered_history: list[Event], filtered_history_offset: int = 0
+        self, filtered_history: Sequence[Event], filtered_history_offset: int = 0
     ) -> bool:
         """Detects if we're stuck in a loop of context window errors.
 
@@ -423,30 +532,23 @@ class StuckDetector:
             bool: True if we detect a context window error loop
         """
         # Look for AgentCondensationObservation events
-        condensation_events = [
-            (i, event)
-            for i, event in enumerate(filtered_history)
-            if isinstance(event, AgentCondensationObservation)
-        ]
+        condensation_indices = _FilteredHistory.from_events(
+            filtered_history
+        ).condensations
 
         # Need at least 10 condensation events to detect a loop
-        if len(condensation_events) < 10:
+        if len(condensation_indices) < 10:
             return False
 
         # Get the last 10 condensation events
-        last_condensation_events = condensation_events[-10:]
+        last_condensation_indices = list(condensation_indices)[-10:]
 
         # Check if there are any non-condensation events between them
-        for i in range(len(last_condensation_events) - 1):
-            start_idx = last_condensation_events[i][0]
-            end_idx = last_condensation_events[i + 1][0]
-
-            # Look for any non-condensation events between these two
-            has_other_events = False
-            for event in filtered_history[start_idx + 1 : end_idx]:
-                if not isinstance(event, AgentCondensationObservation):
-                    has_other_events = True
-                    break
+        for start_idx, end_idx in zip(
+            last_condensation_indices[:-1], last_condensation_indices[1:], strict=True
+        ):
+            # any events between these two are not condensation events
+            has_other_events = end_idx > start_idx + 1
 
             if not has_other_events:
                 logger.warning(
@@ -6,7 +6,7 @@
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
 import os
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, SecretStr
 
@@ -52,6 +52,9 @@ class OpenHandsConfig(BaseModel):
         workspace_mount_path_in_sandbox (deprecated): Path to mount the workspace in sandbox. Defaults to `/workspace`.
         workspace_mount_rewrite (deprecated): Path to rewrite the workspace mount path.
         cache_dir: Path to cache directory. Defaults to `/tmp/cache`.
+        enable_completion_cache: Whether to cache the completions of the condenser and conversation title LLMs in `cache_dir`.
+        event_dispatch_mode: How the events of a conversation are passed to its subscribers: `thread` (A thread for each subscriber) or `async` (One shared event loop and executor).
+        event_write_behind: Whether to buffer the writes of the events of a conversation to the file store, so that they are made together rather than for each event. A crash loses the events buffered, at most those of the last second.
         run_as_openhands: Whether to run as openhands.
         max_iterations: Maximum number of iterations allowed.
         max_budget_per_task: Maximum budget per task, agent stops if exceeded.
@@ -100,6 +103,9 @@ class OpenHandsConfig(BaseModel):
     # End of deprecated parameters
 
     cache_dir: str = Field(default='/tmp/cache')
+    enable_completion_cache: bool = Field(default=False)
+    event_dispatch_mode: Literal['thread', 'async'] = Field(default='thread')
+    event_write_behind: bool = Field(default=False)
     run_as_openhands: bool = Field(default=True)
     max_iterations: int = Field(default=OH_MAX_ITERATIONS)
     max_budget_per_task: float | None = Field(default=None)
@@ -22,6 +22,7 @@ from openhands.core.config import (
 from openhands.core.config.config_utils import DEFAULT_WORKSPACE_MOUNT_PATH_IN_SANDBOX
 from openhands.core.logger import openhands_logger as logger
 from openhands.events import EventStream
+from openhands.events.async_dispatcher import DispatchMode
 from openhands.events.event import Event
 from openhands.integrations.provider import (
     PROVIDER_TOKEN_TYPE,
@@ -67,7 +68,12 @@ def create_runtime(
 
     # set up the event stream
     file_store = get_file_store(config.file_store, config.file_store_path)
-    event_stream = EventStream(session_id, file_store)
+    event_stream = EventStream(
+        session_id,
+        file_store,
+        dispatch_mode=DispatchMode(config.event_dispatch_mode),
+        write_behind=config.event_write_behind,
+    )
 
     # agent class
     if agent:
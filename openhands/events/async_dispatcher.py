@@ -0,0 +1,359 @@
+"""Dispatch of the events in a stream to its subscribers on a shared event loop.
+
+In the thread dispatch mode each EventStream has a thread polling its queue,
+and each subscriber callback has its own single threaded executor and event
+loop. In the async dispatch mode the events of every stream are dispatched by
+one event loop running in a background thread. Each callback has a bounded
+queue of events which it handles in order. Coroutine callbacks are awaited on
+the loop, and synchronous callbacks are run one event at a time on a bounded
+executor shared by every stream. Each synchronous callback has an event loop of
+its own, set as the event loop of the executor thread while it runs, so tasks a
+callback creates on that loop run the next time the callback runs it (As in the
+thread mode). A synchronous callback which blocks holds an executor thread
+until it returns.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from openhands.core.logger import openhands_logger as logger
+from openhands.events.event import Event
+
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_MAX_WORKERS = 32
+CLOSE_TIMEOUT = 5
+
+EventCallback = Callable[[Event], None] | Callable[[Event], Awaitable[None]]
+
+# Set on the dispatch loop and executor threads, which must never wait for room
+# in a queue since they are the ones making it
+_dispatch_thread = threading.local()
+
+
+class DispatchMode(str, Enum):
+    THREAD = 'thread'
+    ASYNC = 'async'
+
+
+@dataclass
+class SubscriberStats:
+    """Latency of the events handled by a subscriber callback."""
+
+    events: int = 0
+    errors: int = 0
+    queue_size: int = 0
+    max_queue_size: int = 0
+    total_queue_latency: float = 0.0
+    max_queue_latency: float = 0.0
+    total_callback_duration: float = 0.0
+    max_callback_duration: float = 0.0
+
+    @property
+    def mean_queue_latency(self) -> float:
+        return self.total_queue_latency / self.events if self.events else 0.0
+
+    @property
+    def mean_callback_duration(self) -> float:
+        return self.total_callback_duration / self.events if self.events else 0.0
+
+    def record(self, queue_latency: float, callback_duration: float) -> None:
+        self.events += 1
+        self.total_queue_latency += queue_latency
+        self.max_queue_latency = max(self.max_queue_latency, queue_latency)
+        self.total_callback_duration += callback_duration
+        self.max_callback_duration = max(self.max_callback_duration, callback_duration)
+
+
+def _init_worker() -> None:
+    _dispatch_thread.active = True
+
+
+class DispatchLoop:
+    """An event loop in a background thread, and an executor for synchronous
+    callbacks, shared by the async dispatchers."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='event-dispatch',
+            initializer=_init_worker,
+        )
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run, args=(loop,), name='event-dispatch-loop'
+                )
+                self._thread.daemon = True
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def _run(self, loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        _dispatch_thread.active = True
+        loop.run_forever()
+
+
+_dispatch_loop: DispatchLoop | None = None
+_dispatch_loop_lock = threading.Lock()
+
+
+def get_dispatch_loop() -> DispatchLoop:
+    global _dispatch_loop
+    with _dispatch_loop_lock:
+        if _dispatch_loop is None:
+            _dispatch_loop = DispatchLoop()
+        return _dispatch_loop
+
+
+class _Subscription:
+    def __init__(
+        self,
+        subscriber_id: str,
+        callback_id: str,
+        callback: EventCallback,
+        max_queue_size: int,
+    ):
+        self.subscriber_id = subscriber_id
+        self.callback_id = callback_id
+        self.callback = callback
+        self.is_coroutine = inspect.iscoroutinefunction(callback)
+        self.queue: asyncio.Queue[tuple[Event, float]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self.stats = SubscriberStats()
+        self.task: asyncio.Task | None = None
+        self.active = True
+        # Like the thread mode, a synchronous callback always runs with the same
+        # event loop, whichever executor thread it runs on
+        self.loop: asyncio.AbstractEventLoop | None = None
+        # Held while the synchronous callback runs
+        self._call_lock = threading.Lock()
+        if not self.is_coroutine:
+            self.loop = asyncio.new_event_loop()
+
+    def call_sync(self, event: Event) -> None:
+        """Run the synchronous callback in the current (executor) thread."""
+        with self._call_lock:
+            if self.loop is None or self.loop.is_closed():
+                return
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.callback(event)
+            finally:
+                asyncio.set_event_loop(None)
+
+    def close_loop(self) -> None:
+        """Close the event loop of the synchronous callback, once any call in
+        progress has returned."""
+        with self._call_lock:
+            loop, self.loop = self.loop, None
+            if loop is None:
+                return
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.close()
+
+
+class AsyncEventDispatcher:
+    """Dispatches the events of one stream to its subscribers in order.
+
+    Events are fanned out one at a time to a bounded queue for each callback.
+    When a callback falls behind and its queue is full, fan out waits for it,
+    and producers outside of the dispatch threads wait once there are more than
+    max_queue_size events waiting to be fanned out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        dispatch_loop: DispatchLoop | None = None,
+    ):
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self._dispatch_loop = dispatch_loop or get_dispatch_loop()
+        self._loop = self._dispatch_loop.loop
+        self._subscriptions: dict[str, dict[str, _Subscription]] = {}
+        self._lock = threading.Lock()
+        self._pending: asyncio.Queue[tuple[Event, float]] = asyncio.Queue()
+        self._pending_count = 0
+        self._pending_condition = threading.Condition()
+        self._closed = False
+        self._fan_out_future = asyncio.run_coroutine_threadsafe(
+            self._fan_out(), self._loop
+        )
+
+    def subscribe(
+        self, subscriber_id: str, callback_id: str, callback: EventCallback
+    ) -> None:
+        subscription = _Subscription(
+            subscriber_id, callback_id, callback, self.max_queue_size
+        )
+        with self._lock:
+            callbacks = self._subscriptions.setdefault(subscriber_id, {})
+            if callback_id in callbacks:
+                raise ValueError(
+                    f'Callback ID on subscriber {subscriber_id} already exists: {callback_id}'
+                )
+            callbacks[callback_id] = subscription
+        self._loop.call_soon_threadsafe(self._start_consumer, subscription)
+
+    def unsubscribe(self, subscriber_id: str, callback_id: str) -> None:
+        with self._lock:
+            subscription = self._subscriptions.get(subscriber_id, {}).pop(
+                callback_id, None
+            )
+        if subscription is not None:
+            subscription.active = False
+            self._loop.call_soon_threadsafe(self._stop_consumer, subscription)
+
+    def dispatch(self, event: Event) -> None:
+        """Queue an event to be passed to each callback, waiting for room if needed."""
+        if self._closed:
+            return
+        with self._pending_condition:
+            if self._can_wait():
+                self._pending_condition.wait_for(
+                    lambda: self._closed or self._pending_count < self.max_queue_size
+                )
+            self._pending_count += 1
+        self._loop.call_soon_threadsafe(
+            self._pending.put_nowait, (event, time.monotonic())
+        )
+
+    def get_stats(self) -> dict[str, dict[str, SubscriberStats]]:
+        with self._lock:
+            subscriptions = [
+                subscription
+                for callbacks in self._subscriptions.values()
+                for subscription in callbacks.values()
+            ]
+        stats: dict[str, dict[str, SubscriberStats]] = {}
+        for subscription in subscriptions:
+            subscription.stats.queue_size = subscription.queue.qsize()
+            stats.setdefault(subscription.subscriber_id, {})[
+                subscription.callback_id
+            ] = subscription.stats
+        return stats
+
+    def close(self) -> None:
+        """Stop dispatching. Events which were not yet handled are dropped."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._pending_condition:
+            self._pending_condition.notify_all()
+        future = asyncio.run_coroutine_threadsafe(self._close(), self._loop)
+        if self._dispatch_loop.in_loop_thread():
+            return
+        try:
+            future.result(timeout=CLOSE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f'Error closing event dispatcher for {self.name}: {e}')
+
+    def _can_wait(self) -> bool:
+        if getattr(_dispatch_thread, 'active', False):
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        # Don't block a running event loop, the event is queued regardless
+        return False
+
+    async def _fan_out(self) -> None:
+        while True:
+            event, dispatched_at = await self._pending.get()
+            # pass each event to each callback in order
+            subscriptions: list[_Subscription] = []
+            with self._lock:
+                for subscriber_id in sorted(self._subscriptions.keys()):
+                    subscriptions.extend(self._subscriptions[subscriber_id].values())
+            for subscription in subscriptions:
+                if not subscription.active:
+                    continue
+                # Waits for a callback which has fallen behind
+                await subscription.queue.put((event, dispatched_at))
+                subscription.stats.max_queue_size = max(
+                    subscription.stats.max_queue_size, subscription.queue.qsize()
+                )
+            with self._pending_condition:
+                self._pending_count -= 1
+                self._pending_condition.notify()
+
+    def _start_consumer(self, subscription: _Subscription) -> None:
+        if self._closed:
+            return
+        subscription.task = self._loop.create_task(self._consume(subscription))
+
+    def _stop_consumer(self, subscription: _Subscription) -> None:
+        if subscription.task is not None:
+            subscription.task.cancel()
+        self._close_loop(subscription)
+        # Make room for fan out if it is waiting for this callback
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+
+    async def _consume(self, subscription: _Subscription) -> None:
+        while True:
+            event, dispatched_at = await subscription.queue.get()
+            started_at = time.monotonic()
+            try:
+                await self._call(subscription, event)
+            except Exception as e:
+                subscription.stats.errors += 1
+                logger.error(
+                    f'Error in event callback {subscription.callback_id} for subscriber {subscription.subscriber_id}: {str(e)}',
+                )
+            subscription.stats.record(
+                started_at - dispatched_at, time.monotonic() - started_at
+            )
+
+    async def _call(self, subscription: _Subscription, event: Event) -> Any:
+        if subscription.is_coroutine:
+            return await subscription.callback(event)  # type: ignore[misc]
+        return await self._loop.run_in_executor(
+            self._dispatch_loop.executor, subscription.call_sync, event
+        )
+
+    def _close_loop(self, subscription: _Subscription) -> None:
+        if subscription.loop is not None:
+            # Waits in the executor for a call in progress, not on the loop
+            self._dispatch_loop.executor.submit(subscription.close_loop)
+
+    async def _close(self) -> None:
+        self._fan_out_future.cancel()
+        with self._lock:
+            subscriptions = [
+                subscription
+                for callbacks in self._subscriptions.values()
+                for subscription in callbacks.values()
+            ]
+            self._subscriptions.clear()
+        tasks = [
+            subscription.task
+            for subscription in subscriptions
+            if subscription.task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in subscriptions:
+            self._close_loop(subscription)
@@ -2,7 +2,9 @@ import json
 from dataclasses import dataclass
 
 from openhands.events.event import Event
+from openhands.events.serialization.action import ACTION_TYPE_TO_CLASS
 from openhands.events.serialization.event import event_to_dict
+from openhands.events.serialization.observation import OBSERVATION_TYPE_TO_CLASS
 
 
 @dataclass
@@ -84,6 +86,47 @@ class EventFilter:
 
         return True
 
+    def include_dict(self, data: dict) -> bool:
+        """Check the criteria which can be evaluated on a serialized event.
+
+        This allows events which are certainly excluded to be skipped without
+        deserializing them. Events for which this returns True must still be
+        checked with include, as the hidden and query criteria are not evaluated.
+
+        Args:
+            data: The event as a dictionary, as produced by event_to_dict.
+
+        Returns:
+            bool: False if the event would be excluded by include, True otherwise.
+        """
+        if self.include_types or self.exclude_types is not None:
+            event_type: type | None = None
+            if 'action' in data:
+                event_type = ACTION_TYPE_TO_CLASS.get(data['action'])
+            elif 'observation' in data:
+                event_type = OBSERVATION_TYPE_TO_CLASS.get(data['observation'])
+            if event_type is not None:
+                if self.include_types and not issubclass(
+                    event_type, self.include_types
+                ):
+                    return False
+                if self.exclude_types is not None and issubclass(
+                    event_type, self.exclude_types
+                ):
+                    return False
+
+        if self.source and data.get('source') != self.source:
+            return False
+
+        timestamp = data.get('timestamp')
+        if isinstance(timestamp, str):
+            if self.start_date and timestamp < self.start_date:
+                return False
+            if self.end_date and timestamp > self.end_date:
+                return False
+
+        return True
+
     def exclude(self, event: Event) -> bool:
         """Determine if an event should be excluded based on the filter criteria.
 
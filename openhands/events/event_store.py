@@ -1,6 +1,9 @@
 import json
-from dataclasses import dataclass
-from typing import Iterable
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.events.event import Event, EventSource
@@ -11,33 +14,32 @@ from openhands.storage.files import FileStore
 from openhands.storage.locations import (
     get_conversation_dir,
     get_conversation_event_filename,
+    get_conversation_event_head_filename,
     get_conversation_events_dir,
 )
 from openhands.utils.shutdown_listener import should_continue
 
+# Shared by all event stores for reading pages and events concurrently. Tasks run
+# here only ever read from the file store, so they never wait on each other.
+_READ_EXECUTOR = ThreadPoolExecutor(
+    max_workers=16, thread_name_prefix='event_store_read'
+)
+
 
 @dataclass(frozen=True)
 class _CachePage:
-    events: list[dict] | None
+    events: list[dict | None] | None
     start: int
     end: int
 
-    def covers(self, global_index: int) -> bool:
-        if global_index < self.start:
-            return False
-        if global_index >= self.end:
-            return False
-        return True
-
-    def get_event(self, global_index: int) -> Event | None:
+    def get_data(self, global_index: int) -> dict | None:
         # If there was not actually a cached page, return None
         if not self.events:
             return None
         local_index = global_index - self.start
-        return event_from_dict(self.events[local_index])
-
-
-_DUMMY_PAGE = _CachePage(None, 1, -1)
+        if local_index >= len(self.events):
+            return None
+        return self.events[local_index]
 
 
 @dataclass
@@ -48,7 +50,18 @@ class EventStore(EventStoreABC):
     file_store: FileStore
     user_id: str | None
     cache_size: int = 25
+    # Maximum number of cache pages read concurrently ahead of the reader
+    max_read_ahead_pages: int = 4
+    # Maximum number of cache pages kept in memory between searches
+    max_cached_pages: int = 16
     _cur_id: int | None = None  # Private field to cache the calculated value
+    # End of the last full cache page known to be written, if known. Pages after
+    # this have not been written, so their events are read individually.
+    _cache_page_end: int | None = None
+    _page_cache: OrderedDict[tuple[int, int], _CachePage] = field(
+        default_factory=OrderedDict
+    )
+    _page_cache_lock: threading.Lock = field(default_factory=threading.Lock)
 
     @property
     def cur_id(self) -> int:
@@ -63,6 +76,24 @@ class EventStore(EventStoreABC):
         self._cur_id = value
 
     def _calculate_cur_id(self) -> int:
+        """Calculate the current event ID from the head pointer written by the
+        event stream, falling back to listing the events when the head is
+        missing or stale."""
+        head = self._load_head()
+        if head is not None:
+            cur_id, cache_page_end = head
+            # The head is moved on as cache pages complete, so the events of at
+            # most one page follow it. If there are more, the head was not
+            # updated by some writer (e.g.: an older version)
+            for _ in range(self.cache_size + 1):
+                if not self._event_exists(cur_id):
+                    self._cache_page_end = cache_page_end
+                    return cur_id
+                cur_id += 1
+            logger.debug(f'Stale event head for session {self.sid}')
+        return self._calculate_cur_id_from_listing()
+
+    def _calculate_cur_id_from_listing(self) -> int:
         """Calculate the current event ID based on file system content."""
         events = []
         try:
@@ -115,20 +146,18 @@ class EventStore(EventStoreABC):
         else:
             step = 1
 
-        cache_page = _DUMMY_PAGE
         num_results = 0
-        for index in range(start_id, end_id, step):
-            if not should_continue():
-                return
-            if not cache_page.covers(index):
-                cache_page = self._load_cache_page_for_index(index)
-            event = cache_page.get_event(index)
-            if event is None:
-                try:
-                    event = self.get_event(index)
-                except FileNotFoundError:
-                    event = None
-            if event:
+        for indexes, page in self._iter_pages(range(start_id, end_id, step)):
+            for index in indexes:
+                if not should_continue():
+                    return
+                data = page.get_data(index)
+                if data is None:
+                    continue
+                # Skip deserializing events which the filter certainly rejects
+                if filter and not filter.include_dict(data):
+                    continue
+                event = event_from_dict(data)
                 if not filter or filter.include(event):
                     yield event
                     num_results += 1
@@ -136,10 +165,40 @@ class EventStore(EventStoreABC):
                         return
 
     def get_event(self, id: int) -> Event:
+        return event_from_dict(self._read_event_dict(id))
+
+    def _event_exists(self, id: int) -> bool:
+        try:
+            self.file_store.read(self._get_filename_for_id(id, self.user_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _load_head(self) -> tuple[int, int | None] | None:
+        """Load the head pointer for the stream, as the next event id and the end
+        of the last full cache page."""
+        try:
+            content = self.file_store.read(
+                get_conversation_event_head_filename(self.sid, self.user_id)
+            )
+            head = json.loads(content)
+            return int(head['cur_id']), head.get('cache_page_end')
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f'Invalid event head for session {self.sid}')
+            return None
+
+    def _read_event_dict(self, id: int) -> dict:
         filename = self._get_filename_for_id(id, self.user_id)
         content = self.file_store.read(filename)
-        data = json.loads(content)
-        return event_from_dict(data)
+        return json.loads(content)
+
+    def _try_read_event_dict(self, id: int) -> dict | None:
+        try:
+            return self._read_event_dict(id)
+        except FileNotFoundError:
+            return None
 
     def get_latest_event(self) -> Event:
         return self.get_event(self.cur_id - 1)
@@ -169,10 +228,80 @@ class EventStore(EventStoreABC):
         page = _CachePage(events, start, end)
         return page
 
-    def _load_cache_page_for_index(self, index: int) -> _CachePage:
-        offset = index % self.cache_size
-        index -= offset
-        return self._load_cache_page(index, index + self.cache_size)
+    def _get_page(self, start: int, end: int) -> _CachePage:
+        """Get a cache page, from memory if it was read before. Pages are never
+        modified once written, so only pages which were found are kept."""
+        if self._cache_page_end is not None and end > self._cache_page_end:
+            # The page has not been written
+            return _CachePage(None, start, end)
+        key = (start, end)
+        with self._page_cache_lock:
+            page = self._page_cache.get(key)
+            if page is not None:
+                self._page_cache.move_to_end(key)
+                return page
+        page = self._load_cache_page(start, end)
+        if page.events is not None:
+            with self._page_cache_lock:
+                self._page_cache[key] = page
+                while len(self._page_cache) > self.max_cached_pages:
+                    self._page_cache.popitem(last=False)
+        return page
+
+    def _iter_pages(self, indexes: range) -> Iterator[tuple[range, _CachePage]]:
+        """Split the indexes given by cache page and yield each group along with
+        its page, in order. Pages are read in batches which double in size up to
+        max_read_ahead_pages, so that short searches (e.g.: for the latest
+        event) read a single page while long scans read ahead concurrently.
+        Events in pages which have not been written (Typically the last
+        partial page) are read individually, also concurrently."""
+        groups = self._group_by_page(indexes)
+        batch_size = 1
+        while groups:
+            batch = groups[:batch_size]
+            groups = groups[batch_size:]
+            batch_size = min(batch_size * 2, max(self.max_read_ahead_pages, 1))
+            if len(batch) == 1:
+                pages = [self._get_page(*self._page_bounds(batch[0]))]
+            else:
+                pages = list(
+                    _READ_EXECUTOR.map(
+                        lambda group: self._get_page(*self._page_bounds(group)),
+                        batch,
+                    )
+                )
+            for group, page in zip(batch, pages, strict=True):
+                if page.events is None:
+                    page = self._read_events_for_page(page, group)
+                yield group, page
+
+    def _group_by_page(self, indexes: range) -> list[range]:
+        groups = []
+        group_start = None
+        for index in indexes:
+            if group_start is None:
+                group_start = index
+            elif (index - index % self.cache_size) != (
+                group_start - group_start % self.cache_size
+            ):
+                groups.append(range(group_start, index, indexes.step))
+                group_start = index
+        if group_start is not None:
+            groups.append(range(group_start, indexes.stop, indexes.step))
+        return groups
+
+    def _page_bounds(self, group: range) -> tuple[int, int]:
+        start = group.start - group.start % self.cache_size
+        return start, start + self.cache_size
+
+    def _read_events_for_page(self, page: _CachePage, group: range) -> _CachePage:
+        ids = sorted(group)
+        events: list[dict | None] = [None] * (page.end - page.start)
+        for id, data in zip(
+            ids, _READ_EXECUTOR.map(self._try_read_event_dict, ids), strict=True
+        ):
+            events[id - page.start] = data
+        return _CachePage(events, page.start, page.end)
 
     @staticmethod
     def _get_id_from_filename(filename: str) -> int:
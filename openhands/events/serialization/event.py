@@ -86,6 +86,12 @@ def event_from_dict(data: dict[str, Any]) -> 'Event':
                         metrics._accumulated_token_usage = TokenUsage(
                             **value.get('accumulated_token_usage', {})
                         )
+                    metrics._completion_cache_hits = value.get(
+                        'completion_cache_hits', 0
+                    )
+                    metrics._completion_cache_misses = value.get(
+                        'completion_cache_misses', 0
+                    )
                 value = metrics
             setattr(evt, '_' + key, value)
     return evt
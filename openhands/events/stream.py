@@ -1,6 +1,9 @@
 import asyncio
+import heapq
+import itertools
 import queue
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
@@ -8,17 +11,64 @@ from functools import partial
 from typing import Any, Callable
 
 from openhands.core.logger import openhands_logger as logger
+from openhands.events.async_dispatcher import (
+    AsyncEventDispatcher,
+    DispatchMode,
+    EventCallback,
+    SubscriberStats,
+)
 from openhands.events.event import Event, EventSource
 from openhands.events.event_store import EventStore
+from openhands.events.observation.agent import AgentStateChangedObservation
 from openhands.events.serialization.event import event_from_dict, event_to_dict
 from openhands.io import json
 from openhands.storage import FileStore
 from openhands.storage.locations import (
     get_conversation_dir,
+    get_conversation_event_head_filename,
 )
 from openhands.utils.async_utils import call_sync_from_async
 from openhands.utils.shutdown_listener import should_continue
 
+# Longest time events buffered by write behind wait to be written
+WRITE_BEHIND_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class _FlushScheduler:
+    """Flushes the events buffered by the event streams using write behind once
+    their flush interval has passed, from a single thread shared by all of them
+    (Rather than starting a timer thread per stream and interval)."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._due: list[tuple[float, int, 'EventStream']] = []
+        self._counter = itertools.count()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, stream: 'EventStream', delay: float) -> None:
+        with self._condition:
+            heapq.heappush(
+                self._due, (time.monotonic() + delay, next(self._counter), stream)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='event-stream-flush', daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._due or self._due[0][0] > time.monotonic():
+                    timeout = self._due[0][0] - time.monotonic() if self._due else None
+                    self._condition.wait(timeout)
+                _, _, stream = heapq.heappop(self._due)
+            stream._flush_from_timer()
+
+
+_FLUSH_SCHEDULER = _FlushScheduler()
+
 
 class EventStreamSubscriber(str, Enum):
     AGENT_CONTROLLER = 'agent_controller'
@@ -51,10 +101,48 @@ class EventStream(EventStore):
     _queue_loop: asyncio.AbstractEventLoop | None
     _thread_pools: dict[str, dict[str, ThreadPoolExecutor]]
     _thread_loops: dict[str, dict[str, asyncio.AbstractEventLoop]]
+    _dispatcher: AsyncEventDispatcher | None
     _write_page_cache: list[dict]
-
-    def __init__(self, sid: str, file_store: FileStore, user_id: str | None = None):
+    _head_lock: threading.Lock
+    _head_cur_id: int
+    _flush_lock: threading.Lock
+    _unflushed: dict[int, dict]
+    _unflushed_pages: list[list[dict]]
+    _flush_scheduled: bool
+
+    def __init__(
+        self,
+        sid: str,
+        file_store: FileStore,
+        user_id: str | None = None,
+        dispatch_mode: DispatchMode = DispatchMode.THREAD,
+        write_behind: bool = False,
+        flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+    ):
+        """Create an event stream.
+
+        Args:
+            dispatch_mode: How events are passed to subscribers. THREAD runs each
+                callback in its own thread, ASYNC runs the callbacks of every
+                stream from one shared event loop (see async_dispatcher).
+            write_behind: Whether to buffer the writes of events to the file
+                store, so that they are made together rather than for each event.
+                Buffered events are written when a cache page is full, when the
+                agent state changes, after flush_interval seconds, and (durably)
+                when the stream is closed.
+
+        Events are always written in order, followed by the cache pages they
+        complete and then the head pointer. So the events in the file store are
+        a prefix of the stream, and opening a stream after a crash finds the last
+        one written (Probing for the events of the page after the head, and
+        falling back to listing the events when the head is stale).
+        With write behind, a crash loses the buffered events: at most those added
+        in the last flush_interval seconds, and none from before a state change.
+        """
         super().__init__(sid, file_store, user_id)
+        self.dispatch_mode = dispatch_mode
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
         self._stop_flag = threading.Event()
         self._queue: queue.Queue[Event] = queue.Queue()
         self._thread_pools = {}
@@ -62,11 +150,21 @@ class EventStream(EventStore):
         self._queue_loop = None
         self._queue_thread = threading.Thread(target=self._run_queue_loop)
         self._queue_thread.daemon = True
-        self._queue_thread.start()
+        self._dispatcher = None
+        if dispatch_mode == DispatchMode.ASYNC:
+            self._dispatcher = AsyncEventDispatcher(sid)
+        else:
+            self._queue_thread.start()
         self._subscribers = {}
         self._lock = threading.Lock()
         self.secrets = {}
         self._write_page_cache = []
+        self._head_lock = threading.Lock()
+        self._head_cur_id = -1
+        self._flush_lock = threading.Lock()
+        self._unflushed = {}
+        self._unflushed_pages = []
+        self._flush_scheduled = False
 
     def _init_thread_loop(self, subscriber_id: str, callback_id: str) -> None:
         loop = asyncio.new_event_loop()
@@ -79,6 +177,12 @@ class EventStream(EventStore):
         self._stop_flag.set()
         if self._queue_thread.is_alive():
             self._queue_thread.join()
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+        if self.write_behind:
+            self.flush(sync=True)
+        elif self._cur_id:
+            self._store_head(self._cur_id)
 
         subscriber_ids = list(self._subscribers.keys())
         for subscriber_id in subscriber_ids:
@@ -125,14 +229,27 @@ class EventStream(EventStore):
             pool.shutdown()
             del self._thread_pools[subscriber_id][callback_id]
 
+        if self._dispatcher is not None:
+            self._dispatcher.unsubscribe(subscriber_id, callback_id)
+
         del self._subscribers[subscriber_id][callback_id]
 
     def subscribe(
         self,
         subscriber_id: EventStreamSubscriber,
-        callback: Callable[[Event], None],
+        callback: EventCallback,
         callback_id: str,
     ) -> None:
+        """Subscribe a callback to the events added to the stream.
+
+        Each callback gets the events in the order they were added. In the async
+        dispatch mode the callback may also be a coroutine function.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.subscribe(subscriber_id, callback_id, callback)
+            self._subscribers.setdefault(subscriber_id, {})[callback_id] = callback
+            return
+
         initializer = partial(self._init_thread_loop, subscriber_id, callback_id)
         pool = ThreadPoolExecutor(max_workers=1, initializer=initializer)
         if subscriber_id not in self._subscribers:
@@ -167,6 +284,7 @@ class EventStream(EventStore):
             )
         event._timestamp = datetime.now().isoformat()
         event._source = source  # type: ignore [attr-defined]
+        flush = False
         with self._lock:
             event._id = self.cur_id  # type: ignore [attr-defined]
             self.cur_id += 1
@@ -180,37 +298,137 @@ class EventStream(EventStore):
             current_write_page.append(data)
 
             # If the page is full, create a new page for future events / other threads to use
-            if len(current_write_page) == self.cache_size:
+            page_full = len(current_write_page) == self.cache_size
+            if page_full:
                 self._write_page_cache = []
 
-        if event.id is not None:
+            if self.write_behind:
+                # Buffered in order, so they are also written in order
+                self._unflushed[event.id] = data
+                if page_full:
+                    self._unflushed_pages.append(current_write_page)
+                flush = page_full or isinstance(event, AgentStateChangedObservation)
+                if not flush and not self._flush_scheduled:
+                    self._flush_scheduled = True
+                    _FLUSH_SCHEDULER.schedule(self, self.flush_interval)
+
+        if flush:
+            self.flush()
+        elif event.id is not None and not self.write_behind:
             # Write the event to the store - this can take some time
-            event_json = json.dumps(data)
-            filename = self._get_filename_for_id(event.id, self.user_id)
-            if len(event_json) > 1_000_000:  # Roughly 1MB in bytes, ignoring encoding
-                logger.warning(
-                    f'Saving event JSON over 1MB: {len(event_json):,} bytes, filename: {filename}',
-                    extra={
-                        'user_id': self.user_id,
-                        'session_id': self.sid,
-                        'size': len(event_json),
-                    },
-                )
-            self.file_store.write(filename, event_json)
+            self._write_event(data)
 
             # Store the cache page last - if it is not present during reads then it will simply be bypassed.
-            self._store_cache_page(current_write_page)
-        self._queue.put(event)
+            # The head is only moved on as pages complete (and on close), rather
+            # than written for every event. Readers probe for the events of the
+            # page past a head which is behind.
+            if self._store_cache_page(current_write_page):
+                self._store_head(event.id + 1)
+        if self._dispatcher is not None:
+            self._dispatcher.dispatch(event)
+        else:
+            self._queue.put(event)
+
+    def get_dispatch_stats(self) -> dict[str, dict[str, SubscriberStats]]:
+        """Get the latency of each subscriber callback, in the async dispatch mode."""
+        if self._dispatcher is None:
+            return {}
+        return self._dispatcher.get_stats()
+
+    def flush(self, sync: bool = False) -> None:
+        """Write the events buffered by write behind to the file store.
+
+        Args:
+            sync: Whether to also make the writes durable (e.g.: fsync local files)
+        """
+        with self._flush_lock:
+            with self._lock:
+                events = sorted(self._unflushed.items())
+                pages = self._unflushed_pages
+                self._unflushed_pages = []
+                self._flush_scheduled = False
+            paths: list[str] = []
+            try:
+                for _, data in events:
+                    paths.append(self._write_event(data))
+                for page in pages:
+                    page_filename = self._store_cache_page(page)
+                    if page_filename:
+                        paths.append(page_filename)
+                if events:
+                    head_filename = self._store_head(events[-1][0] + 1)
+                    if head_filename:
+                        paths.append(head_filename)
+                if sync and paths:
+                    self.file_store.sync(paths)
+            except Exception:
+                # Keep what was not written for the next flush
+                with self._lock:
+                    self._unflushed_pages[:0] = pages
+                raise
+            with self._lock:
+                for id, _ in events:
+                    del self._unflushed[id]
+
+    def _flush_from_timer(self) -> None:
+        # Nothing to do if the stream was flushed since this was scheduled
+        if not self._flush_scheduled:
+            return
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(f'Error writing buffered events for session {self.sid}')
+
+    def _read_event_dict(self, id: int) -> dict:
+        # Events buffered by write behind are not in the file store yet
+        data = self._unflushed.get(id)
+        if data is not None:
+            return data
+        return super()._read_event_dict(id)
+
+    def _write_event(self, data: dict) -> str:
+        event_json = json.dumps(data)
+        filename = self._get_filename_for_id(data['id'], self.user_id)
+        if len(event_json) > 1_000_000:  # Roughly 1MB in bytes, ignoring encoding
+            logger.warning(
+                f'Saving event JSON over 1MB: {len(event_json):,} bytes, filename: {filename}',
+                extra={
+                    'user_id': self.user_id,
+                    'session_id': self.sid,
+                    'size': len(event_json),
+                },
+            )
+        self.file_store.write(filename, event_json)
+        return filename
 
-    def _store_cache_page(self, current_write_page: list[dict]):
+    def _store_cache_page(self, current_write_page: list[dict]) -> str | None:
         """Store a page in the cache. Reading individual events is slow when there are a lot of them, so we use pages."""
         if len(current_write_page) < self.cache_size:
-            return
+            return None
         start = current_write_page[0]['id']
         end = start + self.cache_size
         contents = json.dumps(current_write_page)
         cache_filename = self._get_filename_for_cache(start, end)
         self.file_store.write(cache_filename, contents)
+        with self._head_lock:
+            if self._cache_page_end is None or end > self._cache_page_end:
+                self._cache_page_end = end
+        return cache_filename
+
+    def _store_head(self, cur_id: int) -> str | None:
+        """Store the head pointer, so that opening the stream does not need to list
+        its events. The head is written after the event it covers, and heads for
+        earlier events finishing after later ones are skipped."""
+        with self._head_lock:
+            if cur_id <= self._head_cur_id:
+                return None
+            self._head_cur_id = cur_id
+            contents = json.dumps(
+                {'cur_id': cur_id, 'cache_page_end': self._cache_page_end}
+            )
+            filename = get_conversation_event_head_filename(self.sid, self.user_id)
+            self.file_store.write(filename, contents)
+            return filename
 
     def set_secrets(self, secrets: dict[str, str]) -> None:
         self.secrets = secrets.copy()
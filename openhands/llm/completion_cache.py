@@ -0,0 +1,200 @@
+# IMPORTANT: LEGACY V0 CODE - Deprecated since version 1.0.0, scheduled for removal April 1, 2026
+# This file is part of the legacy (V0) implementation of OpenHands and will be removed soon as we complete the migration to V1.
+# OpenHands V1 uses the Software Agent SDK for the agentic core and runs a new application server. Please refer to:
+#   - V1 agentic core (SDK): https://github.com/OpenHands/software-agent-sdk
+#   - V1 application server (in this repo): openhands/app_server/
+# Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
+# Tag: Legacy-V0
+"""Content addressed cache of LLM completions.
+
+Auxiliary LLM calls (condensers, conversation titles) often send the same prompt
+again, e.g.: when a conversation is resumed, or after a transient error. When a
+cache is attached to an LLM service (see LLMRegistry.attach_completion_cache),
+its completions are cached by a hash of the model, the messages and the
+sampling parameters, in memory and optionally in an SQLite database so that
+they survive restarts. Entries expire after a time to live, and the least
+recently used entries are evicted once there are too many.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_MEMORY_ENTRIES = 1000
+DEFAULT_MAX_DISK_ENTRIES = 10_000
+
+# Completion parameters which don't change the completion
+_UNKEYED_PARAMS = frozenset(
+    {
+        'api_key',
+        'api_version',
+        'aws_access_key_id',
+        'aws_secret_access_key',
+        'aws_region_name',
+        'base_url',
+        'client',
+        'drop_params',
+        'extra_body',
+        'extra_headers',
+        'metadata',
+        'timeout',
+    }
+)
+
+
+def _normalize(value: Any) -> Any:
+    # Prompt caching markers only change how the provider bills the prompt
+    if isinstance(value, dict):
+        return {
+            key: _normalize(item)
+            for key, item in value.items()
+            if key != 'cache_control'
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def completion_cache_key(params: dict[str, Any]) -> str:
+    """Get the cache key for the parameters of a completion call, including the
+    model and the messages."""
+    keyed = {
+        key: _normalize(value)
+        for key, value in params.items()
+        if key not in _UNKEYED_PARAMS
+    }
+    content = json.dumps(keyed, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class CompletionCache:
+    """LRU cache of serialized completions, in memory and optionally on disk."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        # key -> (time created, completion)
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS completions ('
+                'key TEXT PRIMARY KEY, completion TEXT NOT NULL, '
+                'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS completions_accessed_at '
+                'ON completions (accessed_at)'
+            )
+            self._db.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0], now):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._memory.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT completion, created_at FROM completions WHERE key = ?',
+                    (key,),
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute(
+                        'UPDATE completions SET accessed_at = ? WHERE key = ?',
+                        (now, key),
+                    )
+                    self._db.commit()
+                    self._put_memory(key, row[1], row[0])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, completion: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._put_memory(key, now, completion)
+            if self._db is None:
+                return
+            self._db.execute(
+                'INSERT OR REPLACE INTO completions '
+                '(key, completion, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, completion, now, now),
+            )
+            self._db.execute(
+                'DELETE FROM completions WHERE created_at <= ?',
+                (now - self.ttl_seconds,),
+            )
+            self._db.execute(
+                'DELETE FROM completions WHERE key IN ('
+                'SELECT key FROM completions ORDER BY accessed_at DESC '
+                'LIMIT -1 OFFSET ?)',
+                (self.max_disk_entries,),
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM completions')
+                self._db.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return created_at + self.ttl_seconds <= now
+
+    def _put_memory(self, key: str, created_at: float, completion: str) -> None:
+        self._memory[key] = (created_at, completion)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+_completion_caches: dict[str | None, CompletionCache] = {}
+_completion_caches_lock = threading.Lock()
+
+
+def get_completion_cache(path: str | None = None) -> CompletionCache:
+    """Get the completion cache shared by the process for a database path (or
+    for memory only, if there is no path)."""
+    with _completion_caches_lock:
+        cache = _completion_caches.get(path)
+        if cache is None:
+            cache = _completion_caches[path] = CompletionCache(path)
+        return cache
@@ -39,6 +39,7 @@ from litellm.utils import create_pretrained_tokenizer
 from openhands.core.exceptions import LLMNoResponseError
 from openhands.core.logger import openhands_logger as logger
 from openhands.core.message import Message
+from openhands.llm.completion_cache import CompletionCache, completion_cache_key
 from openhands.llm.debug_mixin import DebugMixin
 from openhands.llm.fn_call_converter import (
     STOP_WORDS,
@@ -46,6 +47,11 @@ from openhands.llm.fn_call_converter import (
     convert_non_fncall_messages_to_fncall_messages,
 )
 from openhands.llm.retry_mixin import RetryMixin
+from openhands.llm.token_count_cache import (
+    OVERHEAD_HASH,
+    get_token_count_cache,
+    message_hash,
+)
 
 __all__ = ['LLM']
 
@@ -66,6 +72,7 @@ class LLM(RetryMixin, DebugMixin):
 
     Attributes:
         config: an LLMConfig object specifying the configuration of the LLM.
+        completion_cache: if set, completions are cached by their parameters.
     """
 
     def __init__(
@@ -94,6 +101,7 @@ class LLM(RetryMixin, DebugMixin):
         self.model_info: ModelInfo | None = None
         self._function_calling_active: bool = False
         self.retry_listener = retry_listener
+        self.completion_cache: CompletionCache | None = None
         if self.config.log_completions:
             if self.config.log_completions_folder is None:
                 raise RuntimeError(
@@ -331,28 +339,50 @@ class LLM(RetryMixin, DebugMixin):
             if 'litellm_proxy' not in self.config.model:
                 kwargs.pop('extra_body', None)
 
-            # Record start time for latency measurement
-            start_time = time.time()
-            # we don't support streaming here, thus we get a ModelResponse
-
-            # Suppress httpx deprecation warnings during LiteLLM calls
-            # This prevents the "Use 'content=<...>' to upload raw bytes/text content" warning
-            # that appears when LiteLLM makes HTTP requests to LLM providers
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    'ignore', category=DeprecationWarning, module='httpx.*'
-                )
-                warnings.filterwarnings(
-                    'ignore',
-                    message=r'.*content=.*upload.*',
-                    category=DeprecationWarning,
+            # look up the completion, before any conversion of the response
+            cache_key: str | None = None
+            cached_completion: str | None = None
+            if self.completion_cache is not None:
+                cache_key = completion_cache_key(
+                    {
+                        **getattr(self._completion_unwrapped, 'keywords', {}),
+                        **kwargs,
+                    }
                 )
-                resp: ModelResponse = self._completion_unwrapped(*args, **kwargs)
+                cached_completion = self.completion_cache.get(cache_key)
+                self.metrics.add_completion_cache_lookup(cached_completion is not None)
+
+            if cached_completion is not None:
+                resp: ModelResponse = ModelResponse(**json.loads(cached_completion))
+            else:
+                # Record start time for latency measurement
+                start_time = time.time()
+                # we don't support streaming here, thus we get a ModelResponse
+
+                # Suppress httpx deprecation warnings during LiteLLM calls
+                # This prevents the "Use 'content=<...>' to upload raw bytes/text content" warning
+                # that appears when LiteLLM makes HTTP requests to LLM providers
+                with warnings.catch_warnings():
+                    warnings.filterwarnings(
+                        'ignore', category=DeprecationWarning, module='httpx.*'
+                    )
+                    warnings.filterwarnings(
+                        'ignore',
+                        message=r'.*content=.*upload.*',
+                        category=DeprecationWarning,
+                    )
+                    resp = self._completion_unwrapped(*args, **kwargs)
 
-            # Calculate and record latency
-            latency = time.time() - start_time
-            response_id = resp.get('id', 'unknown')
-            self.metrics.add_response_latency(latency, response_id)
+                # Calculate and record latency
+                latency = time.time() - start_time
+                response_id = resp.get('id', 'unknown')
+                self.metrics.add_response_latency(latency, response_id)
+                if (
+                    self.completion_cache is not None
+                    and cache_key is not None
+                    and resp.get('choices')
+                ):
+                    self.completion_cache.put(cache_key, json.dumps(resp))
 
             non_fncall_response = copy.deepcopy(resp)
 
@@ -389,7 +419,8 @@ class LLM(RetryMixin, DebugMixin):
             self.log_response(resp)
 
             # post-process the response first to calculate cost
-            cost = self._post_completion(resp)
+            # a cached completion was already paid for
+            cost = 0.0 if cached_completion is not None else self._post_completion(resp)
 
             # log for evals or other scripts that need the raw completion
             if self.config.log_completions:
@@ -700,6 +731,56 @@ class LLM(RetryMixin, DebugMixin):
         Returns:
             int: The number of tokens.
         """
+        return self.get_token_counts([messages])[0]
+
+    def get_token_counts(
+        self, message_lists: list[list[dict] | list[Message]]
+    ) -> list[int]:
+        """Get the number of tokens in each of several lists of messages, such as
+        the candidate views considered when deciding how much to condense.
+
+        Each distinct message is counted once, and the counts are cached for the
+        model and tokenizer, so lists sharing a prefix cost little more than one.
+
+        Args:
+            message_lists (list): Lists of messages, each either a list of dicts or a list of Message objects.
+
+        Returns:
+            list[int]: The number of tokens in each list.
+        """
+        # try to get the token count with the default litellm tokenizers
+        # or the custom tokenizer if set for this LLM configuration
+        try:
+            formatted = [
+                self._format_messages_for_token_count(messages)
+                for messages in message_lists
+            ]
+            overhead = self._get_cached_token_count(OVERHEAD_HASH, [])
+            results = []
+            for messages in formatted:
+                total = overhead
+                for message in messages:
+                    count = self._get_cached_token_count(
+                        message_hash(message), [message]
+                    )
+                    total += count - overhead
+                results.append(total)
+            return results
+        except Exception as e:
+            # limit logspam in case token count is not supported
+            logger.error(
+                f'Error getting token count for\n model {self.config.model}\n{e}'
+                + (
+                    f'\ncustom_tokenizer: {self.config.custom_tokenizer}'
+                    if self.config.custom_tokenizer is not None
+                    else ''
+                )
+            )
+            return [0] * len(message_lists)
+
+    def _format_messages_for_token_count(
+        self, messages: list[dict] | list[Message]
+    ) -> list[dict]:
         # attempt to convert Message objects to dicts, litellm expects dicts
         if (
             isinstance(messages, list)
@@ -717,29 +798,24 @@ class LLM(RetryMixin, DebugMixin):
             # We've already asserted that messages is a list of Message objects
             # Use explicit typing to satisfy mypy
             messages_typed: list[Message] = messages  # type: ignore
-            messages = self.format_messages_for_llm(messages_typed)
-
-        # try to get the token count with the default litellm tokenizers
-        # or the custom tokenizer if set for this LLM configuration
-        try:
-            return int(
+            return self.format_messages_for_llm(messages_typed)
+        return messages  # type: ignore[return-value]
+
+    def _get_cached_token_count(self, content_hash: bytes, messages: list[dict]) -> int:
+        """Get the token count for a list of at most one message, using the cache."""
+        cache = get_token_count_cache()
+        tokenizer = self.config.custom_tokenizer or ''
+        count = cache.get(self.config.model, tokenizer, content_hash)
+        if count is None:
+            count = int(
                 litellm.token_counter(
                     model=self.config.model,
                     messages=messages,
                     custom_tokenizer=self.tokenizer,
                 )
             )
-        except Exception as e:
-            # limit logspam in case token count is not supported
-            logger.error(
-                f'Error getting token count for\n model {self.config.model}\n{e}'
-                + (
-                    f'\ncustom_tokenizer: {self.config.custom_tokenizer}'
-                    if self.config.custom_tokenizer is not None
-                    else ''
-                )
-            )
-            return 0
+            cache.put(self.config.model, tokenizer, content_hash, count)
+        return count
 
     def _is_local(self) -> bool:
         """Determines if the system is using a locally running LLM.
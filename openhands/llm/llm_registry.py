@@ -6,6 +6,7 @@
 # Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
 # Tag: Legacy-V0
 import copy
+import os
 from typing import Any, Callable
 from uuid import uuid4
 
@@ -15,8 +16,13 @@ from openhands.core.config.agent_config import AgentConfig
 from openhands.core.config.llm_config import LLMConfig
 from openhands.core.config.openhands_config import OpenHandsConfig
 from openhands.core.logger import openhands_logger as logger
+from openhands.llm.completion_cache import CompletionCache, get_completion_cache
 from openhands.llm.llm import LLM
 
+# Services whose completions are cached when the completion cache is enabled.
+# Their prompts are often sent again, e.g.: when a conversation is resumed.
+COMPLETION_CACHE_SERVICE_IDS = ('condenser', 'conversation_title_creator')
+
 
 class RegistryEvent(BaseModel):
     llm: LLM
@@ -39,12 +45,20 @@ class LLMRegistry:
         self.retry_listner = retry_listener
         self.agent_to_llm_config = self.config.get_agent_to_llm_config_map()
         self.service_to_llm: dict[str, LLM] = {}
+        self.service_to_completion_cache: dict[str, CompletionCache] = {}
         self.subscriber: Callable[[Any], None] | None = None
 
         selected_agent_cls = self.config.default_agent
         if agent_cls:
             selected_agent_cls = agent_cls
 
+        if self.config.enable_completion_cache:
+            cache = get_completion_cache(
+                os.path.join(self.config.cache_dir, 'completions.sqlite3')
+            )
+            for service_id in COMPLETION_CACHE_SERVICE_IDS:
+                self.attach_completion_cache(service_id, cache)
+
         agent_name = selected_agent_cls if selected_agent_cls is not None else 'agent'
         llm_config = self.config.get_llm_config_from_agent(agent_name)
         self.active_agent_llm: LLM = self.get_llm('agent', llm_config)
@@ -58,10 +72,23 @@ class LLMRegistry:
             )
         else:
             llm = LLM(service_id=service_id, config=config)
+        llm.completion_cache = self.service_to_completion_cache.get(service_id)
         self.service_to_llm[service_id] = llm
         self.notify(RegistryEvent(llm=llm, service_id=service_id))
         return llm
 
+    def attach_completion_cache(
+        self, service_id: str, cache: CompletionCache | None
+    ) -> None:
+        """Cache the completions of the LLM for a service, or stop caching them if
+        the cache is None."""
+        if cache is None:
+            self.service_to_completion_cache.pop(service_id, None)
+        else:
+            self.service_to_completion_cache[service_id] = cache
+        if service_id in self.service_to_llm:
+            self.service_to_llm[service_id].completion_cache = cache
+
     def request_extraneous_completion(
         self, service_id: str, llm_config: LLMConfig, messages: list[dict[str, str]]
     ) -> str:
@@ -58,6 +58,7 @@ class Metrics:
       - max_budget_per_task (budget limit)
       - A list of ResponseLatency
       - A list of TokenUsage (one per call).
+      - Hits and misses of the completion cache, if the LLM has one.
     """
 
     def __init__(self, model_name: str = 'default') -> None:
@@ -76,6 +77,8 @@ class Metrics:
             context_window=0,
             response_id='',
         )
+        self._completion_cache_hits = 0
+        self._completion_cache_misses = 0
 
     @property
     def accumulated_cost(self) -> float:
@@ -134,6 +137,26 @@ class Metrics:
             )
         return self._accumulated_token_usage
 
+    @property
+    def completion_cache_hits(self) -> int:
+        # older pickled objects lack the completion cache fields
+        return getattr(self, '_completion_cache_hits', 0)
+
+    @property
+    def completion_cache_misses(self) -> int:
+        return getattr(self, '_completion_cache_misses', 0)
+
+    @property
+    def completion_cache_hit_rate(self) -> float:
+        lookups = self.completion_cache_hits + self.completion_cache_misses
+        return self.completion_cache_hits / lookups if lookups else 0.0
+
+    def add_completion_cache_lookup(self, hit: bool) -> None:
+        if hit:
+            self._completion_cache_hits = self.completion_cache_hits + 1
+        else:
+            self._completion_cache_misses = self.completion_cache_misses + 1
+
     def add_cost(self, value: float) -> None:
         if value < 0:
             raise ValueError('Added cost cannot be negative.')
@@ -196,6 +219,12 @@ class Metrics:
         # use the property so older picked objects that lack the field won't crash
         self.token_usages += other.token_usages
         self.response_latencies += other.response_latencies
+        self._completion_cache_hits = (
+            self.completion_cache_hits + other.completion_cache_hits
+        )
+        self._completion_cache_misses = (
+            self.completion_cache_misses + other.completion_cache_misses
+        )
 
         # Merge accumulated token usage using the __add__ operator
         self._accumulated_token_usage = (
@@ -213,6 +242,8 @@ class Metrics:
                 latency.model_dump() for latency in self._response_latencies
             ],
             'token_usages': [usage.model_dump() for usage in self._token_usages],
+            'completion_cache_hits': self.completion_cache_hits,
+            'completion_cache_misses': self.completion_cache_misses,
         }
 
     def log(self) -> str:
@@ -260,6 +291,13 @@ class Metrics:
         # Include only token usages that were added after the baseline
         result._token_usages = self._token_usages[len(baseline._token_usages) :]
 
+        result._completion_cache_hits = (
+            self.completion_cache_hits - baseline.completion_cache_hits
+        )
+        result._completion_cache_misses = (
+            self.completion_cache_misses - baseline.completion_cache_misses
+        )
+
         # Calculate accumulated token usage difference
         base_usage = baseline.accumulated_token_usage
         current_usage = self.accumulated_token_usage
@@ -0,0 +1,70 @@
+"""Process-wide cache of the token counts of LLM messages.
+
+litellm counts the tokens of each message in a list independently, and adds a
+fixed number of tokens to prime the reply. So the count for a list of messages
+is that overhead plus the sum of the counts for each message. Counts are cached
+by a hash of the message content for each model and tokenizer, so counting a
+conversation which has grown since it was last counted only tokenizes the new
+messages.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# The hash used for the tokens added to a list of messages regardless of content
+OVERHEAD_HASH = b''
+
+
+def message_hash(message: dict) -> bytes:
+    """Get a hash of the content of a message, formatted as sent to the LLM."""
+    content = json.dumps(message, sort_keys=True, default=str)
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+
+class TokenCountCache:
+    """LRU cache of token counts, keyed by model, tokenizer and message hash."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._counts: OrderedDict[tuple[str, str, bytes], int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: str, tokenizer: str, content_hash: bytes) -> int | None:
+        key = (model, tokenizer, content_hash)
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._counts.move_to_end(key)
+            return count
+
+    def put(self, model: str, tokenizer: str, content_hash: bytes, count: int):
+        with self._lock:
+            self._counts[(model, tokenizer, content_hash)] = count
+            self._counts.move_to_end((model, tokenizer, content_hash))
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+_token_count_cache = TokenCountCache()
+
+
+def get_token_count_cache() -> TokenCountCache:
+    return _token_count_cache
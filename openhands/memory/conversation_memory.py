@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Generator
 
 from litellm import ModelResponse
@@ -54,12 +55,31 @@ from openhands.utils.prompt import (
 )
 
 
+@dataclass
+class _RenderedEvent:
+    """The messages rendered from an event, with the parameters used."""
+
+    event: Event
+    params: tuple[int | None, bool, bool]
+    messages: list[Message]
+    pending_tool_call_action_messages: dict[str, Message]
+    tool_call_id_to_message: dict[str, Message]
+
+
 class ConversationMemory:
-    """Processes event history into a coherent conversation for the agent."""
+    """Processes event history into a coherent conversation for the agent.
+
+    The messages rendered from each event are cached between calls to
+    process_events, so a step only renders the events added since the last one.
+    Events are treated as immutable once they are in the history.
+    """
 
     def __init__(self, config: AgentConfig, prompt_manager: PromptManager):
         self.agent_config = config
         self.prompt_manager = prompt_manager
+        # Keyed by the id() of the event. Each entry holds a reference to the
+        # event, so the id cannot be reused while the entry exists.
+        self._render_cache: dict[int, _RenderedEvent] = {}
 
     @staticmethod
     def _is_valid_image_url(url: str | None) -> bool:
@@ -114,27 +134,37 @@ class ConversationMemory:
         # Process regular events
         pending_tool_call_action_messages: dict[str, Message] = {}
         tool_call_id_to_message: dict[str, Message] = {}
+        # Names of the microagents in the recall observations processed so far
+        earlier_agent_names: set[str] = set()
+        # Only the events still in the history are kept in the cache
+        render_cache: dict[int, _RenderedEvent] = {}
 
         for i, event in enumerate(events):
             # create a regular message from an event
-            if isinstance(event, Action):
-                messages_to_add = self._process_action(
-                    action=event,
-                    pending_tool_call_action_messages=pending_tool_call_action_messages,
-                    vision_is_active=vision_is_active,
-                )
-            elif isinstance(event, Observation):
-                messages_to_add = self._process_observation(
-                    obs=event,
-                    tool_call_id_to_message=tool_call_id_to_message,
-                    max_message_chars=max_message_chars,
-                    vision_is_active=vision_is_active,
-                    enable_som_visual_browsing=self.agent_config.enable_som_visual_browsing,
-                    current_index=i,
-                    events=events,
+            rendered = self._render_event(
+                event,
+                i,
+                events,
+                max_message_chars,
+                vision_is_active,
+                earlier_agent_names,
+            )
+            if not self._depends_on_earlier_events(event):
+                render_cache[id(event)] = rendered
+            if isinstance(event, RecallObservation):
+                earlier_agent_names.update(
+                    agent.name for agent in event.microagent_knowledge
                 )
-            else:
-                raise ValueError(f'Unknown event type: {type(event)}')
+
+            # Messages are copied, as the callers modify the messages returned
+            messages_to_add = [_copy_message(m) for m in rendered.messages]
+            for (
+                response_id,
+                message,
+            ) in rendered.pending_tool_call_action_messages.items():
+                pending_tool_call_action_messages[response_id] = _copy_message(message)
+            for tool_call_id, message in rendered.tool_call_id_to_message.items():
+                tool_call_id_to_message[tool_call_id] = _copy_message(message)
 
             # Check pending tool call action messages and see if they are complete
             _response_ids_to_remove = []
@@ -164,6 +194,8 @@ class ConversationMemory:
 
             messages += messages_to_add
 
+        self._render_cache = render_cache
+
         # Apply final filtering so that the messages in context don't have unmatched tool calls
         # and tool responses, for example
         messages = list(ConversationMemory._filter_unmatched_tool_calls(messages))
@@ -173,6 +205,65 @@ class ConversationMemory:
 
         return messages
 
+    def _render_event(
+        self,
+        event: Event,
+        current_index: int,
+        events: list[Event],
+        max_message_chars: int | None,
+        vision_is_active: bool,
+        earlier_agent_names: set[str],
+    ) -> _RenderedEvent:
+        """Render the messages for an event, or get them from the cache if the
+        event was rendered with the same parameters before."""
+        params = (
+            max_message_chars,
+            vision_is_active,
+            self.agent_config.enable_som_visual_browsing,
+        )
+        cached = self._render_cache.get(id(event))
+        if cached is not None and cached.event is event and cached.params == params:
+            return cached
+
+        pending_tool_call_action_messages: dict[str, Message] = {}
+        tool_call_id_to_message: dict[str, Message] = {}
+        if isinstance(event, Action):
+            messages = self._process_action(
+                action=event,
+                pending_tool_call_action_messages=pending_tool_call_action_messages,
+                vision_is_active=vision_is_active,
+            )
+        elif isinstance(event, Observation):
+            messages = self._process_observation(
+                obs=event,
+                tool_call_id_to_message=tool_call_id_to_message,
+                max_message_chars=max_message_chars,
+                vision_is_active=vision_is_active,
+                enable_som_visual_browsing=self.agent_config.enable_som_visual_browsing,
+                current_index=current_index,
+                events=events,
+                earlier_agent_names=earlier_agent_names,
+            )
+        else:
+            raise ValueError(f'Unknown event type: {type(event)}')
+        return _RenderedEvent(
+            event=event,
+            params=params,
+            messages=messages,
+            pending_tool_call_action_messages=pending_tool_call_action_messages,
+            tool_call_id_to_message=tool_call_id_to_message,
+        )
+
+    @staticmethod
+    def _depends_on_earlier_events(event: Event) -> bool:
+        """Whether the messages for an event depend on the events before it, and
+        so cannot be cached."""
+        # Microagents already recalled earlier in the history are left out
+        return (
+            isinstance(event, RecallObservation)
+            and event.recall_type == RecallType.KNOWLEDGE
+        )
+
     def _apply_user_message_formatting(self, messages: list[Message]) -> list[Message]:
         """Applies formatting rules, such as adding newlines between consecutive user messages."""
         formatted_messages = []
@@ -181,10 +272,14 @@ class ConversationMemory:
             # Add double newline between consecutive user messages
             if msg.role == 'user' and prev_role == 'user' and len(msg.content) > 0:
                 # Find the first TextContent in the message to add newlines
-                for content_item in msg.content:
+                for i, content_item in enumerate(msg.content):
                     if isinstance(content_item, TextContent):
-                        # Prepend two newlines to ensure visual separation
-                        content_item.text = '\n\n' + content_item.text
+                        # Prepend two newlines to ensure visual separation. The
+                        # item is replaced, as it may be shared with cached
+                        # messages.
+                        msg.content[i] = content_item.model_copy(
+                            update={'text': '\n\n' + content_item.text}
+                        )
                         break
             formatted_messages.append(msg)
             prev_role = msg.role  # Update prev_role after processing each message
@@ -360,6 +455,7 @@ class ConversationMemory:
         enable_som_visual_browsing: bool = False,
         current_index: int = 0,
         events: list[Event] | None = None,
+        earlier_agent_names: set[str] | None = None,
     ) -> list[Message]:
         """Converts an observation into a message format that can be sent to the LLM.
 
@@ -384,6 +480,8 @@ class ConversationMemory:
             enable_som_visual_browsing: Whether to enable visual browsing for the SOM model
             current_index: The index of the current event in the events list (for deduplication)
             events: The list of all events (for deduplication)
+            earlier_agent_names: The names of the microagents in the recall observations
+                before the current one, if known (for deduplication without scanning events)
 
         Returns:
             list[Message]: A list containing the formatted message(s) for the observation.
@@ -640,7 +738,7 @@ class ConversationMemory:
                 # Use prompt manager to build the microagent info
                 # First, filter out agents that appear in earlier RecallObservations
                 filtered_agents = self._filter_agents_in_microagent_obs(
-                    obs, current_index, events or []
+                    obs, current_index, events or [], earlier_agent_names
                 )
 
                 # Create and return a message if there is microagent knowledge to include
@@ -699,17 +797,19 @@ class ConversationMemory:
         For new Anthropic API, we only need to mark the last user or tool message as cacheable.
         """
         if len(messages) > 0 and messages[0].role == 'system':
-            messages[0].content[-1].cache_prompt = True
+            _set_cache_prompt(messages[0])
         # NOTE: this is only needed for anthropic
         for message in reversed(messages):
             if message.role in ('user', 'tool'):
-                message.content[
-                    -1
-                ].cache_prompt = True  # Last item inside the message content
+                _set_cache_prompt(message)  # Last item inside the message content
                 break
 
     def _filter_agents_in_microagent_obs(
-        self, obs: RecallObservation, current_index: int, events: list[Event]
+        self,
+        obs: RecallObservation,
+        current_index: int,
+        events: list[Event],
+        earlier_agent_names: set[str] | None = None,
     ) -> list[MicroagentKnowledge]:
         """Filter out agents that appear in earlier RecallObservations.
 
@@ -717,6 +817,8 @@ class ConversationMemory:
             obs: The current RecallObservation to filter
             current_index: The index of the current event in the events list
             events: The list of all events
+            earlier_agent_names: The names of the agents in earlier RecallObservations,
+                if known. Otherwise the earlier events are searched.
 
         Returns:
             list[MicroagentKnowledge]: The filtered list of microagent knowledge
@@ -729,7 +831,12 @@ class ConversationMemory:
         for agent in obs.microagent_knowledge:
             # Keep this agent if it doesn't appear in any earlier observation
             # that is, if this is the first microagent observation with this microagent
-            if not self._has_agent_in_earlier_events(agent.name, current_index, events):
+            if earlier_agent_names is not None:
+                if agent.name not in earlier_agent_names:
+                    filtered_agents.append(agent)
+            elif not self._has_agent_in_earlier_events(
+                agent.name, current_index, events
+            ):
                 filtered_agents.append(agent)
 
         return filtered_agents
@@ -896,3 +1003,15 @@ class ConversationMemory:
                 'The user MessageAction at index 1 does not match the provided initial_user_action. '
                 'Proceeding with the one found in condensed history.'
             )
+
+
+def _copy_message(message: Message) -> Message:
+    """Copy a cached message for a caller, which may modify it. The content items
+    are shared, so they are replaced rather than modified when formatting the
+    messages or applying prompt caching."""
+    return message.model_copy(update={'content': list(message.content)})
+
+
+def _set_cache_prompt(message: Message) -> None:
+    """Mark the last content item of a message as cacheable."""
+    message.content[-1] = message.content[-1].model_copy(update={'cache_prompt': True})
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import overload
+from typing import Iterable, overload
 
 from pydantic import BaseModel
 
@@ -49,48 +49,99 @@ class View(BaseModel):
     @staticmethod
     def from_events(events: list[Event]) -> View:
         """Create a view from a list of events, respecting the semantics of any condensation events."""
-        forgotten_event_ids: set[int] = set()
-        for event in events:
-            if isinstance(event, CondensationAction):
-                forgotten_event_ids.update(event.forgotten)
-                # Make sure we also forget the condensation action itself
-                forgotten_event_ids.add(event.id)
-            if isinstance(event, CondensationRequestAction):
-                forgotten_event_ids.add(event.id)
+        builder = ViewBuilder()
+        builder.append(events)
+        return builder.view()
 
-        kept_events = [event for event in events if event.id not in forgotten_event_ids]
 
-        # If we have a summary, insert it at the specified offset.
-        summary: str | None = None
-        summary_offset: int | None = None
-
-        # The relevant summary is always in the last condensation event (i.e., the most recent one).
-        for event in reversed(events):
-            if isinstance(event, CondensationAction):
-                if event.summary is not None and event.summary_offset is not None:
-                    summary = event.summary
-                    summary_offset = event.summary_offset
-                    break
+class ViewBuilder:
+    """Maintains a view of a list of events as events are appended to it.
 
-        if summary is not None and summary_offset is not None:
-            logger.info(f'Inserting summary at offset {summary_offset}')
+    Appending events takes time proportional to the number of events appended,
+    plus the number of events kept when a condensation is applied, so a view can
+    be kept up to date over a long trajectory without rescanning the history on
+    every step. The set of forgotten event ids is copied only when it changes,
+    and is shared by the views produced until then.
+    """
 
-            kept_events.insert(
-                summary_offset, AgentCondensationObservation(content=summary)
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self.forgotten_event_ids: set[int] = set()
+        self._kept_events: list[Event] = []
+        # The relevant summary is always in the most recent condensation event
+        # with a summary.
+        self._summary: AgentCondensationObservation | None = None
+        self._summary_offset: int | None = None
+        # An unhandled condensation request is one closer to the end of the list
+        # than any condensation action.
+        self._unhandled_condensation_request = False
+        self._events: list[Event] | None = None
+        self._last_event: Event | None = None
+        self._num_events = 0
+        self._view: View | None = None
+
+    def append(self, events: Iterable[Event]) -> None:
+        """Apply the semantics of the events given, appended in order."""
+        forgotten_event_ids = self.forgotten_event_ids
+        copied = False
+        for event in events:
+            self._num_events += 1
+            if isinstance(event, (CondensationAction, CondensationRequestAction)):
+                if not copied:
+                    forgotten_event_ids = set(forgotten_event_ids)
+                    copied = True
+                # Make sure we also forget the condensation event itself
+                forgotten_event_ids.add(event.id)
+                if isinstance(event, CondensationRequestAction):
+                    self._unhandled_condensation_request = True
+                    continue
+                forgotten = event.forgotten
+                forgotten_event_ids.update(forgotten)
+                if forgotten:
+                    self._kept_events = [
+                        e for e in self._kept_events if e.id not in forgotten_event_ids
+                    ]
+                if event.summary is not None and event.summary_offset is not None:
+                    logger.info(f'Inserting summary at offset {event.summary_offset}')
+                    self._summary = AgentCondensationObservation(content=event.summary)
+                    self._summary_offset = event.summary_offset
+                self._unhandled_condensation_request = False
+            elif event.id not in forgotten_event_ids:
+                self._kept_events.append(event)
+        self.forgotten_event_ids = forgotten_event_ids
+        self._view = None
+
+    def update(self, events: list[Event]) -> View:
+        """Get the view of the events given, which are expected to be the events
+        previously seen with new events appended. If the list has been replaced or
+        truncated instead, the view is rebuilt from scratch."""
+        num_seen = self._num_events
+        if (
+            events is not self._events
+            or len(events) < num_seen
+            or (num_seen and events[num_seen - 1] is not self._last_event)
+        ):
+            self._reset()
+            self._events = events
+            num_seen = 0
+        if len(events) > num_seen:
+            self.append(events[num_seen:])
+            self._last_event = events[-1]
+        return self.view()
+
+    def view(self) -> View:
+        """Get the view of the events appended so far."""
+        if self._view is None:
+            events = list(self._kept_events)
+            if self._summary is not None and self._summary_offset is not None:
+                events.insert(self._summary_offset, self._summary)
+            # The events were validated when they were created, so the view is
+            # constructed without validating (and copying) them again
+            self._view = View.model_construct(
+                events=events,
+                unhandled_condensation_request=self._unhandled_condensation_request,
+                forgotten_event_ids=self.forgotten_event_ids,
             )
-
-        # Check for an unhandled condensation request -- these are events closer to the
-        # end of the list than any condensation action.
-        unhandled_condensation_request = False
-        for event in reversed(events):
-            if isinstance(event, CondensationAction):
-                break
-            if isinstance(event, CondensationRequestAction):
-                unhandled_condensation_request = True
-                break
-
-        return View(
-            events=kept_events,
-            unhandled_condensation_request=unhandled_condensation_request,
-            forgotten_event_ids=forgotten_event_ids,
-        )
+        return self._view
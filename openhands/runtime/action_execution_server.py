@@ -76,6 +76,11 @@ from openhands.runtime.plugins import ALL_PLUGINS, JupyterPlugin, Plugin, VSCode
 from openhands.runtime.utils import find_available_tcp_port
 from openhands.runtime.utils.bash import BashSession
 from openhands.runtime.utils.files import insert_lines, read_lines
+from openhands.runtime.utils.git_change_tracker import (
+    GitChangeTracker,
+    GitChangeTrackingFailed,
+    GitChangeTrackingUnavailable,
+)
 from openhands.runtime.utils.memory_monitor import MemoryMonitor
 from openhands.runtime.utils.runtime_init import init_user_and_working_directory
 from openhands.runtime.utils.system_stats import (
@@ -213,6 +218,7 @@ class ActionExecutor:
         self._initialized = False
         self.downloaded_files: list[str] = []
         self.downloads_directory = '/workspace/.downloads'
+        self.git_change_trackers: dict[str, GitChangeTracker] = {}
 
         self.max_memory_gb: int | None = None
         if _override_max_memory_gb := os.environ.get('RUNTIME_MAX_MEMORY_GB', None):
@@ -233,6 +239,12 @@ class ActionExecutor:
     def initial_cwd(self):
         return self._initial_cwd
 
+    def get_git_change_tracker(self, cwd: str) -> GitChangeTracker:
+        tracker = self.git_change_trackers.get(cwd)
+        if tracker is None:
+            tracker = self.git_change_trackers[cwd] = GitChangeTracker(cwd)
+        return tracker
+
     async def _init_browser_async(self):
         """Initialize the browser asynchronously."""
         if not self.enable_browser:
@@ -655,6 +667,8 @@ class ActionExecutor:
             self.bash_session.close()
         if self.browser is not None:
             self.browser.close()
+        for tracker in self.git_change_trackers.values():
+            tracker.close()
 
 
 if __name__ == '__main__':
@@ -1077,6 +1091,46 @@ if __name__ == '__main__':
             logger.exception(f'Error listing files: {e}')
             return JSONResponse(content=[])
 
+    # ================================
+    # Git operations for UI
+    # ================================
+
+    @app.post('/git/changes')
+    async def get_git_changes(request: Request):
+        """Get the changed files of the git repos in a directory, tracking them
+        incrementally rather than running git_changes.py each time.
+
+        Responds with a 501 if the changes can't be tracked, in which case the
+        caller should run git_changes.py instead, or with a 503 if they could not
+        be tracked this time (e.g.: while a repo is being cloned).
+        """
+        assert client is not None
+        request_dict = await request.json()
+        cwd = request_dict.get('cwd') or client.initial_cwd
+        tracker = client.get_git_change_tracker(cwd)
+        try:
+            return await call_sync_from_async(tracker.get_git_changes)
+        except GitChangeTrackingUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        except GitChangeTrackingFailed as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+    @app.post('/git/diff')
+    async def get_git_diff(request: Request):
+        """Get the original and modified content of a file, as with git_diff.py."""
+        assert client is not None
+        request_dict = await request.json()
+        cwd = request_dict.get('cwd') or client.initial_cwd
+        tracker = client.get_git_change_tracker(cwd)
+        try:
+            return await call_sync_from_async(
+                tracker.get_git_diff, request_dict['file_path']
+            )
+        except GitChangeTrackingUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        except GitChangeTrackingFailed as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
     logger.debug(f'Starting action execution API on port {args.port}')
     # When LOG_JSON=1, provide a JSON log config to Uvicorn so error/access logs are structured
     log_config = None
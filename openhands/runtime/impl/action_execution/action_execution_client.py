@@ -90,6 +90,8 @@ class ActionExecutionClient(Runtime):
         self.action_semaphore = threading.Semaphore(1)  # Ensure one action at a time
         self._runtime_closed: bool = False
         self._vscode_token: str | None = None  # initial dummy value
+        # Whether the action execution server can track git changes
+        self._git_change_tracking: bool = True
         self._last_updated_mcp_stdio_servers: list[MCPStdioServerConfig] = []
         super().__init__(
             config,
@@ -280,6 +282,42 @@ class ActionExecutionClient(Runtime):
         else:
             return ''
 
+    def get_git_changes(self, cwd: str) -> list[dict[str, str]] | None:
+        response = self._send_git_request('changes', {'cwd': cwd})
+        if response is None:
+            return super().get_git_changes(cwd)
+        return response.json()
+
+    def get_git_diff(self, file_path: str, cwd: str) -> dict[str, str]:
+        response = self._send_git_request('diff', {'cwd': cwd, 'file_path': file_path})
+        if response is None:
+            return super().get_git_diff(file_path, cwd)
+        return response.json()
+
+    def _send_git_request(self, operation: str, data: dict) -> httpx.Response | None:
+        """Send a git request to the action execution server, which answers from the
+        changes it tracks. Returns None if the git scripts should be run instead."""
+        if not self._git_change_tracking:
+            return None
+        try:
+            return self._send_action_server_request(
+                'POST',
+                f'{self.action_execution_server_url}/git/{operation}',
+                json=data,
+                timeout=30,
+            )
+        except httpx.HTTPError as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (
+                404,
+                501,
+            ):
+                # Older servers don't track changes, and others can't (For example
+                # where inotify is unavailable)
+                self._git_change_tracking = False
+            else:
+                self.log('warning', f'Error getting tracked git {operation}: {e}')
+            return None
+
     def send_action_for_execution(self, action: Action) -> Observation:
         if (
             isinstance(action, FileEditAction)
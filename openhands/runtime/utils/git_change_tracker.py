@@ -0,0 +1,460 @@
+# IMPORTANT: LEGACY V0 CODE - Deprecated since version 1.0.0, scheduled for removal April 1, 2026
+# This file is part of the legacy (V0) implementation of OpenHands and will be removed soon as we complete the migration to V1.
+# OpenHands V1 uses the Software Agent SDK for the agentic core and runs a new application server. Please refer to:
+#   - V1 agentic core (SDK): https://github.com/OpenHands/software-agent-sdk
+#   - V1 application server (in this repo): openhands/app_server/
+# Unless you are working on deprecation, please avoid extending this legacy file and consult the V1 codepaths above.
+# Tag: Legacy-V0
+"""Incremental tracking of git changes in a workspace, for the action execution server.
+
+Running git_changes.py scans every repo in the workspace on each request, and
+finding the ref to compare against runs several git commands (One of which
+contacts the remote). The tracker instead watches the workspace with inotify: the
+ref of each repo is cached until HEAD or a ref changes, and the changes are only
+recomputed for paths which were modified since the last request.
+
+Where inotify is unavailable the tracker raises GitChangeTrackingUnavailable, and
+the caller should fall back to running git_changes.py from then on. Where git
+fails (For example while a repo is being cloned, or is locked during a rebase) it
+raises GitChangeTrackingFailed, and the caller should fall back for that request
+only: the tracker starts again on the next one.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import glob
+import os
+import shlex
+import struct
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from openhands.core.logger import openhands_logger as logger
+from openhands.runtime.utils import git_changes, git_diff
+
+# Past this many modified paths in a repo, it is cheaper to rescan the whole repo
+MAX_DIRTY_PATHS = 1000
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+    | IN_DONT_FOLLOW
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Errors from inotify which will not go away by trying again (The limits on
+# watches and instances, or no inotify in the kernel)
+_UNAVAILABLE_ERRNOS = (errno.ENOSPC, errno.EMFILE, errno.ENOSYS)
+
+
+def _is_quoted_by_git(path: str) -> bool:
+    """Whether git quotes the path in its output, so it can't be matched to a change."""
+    return not (path.isascii() and path.isprintable()) or '"' in path or '\\' in path
+
+
+class GitChangeTrackingUnavailable(Exception):
+    """Raised when changes can't be tracked, and a full scan should be used instead."""
+
+
+class GitChangeTrackingFailed(Exception):
+    """Raised when changes could not be tracked this time, and a full scan should
+    be used for this request only."""
+
+
+class Inotify:
+    """Minimal non blocking inotify instance, using libc through ctypes."""
+
+    _libc: ctypes.CDLL | None = None
+    _libc_loaded = False
+
+    def __init__(self):
+        libc = self.get_libc()
+        if libc is None:
+            raise GitChangeTrackingUnavailable('inotify_unavailable')
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    @classmethod
+    def get_libc(cls) -> ctypes.CDLL | None:
+        """Get libc if it supports inotify, loading it only once."""
+        if not cls._libc_loaded:
+            try:
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library('c') or 'libc.so.6', use_errno=True
+                )
+                for name in ('inotify_init1', 'inotify_add_watch', 'inotify_rm_watch'):
+                    getattr(libc, name)
+                cls._libc = libc
+            except (OSError, AttributeError):
+                cls._libc = None
+            cls._libc_loaded = True
+        return cls._libc
+
+    def add_watch(self, path: str, mask: int = _WATCH_MASK) -> int | None:
+        """Watch the directory given, returning None if it no longer exists."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return None
+            raise OSError(error, f'{os.strerror(error)}: {path}')
+        return wd
+
+    def remove_watch(self, wd: int):
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> Iterator[tuple[int, int, str]]:
+        """Yield the pending events as (watch descriptor, mask, name) tuples."""
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b'\0'))
+                offset += length
+                yield wd, mask, name
+
+    def close(self):
+        os.close(self.fd)
+
+
+@dataclass
+class _Repo:
+    path: str
+    # Prefix for the paths of changes, relative to the workspace
+    prefix: str
+    # Directories of nested repos, which are excluded from the changes of this one
+    excluded: list[str] = field(default_factory=list)
+    ref: str | None = None
+    ref_loaded: bool = False
+    # Status by path, or None if the repo needs a full scan
+    changes: dict[str, str] | None = None
+    # Paths (Relative to the repo) modified since the changes were computed
+    dirty: set[str] = field(default_factory=set)
+
+    def invalidate(self):
+        self.ref_loaded = False
+        self.changes = None
+        self.dirty.clear()
+
+
+@dataclass
+class _Watch:
+    # None for directories of the workspace which are not in a repo
+    repo: _Repo | None
+    # Path of the directory, relative to the repo
+    path: str
+    is_git_dir: bool = False
+
+
+class GitChangeTracker:
+    """Tracks the git changes of the repos in a workspace, as reported by git_changes.py."""
+
+    def __init__(self, cwd: str, max_dirty_paths: int = MAX_DIRTY_PATHS):
+        self.cwd = str(Path(cwd).resolve())
+        self.max_dirty_paths = max_dirty_paths
+        self._lock = threading.Lock()
+        self._inotify: Inotify | None = None
+        self._repos: list[_Repo] | None = None
+        self._watches: dict[int, _Watch] = {}
+        self._unavailable: str | None = None
+
+    def get_git_changes(self) -> list[dict[str, str]]:
+        with self._lock:
+            self._sync()
+            assert self._repos is not None
+            changes = []
+            try:
+                for repo in self._repos:
+                    for path, status in self._get_repo_changes(repo).items():
+                        if not any(
+                            path == excluded or path.startswith(excluded + '/')
+                            for excluded in repo.excluded
+                        ):
+                            changes.append(
+                                {'status': status, 'path': repo.prefix + path}
+                            )
+            except (OSError, RuntimeError) as e:
+                raise GitChangeTrackingFailed(str(e) or type(e).__name__) from e
+            changes.sort(key=lambda change: change['path'])
+            return changes
+
+    def get_git_diff(self, file_path: str) -> dict[str, str]:
+        with self._lock:
+            self._sync()
+            try:
+                return git_diff.get_git_diff(file_path, self.cwd, self._get_ref)
+            except (OSError, RuntimeError) as e:
+                raise GitChangeTrackingFailed(str(e) or type(e).__name__) from e
+
+    def close(self):
+        with self._lock:
+            self._reset()
+            self._unavailable = 'closed'
+
+    def _sync(self):
+        """Start tracking if needed, and apply the changes since the last call."""
+        if self._unavailable:
+            raise GitChangeTrackingUnavailable(self._unavailable)
+        try:
+            if self._repos is None:
+                self._start()
+            self._read_events()
+            if self._repos is None:
+                # The layout of the workspace changed
+                self._start()
+        except (OSError, RuntimeError, GitChangeTrackingUnavailable) as e:
+            self._reset()
+            reason = str(e) or type(e).__name__
+            if isinstance(e, GitChangeTrackingUnavailable) or (
+                isinstance(e, OSError) and e.errno in _UNAVAILABLE_ERRNOS
+            ):
+                # For example the inotify watch limit was reached
+                logger.warning(f'GitChangeTracker:unavailable:{self.cwd}:{reason}')
+                self._unavailable = reason
+                raise GitChangeTrackingUnavailable(reason) from e
+            # For example a repo is being cloned, or git is locked during a
+            # rebase: start again on the next call
+            logger.info(f'GitChangeTracker:failed:{self.cwd}:{reason}')
+            raise GitChangeTrackingFailed(reason) from e
+
+    def _start(self):
+        self._inotify = Inotify()
+        repos = []
+        if os.path.exists(os.path.join(self.cwd, '.git')):
+            repos.append(_Repo(self.cwd, ''))
+        elif self._run_git('rev-parse --is-inside-work-tree', self.cwd, check=False):
+            # git_changes.py reports the enclosing repo with a mix of relative
+            # paths, which isn't worth reproducing
+            raise GitChangeTrackingUnavailable('workspace_inside_repo')
+        else:
+            self._add_watch(self.cwd, _Watch(None, ''))
+
+        # Nested repos, matching those found by git_changes.py
+        for git_path in sorted(glob.glob('./*/.git', root_dir=self.cwd)):
+            name = os.path.dirname(git_path)[2:]
+            repos.append(_Repo(os.path.join(self.cwd, name), name + '/'))
+            if repos[0].prefix == '':
+                repos[0].excluded.append(name)
+        if not repos or repos[0].prefix:
+            for entry in os.scandir(self.cwd):
+                if entry.is_dir(follow_symlinks=False) and not any(
+                    repo.prefix == entry.name + '/' for repo in repos
+                ):
+                    self._add_watch(entry.path, _Watch(None, entry.name))
+
+        for repo in repos:
+            git_dirs = self._run_git(
+                'rev-parse --absolute-git-dir --git-common-dir', repo.path
+            ).splitlines()
+            for git_dir in {os.path.join(repo.path, d) for d in git_dirs}:
+                self._add_watch(git_dir, _Watch(repo, '', is_git_dir=True))
+                self._watch_tree(repo, os.path.join(git_dir, 'refs'), is_git_dir=True)
+            self._watch_tree(repo, repo.path)
+        self._repos = repos
+
+    def _reset(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._repos = None
+        self._watches.clear()
+
+    def _add_watch(self, path: str, watch: _Watch):
+        assert self._inotify is not None
+        wd = self._inotify.add_watch(path)
+        if wd is not None:
+            self._watches[wd] = watch
+
+    def _watch_tree(self, repo: _Repo, path: str, is_git_dir: bool = False):
+        """Watch the directory given and those below it, skipping those git ignores."""
+        ignored = set() if is_git_dir else self._get_ignored_dirs(repo, path)
+        for dir_path, dir_names, _ in os.walk(path):
+            relative_dir = os.path.relpath(dir_path, repo.path)
+            relative_dir = '' if relative_dir == '.' else relative_dir
+            self._add_watch(dir_path, _Watch(repo, relative_dir, is_git_dir))
+            dir_names[:] = [
+                name
+                for name in dir_names
+                if name != '.git'
+                and os.path.join(relative_dir, name) not in ignored
+                and (relative_dir or name not in repo.excluded)
+            ]
+
+    def _get_ignored_dirs(self, repo: _Repo, path: str) -> set[str]:
+        """Get the ignored directories under the path given, relative to the repo."""
+        pathspec = ''
+        if path != repo.path:
+            pathspec = ' -- ' + shlex.quote(os.path.relpath(path, repo.path))
+        output = self._run_git(
+            'ls-files --others --ignored --exclude-standard --directory'
+            f' --no-empty-directory{pathspec}',
+            repo.path,
+        )
+        return {line[:-1] for line in output.splitlines() if line.endswith('/')}
+
+    def _run_git(self, args: str, cwd: str, check: bool = True) -> str:
+        try:
+            return git_changes.run(
+                f'git --literal-pathspecs --no-pager -c core.quotePath=false {args}',
+                cwd,
+            )
+        except RuntimeError:
+            if check:
+                raise
+            return ''
+
+    def _read_events(self):
+        assert self._inotify is not None
+        new_dirs: list[tuple[_Repo | None, str, bool]] = []
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so start again from scratch
+                self._reset()
+                return
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                continue
+            if not name:
+                # Events for the watched directory itself are reported by its parent
+                continue
+            repo = watch.repo
+            is_dir = bool(mask & IN_ISDIR)
+            is_new_dir = is_dir and bool(mask & (IN_CREATE | IN_MOVED_TO))
+            if watch.is_git_dir:
+                if name.endswith('.lock'):
+                    continue
+                assert repo is not None
+                if name == 'index' and not watch.path:
+                    # Which files are tracked may have changed, but not the ref. (git
+                    # diff also rewrites the index when it finds unmodified files)
+                    repo.changes = None
+                else:
+                    # HEAD or a ref changed
+                    repo.invalidate()
+                if is_new_dir and watch.path:
+                    new_dirs.append((repo, os.path.join(watch.path, name), True))
+                continue
+            if name == '.git' or self._is_nested_repo(watch, name, is_dir):
+                # A repo was added or removed
+                self._reset()
+                return
+            if repo is None:
+                if is_new_dir and not watch.path:
+                    # Watch for the directory becoming a repo
+                    new_dirs.append((None, name, False))
+                continue
+            if name == '.gitignore':
+                # The files git ignores changed, and so do the directories to watch
+                self._reset()
+                return
+            path = os.path.join(watch.path, name)
+            repo.dirty.add(path)
+            if is_dir and mask & IN_MOVED_FROM:
+                self._remove_watches(repo, path)
+            elif is_new_dir:
+                new_dirs.append((repo, path, False))
+
+        for repo, path, is_git_dir in new_dirs:
+            if repo is None:
+                self._add_watch(os.path.join(self.cwd, path), _Watch(None, path))
+            else:
+                self._watch_tree(repo, os.path.join(repo.path, path), is_git_dir)
+
+    def _is_nested_repo(self, watch: _Watch, name: str, is_dir: bool) -> bool:
+        """Whether the entry given is (Or was) a repo at the top of the workspace."""
+        if not is_dir or watch.path or (watch.repo and watch.repo.prefix):
+            return False
+        return any(
+            repo.prefix == name + '/' for repo in self._repos or ()
+        ) or os.path.exists(os.path.join(self.cwd, name, '.git'))
+
+    def _remove_watches(self, repo: _Repo, path: str):
+        assert self._inotify is not None
+        for wd, watch in list(self._watches.items()):
+            if (
+                watch.repo is repo
+                and not watch.is_git_dir
+                and (watch.path == path or watch.path.startswith(path + os.sep))
+            ):
+                self._inotify.remove_watch(wd)
+                del self._watches[wd]
+
+    def _get_ref(self, repo_dir: str) -> str | None:
+        for repo in self._repos or ():
+            if repo.path == repo_dir:
+                if not repo.ref_loaded:
+                    repo.ref = git_changes.get_valid_ref(repo.path)
+                    repo.ref_loaded = True
+                    repo.changes = None
+                return repo.ref
+        return git_diff.get_valid_ref(repo_dir)
+
+    def _get_repo_changes(self, repo: _Repo) -> dict[str, str]:
+        ref = self._get_ref(repo.path)
+        if not ref:
+            return {}
+        try:
+            if (
+                repo.changes is None
+                or len(repo.dirty) > self.max_dirty_paths
+                or any(_is_quoted_by_git(path) for path in repo.dirty)
+            ):
+                repo.dirty.clear()
+                repo.changes = {
+                    change['path']: change['status']
+                    for change in git_changes.get_changes_in_repo(repo.path, ref)
+                }
+            elif repo.dirty:
+                dirty = repo.dirty
+                repo.dirty = set()
+                for path in list(repo.changes):
+                    parts = path.split('/')
+                    if any(
+                        '/'.join(parts[:i]) in dirty for i in range(1, len(parts) + 1)
+                    ):
+                        del repo.changes[path]
+                for change in git_changes.get_changes_in_repo(
+                    repo.path, ref, sorted(dirty)
+                ):
+                    repo.changes[change['path']] = change['status']
+        except Exception:
+            repo.changes = None
+            raise
+        return repo.changes
@@ -360,7 +360,10 @@ async def search_conversations(
 
     # Get results from old conversation store (V0)
     conversation_metadata_result_set = await conversation_store.search(
-        v0_page_id, limit
+        v0_page_id,
+        limit,
+        selected_repository=selected_repository,
+        trigger=conversation_trigger,
     )
 
     # Get results from new app conversation service (V1)
@@ -22,6 +22,7 @@ from openhands.core.exceptions import AgentRuntimeUnavailableError
 from openhands.core.logger import OpenHandsLoggerAdapter
 from openhands.core.schema.agent import AgentState
 from openhands.events.action import ChangeAgentStateAction, MessageAction
+from openhands.events.async_dispatcher import DispatchMode
 from openhands.events.event import Event, EventSource
 from openhands.events.stream import EventStream
 from openhands.integrations.provider import (
@@ -77,15 +78,25 @@ class AgentSession:
         conversation_stats: ConversationStats,
         status_callback: Callable | None = None,
         user_id: str | None = None,
+        dispatch_mode: DispatchMode = DispatchMode.THREAD,
+        write_behind: bool = False,
     ) -> None:
         """Initializes a new instance of the Session class
 
         Parameters:
         - sid: The session ID
         - file_store: Instance of the FileStore
+        - dispatch_mode: How events are passed to the subscribers of the stream
+        - write_behind: Whether the stream buffers the writes of events
         """
         self.sid = sid
-        self.event_stream = EventStream(sid, file_store, user_id)
+        self.event_stream = EventStream(
+            sid,
+            file_store,
+            user_id,
+            dispatch_mode=dispatch_mode,
+            write_behind=write_behind,
+        )
         self.file_store = file_store
         self._status_callback = status_callback
         self.user_id = user_id
@@ -9,6 +9,7 @@
 import asyncio
 
 from openhands.core.config import OpenHandsConfig
+from openhands.events.async_dispatcher import DispatchMode
 from openhands.events.stream import EventStream
 from openhands.llm.llm_registry import LLMRegistry
 from openhands.runtime import get_runtime_cls
@@ -40,7 +41,13 @@ class ServerConversation:
         self.user_id = user_id
 
         if event_stream is None:
-            event_stream = EventStream(sid, file_store, user_id)
+            event_stream = EventStream(
+                sid,
+                file_store,
+                user_id,
+                dispatch_mode=DispatchMode(config.event_dispatch_mode),
+                write_behind=config.event_write_behind,
+            )
         self.event_stream = event_stream
 
         if runtime:
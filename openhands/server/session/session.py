@@ -25,6 +25,7 @@ from openhands.core.exceptions import MicroagentValidationError
 from openhands.core.logger import OpenHandsLoggerAdapter
 from openhands.core.schema import AgentState
 from openhands.events.action import MessageAction, NullAction
+from openhands.events.async_dispatcher import DispatchMode
 from openhands.events.event import Event, EventSource
 from openhands.events.observation import (
     AgentStateChangedObservation,
@@ -103,6 +104,8 @@ class WebSession:
             conversation_stats=conversation_stats,
             status_callback=self.queue_status_message,
             user_id=user_id,
+            dispatch_mode=DispatchMode(config.event_dispatch_mode),
+            write_behind=config.event_write_behind,
         )
         self.agent_session.event_stream.subscribe(
             EventStreamSubscriber.SERVER, self.on_event, self.sid
@@ -1,5 +1,5 @@
 import threading
-from typing import Optional
+from typing import Iterable, Optional
 
 import httpx
 import tenacity
@@ -115,6 +115,14 @@ class BatchedWebHookFileStore(FileStore):
         """
         return self.file_store.list(path)
 
+    def sync(self, paths: Iterable[str]) -> None:
+        """Make files written to the underlying store durable.
+
+        Args:
+            paths: The paths to make durable
+        """
+        self.file_store.sync(paths)
+
     def delete(self, path: str) -> None:
         """Delete a file and queue a webhook update.
 
@@ -4,7 +4,10 @@ from abc import ABC, abstractmethod
 from typing import Iterable
 
 from openhands.core.config.openhands_config import OpenHandsConfig
-from openhands.storage.data_models.conversation_metadata import ConversationMetadata
+from openhands.storage.data_models.conversation_metadata import (
+    ConversationMetadata,
+    ConversationTrigger,
+)
 from openhands.storage.data_models.conversation_metadata_result_set import (
     ConversationMetadataResultSet,
 )
@@ -54,8 +57,11 @@ class ConversationStore(ABC):
         self,
         page_id: str | None = None,
         limit: int = 20,
+        selected_repository: str | None = None,
+        trigger: ConversationTrigger | None = None,
     ) -> ConversationMetadataResultSet:
-        """Search conversations."""
+        """Search conversations, newest first, optionally filtering by repository
+        and trigger."""
 
     async def get_all_metadata(
         self, conversation_ids: Iterable[str]
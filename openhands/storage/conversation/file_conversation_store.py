@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -10,7 +11,10 @@ from openhands.core.config.openhands_config import OpenHandsConfig
 from openhands.core.logger import openhands_logger as logger
 from openhands.storage import get_file_store
 from openhands.storage.conversation.conversation_store import ConversationStore
-from openhands.storage.data_models.conversation_metadata import ConversationMetadata
+from openhands.storage.data_models.conversation_metadata import (
+    ConversationMetadata,
+    ConversationTrigger,
+)
 from openhands.storage.data_models.conversation_metadata_result_set import (
     ConversationMetadataResultSet,
 )
@@ -24,19 +28,47 @@ from openhands.utils.search_utils import offset_to_page_id, page_id_to_offset
 
 conversation_metadata_type_adapter = TypeAdapter(ConversationMetadata)
 
+# The index is stored alongside the conversation directories. Listings of the
+# conversations skip it, as its name starts with a dot.
+METADATA_INDEX_FILENAME = '.metadata_index.json'
+
 
 @dataclass
 class FileConversationStore(ConversationStore):
+    """Conversation store keeping the metadata for each conversation in a file.
+
+    A sorted index of the fields used to filter and order conversations is kept
+    in a single file, so that a search only reads the metadata for the page of
+    conversations returned. The index is only a hint: each search compares it
+    against a listing of the conversations, adding the metadata of any which are
+    not indexed and dropping any which no longer exist, so updates lost to
+    concurrent writers (e.g.: Other processes sharing a bucket) are recovered.
+    """
+
     file_store: FileStore
 
     async def save_metadata(self, metadata: ConversationMetadata) -> None:
+        await call_sync_from_async(self._write_metadata, metadata)
+
+    def _write_metadata(self, metadata: ConversationMetadata) -> None:
+        try:
+            previous = _index_entry(self._read_metadata(metadata.conversation_id))
+        except Exception:
+            # New conversations are added to the index by the next search
+            previous = None
         json_str = conversation_metadata_type_adapter.dump_json(metadata)
         path = self.get_conversation_metadata_filename(metadata.conversation_id)
-        await call_sync_from_async(self.file_store.write, path, json_str)
+        self.file_store.write(path, json_str)
+        entry = _index_entry(metadata)
+        if previous is not None and previous != entry:
+            self._update_index(metadata.conversation_id, entry)
 
     async def get_metadata(self, conversation_id: str) -> ConversationMetadata:
+        return await call_sync_from_async(self._read_metadata, conversation_id)
+
+    def _read_metadata(self, conversation_id: str) -> ConversationMetadata:
         path = self.get_conversation_metadata_filename(conversation_id)
-        json_str = await call_sync_from_async(self.file_store.read, path)
+        json_str = self.file_store.read(path)
 
         # Validate the JSON
         json_obj = json.loads(json_str)
@@ -54,6 +86,7 @@ class FileConversationStore(ConversationStore):
         path = str(
             Path(self.get_conversation_metadata_filename(conversation_id)).parent
         )
+        # The entry is dropped from the index by the next search
         await call_sync_from_async(self.file_store.delete, path)
 
     async def exists(self, conversation_id: str) -> bool:
@@ -68,33 +101,108 @@ class FileConversationStore(ConversationStore):
         self,
         page_id: str | None = None,
         limit: int = 20,
+        selected_repository: str | None = None,
+        trigger: ConversationTrigger | None = None,
     ) -> ConversationMetadataResultSet:
-        conversations: list[ConversationMetadata] = []
-        metadata_dir = self.get_conversation_metadata_dir()
-        try:
-            conversation_ids = [
-                Path(path).name
-                for path in self.file_store.list(metadata_dir)
-                if not Path(path).name.startswith('.')
+        entries = await call_sync_from_async(self._get_index)
+        if selected_repository is not None:
+            entries = [
+                e for e in entries if e['selected_repository'] == selected_repository
             ]
-        except FileNotFoundError:
-            return ConversationMetadataResultSet([])
-        num_conversations = len(conversation_ids)
+        if trigger is not None:
+            entries = [e for e in entries if e['trigger'] == trigger.value]
+        num_conversations = len(entries)
         start = page_id_to_offset(page_id)
         end = min(limit + start, num_conversations)
+        page = entries[start:end]
+        results = await asyncio.gather(
+            *[self.get_metadata(entry['conversation_id']) for entry in page],
+            return_exceptions=True,
+        )
         conversations = []
-        for conversation_id in conversation_ids:
-            try:
-                conversations.append(await self.get_metadata(conversation_id))
-            except Exception:
-                logger.warning(
-                    f'Could not load conversation metadata: {conversation_id}'
+        for entry, result in zip(page, results, strict=True):
+            if isinstance(result, ConversationMetadata):
+                conversations.append(result)
+                # Correct indexed fields which were changed by lost updates
+                current_entry = _index_entry(result)
+                if current_entry != entry:
+                    await call_sync_from_async(
+                        self._update_index, entry['conversation_id'], current_entry
+                    )
+                continue
+            logger.warning(
+                f'Could not load conversation metadata: {entry["conversation_id"]}'
+            )
+            if isinstance(result, FileNotFoundError):
+                # Removed without going through delete_metadata
+                await call_sync_from_async(
+                    self._update_index, entry['conversation_id'], None
                 )
-        conversations.sort(key=_sort_key, reverse=True)
-        conversations = conversations[start:end]
         next_page_id = offset_to_page_id(end, end < num_conversations)
         return ConversationMetadataResultSet(conversations, next_page_id)
 
+    def get_metadata_index_filename(self) -> str:
+        return f'{self.get_conversation_metadata_dir()}/{METADATA_INDEX_FILENAME}'
+
+    def _load_index(self) -> list[dict] | None:
+        try:
+            return json.loads(self.file_store.read(self.get_metadata_index_filename()))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning('Invalid conversation metadata index, rebuilding')
+            return None
+
+    def _store_index(self, entries: list[dict]) -> None:
+        self.file_store.write(self.get_metadata_index_filename(), json.dumps(entries))
+
+    def _get_index(self) -> list[dict]:
+        """Get the index entries, newest first, reconciling the stored index with
+        the conversations listed."""
+        conversation_ids = self._list_conversation_ids()
+        stored_entries = self._load_index() or []
+        listed = set(conversation_ids)
+        entries = [e for e in stored_entries if e['conversation_id'] in listed]
+        indexed = {e['conversation_id'] for e in entries}
+        for conversation_id in conversation_ids:
+            if conversation_id in indexed:
+                continue
+            try:
+                entries.append(_index_entry(self._read_metadata(conversation_id)))
+            except Exception:
+                # e.g.: A conversation whose metadata is not yet written
+                logger.debug(f'Could not load conversation metadata: {conversation_id}')
+        if len(entries) != len(stored_entries) or len(indexed) != len(stored_entries):
+            _sort_index(entries)
+            self._store_index(entries)
+        return entries
+
+    def _list_conversation_ids(self) -> list[str]:
+        try:
+            paths = self.file_store.list(self.get_conversation_metadata_dir())
+        except FileNotFoundError:
+            return []
+        return [
+            Path(path).name for path in paths if not Path(path).name.startswith('.')
+        ]
+
+    def _update_index(self, conversation_id: str, entry: dict | None) -> None:
+        """Add, replace or (If entry is None) remove the entry for a conversation.
+        If there is no index yet, it is built from the metadata files on the next
+        search. A concurrent update may overwrite this one, in which case the next
+        search restores any conversation missing from the index."""
+        entries = self._load_index()
+        if entries is None:
+            return
+        existing = [e for e in entries if e['conversation_id'] == conversation_id]
+        if existing == ([entry] if entry else []):
+            return
+        entries = [e for e in entries if e['conversation_id'] != conversation_id]
+        if entry:
+            entries.append(entry)
+            _sort_index(entries)
+        self._store_index(entries)
+
     def get_conversation_metadata_dir(self) -> str:
         return CONVERSATION_BASE_DIR
 
@@ -120,3 +228,16 @@ def _sort_key(conversation: ConversationMetadata) -> str:
     if created_at:
         return created_at.isoformat()  # YYYY-MM-DDTHH:MM:SS for sorting
     return ''
+
+
+def _index_entry(metadata: ConversationMetadata) -> dict:
+    return {
+        'conversation_id': metadata.conversation_id,
+        'created_at': _sort_key(metadata),
+        'selected_repository': metadata.selected_repository,
+        'trigger': metadata.trigger.value if metadata.trigger else None,
+    }
+
+
+def _sort_index(entries: list[dict]) -> None:
+    entries.sort(key=lambda e: e['created_at'], reverse=True)
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import Iterable
 
 
 class FileStore:
@@ -17,3 +18,8 @@ class FileStore:
     @abstractmethod
     def delete(self, path: str) -> None:
         pass
+
+    def sync(self, paths: Iterable[str]) -> None:
+        """Make the given files, once written, durable. Stores whose writes are
+        durable once they return (e.g.: object stores) need not override this."""
+        return None
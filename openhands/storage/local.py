@@ -1,5 +1,6 @@
 import os
 import shutil
+from typing import Iterable
 
 from openhands.core.logger import openhands_logger as logger
 from openhands.storage.files import FileStore
@@ -26,6 +27,24 @@ class LocalFileStore(FileStore):
         with open(full_path, mode) as f:
             f.write(contents)
 
+    def sync(self, paths: Iterable[str]) -> None:
+        directories = set()
+        for path in paths:
+            full_path = self.get_full_path(path)
+            fd = os.open(full_path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            directories.add(os.path.dirname(full_path))
+        # New files are only durable once their directory entries are
+        for directory in directories:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
     def read(self, path: str) -> str:
         full_path = self.get_full_path(path)
         with open(full_path, 'r') as f:
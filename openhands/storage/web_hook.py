@@ -1,3 +1,5 @@
+from typing import Iterable
+
 import httpx
 import tenacity
 
@@ -70,6 +72,14 @@ class WebHookFileStore(FileStore):
         """
         return self.file_store.list(path)
 
+    def sync(self, paths: Iterable[str]) -> None:
+        """Make files written to the underlying store durable.
+
+        Args:
+            paths: The paths to make durable
+        """
+        self.file_store.sync(paths)
+
     def delete(self, path: str) -> None:
         """Delete a file and trigger a webhook.
 
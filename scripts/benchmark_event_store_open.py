@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the latency of opening a V0 event stream.
+
+Opening a stream calculates the id of the next event. This compares reading the
+head pointer written by EventStream.add_event with listing the events directory
+(The fallback used when the head is missing or stale).
+
+Usage:
+    python scripts/benchmark_event_store_open.py [--events N] [--repeat N]
+        [--s3-bucket BUCKET] [--latency-ms MS]
+
+Stores:
+- memory: InMemoryFileStore
+- local: LocalFileStore in a temporary directory
+- simulated_s3: InMemoryFileStore with a fixed latency per request, listing at
+  most 1000 keys per request as S3 does
+- s3: S3FileStore, if --s3-bucket is given (Uses the usual AWS credentials)
+
+Output:
+- Prints the mean open latency for each store with and without the head.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openhands.events import EventSource, EventStream  # noqa: E402
+from openhands.events.event_store import EventStore  # noqa: E402
+from openhands.events.observation import NullObservation  # noqa: E402
+from openhands.storage.files import FileStore  # noqa: E402
+from openhands.storage.local import LocalFileStore  # noqa: E402
+from openhands.storage.locations import (  # noqa: E402
+    get_conversation_dir,
+    get_conversation_event_head_filename,
+)
+from openhands.storage.memory import InMemoryFileStore  # noqa: E402
+
+S3_LIST_PAGE_SIZE = 1000
+
+
+class SimulatedS3FileStore(InMemoryFileStore):
+    """In memory store adding a fixed latency to each request."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def read(self, path: str) -> str:
+        time.sleep(self.latency)
+        return super().read(path)
+
+    def list(self, path: str) -> list[str]:
+        result = super().list(path)
+        requests = max(1, -(-len(result) // S3_LIST_PAGE_SIZE))
+        time.sleep(self.latency * requests)
+        return result
+
+
+def populate(file_store: FileStore, sid: str, num_events: int):
+    event_stream = EventStream(sid, file_store)
+    for i in range(num_events):
+        event_stream.add_event(NullObservation(f'event {i}'), EventSource.AGENT)
+    event_stream.close()
+
+
+def time_open(file_store: FileStore, sid: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        EventStore(sid, file_store, None).cur_id
+        timings.append(time.perf_counter() - start)
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--s3-bucket', default=None)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    args = parser.parse_args()
+
+    stores: dict[str, FileStore] = {
+        'memory': InMemoryFileStore(),
+        'local': LocalFileStore(tempfile.mkdtemp(prefix='event_store_bench_')),
+        'simulated_s3': SimulatedS3FileStore(args.latency_ms / 1000),
+    }
+    if args.s3_bucket:
+        from openhands.storage.s3 import S3FileStore
+
+        stores['s3'] = S3FileStore(args.s3_bucket)
+
+    print(f'Opening a stream of {args.events} events (mean of {args.repeat})')
+    print(f'{"store":<14}{"head (ms)":>12}{"listing (ms)":>15}')
+    for name, file_store in stores.items():
+        sid = f'bench-{uuid.uuid4().hex}'
+        populate(file_store, sid, args.events)
+        with_head = time_open(file_store, sid, args.repeat)
+        file_store.delete(get_conversation_event_head_filename(sid))
+        without_head = time_open(file_store, sid, args.repeat)
+        print(f'{name:<14}{with_head * 1000:>12.2f}{without_head * 1000:>15.2f}')
+        file_store.delete(get_conversation_dir(sid))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark the latency from starting a process sandbox to it being ready.
+
+Sandboxes are started with ProcessSandboxService, running a stand in for the
+agent server which answers /alive once a fixed startup delay has passed. This
+compares polling at a fixed interval of 1s after waiting 1s for the process to
+start (As ProcessSandboxService used to) with polling with an exponential
+backoff.
+
+Usage:
+    python scripts/benchmark_sandbox_startup.py [--sandboxes N]
+        [--startup-delay SECONDS]
+
+Output:
+- Prints the mean and max start to ready latency for each mode, along with the
+  mean number of /alive requests made for each sandbox.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openhands.app_server.sandbox import process_sandbox_service  # noqa: E402
+from openhands.app_server.sandbox.process_sandbox_service import (  # noqa: E402
+    ProcessSandboxService,
+)
+from openhands.app_server.sandbox.sandbox_spec_models import (  # noqa: E402
+    SandboxSpecInfo,
+)
+
+AGENT_SERVER_MODULE = 'benchmark_agent_server'
+AGENT_SERVER_SOURCE = """
+import argparse
+import http.server
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--port', type=int)
+args = parser.parse_args()
+time.sleep(STARTUP_DELAY)
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(b'{"status": "ok"}')
+
+    def log_message(self, *args):
+        pass
+
+
+http.server.HTTPServer(('', args.port), Handler).serve_forever()
+"""
+
+
+class SandboxSpecService:
+    def __init__(self, sandbox_spec: SandboxSpecInfo):
+        self.sandbox_spec = sandbox_spec
+
+    async def get_default_sandbox_spec(self) -> SandboxSpecInfo:
+        return self.sandbox_spec
+
+    async def get_sandbox_spec(self, sandbox_spec_id: str) -> SandboxSpecInfo:
+        return self.sandbox_spec
+
+
+async def run(
+    tmp_dir: str, num_sandboxes: int, fixed_interval: bool
+) -> tuple[list[float], float]:
+    num_requests = 0
+
+    async def count_request(request):
+        nonlocal num_requests
+        num_requests += 1
+
+    sandbox_spec = SandboxSpecInfo(
+        id='benchmark', command=None, initial_env={'PYTHONPATH': tmp_dir}
+    )
+    async with httpx.AsyncClient(
+        event_hooks={'request': [count_request]}
+    ) as httpx_client:
+        service = ProcessSandboxService(
+            user_id=None,
+            sandbox_spec_service=SandboxSpecService(sandbox_spec),  # type: ignore[arg-type]
+            base_working_dir=f'{tmp_dir}/sandboxes',
+            base_port=19000,
+            python_executable=sys.executable,
+            agent_server_module=AGENT_SERVER_MODULE,
+            health_check_path='/alive',
+            httpx_client=httpx_client,
+        )
+        start_agent_process = service._start_agent_process
+
+        async def start_agent_process_and_wait(*args, **kwargs):
+            process = await start_agent_process(*args, **kwargs)
+            await asyncio.sleep(1)
+            return process
+
+        timings = []
+        with ExitStack() as stack:
+            # The agent servers run alongside the benchmark, even within docker
+            stack.enter_context(
+                patch.object(
+                    process_sandbox_service,
+                    'replace_localhost_hostname_for_docker',
+                    lambda url: url,
+                )
+            )
+            if fixed_interval:
+                stack.enter_context(
+                    patch.object(
+                        process_sandbox_service,
+                        'backoff_intervals',
+                        lambda: itertools.repeat(1.0),
+                    )
+                )
+                stack.enter_context(
+                    patch.object(
+                        service, '_start_agent_process', start_agent_process_and_wait
+                    )
+                )
+            for _ in range(num_sandboxes):
+                start = time.perf_counter()
+                sandbox_info = await service.start_sandbox()
+                timings.append(time.perf_counter() - start)
+                await service.delete_sandbox(sandbox_info.id)
+    return timings, num_requests / num_sandboxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sandboxes', type=int, default=5)
+    parser.add_argument('--startup-delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        Path(tmp_dir, f'{AGENT_SERVER_MODULE}.py').write_text(
+            AGENT_SERVER_SOURCE.replace('STARTUP_DELAY', str(args.startup_delay))
+        )
+        print(
+            f'{args.sandboxes} sandboxes, agent server ready after '
+            f'{args.startup_delay}s'
+        )
+        for name, fixed_interval in (('fixed 1s polling', True), ('backoff', False)):
+            timings, requests = asyncio.run(
+                run(tmp_dir, args.sandboxes, fixed_interval)
+            )
+            print(
+                f'{name:>18}: mean {statistics.mean(timings) * 1000:8.1f}ms  '
+                f'max {max(timings) * 1000:8.1f}ms  '
+                f'{requests:.1f} requests per sandbox'
+            )
+
+
+if __name__ == '__main__':
+    main()
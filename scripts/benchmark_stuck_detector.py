@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the stuck detector on long agent histories.
+
+The agent controller checks whether the agent is stuck once per step. This
+compares checking with a detector that scans the whole history at each step
+(as it did before the detector kept rolling state) with one that is updated as
+events are appended.
+
+Usage:
+    python scripts/benchmark_stuck_detector.py [--events N ...]
+        [--headless | --interactive]
+
+History:
+- Synthetic command and file read actions with their observations, with an
+  occasional agent message, none of which repeat enough to be a loop.
+
+Output:
+- Prints the total time spent checking at every step for each history length.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openhands.controller.state.state import State  # noqa: E402
+from openhands.controller.stuck import StuckDetector  # noqa: E402
+from openhands.events.action import (  # noqa: E402
+    CmdRunAction,
+    FileReadAction,
+    MessageAction,
+)
+from openhands.events.event import Event, EventSource  # noqa: E402
+from openhands.events.observation import (  # noqa: E402
+    CmdOutputObservation,
+    FileReadObservation,
+)
+
+
+def make_history(num_events: int) -> list[Event]:
+    events: list[Event] = []
+    while len(events) < num_events:
+        i = len(events)
+        if i % 50 == 0:
+            message = MessageAction(content=f'Step {i}')
+            message._source = EventSource.AGENT  # type: ignore[attr-defined]
+            events.append(message)
+        elif i % 4 == 1:
+            events.append(CmdRunAction(command=f'ls dir{i}'))
+            events.append(CmdOutputObservation(command=f'ls dir{i}', content='a b'))
+        else:
+            events.append(FileReadAction(path=f'file{i}.txt'))
+            events.append(FileReadObservation(content=f'{i}', path=f'file{i}.txt'))
+    return events[:num_events]
+
+
+def time_rebuild(events: list[Event], headless_mode: bool) -> float:
+    state = State(inputs={})
+    state.history = []
+    start = time.perf_counter()
+    for event in events:
+        state.history.append(event)
+        StuckDetector(state).is_stuck(headless_mode)
+    return time.perf_counter() - start
+
+
+def time_incremental(events: list[Event], headless_mode: bool) -> float:
+    state = State(inputs={})
+    state.history = []
+    stuck_detector = StuckDetector(state)
+    start = time.perf_counter()
+    for event in events:
+        state.history.append(event)
+        stuck_detector.update(headless_mode)
+        stuck_detector.is_stuck(headless_mode)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--events', type=int, nargs='+', default=[1000, 2000, 5000])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--headless', dest='headless', action='store_true')
+    mode.add_argument('--interactive', dest='headless', action='store_false')
+    parser.set_defaults(headless=True)
+    args = parser.parse_args()
+
+    logging.getLogger('openhands').setLevel(logging.ERROR)
+
+    print(f'{"events":>8}{"rebuild (ms)":>15}{"incremental (ms)":>19}')
+    for num_events in args.events:
+        events = make_history(num_events)
+        rebuild = time_rebuild(events, args.headless)
+        incremental = time_incremental(events, args.headless)
+        print(f'{num_events:>8}{rebuild * 1000:>15.1f}{incremental * 1000:>19.1f}')
+
+
+if __name__ == '__main__':
+    main()
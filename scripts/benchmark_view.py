@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark maintaining the condensed view of a long agent history.
+
+The agent controller asks for the view of the history once per step. This
+compares rebuilding the view from the whole history at each step with updating
+it incrementally as events are appended.
+
+Usage:
+    python scripts/benchmark_view.py [--events N ...] [--condense-every N]
+        [--keep N]
+
+History:
+- Synthetic message events, with a condensation every --condense-every events
+  which forgets all but the first event and the last --keep events, and adds a
+  summary (As the LLM summarizing condenser does).
+
+Output:
+- Prints the total time spent producing the view at every step for each history
+  length.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openhands.events.action.agent import CondensationAction  # noqa: E402
+from openhands.events.action.message import MessageAction  # noqa: E402
+from openhands.events.event import Event  # noqa: E402
+from openhands.memory.view import View, ViewBuilder  # noqa: E402
+
+
+def make_history(num_events: int, condense_every: int, keep: int) -> list[Event]:
+    events: list[Event] = []
+    kept_ids: list[int] = []
+    for i in range(num_events):
+        event: Event
+        if i and i % condense_every == 0:
+            forgotten = kept_ids[1:-keep] if len(kept_ids) > keep + 1 else []
+            event = CondensationAction(
+                forgotten_event_ids=forgotten,
+                summary=f'Summary of {len(forgotten)} events',
+                summary_offset=1,
+            )
+            kept_ids = [kept_ids[0]] + kept_ids[-keep:]
+        else:
+            event = MessageAction(content=f'Event {i}')
+            kept_ids.append(i)
+        event._id = i  # type: ignore[attr-defined]
+        events.append(event)
+    return events
+
+
+def time_rebuild(events: list[Event]) -> float:
+    start = time.perf_counter()
+    for i in range(1, len(events) + 1):
+        View.from_events(events[:i])
+    return time.perf_counter() - start
+
+
+def time_incremental(events: list[Event]) -> float:
+    history: list[Event] = []
+    builder = ViewBuilder()
+    start = time.perf_counter()
+    for event in events:
+        history.append(event)
+        builder.update(history)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--events', type=int, nargs='+', default=[500, 1000, 2000])
+    parser.add_argument('--condense-every', type=int, default=100)
+    parser.add_argument('--keep', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f'{"events":>8}{"rebuild (ms)":>15}{"incremental (ms)":>19}')
+    for num_events in args.events:
+        events = make_history(num_events, args.condense_every, args.keep)
+        rebuild = time_rebuild(events)
+        incremental = time_incremental(events)
+        print(f'{num_events:>8}{rebuild * 1000:>15.1f}{incremental * 1000:>19.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Tests for the process-wide DockerContainerIndex."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from docker.errors import NotFound
+
+from openhands.app_server.sandbox.docker_container_index import DockerContainerIndex
+
+PREFIX = 'oh-test-'
+
+
+def create_container(container_id: str, name: str, session_api_key: str):
+    container = MagicMock()
+    container.id = container_id
+    container.name = name
+    container.attrs = {
+        'Config': {'Env': [f'OH_SESSION_API_KEYS_0={session_api_key}']},
+    }
+    return container
+
+
+def create_index(containers, events=()):
+    docker_client = MagicMock()
+    docker_client.containers.list.return_value = containers
+    # The events are sent once the test releases the stream, which then stays open
+    # until the test ends it
+    stream = SimpleNamespace(
+        release=threading.Event(), processed=threading.Event(), end=threading.Event()
+    )
+
+    def follow_events():
+        stream.release.wait(5)
+        yield from events
+        stream.processed.set()
+        stream.end.wait(5)
+
+    docker_client.events.return_value = follow_events()
+    return DockerContainerIndex(docker_client, PREFIX), stream
+
+
+def test_lookups():
+    sandbox = create_container('c1', 'oh-test-abc', 'key1')
+    other = create_container('c2', 'postgres', 'key2')
+    index, stream = create_index([sandbox, other])
+
+    assert index.list_containers() == [sandbox]
+    assert index.get_by_name('oh-test-abc') is sandbox
+    assert index.get_by_session_api_key('key1') is sandbox
+    assert index.get_by_session_api_key('key2') is None
+    assert index.get_by_name('postgres') is None
+
+    # Containers are only listed once
+    index.list_containers()
+    index.docker_client.containers.list.assert_called_once()
+
+
+def test_events_refresh_containers():
+    sandbox = create_container('c1', 'oh-test-abc', 'key1')
+    index, stream = create_index([sandbox], [{'id': 'c1'}, {'id': 'c2'}])
+    index.list_containers()
+    claimed = create_container('c2', 'oh-test-def', 'key2')
+    index.docker_client.containers.get.side_effect = [NotFound('gone'), claimed]
+
+    stream.release.set()
+    stream.processed.wait(5)
+
+    assert index.get_by_name('oh-test-abc') is None
+    assert index.get_by_session_api_key('key1') is None
+    assert index.get_by_session_api_key('key2') is claimed
+
+
+def test_reloads_after_event_stream_ends():
+    index, stream = create_index([])
+    index.list_containers()
+    stream.release.set()
+    stream.end.set()
+    index._events_thread.join(5)
+
+    sandbox = create_container('c1', 'oh-test-abc', 'key1')
+    index.docker_client.containers.list.return_value = [sandbox]
+    index.docker_client.events.return_value = iter([])
+
+    assert index.list_containers() == [sandbox]
+
+
+def test_health_checks_expire():
+    sandbox = create_container('c1', 'oh-test-abc', 'key1')
+    index, stream = create_index([sandbox])
+    index.list_containers()
+    with patch(
+        'openhands.app_server.sandbox.docker_container_index.time.monotonic',
+        return_value=100.0,
+    ):
+        index.mark_healthy(sandbox)
+        assert index.is_healthy(sandbox)
+    with patch(
+        'openhands.app_server.sandbox.docker_container_index.time.monotonic',
+        return_value=105.0,
+    ):
+        assert not index.is_healthy(sandbox)
+
+    # Any change to the container invalidates its health check
+    index.mark_healthy(sandbox)
+    index.put(sandbox)
+    assert not index.is_healthy(sandbox)
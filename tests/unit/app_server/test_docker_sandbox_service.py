@@ -281,6 +281,74 @@ class TestDockerSandboxService:
         assert len(result.items) == 1
         assert result.items[0].id == 'oh-test-abc123'
 
+    async def test_search_sandboxes_filters_in_docker(
+        self, service, mock_running_container
+    ):
+        """Test that containers are filtered by the docker daemon."""
+        # Setup
+        service.docker_client.containers.list.return_value = [mock_running_container]
+
+        # Execute
+        await service.search_sandboxes()
+
+        # Verify
+        service.docker_client.containers.list.assert_called_once_with(
+            all=True, filters={'label': 'sandbox_spec_id', 'name': 'oh-test-'}
+        )
+
+    async def test_sandbox_spec_id_from_label(self, service, mock_running_container):
+        """Test that the sandbox spec id is read from the container label."""
+        # Setup
+        mock_running_container.attrs['Config']['Labels'] = {
+            'sandbox_spec_id': 'spec-from-label'
+        }
+
+        # Execute
+        result = await service._container_to_sandbox_info(mock_running_container)
+
+        # Verify
+        assert result is not None
+        assert result.sandbox_spec_id == 'spec-from-label'
+
+    async def test_get_sandbox_by_session_api_key_uses_index(
+        self, service, mock_running_container
+    ):
+        """Test that sandboxes are found in the container index when there is one."""
+        # Setup
+        service.container_index = MagicMock()
+        service.container_index.get_by_session_api_key.return_value = (
+            mock_running_container
+        )
+        service.container_index.is_healthy.return_value = False
+
+        # Execute
+        result = await service.get_sandbox_by_session_api_key('session_key_123')
+
+        # Verify
+        assert result is not None
+        assert result.id == 'oh-test-abc123'
+        service.docker_client.containers.list.assert_not_called()
+        service.container_index.mark_healthy.assert_called_once_with(
+            mock_running_container
+        )
+
+    async def test_recent_health_check_is_reused(self, service, mock_running_container):
+        """Test that a container which passed a recent health check is not checked."""
+        # Setup
+        service.container_index = MagicMock()
+        service.container_index.is_healthy.return_value = True
+
+        # Execute
+        result = await service._container_to_checked_sandbox_info(
+            mock_running_container
+        )
+
+        # Verify
+        assert result is not None
+        assert result.status == SandboxStatus.RUNNING
+        assert result.session_api_key == 'session_key_123'
+        service.httpx_client.get.assert_not_called()
+
     async def test_get_sandbox_success(self, service, mock_running_container):
         """Test successful retrieval of specific sandbox."""
         # Setup
@@ -483,6 +551,76 @@ class TestDockerSandboxService:
         ):
             await service.start_sandbox()
 
+    async def test_start_sandbox_from_warm_pool(self, service, mock_running_container):
+        """Test that an idle sandbox from the warm pool is used if there is one."""
+        # Setup
+        sandbox_info = await service._container_to_sandbox_info(mock_running_container)
+        service.warm_sandbox_pool = MagicMock()
+        service.warm_sandbox_pool.claim = AsyncMock(return_value=sandbox_info)
+
+        with patch.object(service, 'pause_old_sandboxes', return_value=[]):
+            # Execute
+            result = await service.start_sandbox(sandbox_id='abc123')
+
+        # Verify
+        assert result is sandbox_info
+        service.warm_sandbox_pool.claim.assert_called_once_with(
+            service, 'test-image:latest', 'abc123'
+        )
+        service.warm_sandbox_pool.record_start.assert_called_once_with(
+            'oh-test-abc123', pooled=True
+        )
+        service.docker_client.containers.run.assert_not_called()
+
+    async def test_claim_warm_sandbox_renames_container(
+        self, service, mock_running_container
+    ):
+        """Test that claiming an idle container renames it to the sandbox id."""
+        # Setup
+        service.docker_client.containers.get.return_value = mock_running_container
+
+        # Execute
+        result = await service.claim_warm_sandbox('warm-oh-test-xyz', 'abc123')
+
+        # Verify
+        service.docker_client.containers.get.assert_called_once_with('warm-oh-test-xyz')
+        mock_running_container.rename.assert_called_once_with('oh-test-abc123')
+        assert result is not None
+        assert result.session_api_key == 'session_key_123'
+
+    async def test_claim_warm_sandbox_not_running(
+        self, service, mock_running_container
+    ):
+        """Test that an idle container which stopped is not claimed."""
+        # Setup
+        mock_running_container.status = 'exited'
+        service.docker_client.containers.get.return_value = mock_running_container
+
+        # Execute
+        result = await service.claim_warm_sandbox('warm-oh-test-xyz', 'abc123')
+
+        # Verify
+        assert result is None
+        mock_running_container.rename.assert_not_called()
+
+    async def test_search_sandboxes_excludes_warm_containers(
+        self, service, mock_running_container
+    ):
+        """Test that idle containers in the warm pool are not listed."""
+        # Setup
+        warm_container = MagicMock()
+        warm_container.name = 'warm-oh-test-xyz'
+        service.docker_client.containers.list.return_value = [
+            mock_running_container,
+            warm_container,
+        ]
+
+        # Execute
+        result = await service.search_sandboxes()
+
+        # Verify
+        assert [sandbox.id for sandbox in result.items] == ['oh-test-abc123']
+
     @patch('openhands.app_server.sandbox.docker_sandbox_service.base62.encodebytes')
     @patch('os.urandom')
     async def test_start_sandbox_with_extra_hosts(
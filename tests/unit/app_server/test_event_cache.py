@@ -0,0 +1,251 @@
+"""Tests for the process-wide EventCache."""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from google.api_core.exceptions import NotFound
+
+from openhands.app_server.event.event_cache import EventCache
+from openhands.app_server.event.filesystem_event_service import FilesystemEventService
+from openhands.app_server.event.google_cloud_event_service import (
+    GoogleCloudEventService,
+)
+from openhands.sdk.event import TokenEvent
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def event_cache() -> EventCache:
+    return EventCache()
+
+
+@pytest.fixture
+def service(temp_dir: Path, event_cache: EventCache) -> FilesystemEventService:
+    """Create a FilesystemEventService using a cache of its own."""
+    return FilesystemEventService(
+        prefix=temp_dir,
+        user_id='test_user',
+        app_conversation_info_service=None,
+        app_conversation_info_load_tasks={},
+        event_cache=event_cache,
+    )
+
+
+def create_token_event() -> TokenEvent:
+    return TokenEvent(source='agent', prompt_token_ids=[1], response_token_ids=[2])
+
+
+def event_size(event: TokenEvent) -> int:
+    return len(event.model_dump_json())
+
+
+class TestEventCache:
+    """Test cases for the cache itself."""
+
+    def test_get_put_and_stats(self):
+        """Test that hits and misses are counted."""
+        cache = EventCache()
+        path = Path('v1_conversations') / uuid4().hex
+        event = create_token_event()
+
+        assert cache.get(path, 'a') is None
+        cache.put(path, 'a', event, event_size(event))
+        assert cache.get(path, 'a') is event
+
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.hit_rate == 0.5
+        assert stats.entries == 1
+        assert stats.size_bytes == event_size(event)
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that the least recently used events are evicted once the total
+        size of the events exceeds the limit."""
+        events = [create_token_event() for _ in range(3)]
+        cache = EventCache(max_bytes=sum(event_size(e) for e in events[:2]))
+        path = Path('v1_conversations') / uuid4().hex
+        cache.put(path, 'a', events[0], event_size(events[0]))
+        cache.put(path, 'b', events[1], event_size(events[1]))
+        cache.get(path, 'a')
+        cache.put(path, 'c', events[2], event_size(events[2]))
+
+        assert cache.get(path, 'b') is None
+        assert cache.get(path, 'a') is events[0]
+        assert cache.get(path, 'c') is events[2]
+        assert cache.stats().evictions == 1
+
+    def test_event_larger_than_limit_is_not_cached(self):
+        """Test that an event which would not fit is never cached."""
+        cache = EventCache(max_bytes=1)
+        path = Path('v1_conversations') / uuid4().hex
+        event = create_token_event()
+        cache.put(path, 'a', event, event_size(event))
+
+        assert cache.get(path, 'a') is None
+        assert cache.stats().size_bytes == 0
+
+    def test_invalidate_conversation(self):
+        """Test that invalidation drops only the events for the conversation."""
+        cache = EventCache()
+        conversation_id = uuid4()
+        path = Path('user') / 'v1_conversations' / conversation_id.hex
+        other_path = Path('user') / 'v1_conversations' / uuid4().hex
+        cache.put(path, 'a', create_token_event(), 100)
+        cache.put(other_path, 'b', create_token_event(), 100)
+
+        cache.invalidate(conversation_id)
+
+        assert cache.get(path, 'a') is None
+        assert cache.get(other_path, 'b') is not None
+        assert cache.stats().entries == 1
+
+    def test_stats_are_logged_periodically(self):
+        """Test that the stats are logged as the cache is used, at most once
+        per interval."""
+        cache = EventCache()
+        path = Path('v1_conversations') / uuid4().hex
+        event = create_token_event()
+        cache.put(path, 'a', event, event_size(event))
+        with patch('openhands.app_server.event.event_cache._logger.info') as log_info:
+            cache.get(path, 'a')
+            log_info.assert_not_called()
+
+            cache.stats_log_interval_seconds = 0
+            cache.get(path, 'a')
+            cache.get(path, 'b')
+
+        assert log_info.call_count == 2
+        assert log_info.call_args.args == ('event_cache_stats',)
+        assert log_info.call_args.kwargs['extra']['hits'] == 2
+        assert log_info.call_args.kwargs['extra']['hit_rate'] == 1.0
+
+
+class TestEventServiceCaching:
+    """Test cases for caching in the event services."""
+
+    @pytest.mark.asyncio
+    async def test_saved_events_are_read_from_cache(
+        self, service: FilesystemEventService, event_cache: EventCache
+    ):
+        """Test that events are cached when saved and not loaded again."""
+        conversation_id = uuid4()
+        first_event = create_token_event()
+        await service.save_event(conversation_id, first_event)
+        await service.search_events(conversation_id)
+        event = create_token_event()
+        await service.save_event(conversation_id, event)
+        hits = event_cache.stats().hits
+
+        with patch.object(FilesystemEventService, '_read_event') as read_event:
+            result = await service.get_event(conversation_id, UUID(event.id))
+            page = await service.search_events(conversation_id)
+
+        assert result is event
+        assert page.items == [first_event, event]
+        read_event.assert_not_called()
+        assert event_cache.stats().hits == hits + 3
+
+    @pytest.mark.asyncio
+    async def test_events_are_cached_when_read(
+        self, temp_dir: Path, service: FilesystemEventService, event_cache: EventCache
+    ):
+        """Test that events saved by another process are cached on first read."""
+        conversation_id = uuid4()
+        event = create_token_event()
+        writer = FilesystemEventService(
+            prefix=temp_dir,
+            user_id='test_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+            event_cache=None,
+        )
+        await writer.save_event(conversation_id, event)
+
+        await service.get_event(conversation_id, UUID(event.id))
+        await service.get_event(conversation_id, UUID(event.id))
+
+        stats = event_cache.stats()
+        assert stats.misses == 1
+        assert stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_scoped_to_user(
+        self, temp_dir: Path, service: FilesystemEventService, event_cache: EventCache
+    ):
+        """Test that cached events are not returned for another user's path."""
+        conversation_id = uuid4()
+        event = create_token_event()
+        await service.save_event(conversation_id, event)
+        other_user_service = FilesystemEventService(
+            prefix=temp_dir,
+            user_id='other_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+            event_cache=event_cache,
+        )
+
+        result = await other_user_service.get_event(conversation_id, UUID(event.id))
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_clear_cache(
+        self, service: FilesystemEventService, event_cache: EventCache
+    ):
+        """Test that clearing the cache for a conversation drops its events."""
+        conversation_id = uuid4()
+        await service.save_event(conversation_id, create_token_event())
+
+        service.clear_cache(conversation_id)
+
+        assert event_cache.stats().entries == 0
+
+    @pytest.mark.asyncio
+    async def test_cached_size_is_stored_size(
+        self, temp_dir: Path, service: FilesystemEventService, event_cache: EventCache
+    ):
+        """Test that events are sized from the bytes stored, not serialized again."""
+        conversation_id = uuid4()
+        event = create_token_event()
+        await service.save_event(conversation_id, event)
+
+        path = await service.get_conversation_path(conversation_id)
+        stored_size = (path / f'{UUID(event.id).hex}.json').stat().st_size
+        assert event_cache.stats().size_bytes == stored_size
+
+    @pytest.mark.asyncio
+    async def test_google_cloud_saved_events_are_cached(self, event_cache: EventCache):
+        """Test that events saved to Google Cloud Storage are cached."""
+        bucket = MagicMock()
+        # The conversation has no index yet
+        bucket.blob.return_value.download_as_bytes.side_effect = NotFound('index')
+        bucket.blob.return_value.exists.return_value = False
+        service = GoogleCloudEventService(
+            prefix=Path('users'),
+            user_id='test_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+            bucket=bucket,
+            event_cache=event_cache,
+        )
+        conversation_id = uuid4()
+        event = create_token_event()
+
+        await service.save_events(conversation_id, [event])
+        with patch.object(GoogleCloudEventService, '_read_event') as read_event:
+            result = await service.get_event(conversation_id, UUID(event.id))
+
+        assert result is event
+        read_event.assert_not_called()
+        data = bucket.blob.return_value.upload_from_string.call_args.args[0]
+        assert event_cache.stats().size_bytes == len(data)
@@ -5,12 +5,16 @@ focusing on search functionality.
 """
 
 import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
-from uuid import uuid4
+from unittest.mock import patch
+from uuid import UUID, uuid4
 
 import pytest
 
 from openhands.agent_server.models import EventPage, EventSortOrder
+from openhands.app_server.event.event_encoding import ZSTD_MAGIC, EventEncoding
+from openhands.app_server.event.event_index import INDEX_FILE_NAME
 from openhands.app_server.event.filesystem_event_service import FilesystemEventService
 from openhands.sdk.event import PauseEvent, TokenEvent
 
@@ -44,13 +48,26 @@ def service_no_user(temp_dir: Path) -> FilesystemEventService:
     )
 
 
-def create_token_event() -> TokenEvent:
+def create_token_event(timestamp: datetime | None = None) -> TokenEvent:
     """Helper to create a TokenEvent for testing."""
+    if timestamp is None:
+        return TokenEvent(
+            source='agent', prompt_token_ids=[1, 2], response_token_ids=[3, 4]
+        )
     return TokenEvent(
-        source='agent', prompt_token_ids=[1, 2], response_token_ids=[3, 4]
+        source='agent',
+        prompt_token_ids=[1, 2],
+        response_token_ids=[3, 4],
+        timestamp=timestamp.isoformat(),
     )
 
 
+def create_sequential_token_events(count: int) -> list[TokenEvent]:
+    """Helper to create TokenEvents with strictly increasing timestamps."""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [create_token_event(start + timedelta(seconds=i)) for i in range(count)]
+
+
 def create_pause_event() -> PauseEvent:
     """Helper to create a PauseEvent for testing."""
     return PauseEvent(source='user')
@@ -217,3 +234,199 @@ class TestFilesystemEventServiceIntegration:
 
         result = await service.search_events(conversation_id)
         assert len(result.items) == 3
+
+
+class TestFilesystemEventServiceIndex:
+    """Test cases for the sidecar index used to resolve searches."""
+
+    @pytest.mark.asyncio
+    async def test_search_events_pages_items(self, service: FilesystemEventService):
+        """Test that pages are sliced from the matching events in sort order."""
+        conversation_id = uuid4()
+        events = create_sequential_token_events(5)
+        for event in events:
+            await service.save_event(conversation_id, event)
+
+        page_1 = await service.search_events(conversation_id, limit=2)
+        page_2 = await service.search_events(
+            conversation_id, page_id=page_1.next_page_id, limit=2
+        )
+        page_3 = await service.search_events(
+            conversation_id, page_id=page_2.next_page_id, limit=2
+        )
+
+        assert len(page_1.items) == 2
+        assert len(page_2.items) == 2
+        assert len(page_3.items) == 1
+        assert page_3.next_page_id is None
+        ids = [item.id for page in (page_1, page_2, page_3) for item in page.items]
+        assert ids == [event.id for event in events]
+
+    @pytest.mark.asyncio
+    async def test_index_built_on_search_and_appended_on_save(
+        self, service: FilesystemEventService
+    ):
+        """Test that the index is built lazily and then maintained by save_event."""
+        conversation_id = uuid4()
+        await service.save_event(conversation_id, create_token_event())
+        conversation_path = await service.get_conversation_path(conversation_id)
+        index_path = conversation_path / INDEX_FILE_NAME
+        assert not index_path.exists()
+
+        await service.search_events(conversation_id)
+        assert index_path.exists()
+
+        await service.save_event(conversation_id, create_pause_event())
+        entries = service._load_index(conversation_path)
+        assert entries is not None
+        assert [entry.kind for entry in entries] == ['TokenEvent', 'PauseEvent']
+
+    @pytest.mark.asyncio
+    async def test_search_events_only_loads_page(self, service: FilesystemEventService):
+        """Test that only the events on the returned page are deserialized."""
+        conversation_id = uuid4()
+        for _ in range(10):
+            await service.save_event(conversation_id, create_token_event())
+        await service.search_events(conversation_id)
+        service.clear_cache(conversation_id)
+
+        with patch.object(
+            FilesystemEventService,
+            '_read_event',
+            autospec=True,
+            side_effect=FilesystemEventService._read_event,
+        ) as read_event:
+            result = await service.search_events(conversation_id, limit=3)
+
+        assert len(result.items) == 3
+        assert read_event.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_count_events_with_filter(self, service: FilesystemEventService):
+        """Test that count_events applies filters from the index."""
+        conversation_id = uuid4()
+        for _ in range(3):
+            await service.save_event(conversation_id, create_token_event())
+        await service.save_event(conversation_id, create_pause_event())
+
+        assert await service.count_events(conversation_id) == 4
+        assert await service.count_events(conversation_id, kind__eq='PauseEvent') == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_get_events_uses_index(self, service: FilesystemEventService):
+        """Test that batch_get_events returns None for ids which are not indexed."""
+        conversation_id = uuid4()
+        event = create_token_event()
+        await service.save_event(conversation_id, event)
+        await service.search_events(conversation_id)
+
+        result = await service.batch_get_events(
+            conversation_id, [UUID(event.id), uuid4()]
+        )
+
+        assert result[0] is not None
+        assert result[0].id == event.id
+        assert result[1] is None
+
+    @pytest.mark.asyncio
+    async def test_search_events_filter_by_timestamp(
+        self, service: FilesystemEventService
+    ):
+        """Test that timestamp filters are resolved from the index."""
+        conversation_id = uuid4()
+        events = create_sequential_token_events(3)
+        for event in events:
+            await service.save_event(conversation_id, event)
+
+        result = await service.search_events(
+            conversation_id,
+            timestamp__gte=datetime.fromisoformat(events[1].timestamp),
+        )
+
+        assert [item.id for item in result.items] == [e.id for e in events[1:]]
+
+    @pytest.mark.asyncio
+    async def test_save_events_batch(self, service: FilesystemEventService):
+        """Test that save_events stores each event and appends to the index once."""
+        conversation_id = uuid4()
+        await service.save_event(conversation_id, create_token_event())
+        await service.search_events(conversation_id)
+        events = create_sequential_token_events(3)
+
+        with patch.object(
+            FilesystemEventService,
+            '_append_index',
+            autospec=True,
+            side_effect=FilesystemEventService._append_index,
+        ) as append_index:
+            await service.save_events(conversation_id, events)
+
+        assert append_index.call_count == 1
+        result = await service.search_events(conversation_id)
+        assert len(result.items) == 4
+        assert await service.count_events(conversation_id) == 4
+
+
+class TestFilesystemEventServiceEncoding:
+    """Test cases for the encodings used to store events."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('encoding', list(EventEncoding))
+    async def test_save_and_get_event_with_encoding(
+        self, temp_dir: Path, encoding: EventEncoding
+    ):
+        """Test that events round trip with every encoding."""
+        service = FilesystemEventService(
+            prefix=temp_dir,
+            user_id='test_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+            encoding=encoding,
+        )
+        conversation_id = uuid4()
+        event = create_token_event()
+        await service.save_event(conversation_id, event)
+
+        result = await service.get_event(conversation_id, UUID(event.id))
+
+        assert result is not None
+        assert result.id == event.id
+        assert result.prompt_token_ids == event.prompt_token_ids
+
+    @pytest.mark.asyncio
+    async def test_zstd_events_are_compressed(self, temp_dir: Path):
+        """Test that zstd encoded events are written behind the magic header."""
+        service = FilesystemEventService(
+            prefix=temp_dir,
+            user_id='test_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+            encoding=EventEncoding.ZSTD,
+        )
+        conversation_id = uuid4()
+        event = create_token_event()
+        await service.save_event(conversation_id, event)
+
+        conversation_path = await service.get_conversation_path(conversation_id)
+        content = (conversation_path / f'{UUID(event.id).hex}.json').read_bytes()
+        assert content.startswith(ZSTD_MAGIC)
+
+    @pytest.mark.asyncio
+    async def test_mixed_encodings_are_readable(self, temp_dir: Path):
+        """Test that events written with different encodings can be searched
+        together."""
+        conversation_id = uuid4()
+        events = create_sequential_token_events(3)
+        for event, encoding in zip(events, EventEncoding, strict=True):
+            service = FilesystemEventService(
+                prefix=temp_dir,
+                user_id='test_user',
+                app_conversation_info_service=None,
+                app_conversation_info_load_tasks={},
+                encoding=encoding,
+            )
+            await service.save_event(conversation_id, event)
+
+        result = await service.search_events(conversation_id)
+
+        assert [item.id for item in result.items] == [e.id for e in events]
@@ -0,0 +1,238 @@
+"""Tests for the sidecar index kept by GoogleCloudEventService."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from openhands.app_server.event.event_cache import EventCache
+from openhands.app_server.event.event_index import INDEX_FILE_NAME
+from openhands.app_server.event.google_cloud_event_service import (
+    _INDEX_COMPACT_THRESHOLD,
+    GoogleCloudEventService,
+)
+from openhands.sdk.event import PauseEvent, TokenEvent
+
+
+class FakeBlob:
+    """Blob whose generation is checked on upload like Google Cloud Storage."""
+
+    def __init__(self, bucket: 'FakeBucket', name: str):
+        self.bucket = bucket
+        self.name = name
+        self.generation: int | None = None
+
+    def download_as_bytes(self) -> bytes:
+        if self.name not in self.bucket.objects:
+            raise NotFound(self.name)
+        self.bucket.downloads.append(self.name)
+        data, self.generation = self.bucket.objects[self.name]
+        return data
+
+    def upload_from_string(
+        self, data, content_type=None, if_generation_match: int | None = None
+    ):
+        current = self.bucket.objects.get(self.name)
+        current_generation = current[1] if current else 0
+        if (
+            if_generation_match is not None
+            and if_generation_match != current_generation
+        ):
+            raise PreconditionFailed(self.name)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.bucket.generation += 1
+        self.bucket.objects[self.name] = (data, self.bucket.generation)
+
+    def exists(self) -> bool:
+        return self.name in self.bucket.objects
+
+    def delete(self):
+        if self.bucket.objects.pop(self.name, None) is None:
+            raise NotFound(self.name)
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects: dict[str, tuple[bytes, int]] = {}
+        self.generation = 0
+        self.downloads: list[str] = []
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def list_blobs(self, page_token=None, prefix=''):
+        return [
+            FakeBlob(self, name) for name in self.objects if name.startswith(prefix)
+        ]
+
+
+@pytest.fixture
+def bucket() -> FakeBucket:
+    return FakeBucket()
+
+
+@pytest.fixture
+def service(bucket: FakeBucket) -> GoogleCloudEventService:
+    return GoogleCloudEventService(
+        prefix=Path('users'),
+        user_id='test_user',
+        app_conversation_info_service=None,
+        app_conversation_info_load_tasks={},
+        bucket=bucket,  # type: ignore[arg-type]
+        event_cache=EventCache(),
+    )
+
+
+def create_sequential_token_events(count: int) -> list[TokenEvent]:
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [
+        TokenEvent(
+            source='agent',
+            prompt_token_ids=[1],
+            response_token_ids=[2],
+            timestamp=(start + timedelta(seconds=i)).isoformat(),
+        )
+        for i in range(count)
+    ]
+
+
+class TestGoogleCloudEventServiceIndex:
+    @pytest.mark.asyncio
+    async def test_index_built_on_search_and_appended_on_save(
+        self, service: GoogleCloudEventService, bucket: FakeBucket
+    ):
+        """Test that the index is stored in the bucket and maintained by saves."""
+        conversation_id = uuid4()
+        events = create_sequential_token_events(3)
+        await service.save_events(conversation_id, events)
+        conversation_path = await service.get_conversation_path(conversation_id)
+        index_name = str(conversation_path / INDEX_FILE_NAME)
+        assert index_name not in bucket.objects
+
+        page = await service.search_events(conversation_id)
+        assert [event.id for event in page.items] == [event.id for event in events]
+        assert index_name in bucket.objects
+
+        await service.save_event(conversation_id, PauseEvent(source='user'))
+        entries = service._load_index(conversation_path)
+        assert entries is not None
+        assert [entry.kind for entry in entries] == [
+            'TokenEvent',
+            'TokenEvent',
+            'TokenEvent',
+            'PauseEvent',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_uses_index_without_listing(
+        self, service: GoogleCloudEventService, bucket: FakeBucket
+    ):
+        """Test that once indexed, only the events on the page are downloaded."""
+        conversation_id = uuid4()
+        events = create_sequential_token_events(10)
+        await service.save_events(conversation_id, events)
+        await service.search_events(conversation_id)
+        service.clear_cache(conversation_id)
+        bucket.downloads.clear()
+        list_blobs = bucket.list_blobs
+        listed_prefixes: list[str] = []
+
+        def recording_list_blobs(page_token=None, prefix=''):
+            listed_prefixes.append(prefix)
+            return list_blobs(page_token, prefix)
+
+        bucket.list_blobs = recording_list_blobs  # type: ignore[method-assign]
+
+        page = await service.search_events(conversation_id, limit=3)
+        count = await service.count_events(conversation_id, kind__eq='TokenEvent')
+        batch = await service.batch_get_events(
+            conversation_id, [UUID(events[5].id), uuid4()]
+        )
+
+        assert [event.id for event in page.items] == [e.id for e in events[:3]]
+        assert count == 10
+        assert batch[0] is not None and batch[0].id == events[5].id
+        assert batch[1] is None
+        event_downloads = [
+            name for name in bucket.downloads if not name.endswith(INDEX_FILE_NAME)
+        ]
+        assert len(event_downloads) == 4
+        # Only the segments of the index are listed, never the events
+        assert all(prefix.endswith('/index/') for prefix in listed_prefixes)
+
+    @pytest.mark.asyncio
+    async def test_appends_are_segments_merged_on_read(
+        self, service: GoogleCloudEventService, bucket: FakeBucket
+    ):
+        """Test that saves don't rewrite the index, and that reads merge the
+        segments saved into it once there are enough of them."""
+        conversation_id = uuid4()
+        events = create_sequential_token_events(_INDEX_COMPACT_THRESHOLD + 1)
+        await service.save_event(conversation_id, events[0])
+        await service.search_events(conversation_id)
+        conversation_path = await service.get_conversation_path(conversation_id)
+        index_name = str(conversation_path / INDEX_FILE_NAME)
+        segments_prefix = f'{conversation_path / "index"}/'
+        index_generation = bucket.objects[index_name][1]
+
+        for event in events[1:]:
+            await service.save_event(conversation_id, event)
+        assert bucket.objects[index_name][1] == index_generation
+        segment_names = [
+            name for name in bucket.objects if name.startswith(segments_prefix)
+        ]
+        assert len(segment_names) == _INDEX_COMPACT_THRESHOLD
+
+        entries = service._load_index(conversation_path)
+        assert entries is not None
+        assert len(entries) == len(events)
+        assert bucket.objects[index_name][1] != index_generation
+        assert not any(name in bucket.objects for name in segment_names)
+        entries = service._load_index(conversation_path)
+        assert entries is not None
+        assert {entry.id for entry in entries} == {
+            UUID(event.id).hex for event in events
+        }
+
+    @pytest.mark.asyncio
+    async def test_load_retries_when_segments_merged_concurrently(
+        self, service: GoogleCloudEventService, bucket: FakeBucket
+    ):
+        """Test that a read racing with another reader merging the segments into
+        the index reads it again rather than losing entries."""
+        conversation_id = uuid4()
+        first, second = create_sequential_token_events(2)
+        await service.save_event(conversation_id, first)
+        await service.search_events(conversation_id)
+        await service.save_event(conversation_id, second)
+        conversation_path = await service.get_conversation_path(conversation_id)
+        index_name = str(conversation_path / INDEX_FILE_NAME)
+        merged = service._load_index(conversation_path)
+        assert merged is not None
+
+        # Another server merges the segments between this one listing and reading them
+        list_blobs = bucket.list_blobs
+
+        def racing_list_blobs(page_token=None, prefix=''):
+            blobs = list_blobs(page_token, prefix)
+            if blobs and prefix.endswith('/index/'):
+                bucket.generation += 1
+                bucket.objects[index_name] = (
+                    ''.join(entry.to_json_line() for entry in merged).encode(),
+                    bucket.generation,
+                )
+                for blob in blobs:
+                    bucket.objects.pop(blob.name, None)
+            return blobs
+
+        bucket.list_blobs = racing_list_blobs  # type: ignore[method-assign]
+        entries = service._load_index(conversation_path)
+
+        assert entries is not None
+        assert [entry.id for entry in entries] == [
+            UUID(first.id).hex,
+            UUID(second.id).hex,
+        ]
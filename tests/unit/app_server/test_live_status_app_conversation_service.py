@@ -1,5 +1,6 @@
 """Unit tests for the methods in LiveStatusAppConversationService."""
 
+import asyncio
 import io
 import json
 import os
@@ -8,6 +9,7 @@ from datetime import datetime
 from unittest.mock import AsyncMock, Mock, patch
 from uuid import UUID, uuid4
 
+import httpx
 import pytest
 from pydantic import SecretStr
 
@@ -23,6 +25,7 @@ from openhands.app_server.app_conversation.app_conversation_models import (
 from openhands.app_server.app_conversation.live_status_app_conversation_service import (
     LiveStatusAppConversationService,
 )
+from openhands.app_server.app_conversation.live_status_cache import LiveStatusCache
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
     ExposedUrl,
@@ -57,6 +60,12 @@ def allow_short_context_windows():
             os.environ.pop(_ALLOW_SHORT_CONTEXT_WINDOWS, None)
 
 
+async def _read_export(service, conversation_id) -> bytes:
+    return b''.join(
+        [chunk async for chunk in service.export_conversation(conversation_id)]
+    )
+
+
 class TestLiveStatusAppConversationService:
     """Test cases for the methods in LiveStatusAppConversationService."""
 
@@ -93,6 +102,7 @@ class TestLiveStatusAppConversationService:
             openhands_provider_base_url='https://provider.example.com',
             access_token_hard_timeout=None,
             app_mode='test',
+            live_status_cache=LiveStatusCache(),
         )
 
         # Mock user info
@@ -1121,7 +1131,7 @@ class TestLiveStatusAppConversationService:
         )
 
         # Act
-        result = await self.service.export_conversation(conversation_id)
+        result = await _read_export(self.service, conversation_id)
 
         # Assert
         assert result is not None
@@ -1173,7 +1183,7 @@ class TestLiveStatusAppConversationService:
         with pytest.raises(
             ValueError, match=f'Conversation not found: {conversation_id}'
         ):
-            await self.service.export_conversation(conversation_id)
+            await _read_export(self.service, conversation_id)
 
         # Verify service calls
         self.mock_app_conversation_info_service.get_app_conversation_info.assert_called_once_with(
@@ -1207,7 +1217,7 @@ class TestLiveStatusAppConversationService:
         self.mock_event_service.search_events = AsyncMock(return_value=mock_event_page)
 
         # Act
-        result = await self.service.export_conversation(conversation_id)
+        result = await _read_export(self.service, conversation_id)
 
         # Assert
         assert result is not None
@@ -1257,7 +1267,7 @@ class TestLiveStatusAppConversationService:
         self.mock_event_service.search_events = AsyncMock(return_value=mock_event_page)
 
         # Act
-        await self.service.export_conversation(conversation_id)
+        await _read_export(self.service, conversation_id)
 
         # Assert - Verify search_events was called with 'conversation_id', not 'conversation_id__eq'
         self.mock_event_service.search_events.assert_called()
@@ -1328,7 +1338,7 @@ class TestLiveStatusAppConversationService:
         )
 
         # Act
-        result = await self.service.export_conversation(conversation_id)
+        result = await _read_export(self.service, conversation_id)
 
         # Assert
         assert result is not None
@@ -1348,6 +1358,49 @@ class TestLiveStatusAppConversationService:
         # Verify service calls - should call search_events for each page
         assert self.mock_event_service.search_events.call_count == total_pages
 
+    @pytest.mark.asyncio
+    async def test_export_conversation_streams_events_incrementally(self):
+        """Test that the zip file is yielded as events are paged, not all at once."""
+        # Arrange
+        conversation_id = uuid4()
+        mock_conversation_info = Mock(spec=AppConversationInfo)
+        mock_conversation_info.model_dump_json = Mock(return_value='{"id": "test"}')
+        self.mock_app_conversation_info_service.get_app_conversation_info = AsyncMock(
+            return_value=mock_conversation_info
+        )
+
+        pages = []
+        for page_num in range(3):
+            mock_event = Mock(spec=Event)
+            mock_event.id = uuid4()
+            mock_event.model_dump = Mock(
+                return_value={'id': str(mock_event.id), 'content': 'x' * 1000}
+            )
+            mock_event_page = Mock()
+            mock_event_page.items = [mock_event]
+            mock_event_page.next_page_id = (
+                f'page{page_num + 1}' if page_num < 2 else None
+            )
+            pages.append(mock_event_page)
+        self.mock_event_service.search_events = AsyncMock(side_effect=pages)
+
+        # Act
+        chunks = []
+        pages_fetched = []
+        async for chunk in self.service.export_conversation(conversation_id):
+            chunks.append(chunk)
+            pages_fetched.append(self.mock_event_service.search_events.call_count)
+
+        # Assert
+        # The metadata is yielded before any events are fetched, and each event
+        # before the next page is fetched
+        assert pages_fetched[:4] == [0, 1, 2, 3]
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks)), 'r') as zipf:
+            assert zipf.testzip() is None
+            file_list = zipf.namelist()
+            assert file_list[0] == 'meta.json'
+            assert len([f for f in file_list if f.startswith('event_')]) == 3
+
     @patch(
         'openhands.app_server.app_conversation.live_status_app_conversation_service.AsyncRemoteWorkspace'
     )
@@ -1849,6 +1902,136 @@ class TestLiveStatusAppConversationService:
         assert stdio_server['command'] == 'npx'
         assert stdio_server['env'] == {'TOKEN': 'value'}
 
+    def _running_sandbox(self, url: str, session_api_key: str = 'test_key'):
+        sandbox = Mock(spec=SandboxInfo)
+        sandbox.id = str(uuid4())
+        sandbox.status = SandboxStatus.RUNNING
+        sandbox.session_api_key = session_api_key
+        sandbox.exposed_urls = [ExposedUrl(name=AGENT_SERVER, url=url, port=8000)]
+        return sandbox
+
+    def _conversation_info(self, conversation_id: UUID):
+        conversation_info = Mock()
+        conversation_info.id = conversation_id
+        return conversation_info
+
+    @pytest.mark.asyncio
+    async def test_get_live_conversation_infos_one_request_per_agent_server(self):
+        """Test that conversations are grouped into one request per agent server."""
+        # Arrange
+        shared_a = self._running_sandbox('http://shared:8000')
+        shared_b = self._running_sandbox('http://shared:8000')
+        other = self._running_sandbox('http://other:8000')
+        sandbox_id_to_conversation_ids = {
+            shared_a.id: [uuid4()],
+            shared_b.id: [uuid4(), uuid4()],
+            other.id: [uuid4()],
+        }
+        self.service._get_live_conversation_info = AsyncMock(
+            side_effect=lambda sandbox, conversation_ids: [
+                self._conversation_info(conversation_id)
+                for conversation_id in conversation_ids
+            ]
+        )
+
+        # Act
+        result = await self.service._get_live_conversation_infos(
+            [shared_a, shared_b, other], sandbox_id_to_conversation_ids
+        )
+
+        # Assert
+        assert self.service._get_live_conversation_info.call_count == 2
+        requested = sorted(
+            len(call.args[1])
+            for call in self.service._get_live_conversation_info.call_args_list
+        )
+        assert requested == [1, 3]
+        assert set(result) == {
+            conversation_id
+            for conversation_ids in sandbox_id_to_conversation_ids.values()
+            for conversation_id in conversation_ids
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_live_conversation_infos_bounds_concurrency(self):
+        """Test that the number of agent servers queried at once is bounded."""
+        # Arrange
+        self.service.agent_server_max_concurrency = 2
+        sandboxes = [self._running_sandbox(f'http://server-{i}:8000') for i in range(5)]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_live_conversation_info(sandbox, conversation_ids):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+
+        self.service._get_live_conversation_info = get_live_conversation_info
+
+        # Act
+        await self.service._get_live_conversation_infos(
+            sandboxes, {sandbox.id: [uuid4()] for sandbox in sandboxes}
+        )
+
+        # Assert
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_get_live_conversation_info_uses_cache(self):
+        """Test that statuses are cached, including conversations the server did not know."""
+        # Arrange
+        sandbox = self._running_sandbox('http://agent-server:8000')
+        known_id = uuid4()
+        unknown_id = uuid4()
+        known_info = self._conversation_info(known_id)
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock()
+        mock_response.json.return_value = []
+        self.mock_httpx_client.get = AsyncMock(return_value=mock_response)
+
+        # Act
+        with patch(
+            'openhands.app_server.app_conversation.live_status_app_conversation_service._conversation_info_type_adapter'
+        ) as mock_type_adapter:
+            mock_type_adapter.validate_python.return_value = [known_info, None]
+            first = await self.service._get_live_conversation_infos(
+                [sandbox], {sandbox.id: [known_id, unknown_id]}
+            )
+            second = await self.service._get_live_conversation_infos(
+                [sandbox], {sandbox.id: [known_id, unknown_id]}
+            )
+
+        # Assert
+        assert first == {known_id: known_info}
+        assert second == {known_id: known_info}
+        self.mock_httpx_client.get.assert_called_once()
+        call_kwargs = self.mock_httpx_client.get.call_args.kwargs
+        assert call_kwargs['params'] == {'ids': [str(known_id), str(unknown_id)]}
+        assert call_kwargs['timeout'] == self.service.agent_server_timeout
+
+    @pytest.mark.asyncio
+    async def test_get_live_conversation_info_timeout_is_not_cached(self):
+        """Test that a timed out agent server is asked again on the next poll."""
+        # Arrange
+        sandbox = self._running_sandbox('http://agent-server:8000')
+        conversation_id = uuid4()
+        self.mock_httpx_client.get = AsyncMock(
+            side_effect=httpx.ReadTimeout('timed out')
+        )
+
+        # Act
+        for _ in range(2):
+            result = await self.service._get_live_conversation_infos(
+                [sandbox], {sandbox.id: [conversation_id]}
+            )
+
+        # Assert
+        assert result == {}
+        assert self.mock_httpx_client.get.call_count == 2
+
 
 class TestPluginHandling:
     """Test cases for plugin-related functionality in LiveStatusAppConversationService."""
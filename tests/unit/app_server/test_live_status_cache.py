@@ -0,0 +1,87 @@
+"""Tests for the process-wide LiveStatusCache."""
+
+from unittest.mock import Mock, patch
+from uuid import UUID, uuid4
+
+from openhands.app_server.app_conversation.live_status_cache import LiveStatusCache
+
+AGENT_SERVER_URL = 'http://agent-server:8000'
+
+
+def create_conversation_info(conversation_id: UUID):
+    conversation_info = Mock()
+    conversation_info.id = conversation_id
+    return conversation_info
+
+
+def test_lookup_returns_cached_and_missing():
+    cache = LiveStatusCache()
+    known_id, unknown_id, uncached_id = uuid4(), uuid4(), uuid4()
+    known_info = create_conversation_info(known_id)
+    cache.put(AGENT_SERVER_URL, [known_id, unknown_id], [known_info])
+
+    found, missing = cache.lookup(AGENT_SERVER_URL, [known_id, unknown_id, uncached_id])
+
+    assert found == [known_info]
+    assert missing == [uncached_id]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (2, 1, 2)
+
+
+def test_entries_expire():
+    cache = LiveStatusCache(ttl_seconds=2)
+    conversation_id = uuid4()
+    with patch(
+        'openhands.app_server.app_conversation.live_status_cache.time.monotonic',
+        return_value=100.0,
+    ):
+        cache.put(
+            AGENT_SERVER_URL,
+            [conversation_id],
+            [create_conversation_info(conversation_id)],
+        )
+    with patch(
+        'openhands.app_server.app_conversation.live_status_cache.time.monotonic',
+        return_value=101.0,
+    ):
+        assert cache.lookup(AGENT_SERVER_URL, [conversation_id])[1] == []
+    with patch(
+        'openhands.app_server.app_conversation.live_status_cache.time.monotonic',
+        return_value=102.0,
+    ):
+        assert cache.lookup(AGENT_SERVER_URL, [conversation_id])[1] == [conversation_id]
+
+
+def test_entries_from_another_agent_server_are_not_used():
+    cache = LiveStatusCache()
+    conversation_id = uuid4()
+    cache.put(
+        AGENT_SERVER_URL, [conversation_id], [create_conversation_info(conversation_id)]
+    )
+
+    found, missing = cache.lookup('http://other:8000', [conversation_id])
+
+    assert found == []
+    assert missing == [conversation_id]
+
+
+def test_invalidate():
+    cache = LiveStatusCache()
+    conversation_id = uuid4()
+    cache.put(AGENT_SERVER_URL, [conversation_id], [])
+
+    cache.invalidate(conversation_id)
+
+    assert cache.lookup(AGENT_SERVER_URL, [conversation_id])[1] == [conversation_id]
+
+
+def test_oldest_entries_are_evicted():
+    cache = LiveStatusCache(max_entries=2)
+    conversation_ids = [uuid4() for _ in range(3)]
+    for conversation_id in conversation_ids:
+        cache.put(AGENT_SERVER_URL, [conversation_id], [])
+
+    _, missing = cache.lookup(AGENT_SERVER_URL, conversation_ids)
+
+    assert missing == conversation_ids[:1]
+    assert cache.stats().entries == 2
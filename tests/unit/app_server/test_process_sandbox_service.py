@@ -108,6 +108,21 @@ class TestProcessSandboxService:
         result = await process_sandbox_service._wait_for_server_ready(9000, timeout=1)
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_wait_for_server_ready_process_exited(self, process_sandbox_service):
+        """Test that waiting stops as soon as the agent process exits."""
+        process_sandbox_service.httpx_client.get.side_effect = Exception(
+            'Connection failed'
+        )
+        process = MagicMock()
+        process.poll.return_value = 1
+
+        result = await process_sandbox_service._wait_for_server_ready(
+            9000, timeout=30, process=process
+        )
+        assert result is False
+        process_sandbox_service.httpx_client.get.assert_not_called()
+
     @patch('psutil.Process')
     def test_get_process_status_running(
         self, mock_process_class, process_sandbox_service
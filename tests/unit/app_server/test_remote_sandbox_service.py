@@ -19,6 +19,10 @@ import httpx
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from openhands.agent_server.models import EventPage
+from openhands.app_server.app_conversation.app_conversation_models import (
+    AppConversationInfo,
+)
 from openhands.app_server.errors import SandboxError
 from openhands.app_server.sandbox.remote_sandbox_service import (
     ALLOW_CORS_ORIGINS_VARIABLE,
@@ -27,6 +31,7 @@ from openhands.app_server.sandbox.remote_sandbox_service import (
     WEBHOOK_CALLBACK_VARIABLE,
     RemoteSandboxService,
     StoredRemoteSandbox,
+    _sync_events,
 )
 from openhands.app_server.sandbox.sandbox_models import (
     AGENT_SERVER,
@@ -38,6 +43,7 @@ from openhands.app_server.sandbox.sandbox_models import (
 )
 from openhands.app_server.sandbox.sandbox_spec_models import SandboxSpecInfo
 from openhands.app_server.user.user_context import UserContext
+from openhands.sdk.event import TokenEvent
 
 
 @pytest.fixture
@@ -994,6 +1000,90 @@ class TestErrorHandling:
         assert result is False
 
 
+class TestSyncEvents:
+    """Test cases for incrementally syncing events from agent servers."""
+
+    def _create_events(self, count: int) -> list[TokenEvent]:
+        return [
+            TokenEvent(
+                source='agent',
+                prompt_token_ids=[1],
+                response_token_ids=[2],
+                timestamp=f'2025-01-01T12:00:0{i}',
+            )
+            for i in range(count)
+        ]
+
+    def _mock_response(self, page: EventPage) -> MagicMock:
+        response = MagicMock()
+        response.json.return_value = page.model_dump(mode='json')
+        return response
+
+    @pytest.mark.asyncio
+    async def test_sync_events_saves_only_missing_events(self, mock_httpx_client):
+        """Test that existence is checked in bulk and only new events are saved."""
+        events = self._create_events(3)
+        mock_httpx_client.get.return_value = self._mock_response(
+            EventPage(items=events)
+        )
+        event_service = AsyncMock()
+        event_service.batch_get_events.return_value = [events[0], None, None]
+        event_callback_service = AsyncMock()
+        app_conversation_info = AppConversationInfo(
+            created_by_user_id='test-user-123',
+            sandbox_id='test-sandbox-123',
+            last_synced_event_timestamp=events[0].timestamp,
+        )
+
+        await _sync_events(
+            event_service=event_service,
+            event_callback_service=event_callback_service,
+            app_conversation_info=app_conversation_info,
+            runtime=create_runtime_data(),
+            httpx_client=mock_httpx_client,
+        )
+
+        params = mock_httpx_client.get.call_args.kwargs['params']
+        assert params == {'timestamp__gte': events[0].timestamp}
+        event_service.batch_get_events.assert_called_once()
+        event_service.save_events.assert_called_once_with(
+            app_conversation_info.id, events[1:]
+        )
+        event_callback_service.batch_execute_callbacks.assert_called_once_with(
+            app_conversation_info.id, events[1:]
+        )
+        assert app_conversation_info.last_synced_event_timestamp == events[2].timestamp
+
+    @pytest.mark.asyncio
+    async def test_sync_events_follows_pages(self, mock_httpx_client):
+        """Test that every page is synced and the high water mark advances."""
+        events = self._create_events(2)
+        mock_httpx_client.get.side_effect = [
+            self._mock_response(EventPage(items=events[:1], next_page_id='1')),
+            self._mock_response(EventPage(items=events[1:])),
+        ]
+        event_service = AsyncMock()
+        event_service.batch_get_events.side_effect = [[None], [None]]
+        app_conversation_info = AppConversationInfo(
+            created_by_user_id='test-user-123', sandbox_id='test-sandbox-123'
+        )
+
+        await _sync_events(
+            event_service=event_service,
+            event_callback_service=AsyncMock(),
+            app_conversation_info=app_conversation_info,
+            runtime=create_runtime_data(),
+            httpx_client=mock_httpx_client,
+        )
+
+        first_params = mock_httpx_client.get.call_args_list[0].kwargs['params']
+        second_params = mock_httpx_client.get.call_args_list[1].kwargs['params']
+        assert first_params == {}
+        assert second_params == {'page_id': '1'}
+        assert event_service.save_events.call_count == 2
+        assert app_conversation_info.last_synced_event_timestamp == events[1].timestamp
+
+
 class TestUtilityFunctions:
     """Test cases for utility functions."""
 
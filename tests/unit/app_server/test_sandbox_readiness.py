@@ -0,0 +1,10 @@
+"""Tests for the intervals between polls for sandbox readiness."""
+
+import itertools
+
+from openhands.app_server.sandbox.sandbox_readiness import backoff_intervals
+
+
+def test_backoff_intervals():
+    intervals = backoff_intervals(initial=0.1, maximum=1.0, factor=2)
+    assert list(itertools.islice(intervals, 6)) == [0.1, 0.2, 0.4, 0.8, 1.0, 1.0]
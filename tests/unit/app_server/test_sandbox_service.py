@@ -9,7 +9,7 @@ This module tests the SandboxService base class implementation, focusing on:
 """
 
 from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -359,3 +359,40 @@ class TestCleanupOldSandboxes:
         # Verify: No sandboxes should be stopped
         assert result == []
         mock_sandbox_service.pause_sandbox_mock.assert_not_called()
+
+
+class TestWaitForSandboxRunning:
+    """Test cases for the wait_for_sandbox_running method."""
+
+    @staticmethod
+    async def _get_poll_intervals(
+        sandbox_service: MockSandboxService, polls: int
+    ) -> list[float]:
+        now = datetime.now(timezone.utc)
+        sandbox_service.get_sandbox_mock.side_effect = [
+            create_sandbox_info('sb1', SandboxStatus.STARTING, now)
+        ] * (polls - 1) + [create_sandbox_info('sb1', SandboxStatus.RUNNING, now)]
+        with patch(
+            'openhands.app_server.sandbox.sandbox_service.asyncio.sleep',
+            AsyncMock(),
+        ) as sleep:
+            result = await sandbox_service.wait_for_sandbox_running(
+                'sb1', poll_interval=2
+            )
+        assert result.status == SandboxStatus.RUNNING
+        return [call.args[0] for call in sleep.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_polls_at_fixed_interval_by_default(self, mock_sandbox_service):
+        """Test that remote services are not polled more often than poll_interval."""
+        intervals = await self._get_poll_intervals(mock_sandbox_service, 4)
+        assert intervals == [2, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_polls_back_off_from_initial_poll_interval(
+        self, mock_sandbox_service
+    ):
+        """Test that services with cheap polls start polling sooner."""
+        mock_sandbox_service.initial_poll_interval = 0.5
+        intervals = await self._get_poll_intervals(mock_sandbox_service, 5)
+        assert intervals == [0.5, 0.75, 1.125, 1.6875]
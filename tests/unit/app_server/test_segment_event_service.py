@@ -0,0 +1,232 @@
+"""Tests for SegmentEventService.
+
+This module tests the append-only segment log implementation of EventService,
+including rolling segments, tail recovery, compaction and migration from the
+one-file-per-event layout.
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from openhands.app_server.event.event_encoding import EventEncoding
+from openhands.app_server.event.event_index import INDEX_FILE_NAME, EventIndexEntry
+from openhands.app_server.event.filesystem_event_service import FilesystemEventService
+from openhands.app_server.event.segment_event_service import (
+    SegmentEventService,
+    SegmentEventServiceInjector,
+)
+from openhands.sdk.event import PauseEvent, TokenEvent
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def service(temp_dir: Path) -> SegmentEventService:
+    """Create a SegmentEventService instance for testing."""
+    return SegmentEventService(
+        prefix=temp_dir,
+        user_id='test_user',
+        app_conversation_info_service=None,
+        app_conversation_info_load_tasks={},
+    )
+
+
+def create_token_events(count: int) -> list[TokenEvent]:
+    """Helper to create TokenEvents with strictly increasing timestamps."""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    return [
+        TokenEvent(
+            source='agent',
+            prompt_token_ids=[1, 2],
+            response_token_ids=[3, 4],
+            timestamp=(start + timedelta(seconds=i)).isoformat(),
+        )
+        for i in range(count)
+    ]
+
+
+class TestSegmentEventService:
+    """Test cases for storing and reading events in segments."""
+
+    @pytest.mark.asyncio
+    async def test_save_and_search_events(self, service: SegmentEventService):
+        """Test that events are appended to a single segment and read back."""
+        conversation_id = uuid4()
+        events = create_token_events(3)
+        for event in events:
+            await service.save_event(conversation_id, event)
+
+        result = await service.search_events(conversation_id)
+
+        assert [item.id for item in result.items] == [e.id for e in events]
+        conversation_path = await service.get_conversation_path(conversation_id)
+        assert [p.name for p in service._search_paths(conversation_path)] == [
+            'segment-000000.jsonl'
+        ]
+        assert list(conversation_path.glob('*.json')) == []
+
+    @pytest.mark.asyncio
+    async def test_save_events_single_write(self, service: SegmentEventService):
+        """Test that a batch of events is appended to the segment in one write."""
+        conversation_id = uuid4()
+        events = create_token_events(5)
+
+        with patch.object(
+            SegmentEventService,
+            '_open_segment',
+            autospec=True,
+            side_effect=SegmentEventService._open_segment,
+        ) as open_segment:
+            await service.save_events(conversation_id, events)
+
+        assert open_segment.call_count == 1
+        result = await service.search_events(conversation_id)
+        assert [item.id for item in result.items] == [e.id for e in events]
+
+    @pytest.mark.asyncio
+    async def test_segments_roll_when_full(self, temp_dir: Path):
+        """Test that a new segment is started once the active one is full."""
+        service = SegmentEventService(
+            prefix=temp_dir,
+            user_id='test_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+            max_segment_bytes=1,
+        )
+        conversation_id = uuid4()
+        events = create_token_events(3)
+        for event in events:
+            await service.save_event(conversation_id, event)
+
+        conversation_path = await service.get_conversation_path(conversation_id)
+        assert len(service._search_paths(conversation_path)) == 3
+        result = await service.search_events(conversation_id)
+        assert [item.id for item in result.items] == [e.id for e in events]
+
+    @pytest.mark.asyncio
+    async def test_get_event_and_batch_get_events(self, service: SegmentEventService):
+        """Test that events are found by id using their segment offset."""
+        conversation_id = uuid4()
+        events = create_token_events(3)
+        for event in events:
+            await service.save_event(conversation_id, event)
+
+        event = await service.get_event(conversation_id, UUID(events[1].id))
+        assert event is not None
+        assert event.id == events[1].id
+
+        result = await service.batch_get_events(
+            conversation_id, [UUID(events[2].id), uuid4()]
+        )
+        assert result[0] is not None
+        assert result[0].id == events[2].id
+        assert result[1] is None
+
+    @pytest.mark.asyncio
+    async def test_unindexed_tail_is_recovered(self, service: SegmentEventService):
+        """Test that events missing from the index are recovered from the tail."""
+        conversation_id = uuid4()
+        events = create_token_events(3)
+        await service.save_event(conversation_id, events[0])
+        await service.search_events(conversation_id)
+
+        # Simulate writers which failed before updating the index
+        conversation_path = await service.get_conversation_path(conversation_id)
+        service._append_events(conversation_path, events[1:])
+
+        assert await service.count_events(conversation_id) == 3
+        index = (conversation_path / INDEX_FILE_NAME).read_text()
+        assert len(index.splitlines()) == 3
+
+    @pytest.mark.asyncio
+    async def test_tail_skips_last_indexed_event_by_id(
+        self, service: SegmentEventService
+    ):
+        """Test that the tail starts after the last indexed event even when it is
+        not the first event at the offset scanned from."""
+        conversation_id = uuid4()
+        events = create_token_events(3)
+        conversation_path = await service.get_conversation_path(conversation_id)
+        appended = service._append_events(conversation_path, events)
+        first, second, _ = (entry for entry, _ in appended)
+        last = EventIndexEntry(
+            id=second.id,
+            kind=second.kind,
+            timestamp=second.timestamp,
+            file=second.file,
+            offset=first.offset,
+        )
+
+        tail = service._scan_tail(conversation_path, [last])
+
+        assert [entry.id for entry, _, _ in tail] == [UUID(events[2].id).hex]
+
+    def test_only_compact_json_encoding_is_supported(self, temp_dir: Path):
+        """Test that encodings which can't be split by line are rejected."""
+        with pytest.raises(ValueError):
+            SegmentEventService(
+                prefix=temp_dir,
+                user_id='test_user',
+                app_conversation_info_service=None,
+                app_conversation_info_load_tasks={},
+                encoding=EventEncoding.ZSTD,
+            )
+        with pytest.raises(ValidationError):
+            SegmentEventServiceInjector(encoding=EventEncoding.ZSTD)
+
+    @pytest.mark.asyncio
+    async def test_compact_drops_duplicates(self, service: SegmentEventService):
+        """Test that compaction keeps a single copy of each event."""
+        conversation_id = uuid4()
+        events = create_token_events(2)
+        for event in events + events:
+            await service.save_event(conversation_id, event)
+
+        kept = await service.compact(conversation_id)
+
+        assert kept == 2
+        conversation_path = await service.get_conversation_path(conversation_id)
+        assert [p.name for p in service._search_paths(conversation_path)] == [
+            'segment-000001.jsonl'
+        ]
+        result = await service.search_events(conversation_id)
+        assert [item.id for item in result.items] == [e.id for e in events]
+
+    @pytest.mark.asyncio
+    async def test_migrate_conversation(self, service: SegmentEventService):
+        """Test migrating events stored one file per event into segments."""
+        conversation_id = uuid4()
+        legacy_service = FilesystemEventService(
+            prefix=service.prefix,
+            user_id='test_user',
+            app_conversation_info_service=None,
+            app_conversation_info_load_tasks={},
+        )
+        events = create_token_events(2)
+        for event in events:
+            await legacy_service.save_event(conversation_id, event)
+        pause_event = PauseEvent(source='user')
+
+        # Legacy events remain readable before migration
+        await service.save_event(conversation_id, pause_event)
+        assert await service.count_events(conversation_id) == 3
+
+        migrated = await service.migrate_conversation(conversation_id)
+
+        assert migrated == 2
+        conversation_path = await service.get_conversation_path(conversation_id)
+        assert list(conversation_path.glob('*.json')) == []
+        assert await service.count_events(conversation_id) == 3
+        result = await service.search_events(conversation_id, kind__eq='TokenEvent')
+        assert [item.id for item in result.items] == [e.id for e in events]
@@ -286,6 +286,46 @@ class TestSQLAppConversationInfoService:
         results = await service.batch_get_app_conversation_info([])
         assert results == []
 
+    @pytest.mark.asyncio
+    async def test_get_conversation_info_by_sandbox_ids(
+        self,
+        service: SQLAppConversationInfoService,
+        multiple_conversation_infos: list[AppConversationInfo],
+    ):
+        """Test getting the conversations in a set of sandboxes."""
+        for info in multiple_conversation_infos:
+            await service.save_app_conversation_info(info)
+        sub_info = AppConversationInfo(
+            id=uuid4(),
+            created_by_user_id=None,
+            sandbox_id='sandbox_2',
+            parent_conversation_id=multiple_conversation_infos[1].id,
+        )
+        await service.save_app_conversation_info(sub_info)
+
+        results = await service.get_app_conversation_info_by_sandbox_ids(
+            ['sandbox_2', 'sandbox_4', 'sandbox_missing']
+        )
+        assert {info.id for info in results} == {
+            multiple_conversation_infos[1].id,
+            multiple_conversation_infos[3].id,
+        }
+
+        results = await service.get_app_conversation_info_by_sandbox_ids(
+            ['sandbox_2'], include_sub_conversations=True
+        )
+        assert {info.id for info in results} == {
+            multiple_conversation_infos[1].id,
+            sub_info.id,
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_conversation_info_by_sandbox_ids_empty_list(
+        self, service: SQLAppConversationInfoService
+    ):
+        """Test getting the conversations in no sandboxes."""
+        assert await service.get_app_conversation_info_by_sandbox_ids([]) == []
+
     @pytest.mark.asyncio
     async def test_search_conversation_info_no_filters(
         self,
@@ -7,9 +7,11 @@ using SQLite as a mock database.
 
 from datetime import datetime, timezone
 from typing import AsyncGenerator
-from uuid import uuid4
+from unittest.mock import patch
+from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
@@ -17,12 +19,21 @@ from openhands.app_server.event_callback.event_callback_models import (
     CreateEventCallbackRequest,
     EventCallback,
     EventCallbackProcessor,
+    EventCallbackStatus,
     LoggingCallbackProcessor,
 )
+from openhands.app_server.event_callback.event_callback_result_models import (
+    EventCallbackResult,
+    EventCallbackResultStatus,
+)
 from openhands.app_server.event_callback.sql_event_callback_service import (
+    EventCallbackRegistry,
     SQLEventCallbackService,
+    StoredEventCallbackResult,
 )
 from openhands.app_server.utils.sql_utils import Base
+from openhands.sdk import Event
+from openhands.sdk.event import PauseEvent
 
 
 @pytest.fixture
@@ -57,7 +68,27 @@ async def async_db_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
 @pytest.fixture
 def service(async_db_session: AsyncSession) -> SQLEventCallbackService:
     """Create a SQLEventCallbackService instance for testing."""
-    return SQLEventCallbackService(db_session=async_db_session)
+    return SQLEventCallbackService(
+        db_session=async_db_session, registry=EventCallbackRegistry()
+    )
+
+
+class DisablingCallbackProcessor(EventCallbackProcessor):
+    """Callback processor which disables itself on the first event."""
+
+    async def __call__(
+        self,
+        conversation_id: UUID,
+        callback: EventCallback,
+        event: Event,
+    ) -> EventCallbackResult | None:
+        callback.status = EventCallbackStatus.DISABLED
+        return EventCallbackResult(
+            status=EventCallbackResultStatus.SUCCESS,
+            event_callback_id=callback.id,
+            event_id=event.id,
+            conversation_id=conversation_id,
+        )
 
 
 @pytest.fixture
@@ -653,3 +684,189 @@ class TestSQLEventCallbackService:
         retrieved_callback = await service.get_event_callback(sample_callback.id)
         assert retrieved_callback is not None
         assert retrieved_callback.id == sample_callback.id
+
+
+class TestSQLEventCallbackServiceExecution:
+    """Test cases for executing callbacks against batches of events."""
+
+    async def _count_results(self, service: SQLEventCallbackService) -> int:
+        result = await service.db_session.execute(
+            select(func.count()).select_from(StoredEventCallbackResult)
+        )
+        return result.scalar_one()
+
+    async def test_batch_execute_callbacks_single_query(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that callbacks for a whole batch are loaded with one query."""
+        conversation_id = uuid4()
+        await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        )
+        events = [PauseEvent(source='user') for _ in range(3)]
+
+        with patch.object(
+            service.db_session, 'execute', wraps=service.db_session.execute
+        ) as execute:
+            await service.batch_execute_callbacks(conversation_id, events)
+
+        assert execute.call_count == 1
+        assert await self._count_results(service) == 3
+
+    async def test_callbacks_cached_between_batches(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that the registry is used for later batches until invalidated."""
+        conversation_id = uuid4()
+        callback = await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        )
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+
+        with patch.object(
+            service.db_session, 'execute', wraps=service.db_session.execute
+        ) as execute:
+            await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+            assert execute.call_count == 0
+
+        await service.save_event_callback(callback)
+        await service.db_session.commit()
+        with patch.object(
+            service.db_session, 'execute', wraps=service.db_session.execute
+        ) as execute:
+            await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+            assert execute.call_count == 1
+
+    async def test_registry_invalidated_after_commit(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that saved callbacks are only invalidated once committed."""
+        conversation_id = uuid4()
+        callback = await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        )
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+
+        await service.save_event_callback(callback)
+        await service.db_session.rollback()
+        assert service.registry.get(conversation_id, 30) is not None
+
+        await service.save_event_callback(callback)
+        assert service.registry.get(conversation_id, 30) is not None
+        await service.db_session.commit()
+        assert service.registry.get(conversation_id, 30) is None
+
+    async def test_save_keeps_concurrent_changes(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that saving a stale callback does not overwrite a newer change."""
+        callback = await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=uuid4(), processor=LoggingCallbackProcessor()
+            )
+        )
+        stale = callback.model_copy(deep=True)
+
+        callback.status = EventCallbackStatus.COMPLETED
+        await service.save_event_callback(callback)
+        await service.db_session.commit()
+
+        stale.status = EventCallbackStatus.DISABLED
+        saved = await service.save_event_callback(stale)
+        await service.db_session.commit()
+
+        assert saved.status == EventCallbackStatus.COMPLETED
+        retrieved = await service.get_event_callback(callback.id)
+        assert retrieved is not None
+        assert retrieved.status == EventCallbackStatus.COMPLETED
+
+    async def test_unchanged_callbacks_are_not_saved(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that callbacks which did not change are not written back."""
+        conversation_id = uuid4()
+        await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        )
+
+        with patch.object(
+            service, 'save_event_callback', wraps=service.save_event_callback
+        ) as save_event_callback:
+            await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+
+        save_event_callback.assert_not_called()
+
+    async def test_callback_disabled_mid_batch(self, service: SQLEventCallbackService):
+        """Test that a callback disabling itself is skipped for later events."""
+        conversation_id = uuid4()
+        callback = await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id,
+                processor=DisablingCallbackProcessor(),
+            )
+        )
+        events = [PauseEvent(source='user') for _ in range(2)]
+
+        await service.batch_execute_callbacks(conversation_id, events)
+
+        assert await self._count_results(service) == 1
+        retrieved = await service.get_event_callback(callback.id)
+        assert retrieved is not None
+        assert retrieved.status == EventCallbackStatus.DISABLED
+
+    async def test_callbacks_filtered_by_event_kind(
+        self, service: SQLEventCallbackService
+    ):
+        """Test that callbacks only run for events of their kind."""
+        conversation_id = uuid4()
+        await service.create_event_callback(
+            CreateEventCallbackRequest(
+                conversation_id=conversation_id,
+                processor=LoggingCallbackProcessor(),
+                event_kind='MessageEvent',
+            )
+        )
+
+        await service.execute_callbacks(conversation_id, PauseEvent(source='user'))
+
+        assert await self._count_results(service) == 0
+
+
+class TestEventCallbackRegistry:
+    """Test cases for the in process callback registry."""
+
+    def _callbacks(self, conversation_id):
+        return [
+            EventCallback(
+                conversation_id=conversation_id, processor=LoggingCallbackProcessor()
+            )
+        ]
+
+    def test_expired_entries_are_dropped(self):
+        registry = EventCallbackRegistry()
+        conversation_id = uuid4()
+        registry.put(conversation_id, self._callbacks(conversation_id))
+
+        assert registry.get(conversation_id, 30) is not None
+        assert registry.get(conversation_id, -1) is None
+        assert conversation_id not in registry._entries
+
+    def test_least_recently_used_entries_are_evicted(self):
+        registry = EventCallbackRegistry(max_size=2)
+        conversation_ids = [uuid4() for _ in range(3)]
+        registry.put(conversation_ids[0], self._callbacks(conversation_ids[0]))
+        registry.put(conversation_ids[1], self._callbacks(conversation_ids[1]))
+        registry.get(conversation_ids[0], 30)
+        registry.put(conversation_ids[2], self._callbacks(conversation_ids[2]))
+
+        assert registry.get(conversation_ids[0], 30) is not None
+        assert registry.get(conversation_ids[1], 30) is None
+        assert registry.get(conversation_ids[2], 30) is not None
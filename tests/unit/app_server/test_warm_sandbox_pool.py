@@ -0,0 +1,158 @@
+"""Tests for the process-wide WarmSandboxPool."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from openhands.app_server.sandbox.sandbox_models import SandboxInfo, SandboxStatus
+from openhands.app_server.sandbox.warm_sandbox_pool import (
+    WarmSandboxFactory,
+    WarmSandboxPool,
+)
+
+SPEC_ID = 'test-image:latest'
+
+
+class FakeWarmSandboxFactory(WarmSandboxFactory):
+    def __init__(self):
+        self.started: list[str] = []
+        self.deleted: list[str] = []
+        self.unavailable: set[str] = set()
+
+    async def start_warm_sandbox(self, sandbox_spec_id: str) -> str:
+        warm_sandbox_id = f'warm-{len(self.started)}'
+        self.started.append(warm_sandbox_id)
+        return warm_sandbox_id
+
+    async def claim_warm_sandbox(
+        self, warm_sandbox_id: str, sandbox_id: str | None
+    ) -> SandboxInfo | None:
+        if warm_sandbox_id in self.unavailable:
+            return None
+        return SandboxInfo(
+            id=sandbox_id or warm_sandbox_id,
+            created_by_user_id=None,
+            sandbox_spec_id=SPEC_ID,
+            status=SandboxStatus.RUNNING,
+            session_api_key='session_api_key',
+        )
+
+    async def delete_warm_sandbox(self, warm_sandbox_id: str) -> None:
+        self.deleted.append(warm_sandbox_id)
+
+    async def delete_stale_warm_sandboxes(self) -> None:
+        pass
+
+
+async def _settle():
+    # Let the maintenance task run until it is waiting again
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def pool():
+    pool = WarmSandboxPool()
+    yield pool
+    await pool.stop()
+
+
+async def test_claim_when_not_running(pool: WarmSandboxPool):
+    factory = FakeWarmSandboxFactory()
+    assert await pool.claim(factory, SPEC_ID, 'sandbox') is None
+    assert pool.stats().misses == 0
+
+
+async def test_replenishes_to_min_idle(pool: WarmSandboxPool):
+    factory = FakeWarmSandboxFactory()
+    pool.start(factory, [SPEC_ID], min_idle=2, max_idle=2)
+    await _settle()
+    assert factory.started == ['warm-0', 'warm-1']
+
+    sandbox_info = await pool.claim(factory, SPEC_ID, 'sandbox')
+    assert sandbox_info is not None
+    assert sandbox_info.id == 'sandbox'
+    await _settle()
+
+    assert factory.started == ['warm-0', 'warm-1', 'warm-2']
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.idle) == (1, 0, 2)
+    assert stats.hit_rate == 1.0
+
+
+async def test_grows_when_empty_up_to_max_idle(pool: WarmSandboxPool):
+    factory = FakeWarmSandboxFactory()
+    pool.start(factory, [SPEC_ID], min_idle=0, max_idle=1)
+    await _settle()
+    assert factory.started == []
+
+    assert await pool.claim(factory, SPEC_ID, 'first') is None
+    await _settle()
+    assert factory.started == ['warm-0']
+
+    assert await pool.claim(factory, SPEC_ID, 'second') is not None
+    await _settle()
+    assert factory.started == ['warm-0', 'warm-1']
+    assert pool.stats().hit_rate == 0.5
+
+
+async def test_unavailable_sandboxes_are_deleted(pool: WarmSandboxPool):
+    factory = FakeWarmSandboxFactory()
+    pool.start(factory, [SPEC_ID], min_idle=2, max_idle=2)
+    await _settle()
+    factory.unavailable.add('warm-0')
+
+    sandbox_info = await pool.claim(factory, SPEC_ID, 'sandbox')
+
+    assert sandbox_info is not None
+    assert factory.deleted == ['warm-0']
+
+
+async def test_reaps_idle_sandboxes_beyond_min_idle(pool: WarmSandboxPool):
+    factory = FakeWarmSandboxFactory()
+    pool.start(factory, [SPEC_ID], min_idle=1, max_idle=2, idle_timeout_seconds=0)
+    await _settle()
+    assert await pool.claim(factory, SPEC_ID, 'sandbox') is not None
+    await pool.claim(factory, SPEC_ID, 'miss')
+    await _settle()
+    assert pool.stats().idle == 2
+
+    await pool._reap(factory)
+
+    assert pool.stats().idle == 1
+    assert len(factory.deleted) == 1
+
+
+def test_time_to_first_event():
+    pool = WarmSandboxPool()
+    with patch(
+        'openhands.app_server.sandbox.warm_sandbox_pool.time.monotonic',
+        side_effect=[10.0, 20.0, 11.0, 50.0],
+    ):
+        pool.record_start('pooled', pooled=True)
+        pool.record_start('cold', pooled=False)
+        pool.record_first_event('pooled')
+        pool.record_first_event('cold')
+    # Only the first event is measured
+    pool.record_first_event('pooled')
+
+    stats = pool.stats()
+    assert stats.pooled_time_to_first_event == 1.0
+    assert stats.cold_time_to_first_event == 30.0
+
+
+async def test_stats_are_logged_periodically(pool: WarmSandboxPool):
+    factory = FakeWarmSandboxFactory()
+    pool.stats_log_interval_seconds = 0
+    with patch(
+        'openhands.app_server.sandbox.warm_sandbox_pool._logger.info'
+    ) as log_info:
+        pool.start(factory, [SPEC_ID], min_idle=1, max_idle=2)
+        await _settle()
+        assert await pool.claim(factory, SPEC_ID, 'sandbox') is not None
+        await _settle()
+
+    assert log_info.call_args.args == ('warm_sandbox_pool_stats',)
+    assert log_info.call_args.kwargs['extra']['hits'] == 1
+    assert log_info.call_args.kwargs['extra']['hit_rate'] == 1.0
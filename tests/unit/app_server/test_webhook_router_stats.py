@@ -540,8 +540,10 @@ class TestOnEventStatsProcessing:
                 event_service=mock_event_service,
             )
 
-            # Verify events were saved
-            assert mock_event_service.save_event.call_count == 2
+            # Verify events were saved in a single batch
+            mock_event_service.save_events.assert_called_once_with(
+                conversation_id, events
+            )
 
             # Verify stats event was processed
             mock_app_conversation_info_service.update_conversation_statistics.assert_called_once()
@@ -4,6 +4,7 @@ from openhands.controller.state.state import State, TrafficControlState
 from openhands.core.schema import AgentState
 from openhands.events.event import Event
 from openhands.llm.metrics import Metrics
+from openhands.memory.view import ViewBuilder
 from openhands.storage.memory import InMemoryFileStore
 
 
@@ -37,6 +38,27 @@ def test_state_view_caching_avoids_unnecessary_rebuilding():
     assert id(new_view) == id(state.view)
 
 
+def test_state_view_updated_incrementally():
+    """Test that the view is updated from the new events only when the history is
+    appended to, and rebuilt when the history is replaced."""
+    state = State()
+    state.history = [example_event(i) for i in range(5)]
+    view = state.view
+
+    state.history.append(example_event(100))
+    with patch.object(
+        ViewBuilder, 'append', autospec=True, side_effect=ViewBuilder.append
+    ) as append:
+        new_view = state.view
+    append.assert_called_once()
+    assert append.call_args.args[1] == [state.history[-1]]
+    assert new_view.events == state.history
+    assert view.events == state.history[:5]
+
+    state.history = state.history[3:]
+    assert state.view.events == state.history
+
+
 def test_state_view_cache_not_serialized():
     """Test that the fields used to cache view construction are not serialized when state is saved."""
     state = State()
@@ -314,9 +314,17 @@ async def test_delegate_step_different_states(
         initial_state=state,
     )
 
-    mock_delegate = AsyncMock()
-    controller.delegate = mock_delegate
+    # The controller receives its system message from the event stream in another
+    # thread, so wait for it before giving the controller a delegate
+    async def system_message_received():
+        while not any(
+            isinstance(event, SystemMessageAction) for event in controller.state.history
+        ):
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(system_message_received(), timeout=10)
 
+    mock_delegate = AsyncMock()
     mock_delegate.state.iteration_flag = MagicMock()
     mock_delegate.state.iteration_flag.current_value = 5
     mock_delegate.state.outputs = {'result': 'test'}
@@ -325,8 +333,9 @@ async def test_delegate_step_different_states(
     mock_delegate.get_agent_state = Mock(return_value=delegate_state)
     mock_delegate._step = AsyncMock()
     mock_delegate.close = AsyncMock()
+    controller.delegate = mock_delegate
 
-    async def call_on_event_with_new_loop():
+    def call_on_event_with_new_loop():
         """In this thread, create and set a fresh event loop, so that the run_until_complete()
         calls inside controller.on_event(...) find a valid loop.
         """
@@ -1,4 +1,5 @@
 import logging
+import random
 from unittest.mock import Mock, patch
 
 import pytest
@@ -6,7 +7,7 @@ from pytest import TempPathFactory
 
 from openhands.controller.agent_controller import AgentController
 from openhands.controller.state.state import State
-from openhands.controller.stuck import StuckDetector
+from openhands.controller.stuck import StuckDetector, _freeze
 from openhands.events.action import (
     CmdRunAction,
     FileReadAction,
@@ -821,6 +822,71 @@ class TestStuckDetector:
             assert stuck_detector.is_stuck(headless_mode=False) is False
             mock_warning.assert_not_called()
 
+    @pytest.mark.parametrize('headless_mode', [True, False])
+    def test_is_stuck_updated_incrementally(self, headless_mode: bool):
+        rng = random.Random(42)
+        user_message = MessageAction(content='Keep going', wait_for_response=False)
+        user_message._source = EventSource.USER
+        agent_message = MessageAction(content='Thinking', wait_for_response=False)
+        agent_message._source = EventSource.AGENT
+        pool: list[Event] = [
+            cmd_ls_action,
+            cmd_ls_observation,
+            read_file1_action,
+            read_file1_observation,
+            pwd_action,
+            cmd_ls_different_observation,
+            ErrorObservation(content='error'),
+            AgentCondensationObservation('Trimming prompt to meet context window'),
+            NullObservation(content=''),
+            agent_message,
+            user_message,
+        ]
+        state = State(inputs={})
+        state.history = []
+        stuck_detector = StuckDetector(state)
+        for _ in range(300):
+            # repeat recent events often, so loops of every kind come up
+            if len(state.history) >= 4 and rng.random() < 0.6:
+                event = state.history[-rng.choice([2, 4])]
+            else:
+                event = rng.choice(pool)
+            state.history.append(event)
+
+            stuck = stuck_detector.is_stuck(headless_mode)
+            rebuilt_detector = StuckDetector(state)
+            assert rebuilt_detector.is_stuck(headless_mode) is stuck
+            if stuck:
+                assert stuck_detector.stuck_analysis == rebuilt_detector.stuck_analysis
+
+    def test_freeze_unhashable_values(self):
+        class Unhashable:
+            def __init__(self, value):
+                self.value = value
+
+            def __eq__(self, other):
+                return isinstance(other, Unhashable) and self.value == other.value
+
+        assert _freeze(Unhashable([1, {'a': 2}])) == _freeze(Unhashable([1, {'a': 2}]))
+        assert _freeze(Unhashable([1])) != _freeze(Unhashable([2]))
+        assert _freeze(bytearray(b'a')) != _freeze(bytearray(b'b'))
+        assert _freeze({1, 2}) == _freeze({2, 1})
+
+    def test_is_stuck_after_history_truncated(self, stuck_detector: StuckDetector):
+        state = stuck_detector.state
+        for _ in range(4):
+            state.history.append(cmd_ls_action)
+            state.history.append(cmd_ls_observation)
+        assert stuck_detector.is_stuck(headless_mode=True) is True
+
+        state.history = state.history[:4]
+        assert stuck_detector.is_stuck(headless_mode=True) is False
+        assert stuck_detector.stuck_analysis is None
+
+        state.history.extend([cmd_ls_action, cmd_ls_observation] * 2)
+        assert stuck_detector.is_stuck(headless_mode=True) is True
+        assert stuck_detector.stuck_analysis.loop_start_idx == 0
+
     @pytest.fixture
     def stuck_detector_mcdc(self):
         return StuckDetector(state=None)
@@ -1,14 +1,17 @@
+import asyncio
 import gc
 import json
 import os
+import threading
 import time
 from datetime import datetime
+from unittest.mock import patch
 
 import psutil
 import pytest
 from pytest import TempPathFactory
 
-from openhands.core.schema import ActionType, ObservationType
+from openhands.core.schema import ActionType, AgentState, ObservationType
 from openhands.events import EventSource, EventStream, EventStreamSubscriber
 from openhands.events.action import (
     CmdRunAction,
@@ -20,18 +23,25 @@ from openhands.events.action.files import (
     FileWriteAction,
 )
 from openhands.events.action.message import MessageAction
+from openhands.events.async_dispatcher import (
+    AsyncEventDispatcher,
+    DispatchLoop,
+    DispatchMode,
+)
 from openhands.events.event import FileEditSource, FileReadSource
 from openhands.events.event_filter import EventFilter
-from openhands.events.observation import NullObservation
+from openhands.events.observation import AgentStateChangedObservation, NullObservation
 from openhands.events.observation.files import (
     FileEditObservation,
     FileReadObservation,
     FileWriteObservation,
 )
-from openhands.events.serialization.event import event_to_dict
+from openhands.events.serialization.event import event_from_dict, event_to_dict
 from openhands.storage import get_file_store
+from openhands.storage.files import FileStore
 from openhands.storage.locations import (
     get_conversation_event_filename,
+    get_conversation_event_head_filename,
 )
 
 
@@ -739,6 +749,160 @@ def test_cache_page_with_missing_events(temp_dir: str):
         assert len(initial_events) > 0, 'Should retrieve events successfully'
 
 
+def test_search_events_reads_ahead_across_pages(temp_dir: str):
+    """Test that events spanning many pages, including a final partial page
+    without a cache file, are returned in order in both directions."""
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('read_ahead_test', file_store)
+    event_stream.cache_size = 5
+    for i in range(33):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    new_stream = EventStream('read_ahead_test', file_store)
+    new_stream.cache_size = 5
+    events = list(new_stream.search_events())
+    reverse_events = list(new_stream.search_events(reverse=True))
+    partial_events = list(new_stream.search_events(start_id=7, end_id=31))
+
+    assert [e.content for e in events] == [f'test{i}' for i in range(33)]
+    assert [e.content for e in reverse_events] == [
+        f'test{i}' for i in reversed(range(33))
+    ]
+    assert [e.content for e in partial_events] == [f'test{i}' for i in range(7, 32)]
+
+
+def test_search_events_caches_pages_between_calls(temp_dir: str):
+    """Test that cache pages read by one search are reused by the next."""
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('page_cache_test', file_store)
+    event_stream.cache_size = 5
+    for i in range(10):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    new_stream = EventStream('page_cache_test', file_store)
+    new_stream.cache_size = 5
+    assert len(list(new_stream.search_events())) == 10
+
+    with patch.object(file_store, 'read', wraps=file_store.read) as read:
+        assert len(list(new_stream.search_events(reverse=True))) == 10
+    read.assert_not_called()
+
+
+def test_search_events_filters_before_deserializing(temp_dir: str):
+    """Test that events rejected by the filter are never deserialized."""
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('prefilter_test', file_store)
+    event_stream.add_event(NullObservation('obs'), EventSource.AGENT)
+    event_stream.add_event(MessageAction(content='hello'), EventSource.USER)
+    event_stream.add_event(NullObservation('obs'), EventSource.ENVIRONMENT)
+
+    with patch(
+        'openhands.events.event_store.event_from_dict', wraps=event_from_dict
+    ) as deserialize:
+        events = list(event_stream.search_events(filter=EventFilter(source='user')))
+
+    assert len(events) == 1
+    assert isinstance(events[0], MessageAction)
+    assert deserialize.call_count == 1
+
+
+def test_event_filter_include_dict_matches_include():
+    """Test that include_dict agrees with include for the criteria it checks."""
+    events = [
+        NullObservation('obs'),
+        MessageAction(content='hello'),
+        CmdRunAction(command='ls'),
+    ]
+    for event, source in zip(
+        events, [EventSource.AGENT, EventSource.USER, None], strict=True
+    ):
+        if source:
+            event._source = source
+        event._timestamp = '2025-01-01T12:00:00'
+    filters = [
+        EventFilter(include_types=(MessageAction,)),
+        EventFilter(exclude_types=(NullObservation,)),
+        EventFilter(source='agent'),
+        EventFilter(start_date='2025-01-02'),
+        EventFilter(end_date='2025-01-02'),
+    ]
+    for event_filter in filters:
+        for event in events:
+            data = event_to_dict(event)
+            assert event_filter.include_dict(data) == event_filter.include(event)
+
+    # The query is only checked by include
+    assert EventFilter(query='missing').include_dict(event_to_dict(events[0]))
+
+
+def test_cur_id_read_from_head_without_listing(temp_dir: str):
+    """Test that opening a stream uses the head pointer rather than a listing."""
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('head_test', file_store)
+    event_stream.cache_size = 5
+    for i in range(12):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    head_filename = get_conversation_event_head_filename('head_test')
+    # The head is only moved on as cache pages complete...
+    assert json.loads(file_store.read(head_filename)) == {
+        'cur_id': 10,
+        'cache_page_end': 10,
+    }
+    # ...and when the stream is closed
+    event_stream.close()
+    assert json.loads(file_store.read(head_filename)) == {
+        'cur_id': 12,
+        'cache_page_end': 10,
+    }
+
+    new_stream = EventStream('head_test', file_store)
+    new_stream.cache_size = 5
+    with patch.object(file_store, 'list', wraps=file_store.list) as list_files:
+        assert new_stream.cur_id == 12
+        events = list(new_stream.search_events(reverse=True))
+    list_files.assert_not_called()
+    assert [e.content for e in events] == [f'test{i}' for i in reversed(range(12))]
+
+
+def test_cur_id_probes_past_head_without_listing(temp_dir: str):
+    """Test that the events added since the last complete cache page are found
+    without a listing."""
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('behind_head_test', file_store)
+    event_stream.cache_size = 5
+    for i in range(12):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+    head_filename = get_conversation_event_head_filename('behind_head_test')
+    assert json.loads(file_store.read(head_filename))['cur_id'] == 10
+
+    new_stream = EventStream('behind_head_test', file_store)
+    new_stream.cache_size = 5
+    with patch.object(file_store, 'list', wraps=file_store.list) as list_files:
+        assert new_stream.cur_id == 12
+    list_files.assert_not_called()
+
+
+def test_cur_id_falls_back_to_listing_when_head_is_stale(temp_dir: str):
+    """Test that a missing or stale head pointer is ignored."""
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream('stale_head_test', file_store)
+    for i in range(12):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+    head_filename = get_conversation_event_head_filename('stale_head_test')
+
+    # More events follow the head than fit in a cache page
+    file_store.write(head_filename, json.dumps({'cur_id': 3}))
+    new_stream = EventStream('stale_head_test', file_store)
+    new_stream.cache_size = 5
+    with patch.object(file_store, 'list', wraps=file_store.list) as list_files:
+        assert new_stream.cur_id == 12
+    list_files.assert_called_once()
+
+    file_store.delete(head_filename)
+    assert EventStream('stale_head_test', file_store).cur_id == 12
+
+
 def test_secrets_replaced_in_content(temp_dir: str):
     """Test that secrets are properly replaced in event content."""
     file_store = get_file_store('local', temp_dir)
@@ -863,3 +1027,350 @@ def test_nested_dict_secret_replacement(temp_dir: str):
     assert 'password123' not in data_with_secrets_replaced['args']['command']
     assert 'password123' not in data_with_secrets_replaced['args']['env']['SECRET_KEY']
     assert 'password123' not in data_with_secrets_replaced['args']['env']['timestamp']
+
+
+def test_async_dispatch_in_order(temp_dir: str):
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream(
+        'async_dispatch', file_store, dispatch_mode=DispatchMode.ASYNC
+    )
+    received: dict[str, list[int]] = {'sync': [], 'async': [], 'loop': []}
+    done = threading.Event()
+
+    def sync_callback(event):
+        received['sync'].append(event.id)
+
+    async def async_callback(event):
+        await asyncio.sleep(0)
+        received['async'].append(event.id)
+        if len(received['async']) == 50:
+            done.set()
+
+    def loop_callback(event):
+        # Synchronous callbacks run their coroutines on the loop of their thread
+        async def handle():
+            received['loop'].append(event.id)
+
+        asyncio.get_event_loop().run_until_complete(handle())
+
+    event_stream.subscribe(EventStreamSubscriber.TEST, sync_callback, 'sync')
+    event_stream.subscribe(EventStreamSubscriber.TEST, async_callback, 'async')
+    event_stream.subscribe(EventStreamSubscriber.MAIN, loop_callback, 'loop')
+    for i in range(50):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    assert done.wait(timeout=5)
+    time.sleep(0.2)
+    assert received == {
+        'sync': list(range(50)),
+        'async': list(range(50)),
+        'loop': list(range(50)),
+    }
+
+    stats = event_stream.get_dispatch_stats()
+    assert stats[EventStreamSubscriber.TEST]['sync'].events == 50
+    assert stats[EventStreamSubscriber.TEST]['async'].events == 50
+    assert stats[EventStreamSubscriber.MAIN]['loop'].max_queue_latency >= 0
+    assert stats[EventStreamSubscriber.MAIN]['loop'].errors == 0
+    event_stream.close()
+
+
+def test_async_dispatch_unsubscribe_and_errors(temp_dir: str):
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream(
+        'async_dispatch_errors', file_store, dispatch_mode=DispatchMode.ASYNC
+    )
+    received: list[int] = []
+
+    async def failing_callback(event):
+        raise ValueError('callback failed')
+
+    def callback(event):
+        received.append(event.id)
+
+    event_stream.subscribe(EventStreamSubscriber.TEST, failing_callback, 'failing')
+    event_stream.subscribe(EventStreamSubscriber.MAIN, callback, 'callback')
+    event_stream.add_event(NullObservation('test1'), EventSource.AGENT)
+    time.sleep(0.3)
+    assert received == [0]
+    assert event_stream.get_dispatch_stats()['test']['failing'].errors == 1
+
+    event_stream.unsubscribe(EventStreamSubscriber.MAIN, 'callback')
+    event_stream.add_event(NullObservation('test2'), EventSource.AGENT)
+    time.sleep(0.3)
+    assert received == [0]
+    assert 'main' not in event_stream.get_dispatch_stats()
+    event_stream.close()
+
+
+def test_async_dispatch_sync_callback_keeps_its_loop(temp_dir: str):
+    file_store = get_file_store('local', temp_dir)
+    event_stream = EventStream(
+        'async_dispatch_loop', file_store, dispatch_mode=DispatchMode.ASYNC
+    )
+    loops: set[int] = set()
+    stepped: list[int] = []
+
+    def callback(event):
+        # Like AgentController.on_event, which creates a step task on its loop
+        async def on_event():
+            async def step():
+                stepped.append(event.id)
+
+            asyncio.create_task(step())
+
+        loop = asyncio.get_event_loop()
+        loops.add(id(loop))
+        loop.run_until_complete(on_event())
+
+    event_stream.subscribe(EventStreamSubscriber.AGENT_CONTROLLER, callback, 'cb')
+    for i in range(20):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+    deadline = time.time() + 5
+    while len(stepped) < 19 and time.time() < deadline:
+        time.sleep(0.05)
+
+    # Each task is run by the next event on the same loop, never stranded
+    assert len(loops) == 1
+    assert stepped[:19] == list(range(19))
+    event_stream.close()
+
+
+def test_async_dispatch_backpressure():
+    dispatcher = AsyncEventDispatcher('backpressure', max_queue_size=2)
+    release = threading.Event()
+    received: list[int] = []
+
+    def slow_callback(event):
+        release.wait(timeout=5)
+        received.append(event.id)
+
+    dispatcher.subscribe(EventStreamSubscriber.TEST, 'slow', slow_callback)
+    dispatched: list[int] = []
+
+    def produce():
+        for i in range(20):
+            event = NullObservation(f'test{i}')
+            event._id = i  # type: ignore[attr-defined]
+            dispatcher.dispatch(event)
+            dispatched.append(i)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.3)
+    # The producer waits for the slow callback rather than queueing everything
+    assert len(dispatched) < 10
+    assert dispatcher.get_stats()['test']['slow'].queue_size <= 2
+
+    release.set()
+    producer.join(timeout=5)
+    deadline = time.time() + 5
+    while len(received) < 20 and time.time() < deadline:
+        time.sleep(0.05)
+    assert received == list(range(20))
+    dispatcher.close()
+
+
+def test_async_dispatch_sync_callbacks_share_threads():
+    dispatch_loop = DispatchLoop(max_workers=2)
+    dispatchers = [
+        AsyncEventDispatcher(f'shared_{i}', dispatch_loop=dispatch_loop)
+        for i in range(10)
+    ]
+    lock = threading.Lock()
+    threads: set[str] = set()
+    received: dict[tuple[int, int], list[int]] = {}
+
+    def make_callback(key: tuple[int, int]):
+        def callback(event):
+            with lock:
+                threads.add(threading.current_thread().name)
+                received.setdefault(key, []).append(event.id)
+
+        return callback
+
+    for i, dispatcher in enumerate(dispatchers):
+        for j, subscriber in enumerate(
+            [EventStreamSubscriber.SERVER, EventStreamSubscriber.RUNTIME]
+        ):
+            dispatcher.subscribe(subscriber, 'cb', make_callback((i, j)))
+    for event_id in range(10):
+        for dispatcher in dispatchers:
+            event = NullObservation(f'test{event_id}')
+            event._id = event_id  # type: ignore[attr-defined]
+            dispatcher.dispatch(event)
+    deadline = time.time() + 5
+    while sum(map(len, received.values())) < 200 and time.time() < deadline:
+        time.sleep(0.05)
+
+    # 20 callbacks run on the 2 shared threads, each still in order
+    assert len(threads) <= 2
+    assert all(name.startswith('event-dispatch') for name in threads)
+    assert len(received) == 20
+    assert all(ids == list(range(10)) for ids in received.values())
+    for dispatcher in dispatchers:
+        dispatcher.close()
+
+
+class _CountingFileStore(FileStore):
+    """Wraps a file store, counting writes and failing after a number of them."""
+
+    def __init__(self, file_store: FileStore, fail_after: int | None = None):
+        self.file_store = file_store
+        self.fail_after = fail_after
+        self.writes: list[str] = []
+        self.synced: list[str] = []
+
+    def write(self, path: str, contents: str | bytes) -> None:
+        if self.fail_after is not None and len(self.writes) >= self.fail_after:
+            raise OSError('Simulated crash')
+        self.file_store.write(path, contents)
+        self.writes.append(path)
+
+    def read(self, path: str) -> str:
+        return self.file_store.read(path)
+
+    def list(self, path: str) -> list[str]:
+        return self.file_store.list(path)
+
+    def delete(self, path: str) -> None:
+        self.file_store.delete(path)
+
+    def sync(self, paths) -> None:
+        self.file_store.sync(paths)
+        self.synced.extend(paths)
+
+
+@pytest.fixture(params=['memory', 'local'])
+def crash_file_store(request, temp_dir: str) -> FileStore:
+    return get_file_store(request.param, temp_dir)
+
+
+def test_write_behind_coalesces_writes(temp_dir: str):
+    file_store = _CountingFileStore(get_file_store('memory'))
+    event_stream = EventStream(
+        'write_behind', file_store, write_behind=True, flush_interval=60
+    )
+    for i in range(10):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    # Nothing is written yet, but the stream reads its buffered events
+    assert file_store.writes == []
+    assert event_stream.get_event(3).content == 'test3'
+    assert [e.content for e in event_stream.search_events(start_id=8)] == [
+        'test8',
+        'test9',
+    ]
+
+    event_stream.flush()
+    assert len(file_store.writes) == 11
+    assert file_store.writes[-1] == get_conversation_event_head_filename(
+        'write_behind', None
+    )
+
+    # Completing a cache page writes its events, the page and the head together
+    for i in range(10, 25):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+    assert len(file_store.writes) == 11 + 15 + 2
+    event_stream.close()
+
+
+def test_write_behind_flushes_on_state_change_and_time(temp_dir: str):
+    file_store = _CountingFileStore(get_file_store('memory'))
+    event_stream = EventStream(
+        'write_behind', file_store, write_behind=True, flush_interval=0.1
+    )
+    event_stream.add_event(NullObservation('test'), EventSource.AGENT)
+    event_stream.add_event(
+        AgentStateChangedObservation('', AgentState.AWAITING_USER_INPUT),
+        EventSource.ENVIRONMENT,
+    )
+    assert len(file_store.writes) == 3
+
+    event_stream.add_event(NullObservation('test'), EventSource.AGENT)
+    assert len(file_store.writes) == 3
+    time.sleep(0.5)
+    assert len(file_store.writes) == 5
+    event_stream.close()
+
+
+def test_write_behind_streams_share_flush_thread(temp_dir: str):
+    file_stores = [_CountingFileStore(get_file_store('memory')) for _ in range(10)]
+    event_streams = [
+        EventStream(
+            f'write_behind{i}', file_store, write_behind=True, flush_interval=0.1
+        )
+        for i, file_store in enumerate(file_stores)
+    ]
+    for event_stream in event_streams:
+        event_stream.add_event(NullObservation('test'), EventSource.AGENT)
+    flush_threads = [
+        t for t in threading.enumerate() if t.name.startswith('event-stream-flush')
+    ]
+    assert len(flush_threads) == 1
+
+    time.sleep(0.5)
+    assert all(len(file_store.writes) == 2 for file_store in file_stores)
+    for event_stream in event_streams:
+        event_stream.close()
+
+
+def test_write_behind_durable_on_close(crash_file_store: FileStore):
+    file_store = _CountingFileStore(crash_file_store)
+    event_stream = EventStream(
+        'write_behind', file_store, write_behind=True, flush_interval=60
+    )
+    for i in range(30):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+    event_stream.close()
+
+    # The events written by the last flush are synced
+    assert len(file_store.synced) == 6
+    reopened = EventStream('write_behind', crash_file_store)
+    assert reopened.cur_id == 30
+    assert [e.content for e in reopened.search_events()] == [
+        f'test{i}' for i in range(30)
+    ]
+
+
+def test_write_behind_crash_loses_only_buffered_events(crash_file_store: FileStore):
+    event_stream = EventStream(
+        'write_behind', crash_file_store, write_behind=True, flush_interval=60
+    )
+    for i in range(30):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+
+    # Crash without closing: the first cache page was flushed, the rest is lost
+    reopened = EventStream('write_behind', crash_file_store)
+    assert reopened.cur_id == 25
+    assert [e.content for e in reopened.search_events()] == [
+        f'test{i}' for i in range(25)
+    ]
+    reopened.add_event(NullObservation('after crash'), EventSource.AGENT)
+    assert reopened.get_event(25).content == 'after crash'
+
+
+def test_write_behind_crash_during_flush(crash_file_store: FileStore):
+    # Fail after writing 10 of the events, before the page and head
+    file_store = _CountingFileStore(crash_file_store, fail_after=10)
+    event_stream = EventStream(
+        'write_behind', file_store, write_behind=True, flush_interval=60
+    )
+    for i in range(24):
+        event_stream.add_event(NullObservation(f'test{i}'), EventSource.AGENT)
+    with pytest.raises(OSError):
+        event_stream.add_event(NullObservation('test24'), EventSource.AGENT)
+
+    # The events written are a prefix of the stream, and are found on reopening
+    reopened = EventStream('write_behind', crash_file_store)
+    assert reopened.cur_id == 10
+    assert [e.content for e in reopened.search_events()] == [
+        f'test{i}' for i in range(10)
+    ]
+
+    # Events which failed to be written are kept for the next flush
+    file_store.fail_after = None
+    event_stream.flush()
+    reopened = EventStream('write_behind', crash_file_store)
+    assert reopened.cur_id == 25
+    assert len(list(reopened.search_events())) == 25
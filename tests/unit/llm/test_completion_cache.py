@@ -0,0 +1,172 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from openhands.core.config import LLMConfig, OpenHandsConfig
+from openhands.llm.completion_cache import CompletionCache, completion_cache_key
+from openhands.llm.llm import LLM
+from openhands.llm.llm_registry import LLMRegistry
+from openhands.llm.metrics import Metrics
+
+
+@pytest.fixture(autouse=True)
+def mock_logger(monkeypatch):
+    # suppress logging of completion data to file
+    mock_logger = MagicMock()
+    monkeypatch.setattr('openhands.llm.debug_mixin.llm_prompt_logger', mock_logger)
+    monkeypatch.setattr('openhands.llm.debug_mixin.llm_response_logger', mock_logger)
+    monkeypatch.setattr('openhands.llm.llm.logger', mock_logger)
+    return mock_logger
+
+
+@pytest.fixture
+def default_config():
+    return LLMConfig(model='gpt-4o', api_key='test_key', num_retries=1)
+
+
+def _response(content: str) -> dict:
+    return {
+        'id': 'test-id',
+        'choices': [{'message': {'role': 'assistant', 'content': content}}],
+        'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15},
+    }
+
+
+def test_completion_cache_key_ignores_unkeyed_params():
+    messages = [{'role': 'user', 'content': 'Hello'}]
+    key = completion_cache_key(
+        {'model': 'gpt-4o', 'messages': messages, 'api_key': 'a', 'timeout': 10}
+    )
+    assert key == completion_cache_key(
+        {'model': 'gpt-4o', 'messages': messages, 'api_key': 'b'}
+    )
+    assert key != completion_cache_key({'model': 'gpt-4', 'messages': messages})
+    assert key != completion_cache_key(
+        {'model': 'gpt-4o', 'messages': messages, 'temperature': 0.5}
+    )
+
+
+def test_completion_cache_key_ignores_cache_control():
+    text = {'type': 'text', 'text': 'Hello'}
+    assert completion_cache_key(
+        {'messages': [{'role': 'user', 'content': [text]}]}
+    ) == completion_cache_key(
+        {
+            'messages': [
+                {
+                    'role': 'user',
+                    'content': [{**text, 'cache_control': {'type': 'ephemeral'}}],
+                }
+            ]
+        }
+    )
+
+
+def test_completion_cache_expires_entries():
+    cache = CompletionCache(ttl_seconds=60)
+    with patch('openhands.llm.completion_cache.time.time', return_value=1000.0):
+        cache.put('key', 'completion')
+        assert cache.get('key') == 'completion'
+    with patch('openhands.llm.completion_cache.time.time', return_value=1060.0):
+        assert cache.get('key') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_completion_cache_evicts_least_recently_used():
+    cache = CompletionCache(max_memory_entries=2)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    cache.get('a')
+    cache.put('c', '3')
+    assert cache.get('b') is None
+    assert cache.get('a') == '1'
+    assert cache.get('c') == '3'
+
+
+def test_completion_cache_persists_to_disk(tmp_path):
+    path = str(tmp_path / 'cache' / 'completions.sqlite3')
+    cache = CompletionCache(path, max_disk_entries=2)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    cache.put('c', '3')
+    cache.close()
+
+    cache = CompletionCache(path)
+    assert cache.get('a') is None
+    assert cache.get('b') == '2'
+    assert cache.get('c') == '3'
+    cache.close()
+
+
+@patch('openhands.llm.llm.litellm_completion')
+def test_llm_completion_cache_hit(mock_litellm_completion, default_config):
+    mock_litellm_completion.return_value = _response('Cached response')
+    llm = LLM(default_config, service_id='test-service')
+    llm.completion_cache = CompletionCache()
+    messages = [{'role': 'user', 'content': 'Hello'}]
+
+    first = llm.completion(messages=messages)
+    second = llm.completion(messages=messages)
+
+    assert mock_litellm_completion.call_count == 1
+    assert first['choices'][0]['message']['content'] == 'Cached response'
+    assert second.choices[0].message.content == 'Cached response'
+    assert llm.metrics.completion_cache_hits == 1
+    assert llm.metrics.completion_cache_misses == 1
+    assert llm.metrics.completion_cache_hit_rate == 0.5
+    # only the completion which was not cached is recorded
+    assert len(llm.metrics.token_usages) == 1
+    assert len(llm.metrics.response_latencies) == 1
+
+    llm.completion(messages=[{'role': 'user', 'content': 'Hello again'}])
+    assert mock_litellm_completion.call_count == 2
+
+
+@patch('openhands.llm.llm.litellm_completion')
+def test_llm_completion_without_cache(mock_litellm_completion, default_config):
+    mock_litellm_completion.return_value = _response('Response')
+    llm = LLM(default_config, service_id='test-service')
+    messages = [{'role': 'user', 'content': 'Hello'}]
+
+    llm.completion(messages=messages)
+    llm.completion(messages=messages)
+
+    assert mock_litellm_completion.call_count == 2
+    assert llm.metrics.completion_cache_hit_rate == 0.0
+
+
+def test_metrics_completion_cache_merge_and_diff():
+    metrics = Metrics()
+    metrics.add_completion_cache_lookup(True)
+    baseline = metrics.copy()
+    metrics.add_completion_cache_lookup(False)
+
+    diff = metrics.diff(baseline)
+    assert (diff.completion_cache_hits, diff.completion_cache_misses) == (0, 1)
+
+    metrics.merge(baseline)
+    assert metrics.get()['completion_cache_hits'] == 2
+    assert metrics.get()['completion_cache_misses'] == 1
+
+
+def test_registry_attaches_completion_cache(default_config):
+    registry = LLMRegistry(OpenHandsConfig())
+    cache = CompletionCache()
+    registry.attach_completion_cache('condenser', cache)
+
+    assert registry.get_llm('condenser', default_config).completion_cache is cache
+    assert registry.get_llm('other', default_config).completion_cache is None
+    assert registry.get_active_llm().completion_cache is None
+
+    registry.attach_completion_cache('condenser', None)
+    assert registry.service_to_llm['condenser'].completion_cache is None
+
+
+def test_registry_enable_completion_cache(tmp_path, default_config):
+    config = OpenHandsConfig(cache_dir=str(tmp_path), enable_completion_cache=True)
+    registry = LLMRegistry(config)
+
+    llm = registry.get_llm('condenser', default_config)
+    assert llm.completion_cache is not None
+    assert llm.completion_cache.path == str(tmp_path / 'completions.sqlite3')
+    assert registry.get_active_llm().completion_cache is None
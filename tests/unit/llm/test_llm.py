@@ -3,6 +3,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import litellm
 import pytest
 from litellm import PromptTokensDetails
 from litellm.exceptions import (
@@ -16,6 +17,7 @@ from openhands.llm.async_llm import AsyncLLM
 from openhands.llm.llm import LLM
 from openhands.llm.metrics import Metrics, TokenUsage
 from openhands.llm.streaming_llm import StreamingLLM
+from openhands.llm.token_count_cache import get_token_count_cache
 
 
 @pytest.fixture(autouse=True)
@@ -783,23 +785,45 @@ def test_llm_gemini_thinking_parameter(mock_litellm_completion, default_config):
     )  # No positional args should be passed to litellm_completion here
 
 
+@pytest.fixture
+def token_count_cache():
+    cache = get_token_count_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def fake_token_counter(model, messages, custom_tokenizer):
+    """Count 3 tokens for the reply priming plus one per character of text."""
+    count = 3
+    for message in messages:
+        content = message['content']
+        if isinstance(content, str):
+            count += len(content)
+        else:
+            count += sum(len(item['text']) for item in content)
+    return count
+
+
 @patch('openhands.llm.llm.litellm.token_counter')
-def test_get_token_count_with_dict_messages(mock_token_counter, default_config):
-    mock_token_counter.return_value = 42
+def test_get_token_count_with_dict_messages(
+    mock_token_counter, default_config, token_count_cache
+):
+    mock_token_counter.side_effect = fake_token_counter
     llm = LLM(default_config, service_id='test-service')
     messages = [{'role': 'user', 'content': 'Hello!'}]
 
     token_count = llm.get_token_count(messages)
 
-    assert token_count == 42
-    mock_token_counter.assert_called_once_with(
+    assert token_count == 9
+    mock_token_counter.assert_any_call(
         model=default_config.model, messages=messages, custom_tokenizer=None
     )
 
 
 @patch('openhands.llm.llm.litellm.token_counter')
 def test_get_token_count_with_message_objects(
-    mock_token_counter, default_config, mock_logger
+    mock_token_counter, default_config, mock_logger, token_count_cache
 ):
     llm = LLM(default_config, service_id='test-service')
 
@@ -807,26 +831,24 @@ def test_get_token_count_with_message_objects(
     message_obj = Message(role='user', content=[TextContent(text='Hello!')])
     message_dict = {'role': 'user', 'content': 'Hello!'}
 
-    # Mock token counter to return different values for each call
-    mock_token_counter.side_effect = [42, 42]  # Same value for both cases
+    mock_token_counter.side_effect = fake_token_counter
 
     # Get token counts for both formats
     token_count_obj = llm.get_token_count([message_obj])
     token_count_dict = llm.get_token_count([message_dict])
 
     # Verify both formats get the same token count
-    assert token_count_obj == token_count_dict
-    assert mock_token_counter.call_count == 2
+    assert token_count_obj == token_count_dict == 9
 
 
 @patch('openhands.llm.llm.litellm.token_counter')
 @patch('openhands.llm.llm.create_pretrained_tokenizer')
 def test_get_token_count_with_custom_tokenizer(
-    mock_create_tokenizer, mock_token_counter, default_config
+    mock_create_tokenizer, mock_token_counter, default_config, token_count_cache
 ):
     mock_tokenizer = MagicMock()
     mock_create_tokenizer.return_value = mock_tokenizer
-    mock_token_counter.return_value = 42
+    mock_token_counter.side_effect = fake_token_counter
 
     config = copy.deepcopy(default_config)
     config.custom_tokenizer = 'custom/tokenizer'
@@ -835,16 +857,16 @@ def test_get_token_count_with_custom_tokenizer(
 
     token_count = llm.get_token_count(messages)
 
-    assert token_count == 42
+    assert token_count == 9
     mock_create_tokenizer.assert_called_once_with('custom/tokenizer')
-    mock_token_counter.assert_called_once_with(
+    mock_token_counter.assert_any_call(
         model=config.model, messages=messages, custom_tokenizer=mock_tokenizer
     )
 
 
 @patch('openhands.llm.llm.litellm.token_counter')
 def test_get_token_count_error_handling(
-    mock_token_counter, default_config, mock_logger
+    mock_token_counter, default_config, mock_logger, token_count_cache
 ):
     mock_token_counter.side_effect = Exception('Token counting failed')
     llm = LLM(default_config, service_id='test-service')
@@ -859,6 +881,82 @@ def test_get_token_count_error_handling(
     )
 
 
+@patch('openhands.llm.llm.litellm.token_counter')
+def test_get_token_count_only_counts_new_messages(
+    mock_token_counter, default_config, token_count_cache
+):
+    mock_token_counter.side_effect = fake_token_counter
+    llm = LLM(default_config, service_id='test-service')
+    messages = [
+        {'role': 'system', 'content': 'System'},
+        {'role': 'user', 'content': 'Hello!'},
+    ]
+    assert llm.get_token_count(messages) == 15
+
+    mock_token_counter.reset_mock()
+    messages.append({'role': 'assistant', 'content': 'Hi'})
+    assert llm.get_token_count(messages) == 17
+    mock_token_counter.assert_called_once_with(
+        model=default_config.model, messages=[messages[-1]], custom_tokenizer=None
+    )
+
+    # Counts are cached for each model
+    other_config = copy.deepcopy(default_config)
+    other_config.model = 'gpt-4o-mini'
+    other_llm = LLM(other_config, service_id='other-service')
+    mock_token_counter.reset_mock()
+    assert other_llm.get_token_count(messages) == 17
+    assert mock_token_counter.call_count == 4
+
+
+@patch('openhands.llm.llm.litellm.token_counter')
+def test_get_token_counts_batched(
+    mock_token_counter, default_config, token_count_cache
+):
+    mock_token_counter.side_effect = fake_token_counter
+    llm = LLM(default_config, service_id='test-service')
+    messages = [{'role': 'user', 'content': f'Message {i}'} for i in range(5)]
+
+    counts = llm.get_token_counts([messages[:i] for i in range(6)])
+
+    assert counts == [3 + 9 * i for i in range(6)]
+    # The overhead and each message are only counted once
+    assert mock_token_counter.call_count == 6
+
+
+def test_get_token_count_matches_litellm(default_config, token_count_cache):
+    llm = LLM(default_config, service_id='test-service')
+    messages = [
+        {'role': 'system', 'content': 'You are a helpful assistant.'},
+        {'role': 'user', 'content': [{'type': 'text', 'text': 'List the files'}]},
+        {
+            'role': 'assistant',
+            'content': 'Listing them.',
+            'tool_calls': [
+                {
+                    'id': 'call_1',
+                    'type': 'function',
+                    'function': {
+                        'name': 'execute_bash',
+                        'arguments': '{"command": "ls -la"}',
+                    },
+                }
+            ],
+        },
+        {
+            'role': 'tool',
+            'content': 'README.md\nsetup.py',
+            'tool_call_id': 'call_1',
+            'name': 'execute_bash',
+        },
+    ]
+
+    for i in range(len(messages) + 1):
+        assert llm.get_token_count(messages[:i]) == litellm.token_counter(
+            model=default_config.model, messages=messages[:i]
+        )
+
+
 @patch('openhands.llm.llm.litellm_completion')
 def test_llm_token_usage(mock_litellm_completion, default_config):
     # This mock response includes usage details with prompt_tokens,
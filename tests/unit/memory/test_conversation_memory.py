@@ -1,6 +1,6 @@
 import os
 import shutil
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from litellm import ChatCompletionMessageToolCall
@@ -1717,3 +1717,132 @@ def test_process_events_does_not_reinsert_condensed_initial_message(
         for content in msg.content:
             if hasattr(content, 'text'):
                 assert 'Do task A, B, and C' not in content.text
+
+
+def _tool_call_events(count: int) -> list[Event]:
+    """Create pairs of agent command actions and their observations."""
+    events: list[Event] = []
+    for i in range(count):
+        mock_response = {
+            'id': f'response_{i}',
+            'choices': [
+                {
+                    'message': {
+                        'content': None,
+                        'tool_calls': [
+                            {
+                                'id': f'call_{i}',
+                                'type': 'function',
+                                'function': {
+                                    'name': 'execute_bash',
+                                    'arguments': '{"command": "ls"}',
+                                },
+                            }
+                        ],
+                    }
+                }
+            ],
+        }
+        tool_call_metadata = ToolCallMetadata(
+            tool_call_id=f'call_{i}',
+            function_name='execute_bash',
+            model_response=mock_response,
+            total_calls_in_response=1,
+        )
+        action = CmdRunAction(command='ls')
+        action._source = EventSource.AGENT
+        action.tool_call_metadata = tool_call_metadata
+        obs = CmdOutputObservation(content=f'output {i}', command='ls', command_id=i)
+        obs.tool_call_metadata = tool_call_metadata
+        events += [action, obs]
+    for i, event in enumerate(events):
+        event._id = i + 2
+    return events
+
+
+def _history(events: list[Event]) -> tuple[list[Event], MessageAction]:
+    system_message = SystemMessageAction(content='System message')
+    system_message._id = 0
+    user_message = MessageAction(content='Hello')
+    user_message._source = EventSource.USER
+    user_message._id = 1
+    return [system_message, user_message, *events], user_message
+
+
+def test_process_events_only_renders_new_events(conversation_memory):
+    """Test that events rendered by an earlier call are not rendered again."""
+    history, user_message = _history(_tool_call_events(3))
+    conversation_memory.process_events(list(history[:4]), user_message)
+
+    original = conversation_memory._process_observation
+    with patch.object(
+        conversation_memory, '_process_observation', wraps=original
+    ) as process_observation:
+        messages = conversation_memory.process_events(list(history), user_message)
+    assert process_observation.call_count == 2
+
+    fresh_memory = ConversationMemory(
+        conversation_memory.agent_config, conversation_memory.prompt_manager
+    )
+    assert messages == fresh_memory.process_events(list(history), user_message)
+
+
+def test_process_events_renders_again_with_new_parameters(conversation_memory):
+    """Test that cached messages are only used with the same rendering parameters."""
+    history, user_message = _history(_tool_call_events(1))
+    obs = history[-1]
+    obs.content = 'x' * 100
+
+    messages = conversation_memory.process_events(
+        list(history), user_message, max_message_chars=None
+    )
+    assert messages[-1].content[0].text == 'x' * 100
+
+    messages = conversation_memory.process_events(
+        list(history), user_message, max_message_chars=20
+    )
+    assert 'truncated' in messages[-1].content[0].text
+
+
+def test_process_events_messages_independent_of_earlier_results(
+    conversation_memory,
+):
+    """Test that changes made by callers to the messages returned do not affect the
+    messages returned by later calls."""
+    user_message_2 = MessageAction(content='Second message')
+    user_message_2._source = EventSource.USER
+    user_message_2._id = 2
+    history, user_message = _history([user_message_2])
+
+    first = conversation_memory.process_events(list(history), user_message)
+    conversation_memory.apply_prompt_caching(first)
+    first[-1].content.append(TextContent(text='Reminder'))
+    first[-1].cache_enabled = True
+
+    second = conversation_memory.process_events(list(history), user_message)
+    assert first[-1].content[0].cache_prompt is True
+    assert second[-1].content[0].cache_prompt is False
+    assert second[-1].content[0].text == '\n\nSecond message'
+    assert len(second[-1].content) == 1
+    assert second[-1].cache_enabled is False
+
+
+def test_process_events_knowledge_deduplicated_across_calls(conversation_memory):
+    """Test that microagent knowledge recalled earlier is left out of later recall
+    observations on every call."""
+    knowledge = [MicroagentKnowledge(name='agent', trigger='t', content='c')]
+    recalls = []
+    for i in range(2):
+        recall = RecallObservation(
+            recall_type=RecallType.KNOWLEDGE,
+            microagent_knowledge=knowledge,
+            content='Recalled',
+        )
+        recall._id = i + 2
+        recalls.append(recall)
+    history, user_message = _history(recalls)
+
+    for _ in range(2):
+        conversation_memory.prompt_manager.build_microagent_info.reset_mock()
+        conversation_memory.process_events(list(history), user_message)
+        conversation_memory.prompt_manager.build_microagent_info.assert_called_once()
@@ -1,8 +1,10 @@
+import random
+
 from openhands.events.action.agent import CondensationAction, CondensationRequestAction
 from openhands.events.action.message import MessageAction
 from openhands.events.event import Event
 from openhands.events.observation.agent import AgentCondensationObservation
-from openhands.memory.view import View
+from openhands.memory.view import View, ViewBuilder
 
 
 def test_view_preserves_uncondensed_lists() -> None:
@@ -261,6 +263,105 @@ def test_condensation_request_always_removed_from_view() -> None:
         assert not isinstance(event, CondensationAction)
 
 
+def test_view_builder_matches_rebuilt_views() -> None:
+    """Tests that updating a view incrementally gives the same view as building it
+    from all the events at each step."""
+    rng = random.Random(42)
+    events: list[Event] = []
+    builder = ViewBuilder()
+    for i in range(300):
+        roll = rng.random()
+        if roll < 0.05:
+            event: Event = CondensationRequestAction()
+        elif roll < 0.1 and i > 0:
+            start = rng.randrange(i)
+            end = rng.randrange(start, i) + 1
+            summary = 'Summary' if rng.random() < 0.5 else None
+            event = CondensationAction(
+                forgotten_events_start_id=start,
+                forgotten_events_end_id=end,
+                summary=summary,
+                summary_offset=0 if summary else None,
+            )
+        else:
+            event = MessageAction(content=f'Event {i}')
+        event._id = i  # type: ignore
+        events.append(event)
+
+        view = builder.update(events)
+        expected = _rebuild_view(events)
+        assert view.events == expected.events
+        assert view.forgotten_event_ids == expected.forgotten_event_ids
+        assert (
+            view.unhandled_condensation_request
+            == expected.unhandled_condensation_request
+        )
+
+
+def test_view_builder_reuses_view_until_events_change() -> None:
+    """Tests that the builder returns the same view while the events are unchanged,
+    and that views already returned are not changed by later updates."""
+    events: list[Event] = [MessageAction(content=f'Event {i}') for i in range(5)]
+    set_ids(events)
+    builder = ViewBuilder()
+    view = builder.update(events)
+    assert builder.update(events) is view
+
+    events.append(CondensationAction(forgotten_event_ids=[0, 1]))
+    set_ids(events)
+    new_view = builder.update(events)
+    assert new_view is not view
+    assert new_view.events == events[2:5]
+    assert view.events == events[:5]
+    assert view.forgotten_event_ids == set()
+
+
+def test_view_builder_rebuilds_replaced_events() -> None:
+    """Tests that the view is rebuilt when the list of events is replaced or
+    truncated rather than appended to."""
+    events: list[Event] = [MessageAction(content=f'Event {i}') for i in range(5)]
+    set_ids(events)
+    builder = ViewBuilder()
+    builder.update(events)
+
+    truncated = events[2:]
+    assert builder.update(truncated).events == truncated
+
+    del truncated[1:]
+    truncated.append(events[4])
+    assert builder.update(truncated).events == [events[2], events[4]]
+
+
+def _rebuild_view(events: list[Event]) -> View:
+    """Build a view with a full pass over the events."""
+    forgotten_event_ids: set[int] = set()
+    for event in events:
+        if isinstance(event, CondensationAction):
+            forgotten_event_ids.update(event.forgotten)
+            forgotten_event_ids.add(event.id)
+        if isinstance(event, CondensationRequestAction):
+            forgotten_event_ids.add(event.id)
+    kept_events = [event for event in events if event.id not in forgotten_event_ids]
+    for event in reversed(events):
+        if isinstance(event, CondensationAction) and event.summary is not None:
+            kept_events.insert(
+                event.summary_offset, AgentCondensationObservation(event.summary)
+            )
+            break
+    unhandled_condensation_request = False
+    for event in reversed(events):
+        if isinstance(event, CondensationAction):
+            break
+        if isinstance(event, CondensationRequestAction):
+            unhandled_condensation_request = True
+            break
+    return View(
+        events=kept_events,
+        unhandled_condensation_request=unhandled_condensation_request,
+        forgotten_event_ids=forgotten_event_ids,
+    )
+
+
 def set_ids(events: list[Event]) -> None:
     """Set the IDs of the events in the list to their index."""
     for i, e in enumerate(events):
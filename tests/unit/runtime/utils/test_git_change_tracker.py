@@ -0,0 +1,184 @@
+import errno
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from openhands.runtime.utils import git_changes
+from openhands.runtime.utils.git_change_tracker import (
+    GitChangeTracker,
+    GitChangeTrackingFailed,
+    GitChangeTrackingUnavailable,
+    Inotify,
+)
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith('linux'), reason='inotify is only available on linux'
+)
+
+
+def run(cmd: str, cwd: Path):
+    subprocess.run(cmd, shell=True, cwd=cwd, check=True, capture_output=True)
+
+
+def create_repo(workspace: Path, name: str) -> Path:
+    origin = workspace.parent / f'{name}_origin'
+    origin.mkdir()
+    (origin / 'unchanged.txt').write_text('unchanged')
+    (origin / 'modified.txt').write_text('modified')
+    (origin / 'dir').mkdir()
+    (origin / 'dir' / 'deleted.txt').write_text('deleted')
+    (origin / '.gitignore').write_text('ignored/\n')
+    run(
+        'git init --initial-branch=main && git add . && '
+        "git -c user.email=test@example.com -c user.name=Test commit -m 'Initial'",
+        origin,
+    )
+    run(f'git clone "{origin}" "{workspace / name}"', workspace)
+    run('git checkout -b feature-branch', workspace / name)
+    return workspace / name
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    workspace = tmp_path / 'workspace'
+    workspace.mkdir()
+    tracker = GitChangeTracker(str(workspace))
+    yield tracker
+    tracker.close()
+
+
+def assert_matches_full_scan(tracker: GitChangeTracker):
+    changes = tracker.get_git_changes()
+    assert changes == git_changes.get_git_changes(tracker.cwd)
+    return changes
+
+
+def test_changes_are_updated_incrementally(tracker):
+    repo = create_repo(Path(tracker.cwd), 'repo')
+    assert assert_matches_full_scan(tracker) == []
+
+    (repo / 'modified.txt').write_text('changed')
+    (repo / 'added.txt').write_text('added')
+    (repo / 'dir' / 'deleted.txt').unlink()
+    (repo / 'new_dir').mkdir()
+    (repo / 'new_dir' / 'nested.txt').write_text('nested')
+    (repo / 'ignored').mkdir()
+    (repo / 'ignored' / 'file.txt').write_text('ignored')
+    with patch.object(
+        git_changes, 'get_changes_in_repo', wraps=git_changes.get_changes_in_repo
+    ) as get_changes_in_repo:
+        changes = tracker.get_git_changes()
+    get_changes_in_repo.assert_called_once()
+    assert sorted(get_changes_in_repo.call_args.args[2]) == [
+        'added.txt',
+        'dir/deleted.txt',
+        'ignored',
+        'modified.txt',
+        'new_dir',
+    ]
+    assert changes == [
+        {'status': 'A', 'path': 'repo/added.txt'},
+        {'status': 'D', 'path': 'repo/dir/deleted.txt'},
+        {'status': 'M', 'path': 'repo/modified.txt'},
+        {'status': 'A', 'path': 'repo/new_dir/nested.txt'},
+    ]
+    assert changes == git_changes.get_git_changes(tracker.cwd)
+
+    # Nothing changed, so no git commands are run
+    with patch.object(git_changes, 'run') as run_git:
+        assert tracker.get_git_changes() == changes
+    run_git.assert_not_called()
+
+    # Reverting a change removes it
+    (repo / 'modified.txt').write_text('modified')
+    assert_matches_full_scan(tracker)
+
+
+def test_ref_is_reloaded_when_head_changes(tracker):
+    repo = create_repo(Path(tracker.cwd), 'repo')
+    (repo / 'modified.txt').write_text('changed')
+    assert_matches_full_scan(tracker)
+
+    with patch.object(
+        git_changes, 'get_valid_ref', wraps=git_changes.get_valid_ref
+    ) as get_valid_ref:
+        tracker.get_git_changes()
+        get_valid_ref.assert_not_called()
+        run(
+            'git add . && git -c user.email=test@example.com -c user.name=Test '
+            "commit -m 'Change'",
+            repo,
+        )
+        changes = tracker.get_git_changes()
+        get_valid_ref.assert_called_once()
+    assert changes == git_changes.get_git_changes(tracker.cwd)
+
+    run('git checkout main', repo)
+    assert assert_matches_full_scan(tracker) == []
+
+
+def test_repos_added_to_workspace(tracker):
+    create_repo(Path(tracker.cwd), 'repo')
+    assert_matches_full_scan(tracker)
+
+    other = create_repo(Path(tracker.cwd), 'other')
+    (other / 'added.txt').write_text('added')
+    assert assert_matches_full_scan(tracker) == [
+        {'status': 'A', 'path': 'other/added.txt'}
+    ]
+
+
+def test_get_git_diff(tracker):
+    repo = create_repo(Path(tracker.cwd), 'repo')
+    (repo / 'modified.txt').write_text('changed')
+    tracker.get_git_changes()
+
+    assert tracker.get_git_diff('repo/modified.txt') == {
+        'original': 'modified',
+        'modified': 'changed',
+    }
+
+
+def test_unavailable_without_inotify(tracker):
+    create_repo(Path(tracker.cwd), 'repo')
+    with patch.object(Inotify, 'get_libc', return_value=None):
+        with pytest.raises(GitChangeTrackingUnavailable):
+            tracker.get_git_changes()
+    # The tracker stays unavailable, so callers fall back to running the script
+    with pytest.raises(GitChangeTrackingUnavailable):
+        tracker.get_git_changes()
+
+
+def test_git_failures_are_retried(tracker):
+    create_repo(Path(tracker.cwd), 'repo')
+    # For example git is locked during a rebase
+    with patch.object(
+        git_changes, 'run', side_effect=RuntimeError('index.lock exists')
+    ):
+        with pytest.raises(GitChangeTrackingFailed):
+            tracker.get_git_changes()
+    # The tracker starts again on the next call
+    assert_matches_full_scan(tracker)
+
+
+def test_unavailable_when_watch_limit_reached(tracker):
+    create_repo(Path(tracker.cwd), 'repo')
+    with patch.object(
+        Inotify, 'add_watch', side_effect=OSError(errno.ENOSPC, 'No space left')
+    ):
+        with pytest.raises(GitChangeTrackingUnavailable):
+            tracker.get_git_changes()
+    with pytest.raises(GitChangeTrackingUnavailable):
+        tracker.get_git_changes()
+
+
+def test_unavailable_for_workspace_inside_repo(tmp_path):
+    repo = create_repo(tmp_path, 'repo')
+    os.makedirs(repo / 'dir' / 'subdir')
+    tracker = GitChangeTracker(str(repo / 'dir'))
+    with pytest.raises(GitChangeTrackingUnavailable):
+        tracker.get_git_changes()
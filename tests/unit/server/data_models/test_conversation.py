@@ -288,8 +288,10 @@ async def test_search_conversations_with_repository_filter():
                         app_conversation_service=mock_app_conversation_service,
                     )
 
-                    # Verify that search was called with only pagination parameters (filtering is done at API level)
-                    mock_store.search.assert_called_once_with(None, 20)
+                    # Verify that the filters were passed through to the store
+                    mock_store.search.assert_called_once_with(
+                        None, 20, selected_repository='test/repo', trigger=None
+                    )
 
                     # Verify the result contains only conversations from the specified repository
                     assert len(result_set.results) == 1
@@ -365,8 +367,13 @@ async def test_search_conversations_with_trigger_filter():
                         app_conversation_service=mock_app_conversation_service,
                     )
 
-                    # Verify that search was called with only pagination parameters (filtering is done at API level)
-                    mock_store.search.assert_called_once_with(None, 20)
+                    # Verify that the filters were passed through to the store
+                    mock_store.search.assert_called_once_with(
+                        None,
+                        20,
+                        selected_repository=None,
+                        trigger=ConversationTrigger.GUI,
+                    )
 
                     # Verify the result contains only conversations with the specified trigger
                     assert len(result_set.results) == 1
@@ -442,8 +449,13 @@ async def test_search_conversations_with_both_filters():
                         app_conversation_service=mock_app_conversation_service,
                     )
 
-                    # Verify that search was called with only pagination parameters (filtering is done at API level)
-                    mock_store.search.assert_called_once_with(None, 20)
+                    # Verify that the filters were passed through to the store
+                    mock_store.search.assert_called_once_with(
+                        None,
+                        20,
+                        selected_repository='test/repo',
+                        trigger=ConversationTrigger.SUGGESTED_TASK,
+                    )
 
                     # Verify the result contains only conversations matching both filters
                     assert len(result_set.results) == 1
@@ -522,7 +534,9 @@ async def test_search_conversations_with_pagination():
                     )
 
                     # Verify that search was called with pagination parameters (filtering is done at API level)
-                    mock_store.search.assert_called_once_with('page_123', 10)
+                    mock_store.search.assert_called_once_with(
+                        'page_123', 10, selected_repository=None, trigger=None
+                    )
 
                     # Verify the result includes pagination info
                     assert (
@@ -601,8 +615,13 @@ async def test_search_conversations_with_filters_and_pagination():
                         app_conversation_service=mock_app_conversation_service,
                     )
 
-                    # Verify that search was called with only pagination parameters (filtering is done at API level)
-                    mock_store.search.assert_called_once_with('page_456', 5)
+                    # Verify that the filters were passed through to the store
+                    mock_store.search.assert_called_once_with(
+                        'page_456',
+                        5,
+                        selected_repository='test/repo',
+                        trigger=ConversationTrigger.GUI,
+                    )
 
                     # Verify the result includes pagination info
                     assert (
@@ -670,8 +689,13 @@ async def test_search_conversations_empty_results():
                         app_conversation_service=mock_app_conversation_service,
                     )
 
-                    # Verify that search was called with only pagination parameters (filtering is done at API level)
-                    mock_store.search.assert_called_once_with(None, 20)
+                    # Verify that the filters were passed through to the store
+                    mock_store.search.assert_called_once_with(
+                        None,
+                        20,
+                        selected_repository='nonexistent/repo',
+                        trigger=ConversationTrigger.GUI,
+                    )
 
                     # Verify the result is empty
                     assert len(result_set.results) == 0
@@ -1,9 +1,14 @@
 import json
+from datetime import datetime, timezone
+from unittest.mock import patch
 
 import pytest
 
 from openhands.storage.conversation.file_conversation_store import FileConversationStore
-from openhands.storage.data_models.conversation_metadata import ConversationMetadata
+from openhands.storage.data_models.conversation_metadata import (
+    ConversationMetadata,
+    ConversationTrigger,
+)
 from openhands.storage.locations import get_conversation_metadata_filename
 from openhands.storage.memory import InMemoryFileStore
 
@@ -200,3 +205,124 @@ async def test_get_all_metadata():
     assert results[0].title == 'First conversation'
     assert results[1].conversation_id == 'conv2'
     assert results[1].title == 'Second conversation'
+
+
+def _metadata(conversation_id: str, day: int, **kwargs) -> ConversationMetadata:
+    return ConversationMetadata(
+        conversation_id=conversation_id,
+        user_id='123',
+        selected_repository=kwargs.pop('selected_repository', 'repo1'),
+        created_at=datetime(2025, 1, day, tzinfo=timezone.utc),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_index_maintained_by_save_and_delete():
+    file_store = InMemoryFileStore({})
+    store = FileConversationStore(file_store)
+    await store.save_metadata(_metadata('conv1', 16))
+    await store.save_metadata(_metadata('conv2', 17))
+
+    # The index is built by the first search
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv2', 'conv1']
+    index = json.loads(file_store.read(store.get_metadata_index_filename()))
+    assert [e['conversation_id'] for e in index] == ['conv2', 'conv1']
+
+    await store.save_metadata(_metadata('conv3', 18))
+    await store.delete_metadata('conv2')
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv3', 'conv1']
+
+
+@pytest.mark.asyncio
+async def test_search_only_reads_page_metadata():
+    store = FileConversationStore(InMemoryFileStore({}))
+    for day in range(1, 11):
+        await store.save_metadata(_metadata(f'conv{day}', day))
+    await store.search()
+
+    with patch.object(
+        store, '_read_metadata', wraps=store._read_metadata
+    ) as read_metadata:
+        result = await store.search(limit=3)
+    assert [c.conversation_id for c in result.results] == [
+        'conv10',
+        'conv9',
+        'conv8',
+    ]
+    assert read_metadata.call_count == 3
+    assert result.next_page_id is not None
+
+
+@pytest.mark.asyncio
+async def test_search_filters():
+    store = FileConversationStore(InMemoryFileStore({}))
+    await store.save_metadata(_metadata('conv1', 16, trigger=ConversationTrigger.GUI))
+    await store.save_metadata(
+        _metadata(
+            'conv2', 17, selected_repository='repo2', trigger=ConversationTrigger.GUI
+        )
+    )
+    await store.save_metadata(
+        _metadata('conv3', 18, trigger=ConversationTrigger.RESOLVER)
+    )
+
+    result = await store.search(selected_repository='repo1')
+    assert [c.conversation_id for c in result.results] == ['conv3', 'conv1']
+    result = await store.search(trigger=ConversationTrigger.GUI)
+    assert [c.conversation_id for c in result.results] == ['conv2', 'conv1']
+    result = await store.search(
+        selected_repository='repo1', trigger=ConversationTrigger.GUI
+    )
+    assert [c.conversation_id for c in result.results] == ['conv1']
+
+
+@pytest.mark.asyncio
+async def test_search_drops_removed_conversations_from_index():
+    file_store = InMemoryFileStore({})
+    store = FileConversationStore(file_store)
+    await store.save_metadata(_metadata('conv1', 16))
+    await store.save_metadata(_metadata('conv2', 17))
+    await store.search()
+
+    # Removed without going through delete_metadata
+    file_store.delete(get_conversation_metadata_filename('conv2'))
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv1']
+    index = json.loads(file_store.read(store.get_metadata_index_filename()))
+    assert [e['conversation_id'] for e in index] == ['conv1']
+
+
+@pytest.mark.asyncio
+async def test_search_restores_conversations_missing_from_index():
+    file_store = InMemoryFileStore({})
+    store = FileConversationStore(file_store)
+    await store.save_metadata(_metadata('conv1', 16))
+    await store.search()
+    await store.save_metadata(_metadata('conv2', 17))
+
+    # e.g.: The update was lost to a concurrent write from another process
+    file_store.write(store.get_metadata_index_filename(), json.dumps([]))
+    result = await store.search()
+    assert [c.conversation_id for c in result.results] == ['conv2', 'conv1']
+    index = json.loads(file_store.read(store.get_metadata_index_filename()))
+    assert [e['conversation_id'] for e in index] == ['conv2', 'conv1']
+
+
+@pytest.mark.asyncio
+async def test_save_metadata_does_not_read_index():
+    store = FileConversationStore(InMemoryFileStore({}))
+    await store.save_metadata(_metadata('conv1', 16))
+    await store.search()
+
+    with patch.object(store, '_load_index', wraps=store._load_index) as load_index:
+        await store.save_metadata(_metadata('conv2', 17))
+        await store.save_metadata(_metadata('conv1', 16, title='Renamed'))
+    load_index.assert_not_called()
+
+    # Changes to indexed fields are applied to the index
+    await store.save_metadata(_metadata('conv1', 16, selected_repository='repo2'))
+    result = await store.search(selected_repository='repo2')
+    assert [c.conversation_id for c in result.results] == ['conv1']